@@ -1,5 +1,5 @@
 import pyomo.environ as pyo
-from Donnees.data import Time, Prod, Demande_H2
+from Donnees.data import Prod
 
 
 def objectif(model: pyo.ConcreteModel, Names: list[str]) -> pyo.ConcreteModel:
@@ -24,9 +24,9 @@ def objectif(model: pyo.ConcreteModel, Names: list[str]) -> pyo.ConcreteModel:
     # Valeur de la fonction objective des consommateur:
     # prix au kilo de l'H2
     def C_val_cons_rule(m, j):
-        prix_total = sum(model.P_H2_vendu[i, j, t] for t in Time for i in Prod)
-        demande_tot_cons = sum(Demande_H2[j][t] for t in Time)
-        if demande_tot_cons == 0:
+        prix_total = sum(model.P_H2_vendu[i, j, t] for t in m.Time for i in Prod)
+        demande_tot_cons = sum(m.Demande_H2[j, t] for t in m.Time)
+        if pyo.value(demande_tot_cons) == 0:
             return m.fn_obj[j] == 0
         else:
             return m.fn_obj[j] == prix_total / demande_tot_cons
@@ -37,7 +37,7 @@ def objectif(model: pyo.ConcreteModel, Names: list[str]) -> pyo.ConcreteModel:
 
 
 def contraintes(
-    model: pyo.ConcreteModel, Names: list[str], optim_prix: bool = False
+    model: pyo.ConcreteModel, Names: list[str], optim_prix: bool | str = False
 ) -> pyo.ConcreteModel:
     """
     Ajoute les contraintes liées aux consommateurs dans le modèle Pyomo.
@@ -46,8 +46,8 @@ def contraintes(
         model (pyo.ConcreteModel):
             Le modèle Pyomo dans lequel les variables et contraintes sont définies.
         Names (list[str]): Liste des noms des consommateurs.
-        optim_prix (bool, optional):
-            Si True, le prix de vente de l'H2 est inclu en variable d'optimisation.
+        optim_prix (bool | str, optional):
+            Si True ou "menu", le prix de vente de l'H2 est inclu en variable d'optimisation.
             Certaines contraintes ne doivent dans ce cas pas être générées. Defaults to False.
 
     Returns:
@@ -57,9 +57,9 @@ def contraintes(
 
     # La demande est satisfaite
     def C_cons_1_rule(m, j, t):
-        return sum(m.Q_H2_vendu[i, j, t] for i in Prod) == Demande_H2[j][t]
+        return sum(m.Q_H2_vendu[i, j, t] for i in Prod) == m.Demande_H2[j, t]
 
-    model.C_cons_1 = pyo.Constraint(Names, Time, rule=C_cons_1_rule)
+    model.C_cons_1 = pyo.Constraint(Names, model.Time, rule=C_cons_1_rule)
 
     # Si on n'optimise pas avec McCormick
     # Prix payé aux producteur (contrainte redondante avec la modélisation des producteurs)
@@ -70,5 +70,5 @@ def contraintes(
                 m.P_H2_vendu[i, j, t] == m.Q_H2_vendu[i, j, t] * m.Prix_vente_H2[i, j]
             )
 
-        model.C_cons_2 = pyo.Constraint(Prod, Names, Time, rule=C_cons_2_rule)
+        model.C_cons_2 = pyo.Constraint(Prod, Names, model.Time, rule=C_cons_2_rule)
     return model
@@ -1,19 +1,22 @@
 import pyomo.environ as pyo
 from Donnees.data import (
     Cons,
-    Energie,
-    Time,
-    Time_horizon,
+    Energies_autorisees,
     Rendement_vaporeformage,
     Taille_vaporeformeur,
     Impact_max,
     Taille_max_captage,
-    Prix_energie,
     CAPEX_t_captage,
     Impact_vaporeformage,
 )
 
 
+# Plafond d'émissions horaire (emission_CO2_heure), utilisé aussi par
+# Definition.contraintes_paresseuses pour ajouter les lignes violées
+def C_prod_smr_11_rule(m, i, t):
+    return m.Impact_prod[i, t] <= Impact_max[i] * m.Q_H2_prod[i, t]
+
+
 def objectif(model: pyo.ConcreteModel, Names: list[str]) -> pyo.ConcreteModel:
     """
     Définit la contrainte correspondant à la valeur de l'objectif des producteurs utilisant le SMR et un système CCS.
@@ -35,8 +38,8 @@ def objectif(model: pyo.ConcreteModel, Names: list[str]) -> pyo.ConcreteModel:
     # /!\ si modification, ne pas oublier de la changer dans point_nadir.py
     def C_obj_prod_smr_rule(m, i):
         cout_energie = m.P_energie_total[i]
-        cout_CAPEX = m.P_CAPEX_Captage[i] * Time_horizon
-        recettes = sum(model.P_H2_vendu[i, j, t] for j in Cons for t in Time)
+        cout_CAPEX = m.P_CAPEX_Captage[i] * sum(m.Duree[t] for t in m.Time)
+        recettes = sum(model.P_H2_vendu[i, j, t] for j in Cons for t in m.Time)
         return m.fn_obj[i] == cout_energie + cout_CAPEX - recettes
 
     model.C_obj_prod_smr = pyo.Constraint(Names, rule=C_obj_prod_smr_rule)
@@ -47,7 +50,9 @@ def contraintes(
     model: pyo.ConcreteModel,
     Names: list[str],
     emission_CO2_heure: bool = True,
-    optim_prix: bool = False,
+    optim_prix: bool | str = False,
+    dimensionnement: bool = True,
+    paresseuses: bool = False,
 ) -> pyo.ConcreteModel:
     """
     Ajoute les contraintes liées aux producteurs via smr dans le modèle Pyomo.
@@ -60,20 +65,33 @@ def contraintes(
             Si True, les contraintes d'emisions CO2 sont horaires.
             Sinon, la contrainte quota d'emissions carbone porte sur l'horizon entier d'optimisation.
             Defaults to True.
-        optim_prix (bool, optional):
-            Si True, le prix de vente de l'H2 est inclu en variable d'optimisation.
+        optim_prix (bool | str, optional):
+            Si True ou "menu", le prix de vente de l'H2 est inclu en variable d'optimisation.
             Certaines contraintes ne doivent dans ce cas pas être générées. Defaults to False.
+        dimensionnement (bool, optional):
+            Si False, les tailles sont des données (mode dispatch, tailles fixées par
+            modelisation.fixer_tailles) : les contraintes de taille max et de CAPEX ne
+            sont pas générées. Defaults to True.
+        paresseuses (bool, optional):
+            Si True, le plafond d'émissions horaire est déclaré sans ligne : les lignes
+            violées sont ajoutées au fil des résolutions (voir contraintes_paresseuses).
+            Defaults to False.
 
 
     Returns:
         pyo.ConcreteModel:
             Le modèle avec les contraintes des producteurs smr.
     """
+    # Pas de temps du modèle
+    Time = model.Time
+
     # Contraintes flux physiques
 
     # Quantité d'énergie achetée par le producteur
     def C_prod_smr_0_rule(m, i, t):
-        return m.Q_energie_total[i, t] == sum(m.Q_energie[i, e, t] for e in Energie)
+        return m.Q_energie_total[i, t] == sum(
+            m.Q_energie[i, e, t] for e in Energies_autorisees[i]
+        )
 
     model.C_prod_smr_0 = pyo.Constraint(Names, Time, rule=C_prod_smr_0_rule)
 
@@ -89,9 +107,9 @@ def contraintes(
 
     model.C_prod_smr_1bis = pyo.Constraint(Names, Time, rule=C_prod_smr_1bis_rule)
 
-    # Contrainte de dimensionnement electrolyseur
+    # Contrainte de dimensionnement electrolyseur (sur la durée du pas de temps)
     def C_prod_smr_2_rule(m, i, t):
-        return m.Q_energie_total[i, t] <= Taille_vaporeformeur[i]
+        return m.Q_energie_total[i, t] <= Taille_vaporeformeur[i] * m.Duree[t]
 
     model.C_prod_smr_2 = pyo.Constraint(Names, Time, rule=C_prod_smr_2_rule)
 
@@ -101,35 +119,41 @@ def contraintes(
 
     model.C_prod_smr_3 = pyo.Constraint(Names, Time, rule=C_prod_smr_3_rule)
 
-    # Contrainte de dimensionnement système de capture CO2
+    # Contrainte de dimensionnement système de capture CO2 (sur la durée du pas de temps)
     def C_prod_smr_4_rule(m, i, t):
-        return m.Captage[i, t] <= m.Taille_captage[i]
+        return m.Captage[i, t] <= m.Taille_captage[i] * m.Duree[t]
 
     model.C_prod_smr_4 = pyo.Constraint(Names, Time, rule=C_prod_smr_4_rule)
 
-    # Taille max captage
-    def C_prod_smr_5_rule(m, i):
-        return m.Taille_captage[i] <= Taille_max_captage[i]
+    # Taille max captage (si la taille est à dimensionner)
+    if dimensionnement:
 
-    model.C_prod_smr_5 = pyo.Constraint(Names, rule=C_prod_smr_5_rule)
+        def C_prod_smr_5_rule(m, i):
+            return m.Taille_captage[i] <= Taille_max_captage[i]
+
+        model.C_prod_smr_5 = pyo.Constraint(Names, rule=C_prod_smr_5_rule)
 
     # Contraintes économiques
 
     # Cout de production d'H2 : Energie
     def C_prod_smr_6_rule(m, i):
         return m.P_energie_total[i] == sum(
-            m.Q_energie_total[i, t] * Prix_energie["Gaz"][t] for t in Time
+            m.Q_energie[i, e, t] * m.Prix_energie[e, t]
+            for e in Energies_autorisees[i]
+            for t in Time
         )
 
     model.C_prod_smr_6 = pyo.Constraint(Names, rule=C_prod_smr_6_rule)
 
-    # Cout de production : CAPEX par heure
-    def C_prod_smr_7_rule(m, i):
-        return m.P_CAPEX_Captage[i] == m.Taille_captage[i] * CAPEX_t_captage[i]
+    # Cout de production : CAPEX par heure (fixé avec la taille sinon)
+    if dimensionnement:
+
+        def C_prod_smr_7_rule(m, i):
+            return m.P_CAPEX_Captage[i] == m.Taille_captage[i] * CAPEX_t_captage[i]
 
-    model.C_prod_smr_7 = pyo.Constraint(Names, rule=C_prod_smr_7_rule)
+        model.C_prod_smr_7 = pyo.Constraint(Names, rule=C_prod_smr_7_rule)
 
-    # Si on n'optimise pas avec McCormick
+    # Si on n'optimise pas les prix (McCormick ou menu de prix)
     # Prix vendu aux consommateurs (contrainte redondante avec la modélisation des consommateurs)
     if not optim_prix:
 
@@ -160,19 +184,19 @@ def contraintes(
     # Contraintes d'emissions maximum
     # Si contrainte horaire
     if emission_CO2_heure:
-
-        def C_prod_smr_11_rule(m, i, t):
-            return m.Impact_prod[i, t] <= Impact_max[i] * m.Q_H2_prod[i, t]
-
-        model.C_prod_smr_11 = pyo.Constraint(Names, Time, rule=C_prod_smr_11_rule)
+        if paresseuses:
+            # Lignes ajoutées par Definition.contraintes_paresseuses
+            model.C_prod_smr_11 = pyo.Constraint(Names, Time)
+        else:
+            model.C_prod_smr_11 = pyo.Constraint(Names, Time, rule=C_prod_smr_11_rule)
     # Si contrainte en moyenne
     else:
 
-        def C_prod_smr_11_rule(m, i):
+        def C_prod_smr_11_horizon_rule(m, i):
             return sum(m.Impact_prod[i, t] for t in Time) <= Impact_max[i] * sum(
                 m.Q_H2_prod[i, t] for t in Time
             )
 
-        model.C_prod_smr_11 = pyo.Constraint(Names, rule=C_prod_smr_11_rule)
+        model.C_prod_smr_11 = pyo.Constraint(Names, rule=C_prod_smr_11_horizon_rule)
 
     return model
@@ -1,21 +1,23 @@
 import pyomo.environ as pyo
 from Donnees.data import (
     Cons,
-    Energie,
-    Time,
-    Time_horizon,
-    Impact_elec,
     Electricite,
+    Energies_autorisees,
     Rendement_electrolyseur,
     CAPEX_t_electrolyseur,
     CAPEX_t_stockage,
     Taille_max_electrolyseur,
     Impact_max,
     Taille_max_stockage,
-    Prix_energie,
 )
 
 
+# Plafond d'émissions horaire (emission_CO2_heure), utilisé aussi par
+# Definition.contraintes_paresseuses pour ajouter les lignes violées
+def C_prod_elec_17_rule(m, i, t):
+    return m.Impact_prod[i, t] <= Impact_max[i] * m.Q_H2_prod[i, t]
+
+
 def objectif(model: pyo.ConcreteModel, Names: list[str]) -> pyo.ConcreteModel:
     """
     Définit la contrainte correspondant à la valeur de l'objectif des producteurs utilisant un électrolyseur et un stockage H2.
@@ -37,8 +39,10 @@ def objectif(model: pyo.ConcreteModel, Names: list[str]) -> pyo.ConcreteModel:
     # /!\ si modification, ne pas oublier de la changer dans point_nadir.py
     def C_obj_prod_elec_rule(m, i):
         cout_energie = m.P_energie_total[i]
-        cout_CAPEX = (m.P_CAPEX_Electrolyseur[i] + m.P_CAPEX_Stockage[i]) * Time_horizon
-        recettes = sum(m.P_H2_vendu[i, j, t] for t in Time for j in Cons)
+        cout_CAPEX = (m.P_CAPEX_Electrolyseur[i] + m.P_CAPEX_Stockage[i]) * sum(
+            m.Duree[t] for t in m.Time
+        )
+        recettes = sum(m.P_H2_vendu[i, j, t] for t in m.Time for j in Cons)
         return m.fn_obj[i] == cout_energie + cout_CAPEX - recettes
 
     model.C_obj_prod_elec = pyo.Constraint(Names, rule=C_obj_prod_elec_rule)
@@ -49,7 +53,9 @@ def contraintes(
     model: pyo.ConcreteModel,
     Names: list[str],
     emission_CO2_heure: bool = True,
-    optim_prix: bool = False,
+    optim_prix: bool | str = False,
+    dimensionnement: bool = True,
+    paresseuses: bool = False,
 ) -> pyo.ConcreteModel:
     """
     Ajoute les contraintes liées aux producteurs via électrolyse dans le modèle Pyomo.
@@ -62,20 +68,33 @@ def contraintes(
             Si True, les contraintes d'emisions CO2 sont horaires.
             Sinon, la contrainte quota d'emissions carbone porte sur l'horizon entier d'optimisation.
             Defaults to True.
-        optim_prix (bool, optional):
-            Si True, le prix de vente de l'H2 est inclu en variable d'optimisation.
+        optim_prix (bool | str, optional):
+            Si True ou "menu", le prix de vente de l'H2 est inclu en variable d'optimisation.
             Certaines contraintes ne doivent dans ce cas pas être générées. Defaults to False.
+        dimensionnement (bool, optional):
+            Si False, les tailles sont des données (mode dispatch, tailles fixées par
+            modelisation.fixer_tailles) : les contraintes de taille max et de CAPEX ne
+            sont pas générées. Defaults to True.
+        paresseuses (bool, optional):
+            Si True, le plafond d'émissions horaire est déclaré sans ligne : les lignes
+            violées sont ajoutées au fil des résolutions (voir contraintes_paresseuses).
+            Defaults to False.
 
 
     Returns:
         pyo.ConcreteModel:
             Le modèle avec les contraintes des producteurs électrolyse.
     """
+    # Pas de temps du modèle
+    Time = model.Time
+
     # Contraintes flux physiques
 
     # Quantité d'énergie achetée par le producteur
     def C_prod_elec_1_rule(m, i, t):
-        return m.Q_energie_total[i, t] == sum(m.Q_energie[i, e, t] for e in Energie)
+        return m.Q_energie_total[i, t] == sum(
+            m.Q_energie[i, e, t] for e in Energies_autorisees[i]
+        )
 
     model.C_prod_elec_1 = pyo.Constraint(Names, Time, rule=C_prod_elec_1_rule)
 
@@ -85,15 +104,15 @@ def contraintes(
 
     model.C_prod_elec_2 = pyo.Constraint(Names, Time, rule=C_prod_elec_2_rule)
 
-    # Contrainte de dimensionnement electrolyseur
+    # Contrainte de dimensionnement electrolyseur (sur la durée du pas de temps)
     def C_prod_elec_3_rule(m, i, t):
-        return m.Q_energie_total[i, t] <= m.Taille_electrolyseur[i]
+        return m.Q_energie_total[i, t] <= m.Taille_electrolyseur[i] * m.Duree[t]
 
     model.C_prod_elec_3 = pyo.Constraint(Names, Time, rule=C_prod_elec_3_rule)
 
     # Quantité d'H2 en stock
     def C_prod_elec_4_rule(m, i, t):
-        if t == 0:
+        if t == Time.first():
             return (
                 m.Q_H2_stock[i, t]
                 == m.Q_H2_init_stock[i] + m.Q_H2_stock_in[i, t] - m.Q_H2_stock_out[i, t]
@@ -101,7 +120,7 @@ def contraintes(
         else:
             return (
                 m.Q_H2_stock[i, t]
-                == m.Q_H2_stock[i, t - 1]
+                == m.Q_H2_stock[i, Time.prev(t)]
                 + m.Q_H2_stock_in[i, t]
                 - m.Q_H2_stock_out[i, t]
             )
@@ -116,7 +135,7 @@ def contraintes(
 
     # Quantité finale d'H2 en stock
     def C_prod_elec_6_rule(m, i):
-        return m.Q_H2_init_stock[i] == m.Q_H2_stock[i, Time[-1]]
+        return m.Q_H2_init_stock[i] == m.Q_H2_stock[i, Time.last()]
 
     model.C_prod_elec_6 = pyo.Constraint(Names, rule=C_prod_elec_6_rule)
 
@@ -141,44 +160,51 @@ def contraintes(
 
     model.C_prod_elec_9 = pyo.Constraint(Names, Time, rule=C_prod_elec_9_rule)
 
-    # Taille max electrolyseur
-    def C_prod_elec_10_rule(m, i):
-        return m.Taille_electrolyseur[i] <= Taille_max_electrolyseur[i]
+    # Si les tailles sont à dimensionner
+    if dimensionnement:
+        # Taille max electrolyseur
+        def C_prod_elec_10_rule(m, i):
+            return m.Taille_electrolyseur[i] <= Taille_max_electrolyseur[i]
 
-    model.C_prod_elec_10 = pyo.Constraint(Names, rule=C_prod_elec_10_rule)
+        model.C_prod_elec_10 = pyo.Constraint(Names, rule=C_prod_elec_10_rule)
 
-    # Taille max stockage
-    def C_prod_elec_11_rule(m, i):
-        return m.Taille_stockage[i] <= Taille_max_stockage[i]
+        # Taille max stockage
+        def C_prod_elec_11_rule(m, i):
+            return m.Taille_stockage[i] <= Taille_max_stockage[i]
 
-    model.C_prod_elec_11 = pyo.Constraint(Names, rule=C_prod_elec_11_rule)
+        model.C_prod_elec_11 = pyo.Constraint(Names, rule=C_prod_elec_11_rule)
 
     # Contraintes économiques
 
     # Cout de production d'H2 : Energie
     def C_prod_elec_12_rule(m, i):
         return m.P_energie_total[i] == sum(
-            sum(m.Q_energie[i, e, t] * Prix_energie[e][t] for e in Energie)
+            sum(
+                m.Q_energie[i, e, t] * m.Prix_energie[e, t]
+                for e in Energies_autorisees[i]
+            )
             for t in Time
         )
 
     model.C_prod_elec_12 = pyo.Constraint(Names, rule=C_prod_elec_12_rule)
 
-    # Cout de production : CAPEX par h
-    def C_prod_elec_13_rule(m, i):
-        return (
-            m.P_CAPEX_Electrolyseur[i]
-            == m.Taille_electrolyseur[i] * CAPEX_t_electrolyseur[i]
-        )
+    # Cout de production : CAPEX par h (fixé avec les tailles sinon)
+    if dimensionnement:
+
+        def C_prod_elec_13_rule(m, i):
+            return (
+                m.P_CAPEX_Electrolyseur[i]
+                == m.Taille_electrolyseur[i] * CAPEX_t_electrolyseur[i]
+            )
 
-    model.C_prod_elec_13 = pyo.Constraint(Names, rule=C_prod_elec_13_rule)
+        model.C_prod_elec_13 = pyo.Constraint(Names, rule=C_prod_elec_13_rule)
 
-    def C_prod_elec_14_rule(m, i):
-        return m.P_CAPEX_Stockage[i] == m.Taille_stockage[i] * CAPEX_t_stockage[i]
+        def C_prod_elec_14_rule(m, i):
+            return m.P_CAPEX_Stockage[i] == m.Taille_stockage[i] * CAPEX_t_stockage[i]
 
-    model.C_prod_elec_14 = pyo.Constraint(Names, rule=C_prod_elec_14_rule)
+        model.C_prod_elec_14 = pyo.Constraint(Names, rule=C_prod_elec_14_rule)
 
-    # Si on n'optimise pas avec McCormick
+    # Si on n'optimise pas les prix (McCormick ou menu de prix)
     # Prix vendu aux consommateurs (contrainte redondante avec la modélisation des consommateurs)
     # Profit vente d'H2
     if not optim_prix:
@@ -197,7 +223,9 @@ def contraintes(
     # Impact carbone producteur
     def C_prod_elec_16_rule(m, i, t):
         return m.Impact_prod[i, t] == sum(
-            m.Q_energie[i, e, t] * Impact_elec[e][t] for e in Electricite
+            m.Q_energie[i, e, t] * m.Impact_elec[e, t]
+            for e in Energies_autorisees[i]
+            if e in Electricite
         )
 
     model.C_prod_elec_16 = pyo.Constraint(Names, Time, rule=C_prod_elec_16_rule)
@@ -205,19 +233,19 @@ def contraintes(
     # Contraintes d'emissions maximum
     # Si contrainte horaire
     if emission_CO2_heure:
-
-        def C_prod_elec_17_rule(m, i, t):
-            return m.Impact_prod[i, t] <= Impact_max[i] * m.Q_H2_prod[i, t]
-
-        model.C_prod_elec_17 = pyo.Constraint(Names, Time, rule=C_prod_elec_17_rule)
+        if paresseuses:
+            # Lignes ajoutées par Definition.contraintes_paresseuses
+            model.C_prod_elec_17 = pyo.Constraint(Names, Time)
+        else:
+            model.C_prod_elec_17 = pyo.Constraint(Names, Time, rule=C_prod_elec_17_rule)
     # Si contrainte en moyenne
     else:
 
-        def C_prod_elec_17_rule(m, i):
+        def C_prod_elec_17_horizon_rule(m, i):
             return sum(m.Impact_prod[i, t] for t in Time) <= Impact_max[i] * sum(
                 m.Q_H2_prod[i, t] for t in Time
             )
 
-        model.C_prod_elec_17 = pyo.Constraint(Names, rule=C_prod_elec_17_rule)
+        model.C_prod_elec_17 = pyo.Constraint(Names, rule=C_prod_elec_17_horizon_rule)
 
     return model
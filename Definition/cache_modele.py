@@ -0,0 +1,594 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.repn.plugins.standard_form import LinearStandardFormCompiler
+from pyomo.version import version as version_pyomo
+import config as config
+import Donnees.data as data
+import Definition.contraintes_paresseuses as contraintes_paresseuses
+from Donnees.data import Prod, Cons, Acteurs
+
+# Cache du modèle compilé (forme standard de init_model).
+#
+# Pour un scénario et des options donnés, la matrice des contraintes produite par
+# init_model est toujours la même. Elle est compilée une fois (LinearStandardFormCompiler
+# de Pyomo) et enregistrée dans config.cache_modeles :
+#   - <cle>.npz : matrice A (creuse, par colonnes), second membre et sens des lignes,
+#     bornes et intégrité des variables, une ligne d'objectif par acteur (fn_obj) et
+#     l'objectif sans priorité de la table des gains ;
+#   - <cle>.json : index (options, noms des variables, des contraintes et des objectifs) ;
+#   - <cle>.mps (optionnel) : instance reproductible pour des bancs de solveurs.
+# La clé est une empreinte des séries de la fenêtre de données, du registre des acteurs,
+# des options de modélisation et du code de Definition/.
+#
+# Une exécution suivante charge directement la matrice dans HiGHS (highspy) sans construire
+# le modèle Pyomo : table des gains (table_gains) ou résolution d'un objectif pondéré.
+#
+# Utilisation :
+#   python -m Definition.cache_modele --exporter --mps
+#   python -m Definition.cache_modele --table
+
+# Nom de l'objectif sans priorité (somme des objectifs, consommateurs pondérés par leur
+# demande totale) dans le cache
+SANS_PRIORITE = "sans_priorite"
+
+# Sens des lignes (bound_type de la forme standard mixte de Pyomo)
+SUPERIEUR, EGAL, INFERIEUR = -1, 0, 1
+
+
+def _empreinte_code() -> str:
+    # Empreinte des fichiers de la modélisation : le cache change avec le modèle
+    h = hashlib.sha256()
+    dossier = os.path.dirname(os.path.abspath(__file__))
+    for fichier in sorted(
+        glob.glob(os.path.join(dossier, "**", "*.py"), recursive=True)
+    ):
+        with open(fichier, "rb") as file:
+            h.update(file.read())
+    return h.hexdigest()
+
+
+def cle(
+    emission_CO2_heure: bool,
+    optim_prix: bool | str = False,
+    segments_mccormick: int | None = None,
+    donnees: tuple | None = None,
+    tailles: dict[str, dict[str, float]] | None = None,
+    durees: list[int] | None = None,
+) -> str:
+    """
+    Clé du cache : empreinte des séries, du registre, des options et du code du modèle.
+
+    Args:
+        emission_CO2_heure (bool):
+            Option emission_CO2_heure de init_model.
+        optim_prix (bool | str, optional):
+            Option optim_prix de init_model. Defaults to False.
+        segments_mccormick (int | None, optional):
+            Option segments_mccormick de init_model. Defaults to None
+            (config.segments_mccormick).
+        donnees (tuple | None, optional):
+            Séries (Production_elec, Impact_elec, Prix_energie, Demande_H2). Defaults to
+            None (données de Donnees.data).
+        tailles (dict[str, dict[str, float]] | None, optional):
+            Tailles fixées (mode dispatch). Defaults to None.
+        durees (list[int] | None, optional):
+            Durées des pas de temps (modèle segmenté). Defaults to None.
+
+    Returns:
+        str:
+            La clé (empreinte hexadécimale).
+    """
+    if segments_mccormick is None:
+        segments_mccormick = config.segments_mccormick
+    if donnees is None:
+        donnees = (
+            data.Production_elec,
+            data.Impact_elec,
+            data.Prix_energie,
+            data.Demande_H2,
+        )
+    h = hashlib.sha256()
+    for serie in donnees:
+        for k in sorted(serie):
+            h.update(k.encode())
+            h.update(np.asarray(serie[k], dtype=np.float64).tobytes())
+    options = {
+        "emission_CO2_heure": emission_CO2_heure,
+        "optim_prix": optim_prix,
+        "segments_mccormick": segments_mccormick if optim_prix is True else None,
+        "menu_prix": data.Menu_prix if optim_prix == "menu" else None,
+        "Prix_vente_H2": data.Prix_vente_H2,
+        "registre": data.Registre,
+        "tailles": tailles,
+        "durees": durees,
+        "code": _empreinte_code(),
+    }
+    h.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:32]
+
+
+def compiler(model: pyo.ConcreteModel) -> dict:
+    """
+    Compile le modèle complet en forme standard (sans le modifier).
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle construit par init_model (sans objectif actif).
+
+    Returns:
+        dict:
+            Tableaux de la forme standard ("A", "rhs", "sens", "col_lower", "col_upper",
+            "entiers", "c", "c_offset") et noms ("colonnes", "lignes",
+            "objectifs").
+    """
+    objectifs = Acteurs + [SANS_PRIORITE]
+
+    def objectif_rule(m, a):
+        if a == SANS_PRIORITE:
+            return sum(m.fn_obj[p] for p in Prod) + sum(
+                m.fn_obj[c] * sum(m.Demande_H2[c, t] for t in m.Time) for c in Cons
+            )
+        return m.fn_obj[a]
+
+    actifs = [o for o in model.component_data_objects(pyo.Objective, active=True)]
+    for o in actifs:
+        o.deactivate()
+    model.objectifs_cache = pyo.Objective(objectifs, rule=objectif_rule)
+    # Le cache contient le modèle complet, même si des contraintes sont paresseuses
+    ajoutees = contraintes_paresseuses.completer(model)
+    try:
+        info = LinearStandardFormCompiler().write(
+            model, mixed_form=True, set_sense=None
+        )
+    finally:
+        contraintes_paresseuses.retirer(model, ajoutees)
+        model.del_component(model.objectifs_cache)
+        for o in actifs:
+            o.activate()
+
+    colonnes = info.columns
+    return {
+        "A": info.A.tocsc(),
+        "rhs": np.asarray(info.rhs, dtype=np.float64),
+        "sens": np.array([r.bound_type for r in info.rows], dtype=np.int8),
+        "col_lower": np.array(
+            [-np.inf if v.lb is None else v.lb for v in colonnes], dtype=np.float64
+        ),
+        "col_upper": np.array(
+            [np.inf if v.ub is None else v.ub for v in colonnes], dtype=np.float64
+        ),
+        "entiers": np.array([v.is_integer() for v in colonnes], dtype=bool),
+        "c": info.c.toarray(),
+        "c_offset": np.asarray(info.c_offset, dtype=np.float64),
+        "colonnes": [v.name for v in colonnes],
+        "lignes": [r.constraint.name for r in info.rows],
+        "objectifs": [str(o.index()) for o in info.objectives],
+    }
+
+
+def _options(emission_CO2_heure: bool, optim_prix: bool | str) -> dict:
+    # Options et fenêtre de données enregistrées dans l'index
+    return {
+        "emission_CO2_heure": emission_CO2_heure,
+        "optim_prix": optim_prix,
+        "fichier_donnees": data.fichier_données,
+        "debut_data": data.debut_data,
+        "Time_horizon": data.Time_horizon,
+    }
+
+
+def _chemin(cle_cache: str, dossier: str | None, extension: str) -> str:
+    dossier = config.cache_modeles if dossier is None else dossier
+    return os.path.join(dossier, f"{cle_cache}.{extension}")
+
+
+def exporter(
+    cache: dict,
+    cle_cache: str,
+    dossier: str | None = None,
+    mps: bool = False,
+    options: dict | None = None,
+) -> str:
+    """
+    Enregistre le modèle compilé (npz et index json, mps en option).
+
+    Args:
+        cache (dict):
+            Le modèle compilé (compiler).
+        cle_cache (str):
+            La clé du cache (cle).
+        dossier (str | None, optional):
+            Dossier du cache. Defaults to None (config.cache_modeles).
+        mps (bool, optional):
+            Si True, écrit aussi l'instance au format MPS (objectif sans priorité).
+            Defaults to False.
+        options (dict | None, optional):
+            Options de modélisation enregistrées dans l'index. Defaults to None.
+
+    Returns:
+        str:
+            Le chemin du fichier npz.
+    """
+    fichier = _chemin(cle_cache, dossier, "npz")
+    os.makedirs(os.path.dirname(fichier) or ".", exist_ok=True)
+    A = cache["A"]
+    np.savez_compressed(
+        fichier,
+        A_data=A.data,
+        A_indices=A.indices,
+        A_indptr=A.indptr,
+        A_shape=np.array(A.shape),
+        **{
+            k: cache[k]
+            for k in (
+                "rhs",
+                "sens",
+                "col_lower",
+                "col_upper",
+                "entiers",
+                "c",
+                "c_offset",
+            )
+        },
+    )
+    index = {
+        "cle": cle_cache,
+        "options": options,
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "pyomo": version_pyomo,
+        "objectifs": cache["objectifs"],
+        "colonnes": cache["colonnes"],
+        "lignes": cache["lignes"],
+    }
+    with open(_chemin(cle_cache, dossier, "json"), "w") as file:
+        json.dump(index, file)
+    if mps:
+        instance_highs(cache, SANS_PRIORITE).writeModel(
+            _chemin(cle_cache, dossier, "mps")
+        )
+    return fichier
+
+
+def charger(cle_cache: str, dossier: str | None = None) -> dict | None:
+    """
+    Charge un modèle compilé du cache.
+
+    Args:
+        cle_cache (str):
+            La clé du cache (cle).
+        dossier (str | None, optional):
+            Dossier du cache. Defaults to None (config.cache_modeles).
+
+    Returns:
+        dict | None:
+            Le modèle compilé (même contenu que compiler), ou None s'il n'est pas en cache.
+    """
+    fichier = _chemin(cle_cache, dossier, "npz")
+    if not os.path.exists(fichier) or not os.path.exists(
+        _chemin(cle_cache, dossier, "json")
+    ):
+        return None
+    from scipy.sparse import csc_array
+
+    with np.load(fichier) as tableaux:
+        cache = {k: tableaux[k] for k in tableaux.files}
+    cache["A"] = csc_array(
+        (cache.pop("A_data"), cache.pop("A_indices"), cache.pop("A_indptr")),
+        shape=tuple(cache.pop("A_shape")),
+    )
+    with open(_chemin(cle_cache, dossier, "json"), "r") as file:
+        index = json.load(file)
+    for k in ("colonnes", "lignes", "objectifs"):
+        cache[k] = index[k]
+    return cache
+
+
+def obtenir(
+    emission_CO2_heure: bool,
+    optim_prix: bool | str = False,
+    model: pyo.ConcreteModel | None = None,
+    dossier: str | None = None,
+    durees: list[int] | None = None,
+) -> dict:
+    """
+    Modèle compilé des options données : lu dans le cache, sinon compilé (à partir de
+    model, ou d'un modèle construit par init_model) et enregistré.
+
+    Args:
+        emission_CO2_heure (bool):
+            Option emission_CO2_heure de init_model.
+        optim_prix (bool | str, optional):
+            Option optim_prix de init_model. Defaults to False.
+        model (pyo.ConcreteModel | None, optional):
+            Modèle déjà construit avec ces options (et les données de Donnees.data).
+            Defaults to None.
+        dossier (str | None, optional):
+            Dossier du cache. Defaults to None (config.cache_modeles).
+        durees (list[int] | None, optional):
+            Durées des pas de temps (modèle segmenté). Defaults to None.
+
+    Returns:
+        dict:
+            Le modèle compilé.
+    """
+    cle_cache = cle(emission_CO2_heure, optim_prix, durees=durees)
+    cache = charger(cle_cache, dossier)
+    if cache is not None:
+        return cache
+    if model is None:
+        import Definition.modelisation as modelisation
+
+        model = modelisation.init_model(
+            emission_CO2_heure=emission_CO2_heure, optim_prix=optim_prix, durees=durees
+        )
+    cache = compiler(model)
+    exporter(
+        cache,
+        cle_cache,
+        dossier,
+        options=_options(emission_CO2_heure, optim_prix),
+    )
+    return cache
+
+
+def instance_highs(
+    cache: dict, objectif: str | dict[str, float], maximiser: bool = False
+):
+    """
+    Charge le modèle compilé dans HiGHS avec un objectif.
+
+    Args:
+        cache (dict):
+            Le modèle compilé.
+        objectif (str | dict[str, float]):
+            Nom d'un objectif du cache (acteur ou SANS_PRIORITE), ou poids des acteurs.
+        maximiser (bool, optional):
+            Si True, maximise l'objectif. Defaults to False.
+
+    Returns:
+        highspy.Highs:
+            L'instance HiGHS prête à résoudre.
+    """
+    import highspy
+
+    if isinstance(objectif, str):
+        objectif = {objectif: 1.0}
+    ligne = {nom: i for i, nom in enumerate(cache["objectifs"])}
+    cout = sum(poids * cache["c"][ligne[nom]] for nom, poids in objectif.items())
+    constante = sum(
+        poids * cache["c_offset"][ligne[nom]] for nom, poids in objectif.items()
+    )
+
+    A = cache["A"]
+    sens = cache["sens"]
+    rhs = cache["rhs"]
+    lp = highspy.HighsLp()
+    lp.num_col_, lp.num_row_ = A.shape[1], A.shape[0]
+    lp.col_cost_ = np.asarray(cout, dtype=np.float64)
+    lp.offset_ = float(constante)
+    lp.col_lower_ = cache["col_lower"]
+    lp.col_upper_ = cache["col_upper"]
+    lp.row_lower_ = np.where(sens == INFERIEUR, -np.inf, rhs)
+    lp.row_upper_ = np.where(sens == SUPERIEUR, np.inf, rhs)
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = A.indptr
+    lp.a_matrix_.index_ = A.indices
+    lp.a_matrix_.value_ = A.data
+    lp.sense_ = highspy.ObjSense.kMaximize if maximiser else highspy.ObjSense.kMinimize
+    if cache["entiers"].any():
+        lp.integrality_ = [
+            highspy.HighsVarType.kInteger if e else highspy.HighsVarType.kContinuous
+            for e in cache["entiers"]
+        ]
+    lp.col_names_ = list(cache["colonnes"])
+    lp.row_names_ = list(cache["lignes"])
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    if config.solveur_threads is not None:
+        h.setOptionValue("threads", config.solveur_threads)
+    h.passModel(lp)
+    return h
+
+
+def _solution(
+    cache: dict, objectif: str | dict[str, float], maximiser: bool = False
+) -> np.ndarray | None:
+    # Valeurs des colonnes de la solution optimale, None si la résolution n'a pas abouti
+    import highspy
+
+    h = instance_highs(cache, objectif, maximiser)
+    h.run()
+    if h.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+        return None
+    return np.asarray(h.getSolution().col_value)
+
+
+def _objectifs(cache: dict, x: np.ndarray) -> dict[str, float]:
+    # fn_obj de chaque acteur pour les valeurs x des colonnes
+    ligne = {nom: i for i, nom in enumerate(cache["objectifs"])}
+    return {
+        a: float(cache["c"][ligne[a]] @ x + cache["c_offset"][ligne[a]])
+        for a in Acteurs
+    }
+
+
+def resoudre(
+    cache: dict, objectif: str | dict[str, float], maximiser: bool = False
+) -> dict[str, float] | None:
+    """
+    Résout le modèle compilé et retourne la valeur de l'objectif de chaque acteur.
+
+    Args:
+        cache (dict):
+            Le modèle compilé.
+        objectif (str | dict[str, float]):
+            Objectif à optimiser (voir instance_highs).
+        maximiser (bool, optional):
+            Si True, maximise l'objectif. Defaults to False.
+
+    Returns:
+        dict[str, float] | None:
+            fn_obj de chaque acteur dans la solution optimale, None si la résolution n'a
+            pas abouti.
+    """
+    x = _solution(cache, objectif, maximiser)
+    if x is None:
+        return None
+    return _objectifs(cache, x)
+
+
+def _colonnes_prix(
+    cache: dict,
+) -> dict[tuple[str, str], tuple[int, list[int], list[int]]]:
+    # Colonnes du prix de contrat, des quantités et des montants vendus heure par heure de
+    # chaque couple (enveloppes de McCormick), d'après les noms Pyomo des variables
+    from pyomo.core.base.component import index_repr
+
+    position = {nom: k for k, nom in enumerate(cache["colonnes"])}
+    colonnes = {}
+    for i in Prod:
+        for j in Cons:
+            prix = position.get("P_H2_contrat" + index_repr((i, j)))
+            if prix is None:
+                continue
+            ventes, montants = (
+                [
+                    position[nom + index_repr((i, j, t))]
+                    for t in data.Time
+                    if nom + index_repr((i, j, t)) in position
+                ]
+                for nom in ("Q_H2_vendu", "P_H2_vendu")
+            )
+            colonnes[(i, j)] = (prix, ventes, montants)
+    return colonnes
+
+
+def table_gains(
+    cache: dict,
+    display: bool = False,
+    prix_contrat: dict[tuple[str, str], list[tuple[float, float]]] | None = None,
+) -> tuple[
+    dict[str, float], dict[str, float], dict[str, float], dict[str, dict[str, float]]
+]:
+    """
+    Table des gains (mêmes résolutions et mêmes résultats que
+    optim_individuelle.optim_individuelle) calculée sur le modèle compilé.
+
+    Args:
+        cache (dict):
+            Le modèle compilé.
+        display (bool, optional):
+            Active l'affichage des étapes de résolution. Defaults to False.
+        prix_contrat (dict[tuple[str, str], list[tuple[float, float]]] | None, optional):
+            Si donné (enveloppes de McCormick), complété avec les prix de contrat et coûts
+            de revient des solutions de la table des gains (modelisation.relever_prix),
+            pour modelisation.resserrer_prix.
+            Defaults to None.
+
+    Returns:
+        tuple[dict[str, float], dict[str, float], dict[str, float], dict[str, dict[str, float]]]:
+            point_utopia, point_nadir, point_worst et priority_results.
+    """
+
+    def _print(texte: str) -> None:
+        if display:
+            print(texte)
+
+    colonnes_prix = _colonnes_prix(cache) if prix_contrat is not None else {}
+
+    def _resoudre(objectif, maximiser=False):
+        x = _solution(cache, objectif, maximiser)
+        if x is None:
+            raise RuntimeError(
+                f"La résolution de l'objectif {objectif} (cache) n'a pas abouti."
+            )
+        objectifs = _objectifs(cache, x)
+        if colonnes_prix and not maximiser:
+            import Definition.modelisation as modelisation
+
+            couts = {i: objectifs[i] for i in Prod}
+            for (i, _), (_, _, montants) in colonnes_prix.items():
+                couts[i] += float(x[montants].sum())
+            modelisation.relever_prix(
+                prix_contrat,
+                {k: float(x[c[0]]) for k, c in colonnes_prix.items()},
+                {k: float(x[c[1]].sum()) for k, c in colonnes_prix.items()},
+                couts,
+            )
+        return objectifs
+
+    results = _resoudre(SANS_PRIORITE)
+    point_utopia = dict(results)
+    point_nadir = dict(results)
+    point_worst = dict(results)
+    _print(f"Objectifs sans priorité : {results}")
+
+    priority_results = {}
+    for a in Acteurs:
+        results = _resoudre(a)
+        point_utopia[a] = results[a]
+        for b in Acteurs:
+            point_nadir[b] = max(point_nadir[b], results[b])
+        priority_results[a] = results
+        _print(f"Objectifs en priorisant {a} : {results}")
+
+    for a in Acteurs:
+        point_worst[a] = _resoudre(a, maximiser=True)[a]
+    return point_utopia, point_nadir, point_worst, priority_results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Cache du modèle compilé (options de config.py)."
+    )
+    parser.add_argument("--dossier", default=config.cache_modeles or "Cache")
+    parser.add_argument(
+        "--exporter", action="store_true", help="Compile et enregistre le modèle."
+    )
+    parser.add_argument(
+        "--mps", action="store_true", help="Écrit aussi l'instance au format MPS."
+    )
+    parser.add_argument(
+        "--table", action="store_true", help="Table des gains à partir du cache."
+    )
+    args = parser.parse_args()
+
+    emission, optim_prix = config.emission_CO2_heure, config.optim_prix
+    cle_cache = cle(emission, optim_prix)
+    print(f"Clé : {cle_cache}")
+    if args.exporter:
+        import Definition.modelisation as modelisation
+
+        start_time = time.time()
+        model = modelisation.init_model(
+            emission_CO2_heure=emission, optim_prix=optim_prix
+        )
+        cache = compiler(model)
+        fichier = exporter(
+            cache,
+            cle_cache,
+            args.dossier,
+            mps=args.mps,
+            options=_options(emission, optim_prix),
+        )
+        print(
+            f"{fichier} : {cache['A'].shape[0]} contraintes, {cache['A'].shape[1]} variables ({time.time() - start_time:.2f}s)"
+        )
+    if args.table:
+        start_time = time.time()
+        cache = charger(cle_cache, args.dossier)
+        if cache is None:
+            print("Modèle absent du cache (--exporter).")
+        else:
+            print(f"Chargement : {time.time() - start_time:.2f}s")
+            point_utopia, point_nadir, point_worst, _ = table_gains(cache)
+            print(f"Point idéal : {point_utopia}")
+            print(f"Point nadir : {point_nadir}")
+            print(f"Pire point : {point_worst}")
+            print(f"Temps : {time.time() - start_time:.2f}s")
@@ -0,0 +1,236 @@
+import numpy as np
+import pyomo.environ as pyo
+from Donnees.data import Impact_max, Producteurs_energie
+from Definition.Acteurs.prod_electrolyse import C_prod_elec_17_rule
+from Definition.Acteurs.prod_SMR import C_prod_smr_11_rule
+from Definition.modelisation import C_prod_elec_max_energie_rule
+
+# Génération paresseuse des contraintes horaires (plans coupants).
+#
+# Avec config.contraintes_paresseuses, init_model déclare les familles ci-dessous sans
+# aucune ligne :
+#   - C_prod_elec_17, C_prod_smr_11 : plafond d'émissions horaire de chaque producteur
+#     (emission_CO2_heure = True) ;
+#   - C_prod_elec_max_energie : production disponible de chaque source d'électricité,
+#     rarement atteinte.
+# Après chaque résolution (Resolution.solveur.resoudre), la solution est vérifiée en bloc
+# (tableaux numpy producteur x heure) et seules les lignes violées sont ajoutées avant de
+# résoudre à nouveau, jusqu'à ce que la solution respecte toutes les lignes : c'est alors
+# une solution optimale du modèle complet, obtenue sur un modèle de travail plus petit.
+# Les lignes ajoutées restent dans le modèle pour les résolutions suivantes.
+
+# Violation tolérée, relative à la valeur du second membre (au moins 1)
+TOLERANCE = 1e-6
+
+
+def _valeurs(composant, indices: list) -> np.ndarray:
+    # Valeurs courantes d'un composant (variable ou paramètre), 0 si non chargées
+    valeurs = np.fromiter(
+        (pyo.value(composant[k], exception=False) for k in indices),
+        dtype=np.float64,
+        count=len(indices),
+    )
+    return np.nan_to_num(valeurs)
+
+
+def _ecarts_plafond_co2(model, noms: list[str], Time: list) -> tuple:
+    indices = [(i, t) for i in noms for t in Time]
+    forme = (len(noms), len(Time))
+    impact = _valeurs(model.Impact_prod, indices).reshape(forme)
+    impact_max = np.array([Impact_max[i] for i in noms], dtype=np.float64)
+    plafond = impact_max[:, None] * _valeurs(model.Q_H2_prod, indices).reshape(forme)
+    return impact - plafond, plafond
+
+
+def _ecarts_production_max(model, energies: list[str], Time: list) -> tuple:
+    quantites = np.array(
+        [
+            _valeurs(
+                model.Q_energie,
+                [(i, e, t) for i in Producteurs_energie[e] for t in Time],
+            )
+            .reshape(-1, len(Time))
+            .sum(axis=0)
+            for e in energies
+        ]
+    ).reshape(len(energies), len(Time))
+    production = _valeurs(
+        model.Production_elec, [(e, t) for e in energies for t in Time]
+    ).reshape(len(energies), len(Time))
+    return quantites - production, production
+
+
+# Familles paresseuses : règle d'une ligne (celle de la déclaration complète, importée du
+# module qui la déclare), écarts (membre gauche - membre droit) et second membre de toutes
+# les lignes (tableaux nom x heure), variables lues par la vérification
+FAMILLES = {
+    "C_prod_elec_17": (
+        C_prod_elec_17_rule,
+        _ecarts_plafond_co2,
+        ["Impact_prod", "Q_H2_prod"],
+    ),
+    "C_prod_smr_11": (
+        C_prod_smr_11_rule,
+        _ecarts_plafond_co2,
+        ["Impact_prod", "Q_H2_prod"],
+    ),
+    "C_prod_elec_max_energie": (
+        C_prod_elec_max_energie_rule,
+        _ecarts_production_max,
+        ["Q_energie"],
+    ),
+}
+
+
+def familles_incompletes(model: pyo.ConcreteModel) -> list[str]:
+    """
+    Liste les familles paresseuses du modèle auxquelles il manque des lignes.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+
+    Returns:
+        list[str]:
+            Noms des familles incomplètes (vide si le modèle est complet).
+    """
+    familles = []
+    for nom in FAMILLES:
+        contrainte = model.component(nom)
+        # Contrainte sur l'horizon entier (emission_CO2_heure = False) : non paresseuse
+        if contrainte is None or contrainte.dim() != 2:
+            continue
+        if len(contrainte) < len(contrainte.index_set()):
+            familles.append(nom)
+    return familles
+
+
+def variables(model: pyo.ConcreteModel, familles: list[str] | None = None) -> list:
+    """
+    Variables dont la valeur est nécessaire à la vérification des familles paresseuses
+    (à charger après une résolution partielle, voir solveur.charger_solution).
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+        familles (list[str] | None, optional):
+            Familles à vérifier. Defaults to None (familles incomplètes).
+
+    Returns:
+        list:
+            Les composants Var.
+    """
+    if familles is None:
+        familles = familles_incompletes(model)
+    noms = dict.fromkeys(v for f in familles for v in FAMILLES[f][2])
+    return [model.component(v) for v in noms]
+
+
+def _noms(contrainte) -> list[str]:
+    # Premier index des lignes de la famille (producteurs ou sources d'énergie), dans l'ordre
+    return list(dict.fromkeys(k[0] for k in contrainte.index_set()))
+
+
+def violations(
+    model: pyo.ConcreteModel, nom: str, tolerance: float = TOLERANCE
+) -> list[tuple]:
+    """
+    Lignes absentes d'une famille paresseuse violées par la solution chargée dans le modèle.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo, avec la solution à vérifier.
+        nom (str):
+            Nom de la famille (clé de FAMILLES).
+        tolerance (float, optional):
+            Violation tolérée, relative au second membre. Defaults to TOLERANCE.
+
+    Returns:
+        list[tuple]:
+            Index (nom, heure) des lignes violées.
+    """
+    contrainte = model.component(nom)
+    noms = _noms(contrainte)
+    Time = list(model.Time)
+    ecarts, second_membre = FAMILLES[nom][1](model, noms, Time)
+    violees = ecarts > tolerance * np.maximum(np.abs(second_membre), 1)
+    # Les lignes déjà présentes sont respectées à la tolérance du solveur près
+    if len(contrainte):
+        position_nom = {n: a for a, n in enumerate(noms)}
+        position_t = {t: b for b, t in enumerate(Time)}
+        presentes = np.array(
+            [(position_nom[k[0]], position_t[k[1]]) for k in contrainte]
+        )
+        violees[presentes[:, 0], presentes[:, 1]] = False
+    return [(noms[a], Time[b]) for a, b in zip(*np.nonzero(violees))]
+
+
+def ajouter_violees(
+    model: pyo.ConcreteModel,
+    familles: list[str] | None = None,
+    tolerance: float = TOLERANCE,
+) -> int:
+    """
+    Ajoute au modèle les lignes des familles paresseuses violées par la solution chargée.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo, avec la solution à vérifier.
+        familles (list[str] | None, optional):
+            Familles à vérifier. Defaults to None (familles incomplètes).
+        tolerance (float, optional):
+            Violation tolérée, relative au second membre. Defaults to TOLERANCE.
+
+    Returns:
+        int:
+            Nombre de lignes ajoutées (0 : la solution respecte le modèle complet).
+    """
+    if familles is None:
+        familles = familles_incompletes(model)
+    ajoutees = 0
+    for nom in familles:
+        contrainte = model.component(nom)
+        regle = FAMILLES[nom][0]
+        for k in violations(model, nom, tolerance):
+            contrainte[k] = regle(model, *k)
+            ajoutees += 1
+    return ajoutees
+
+
+def completer(model: pyo.ConcreteModel) -> dict[str, list[tuple]]:
+    """
+    Ajoute toutes les lignes manquantes des familles paresseuses (modèle complet, par
+    exemple avant une compilation de la forme standard).
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+
+    Returns:
+        dict[str, list[tuple]]:
+            Index des lignes ajoutées par famille (pour retirer).
+    """
+    ajoutees = {}
+    for nom in familles_incompletes(model):
+        contrainte = model.component(nom)
+        regle = FAMILLES[nom][0]
+        ajoutees[nom] = [k for k in contrainte.index_set() if k not in contrainte]
+        for k in ajoutees[nom]:
+            contrainte[k] = regle(model, *k)
+    return ajoutees
+
+
+def retirer(model: pyo.ConcreteModel, ajoutees: dict[str, list[tuple]]) -> None:
+    """
+    Retire les lignes ajoutées par completer.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+        ajoutees (dict[str, list[tuple]]):
+            Index des lignes par famille, retournés par completer.
+    """
+    for nom, indices in ajoutees.items():
+        contrainte = model.component(nom)
+        for k in indices:
+            del contrainte[k]
@@ -1,34 +1,72 @@
 import pyomo.environ as pyo
+import Donnees.data as data
 from Donnees.data import (
     Prod,
     Cons,
     Energie,
-    Time,
     Prix_vente_H2,
     Acteurs,
     P_SMR,
     P_electrolyseur,
-    Production_elec,
     Electricite,
-    Demande_H2,
+    Couples_energie,
+    Producteurs_energie,
+    Meilleur_prix,
     Pire_prix,
+    Menu_prix,
+    CAPEX_t_electrolyseur,
+    CAPEX_t_stockage,
+    CAPEX_t_captage,
 )
+import config as config
+import Utils.utils as utils
 import Definition.Acteurs.prod_electrolyse as p_electrolyse
 import Definition.Acteurs.prod_SMR as p_SMR
 import Definition.Acteurs.consommateur as consommateur
+import Definition.segmentation as segmentation
 
-# Modélisation du scénario :
-#   - 2 Producteur via électrolyse:
-#       P1 : Source d'énergie PV + réseau
-#       P2 : Source d'énergie réseau
+# Modélisation du scénario (acteurs du registre Donnees/acteurs.json) :
+#   - Producteurs via électrolyse (sources d'énergie PV et/ou réseau)
 #   => Stockage et électrolyseur à dimensionner
-#   - 1 Producteur via vaporéformage
+#   - Producteurs via vaporéformage
 #   => Captage d'émission CO2 à dimensionner
-#   - 2 Consommateurs d'H2
+#   - Consommateurs d'H2
+
+# Valeur de optim_prix pour le choix des prix dans un menu (menu_prix de config.py)
+MENU_PRIX = "menu"
+
+# Variables de dimensionnement et producteurs concernés (tailles fixées : fixer_tailles)
+TAILLES = {
+    "Taille_electrolyseur": P_electrolyseur,
+    "Taille_stockage": P_electrolyseur,
+    "Taille_captage": P_SMR,
+}
+
+
+# Production disponible de chaque source d'électricité, utilisée aussi par
+# Definition.contraintes_paresseuses pour ajouter les lignes violées
+def C_prod_elec_max_energie_rule(m, e, t):
+    return (
+        sum(m.Q_energie[i, e, t] for i in Producteurs_energie[e])
+        <= m.Production_elec[e, t]
+    )
 
 
 def init_model(
-    emission_CO2_heure: bool = True, display: bool = False, optim_prix: bool = False
+    emission_CO2_heure: bool = True,
+    display: bool = False,
+    optim_prix: bool | str = False,
+    donnees: tuple[
+        dict[str, list[float]],
+        dict[str, list[float]],
+        dict[str, list[float]],
+        dict[str, list[float]],
+    ]
+    | None = None,
+    segments_mccormick: int | None = None,
+    tailles: dict[str, dict[str, float]] | None = None,
+    contraintes_paresseuses: bool | None = None,
+    durees: list[int] | None = None,
 ) -> pyo.ConcreteModel:
     """Initialise un modèle Pyomo pour la modélisation d'une chaîne de distribution simplifiée d'hydrogène.
 
@@ -39,9 +77,32 @@ def init_model(
             Defaults to True.
         display (bool, optional):
             Si True, active les print. Defaults to False.
-        optim_prix (bool, optional):
+        optim_prix (bool | str, optional):
             Si True, fait rentrer le prix de vente de l'H2 en variable d'optimisation en utilisant l'approximation de variables bilinéaire
-            des enveloppes de McCormick. Defaults to False.
+            des enveloppes de McCormick. Si "menu", le prix de chaque contrat est choisi dans
+            le menu de prix (modélisation exacte, voir menu_prix). Defaults to False.
+        donnees (tuple[dict[str, list[float]], ...] | None, optional):
+            Séries temporelles (Production_elec, Impact_elec, Prix_energie, Demande_H2)
+            au format de Utils.utils.read_data. L'horizon du modèle est la longueur des séries.
+            Defaults to None (données de Donnees.data).
+        segments_mccormick (int | None, optional):
+            Nombre de segments du domaine des prix de contrat pour les enveloppes de
+            McCormick (optim_prix = True). Au-delà de 1, chaque segment a une variable
+            binaire : relaxation plus précise mais résolution plus longue.
+            Defaults to None (config.segments_mccormick).
+        tailles (dict[str, dict[str, float]] | None, optional):
+            Tailles fixées tailles[nom][producteur] (Taille_electrolyseur, Taille_stockage,
+            Taille_captage) : le modèle ne contient plus que les décisions d'exploitation
+            (mode dispatch, voir fixer_tailles). Defaults to None (tailles à dimensionner).
+        contraintes_paresseuses (bool | None, optional):
+            Si True, les plafonds d'émissions horaires et la production disponible des
+            sources d'électricité sont déclarés sans ligne : seules les lignes violées sont
+            ajoutées au fil des résolutions (voir Definition.contraintes_paresseuses).
+            Defaults to None (config.contraintes_paresseuses).
+        durees (list[int] | None, optional):
+            Durée de chaque pas de temps - en heures (somme égale à l'horizon des séries) :
+            les séries sont agrégées par segment et les variables sont des quantités sur le
+            segment (voir Definition.segmentation). Defaults to None (pas horaires).
 
     Returns:
         pyo.ConcreteModel:
@@ -54,8 +115,29 @@ def init_model(
         if display:
             print(texte)
 
+    if donnees is None:
+        donnees = (
+            data.Production_elec,
+            data.Impact_elec,
+            data.Prix_energie,
+            data.Demande_H2,
+        )
+    if durees is None:
+        durees = [1] * len(donnees[3][Cons[0]])
+    else:
+        # Pas de temps de durée variable : séries agrégées par segment
+        donnees = segmentation.agreger(donnees, durees)
+    Production_elec, Impact_elec, Prix_energie, Demande_H2 = donnees
+
     model = pyo.ConcreteModel()
 
+    # Pas de temps du modèle (heure de début de chaque pas)
+    debuts = segmentation.debuts(durees)
+    model.Time = pyo.Set(initialize=debuts, ordered=True)
+    Time = model.Time
+    # Durée de chaque pas de temps - en heures
+    model.Duree = pyo.Param(Time, initialize=dict(zip(debuts, durees)))
+
     # --------------------------------------------------#
     #                Paramètres de prix                #
     # --------------------------------------------------#
@@ -63,6 +145,32 @@ def init_model(
         return Prix_vente_H2[p][c]
 
     model.Prix_vente_H2 = pyo.Param(Prod, Cons, initialize=init_prix, mutable=True)
+
+    # --------------------------------------------------#
+    #              Séries temporelles                  #
+    # --------------------------------------------------#
+    # Paramètres mutables : une nouvelle fenêtre de données de même horizon peut être
+    # chargée dans le modèle construit avec charger_donnees
+
+    # Stock disponible d'électricité - en MWh
+    model.Production_elec = pyo.Param(
+        Electricite,
+        Time,
+        initialize=lambda m, e, t: Production_elec[e][t],
+        mutable=True,
+    )
+    # Impact carbone de l'électricité - en kgCo2/MWh
+    model.Impact_elec = pyo.Param(
+        Electricite, Time, initialize=lambda m, e, t: Impact_elec[e][t], mutable=True
+    )
+    # Prix de l'énergie - en €/MWh
+    model.Prix_energie = pyo.Param(
+        Energie, Time, initialize=lambda m, e, t: Prix_energie[e][t], mutable=True
+    )
+    # Demande d'H2 du client j - en kgH2
+    model.Demande_H2 = pyo.Param(
+        Cons, Time, initialize=lambda m, j, t: Demande_H2[j][t], mutable=True
+    )
     # --------------------------------------------------#
     #               Variables de décision              #
     # --------------------------------------------------#
@@ -70,8 +178,8 @@ def init_model(
     # Variables de flux
 
     # Quantitée d'énergie provenant de la source e consommée par le producteur i à temps t. En MWh
-    # Q_energie[i,e,t]
-    model.Q_energie = pyo.Var(Prod, Energie, Time, within=pyo.NonNegativeReals)
+    # Q_energie[i,e,t], seulement pour les sources autorisées du producteur (registre)
+    model.Q_energie = pyo.Var(Couples_energie, Time, within=pyo.NonNegativeReals)
 
     # Quantitée d'énergie totale consommée par le producteur i à temps t. En MWh
     # Q_energie_total[i,t]
@@ -178,75 +286,575 @@ def init_model(
     # --------------------------------------------------#
     #               Contraintes                         #
     # --------------------------------------------------#
-    # Sources d'énergie
-    def C_prod_elec_max_energie_rule(m, e, t):
-        return sum(m.Q_energie[i, e, t] for i in Prod) <= Production_elec[e][t]
+    if contraintes_paresseuses is None:
+        contraintes_paresseuses = config.contraintes_paresseuses
+
+    # Sources d'énergie (sources d'électricité achetées par au moins un producteur)
+    sources = [e for e in Electricite if Producteurs_energie[e]]
+    if contraintes_paresseuses:
+        # Lignes ajoutées par Definition.contraintes_paresseuses
+        model.C_prod_elec_max_energie = pyo.Constraint(sources, Time)
+    else:
+        model.C_prod_elec_max_energie = pyo.Constraint(
+            sources, Time, rule=C_prod_elec_max_energie_rule
+        )
+
+    # Mode dispatch : tailles et CAPEX fixés
+    dimensionnement = tailles is None
+    if not dimensionnement:
+        fixer_tailles(model, tailles)
+
+    p_electrolyse.contraintes(
+        model,
+        P_electrolyseur,
+        emission_CO2_heure,
+        optim_prix,
+        dimensionnement,
+        contraintes_paresseuses,
+    )
+    p_SMR.contraintes(
+        model,
+        P_SMR,
+        emission_CO2_heure,
+        optim_prix,
+        dimensionnement,
+        contraintes_paresseuses,
+    )
+    consommateur.contraintes(model, Cons, optim_prix)
+
+    if optim_prix == MENU_PRIX:
+        menu_prix(model)
+    elif optim_prix:
+        if segments_mccormick is None:
+            segments_mccormick = config.segments_mccormick
+        enveloppes_mccormick(model, segments_mccormick)
 
-    model.C_prod_elec_max_energie = pyo.Constraint(
-        Electricite, Time, rule=C_prod_elec_max_energie_rule
+    Nb_contr = sum(1 for _ in model.component_data_objects(pyo.Constraint))
+    _print(f"Nombre de contraintes : {Nb_contr}")
+    return model
+
+
+def enveloppes_mccormick(model: pyo.ConcreteModel, segments: int = 1) -> None:
+    """Relaxation linéaire de P_H2_vendu[i,j,t] = Q_H2_vendu[i,j,t] * P_H2_contrat[i,j]
+    par enveloppes de McCormick, éventuellement par morceaux.
+
+    Domaines des deux facteurs :
+        0 <= Q_H2_vendu[i,j,t] <= Demande_H2[j,t]
+        Prix_min[i,j] <= P_H2_contrat[i,j] <= Prix_max[i,j]
+    Les bornes des prix sont des paramètres mutables (par défaut Meilleur_prix et
+    Pire_prix du consommateur), resserrés par resserrer_prix.
+
+    Avec plusieurs segments, le domaine des prix est découpé en segments de même longueur.
+    Une variable binaire par segment sélectionne celui du prix de contrat, le prix et les
+    quantités sont désagrégés par segment et l'enveloppe du segment sélectionné s'applique.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo (optim_prix = True).
+        segments (int, optional):
+            Nombre de segments du domaine des prix. Defaults to 1.
+
+    Raises:
+        ValueError: Si le nombre de segments est inférieur à 1.
+    """
+    if segments < 1:
+        raise ValueError(f"Nombre de segments de McCormick invalide : {segments}.")
+    Time = model.Time
+    model.Prix_min = pyo.Param(
+        Prod, Cons, initialize=lambda m, i, j: Meilleur_prix[j], mutable=True
     )
+    model.Prix_max = pyo.Param(
+        Prod, Cons, initialize=lambda m, i, j: Pire_prix[j], mutable=True
+    )
+    model.Segment = pyo.RangeSet(0, segments - 1)
 
-    # P1: Producteur via électrolyse avec PV + Elec réseau
-    def C_P1_energie_rule(m, t):
-        return m.Q_energie["P1_electrolyse(avec PV)", "Gaz", t] == 0
+    def point(m, i, j, n):
+        # Borne inférieure du segment n (n = segments : borne supérieure du domaine)
+        return m.Prix_min[i, j] + (m.Prix_max[i, j] - m.Prix_min[i, j]) * n / segments
 
-    model.C_P1_energie = pyo.Constraint(Time, rule=C_P1_energie_rule)
+    if segments == 1:
+        # Enveloppe unique : pas de désagrégation
+        def prix(m, i, j, n):
+            return m.P_H2_contrat[i, j]
 
-    # P2: Producteur via électrolyse avec Elec réseau
-    def C_P2_energie_rule(m, t):
-        return (
-            m.Q_energie["P2_electrolyse", "Gaz", t]
-            + m.Q_energie["P2_electrolyse", "PV", t]
-            == 0
+        def quantite(m, i, j, n, t):
+            return m.Q_H2_vendu[i, j, t]
+
+        def choix(m, i, j, n):
+            return 1
+
+        def C_prix_rule(m, i, j):
+            return (m.Prix_min[i, j], m.P_H2_contrat[i, j], m.Prix_max[i, j])
+
+        model.C_prix = pyo.Constraint(Prod, Cons, rule=C_prix_rule)
+    else:
+        # Segment choisi pour le prix du contrat (i, j)
+        model.segment_prix = pyo.Var(Prod, Cons, model.Segment, within=pyo.Binary)
+        # Prix et quantités désagrégés : nuls hors du segment choisi
+        model.P_H2_contrat_segment = pyo.Var(
+            Prod, Cons, model.Segment, within=pyo.NonNegativeReals
         )
+        model.Q_H2_vendu_segment = pyo.Var(
+            Prod, Cons, model.Segment, Time, within=pyo.NonNegativeReals
+        )
+
+        def prix(m, i, j, n):
+            return m.P_H2_contrat_segment[i, j, n]
+
+        def quantite(m, i, j, n, t):
+            return m.Q_H2_vendu_segment[i, j, n, t]
+
+        def choix(m, i, j, n):
+            return m.segment_prix[i, j, n]
+
+        def C_segment_rule(m, i, j):
+            return sum(m.segment_prix[i, j, n] for n in m.Segment) == 1
 
-    model.C_P2_energie = pyo.Constraint(Time, rule=C_P2_energie_rule)
+        model.C_segment = pyo.Constraint(Prod, Cons, rule=C_segment_rule)
 
-    # P3: Producteur via SMR
-    def C_P3_energie_rule(m, t):
+        def C_prix_rule(m, i, j):
+            return m.P_H2_contrat[i, j] == sum(
+                m.P_H2_contrat_segment[i, j, n] for n in m.Segment
+            )
+
+        model.C_prix = pyo.Constraint(Prod, Cons, rule=C_prix_rule)
+
+        def C_prix_segment_1_rule(m, i, j, n):
+            return m.P_H2_contrat_segment[i, j, n] >= point(m, i, j, n) * choix(
+                m, i, j, n
+            )
+
+        model.C_prix_segment_1 = pyo.Constraint(
+            Prod, Cons, model.Segment, rule=C_prix_segment_1_rule
+        )
+
+        def C_prix_segment_2_rule(m, i, j, n):
+            return m.P_H2_contrat_segment[i, j, n] <= point(m, i, j, n + 1) * choix(
+                m, i, j, n
+            )
+
+        model.C_prix_segment_2 = pyo.Constraint(
+            Prod, Cons, model.Segment, rule=C_prix_segment_2_rule
+        )
+
+        def C_quantite_rule(m, i, j, t):
+            return m.Q_H2_vendu[i, j, t] == sum(
+                m.Q_H2_vendu_segment[i, j, n, t] for n in m.Segment
+            )
+
+        model.C_quantite = pyo.Constraint(Prod, Cons, Time, rule=C_quantite_rule)
+
+        def C_quantite_segment_rule(m, i, j, n, t):
+            return m.Q_H2_vendu_segment[i, j, n, t] <= m.Demande_H2[j, t] * choix(
+                m, i, j, n
+            )
+
+        model.C_quantite_segment = pyo.Constraint(
+            Prod, Cons, model.Segment, Time, rule=C_quantite_segment_rule
+        )
+
+    # Enveloppes de chaque segment, sommées : seul le segment choisi est non nul
+    def C_cormick_1_rule(m, i, j, t):
+        return m.P_H2_vendu[i, j, t] <= sum(
+            point(m, i, j, n + 1) * quantite(m, i, j, n, t) for n in m.Segment
+        )
+
+    model.C_cormick_1 = pyo.Constraint(Prod, Cons, Time, rule=C_cormick_1_rule)
+
+    def C_cormick_2_rule(m, i, j, t):
+        return m.P_H2_vendu[i, j, t] <= sum(
+            m.Demande_H2[j, t]
+            * (prix(m, i, j, n) - point(m, i, j, n) * choix(m, i, j, n))
+            + point(m, i, j, n) * quantite(m, i, j, n, t)
+            for n in m.Segment
+        )
+
+    model.C_cormick_2 = pyo.Constraint(Prod, Cons, Time, rule=C_cormick_2_rule)
+
+    def C_cormick_3_rule(m, i, j, t):
+        return m.P_H2_vendu[i, j, t] >= sum(
+            m.Demande_H2[j, t]
+            * (prix(m, i, j, n) - point(m, i, j, n + 1) * choix(m, i, j, n))
+            + point(m, i, j, n + 1) * quantite(m, i, j, n, t)
+            for n in m.Segment
+        )
+
+    model.C_cormick_3 = pyo.Constraint(Prod, Cons, Time, rule=C_cormick_3_rule)
+
+    def C_cormick_4_rule(m, i, j, t):
+        return m.P_H2_vendu[i, j, t] >= sum(
+            point(m, i, j, n) * quantite(m, i, j, n, t) for n in m.Segment
+        )
+
+    model.C_cormick_4 = pyo.Constraint(Prod, Cons, Time, rule=C_cormick_4_rule)
+
+
+def menu_prix(model: pyo.ConcreteModel) -> None:
+    """Choix du prix de chaque contrat dans le menu de prix du consommateur (Menu_prix).
+
+    Une variable binaire par niveau de prix sélectionne le prix du contrat (i, j) et les
+    quantités vendues sont réparties par niveau : le revenu
+    P_H2_vendu[i,j,t] = sum_k Menu_prix[j][k] * Q_H2_vendu_niveau[i,j,k,t] est exact
+    (pas d'écart de relaxation), au prix d'une variable binaire par niveau du menu.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo (optim_prix = "menu").
+    """
+    Time = model.Time
+    # Niveaux du menu de chaque contrat (i, j, k)
+    model.Niveau_prix = pyo.Set(
+        initialize=[
+            (i, j, k) for i in Prod for j in Cons for k in range(len(Menu_prix[j]))
+        ],
+        dimen=3,
+        ordered=True,
+    )
+    model.choix_prix = pyo.Var(model.Niveau_prix, within=pyo.Binary)
+    # Quantité vendue au niveau de prix k : nulle si le niveau n'est pas choisi
+    model.Q_H2_vendu_niveau = pyo.Var(
+        model.Niveau_prix, Time, within=pyo.NonNegativeReals
+    )
+
+    def C_menu_1_rule(m, i, j):
+        return sum(m.choix_prix[i, j, k] for k in range(len(Menu_prix[j]))) == 1
+
+    model.C_menu_1 = pyo.Constraint(Prod, Cons, rule=C_menu_1_rule)
+
+    def C_menu_2_rule(m, i, j, k, t):
         return (
-            m.Q_energie["P3_SMR", "Elec_reseau", t] + m.Q_energie["P3_SMR", "PV", t]
-            == 0
+            m.Q_H2_vendu_niveau[i, j, k, t]
+            <= m.Demande_H2[j, t] * m.choix_prix[i, j, k]
         )
 
-    model.C_P3_energie = pyo.Constraint(Time, rule=C_P3_energie_rule)
+    model.C_menu_2 = pyo.Constraint(model.Niveau_prix, Time, rule=C_menu_2_rule)
 
-    p_electrolyse.contraintes(model, P_electrolyseur, emission_CO2_heure, optim_prix)
-    p_SMR.contraintes(model, P_SMR, emission_CO2_heure, optim_prix)
-    consommateur.contraintes(model, Cons, optim_prix)
+    def C_menu_3_rule(m, i, j, t):
+        return m.Q_H2_vendu[i, j, t] == sum(
+            m.Q_H2_vendu_niveau[i, j, k, t] for k in range(len(Menu_prix[j]))
+        )
 
-    # relaxation linéarisation P_H2_vendu[i,j,t] = Q_H2_vendu[i,j,t] * P_H2_contrat[i,j]
-    # avec:
-    #       0 <= Q_H2_vendu[i,j] <= Demande_H2[j][t]
-    #       0 <= P_H2_contrat[i,j] <= Pire_prix[j]
-    # Adapté de McCormick
-    if optim_prix:
+    model.C_menu_3 = pyo.Constraint(Prod, Cons, Time, rule=C_menu_3_rule)
 
-        def C_cormick_1_rule(m, i, j, t):
-            return m.P_H2_vendu[i, j, t] <= m.Q_H2_vendu[i, j, t] * Pire_prix[j]
+    def C_menu_4_rule(m, i, j, t):
+        return m.P_H2_vendu[i, j, t] == sum(
+            prix * m.Q_H2_vendu_niveau[i, j, k, t]
+            for k, prix in enumerate(Menu_prix[j])
+        )
 
-        model.C_cormick_1 = pyo.Constraint(Prod, Cons, Time, rule=C_cormick_1_rule)
+    model.C_menu_4 = pyo.Constraint(Prod, Cons, Time, rule=C_menu_4_rule)
 
-        def C_cormick_2_rule(m, i, j, t):
-            return m.P_H2_vendu[i, j, t] <= Demande_H2[j][t] * m.P_H2_contrat[i, j]
+    def C_menu_5_rule(m, i, j):
+        return m.P_H2_contrat[i, j] == sum(
+            prix * m.choix_prix[i, j, k] for k, prix in enumerate(Menu_prix[j])
+        )
 
-        model.C_cormick_2 = pyo.Constraint(Prod, Cons, Time, rule=C_cormick_2_rule)
+    model.C_menu_5 = pyo.Constraint(Prod, Cons, rule=C_menu_5_rule)
 
-        def C_cormick_3_rule(m, i, j, t):
-            return (
-                m.P_H2_vendu[i, j, t]
-                >= Pire_prix[j] * m.Q_H2_vendu[i, j, t]
-                + Demande_H2[j][t] * m.P_H2_contrat[i, j]
-                - Pire_prix[j] * Demande_H2[j][t]
-            )
 
-        model.C_cormick_3 = pyo.Constraint(Prod, Cons, Time, rule=C_cormick_3_rule)
+# Quantité vendue sur l'horizon (kgH2) en dessous de laquelle un contrat est sans vente :
+# son prix de contrat est alors arbitraire
+VENTE_NULLE = 1e-6
 
-        def C_cormick_4_rule(m, i, j, t):
-            return m.P_H2_vendu[i, j, t] >= 0
 
-        model.C_cormick_4 = pyo.Constraint(Prod, Cons, Time, rule=C_cormick_4_rule)
+def relever_prix(
+    prix_contrat: dict[tuple[str, str], list[tuple[float, float]]],
+    prix: dict[tuple[str, str], float],
+    ventes: dict[tuple[str, str], float],
+    couts: dict[str, float],
+) -> None:
+    """Ajoute à prix_contrat le prix de contrat et le coût de revient du producteur d'une
+    solution de la table des gains, pour les contrats qui vendent de l'H2.
 
-    Nb_contr = sum(1 for _ in model.component_data_objects(pyo.Constraint))
-    _print(f"Nombre de contraintes : {Nb_contr}")
+    Args:
+        prix_contrat (dict[tuple[str, str], list[tuple[float, float]]]):
+            Couples (prix de contrat, coût de revient du producteur - en €/kgH2) relevés par
+            couple (producteur, consommateur), complété.
+        prix (dict[tuple[str, str], float]):
+            P_H2_contrat de chaque couple dans la solution.
+        ventes (dict[tuple[str, str], float]):
+            Quantité vendue de chaque couple sur l'horizon dans la solution - en kgH2.
+        couts (dict[str, float]):
+            Coût de production de chaque producteur dans la solution (fn_obj + recettes)
+            - en €.
+    """
+    vendu = {i: 0.0 for i in couts}
+    for (i, j), quantite in ventes.items():
+        vendu[i] += quantite
+    for (i, j), valeur in prix.items():
+        if ventes.get((i, j), 0) > VENTE_NULLE:
+            prix_contrat.setdefault((i, j), []).append((valeur, couts[i] / vendu[i]))
+
+
+def resserrer_prix(
+    model: pyo.ConcreteModel,
+    prix_contrat: dict[tuple[str, str], list[tuple[float, float]]],
+) -> pyo.ConcreteModel:
+    """Resserre le domaine des prix de contrat des enveloppes de McCormick à partir des
+    solutions de la table des gains (relever_prix).
+
+    Le prix de contrat est un transfert entre producteur et consommateur : chaque solution de
+    la table des gains le place à une extrémité du domaine. Le domaine de chaque couple
+    devient [coût de revient minimal du producteur, prix de contrat maximal atteint] sur les
+    solutions qui vendent sur ce contrat : en dessous, le producteur vend à perte dans toutes
+    ces solutions et au-dessus, aucune ne l'a atteint. Le domaine n'est jamais élargi et les
+    couples sans vente gardent le leur. Sans effet avec le menu de prix
+    (optim_prix = "menu").
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo (optim_prix = True).
+        prix_contrat (dict[tuple[str, str], list[tuple[float, float]]]):
+            Prix de contrat et coûts de revient relevés dans les solutions de la table des
+            gains, par couple (producteur, consommateur).
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec les nouvelles bornes (paramètres mutables Prix_min et Prix_max).
+    """
+    if not hasattr(model, "Prix_min"):
+        return model
+    for (i, j), releves in prix_contrat.items():
+        minimum = max(pyo.value(model.Prix_min[i, j]), min(c for _, c in releves))
+        maximum = min(pyo.value(model.Prix_max[i, j]), max(p for p, _ in releves))
+        if minimum <= maximum:
+            model.Prix_min[i, j] = minimum
+            model.Prix_max[i, j] = maximum
+    return model
+
+
+def ecart_mccormick(model: pyo.ConcreteModel) -> dict[str, float]:
+    """Mesure l'écart de la relaxation de McCormick dans la solution chargée :
+    différence entre P_H2_vendu et le produit Q_H2_vendu * P_H2_contrat.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo résolu (optim_prix = True).
+
+    Returns:
+        dict[str, float]:
+            - "max" : plus grand écart horaire - en €,
+            - "total" : somme des écarts - en €,
+            - "relatif" : somme des écarts rapportée au montant exact des ventes.
+    """
+    ecarts = []
+    montant = 0
+    for i, j, t in model.P_H2_vendu:
+        exact = pyo.value(model.Q_H2_vendu[i, j, t]) * pyo.value(
+            model.P_H2_contrat[i, j]
+        )
+        ecarts.append(abs(pyo.value(model.P_H2_vendu[i, j, t]) - exact))
+        montant += exact
+    total = sum(ecarts)
+    return {
+        "max": max(ecarts, default=0),
+        "total": total,
+        # Montant négligeable : écart relatif non significatif
+        "relatif": total / montant if montant > 1e-6 else 0,
+    }
+
+
+# Composants ajoutés au modèle par les méthodes de résolution
+COMPOSANTS_RESOLUTION = [
+    "objective",
+    "objectif",
+    "satisfaction",
+    "bin",
+    "C_satisf_1_a",
+    "C_satisf_1_b",
+    "C_satisf_2",
+    "C_satisf_3",
+    "z",
+    "linear_z",
+    "C_seuil_satisf",
+    "epsilon",
+    "ecart_epsilon",
+    "C_epsilon",
+    "poids_dispatch",
+]
+
+
+def reinitialiser_model(model: pyo.ConcreteModel) -> pyo.ConcreteModel:
+    """Retire du modèle les objectifs, variables et contraintes ajoutés par les méthodes de résolution
+    (optimisations individuelles, Goal Programming, max min satisfaction).
+
+    Permet de réutiliser un modèle déjà construit pour une nouvelle résolution.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle tel que retourné par init_model.
+    """
+    for nom in COMPOSANTS_RESOLUTION:
+        if hasattr(model, nom):
+            model.del_component(nom)
     return model
+
+
+def fixer_tailles(
+    model: pyo.ConcreteModel, tailles: dict[str, dict[str, float]]
+) -> pyo.ConcreteModel:
+    """Fixe les tailles des installations et les CAPEX correspondants.
+
+    Les variables fixées sont remplacées par leur valeur lors de l'envoi au solveur : avec
+    un modèle construit avec tailles (sans contraintes de taille max ni de CAPEX), il ne
+    reste qu'un problème d'exploitation. Peut être rappelée sur un modèle déjà construit
+    pour changer de tailles.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+        tailles (dict[str, dict[str, float]]):
+            Tailles tailles[nom][producteur] : Taille_electrolyseur et Taille_stockage des
+            électrolyseurs, Taille_captage des SMR.
+
+    Raises:
+        ValueError: Si la taille d'un producteur manque.
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec les tailles fixées.
+    """
+    for nom, producteurs in TAILLES.items():
+        manquants = [p for p in producteurs if p not in tailles.get(nom, {})]
+        if manquants:
+            raise ValueError(f"{nom} manquante pour {manquants}.")
+        for p in producteurs:
+            getattr(model, nom)[p].fix(tailles[nom][p])
+    for p in P_electrolyseur:
+        model.P_CAPEX_Electrolyseur[p].fix(
+            tailles["Taille_electrolyseur"][p] * CAPEX_t_electrolyseur[p]
+        )
+        model.P_CAPEX_Stockage[p].fix(
+            tailles["Taille_stockage"][p] * CAPEX_t_stockage[p]
+        )
+    for p in P_SMR:
+        model.P_CAPEX_Captage[p].fix(tailles["Taille_captage"][p] * CAPEX_t_captage[p])
+    return model
+
+
+def modifier_prix(
+    model: pyo.ConcreteModel, prix: dict[str, dict[str, float]]
+) -> pyo.ConcreteModel:
+    """Modifie en place le paramètre mutable Prix_vente_H2 d'un modèle déjà construit.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+        prix (dict[str, dict[str, float]]):
+            Nouveaux prix de vente prix[producteur][consommateur] en €/kgH2.
+            Les couples non renseignés ne sont pas modifiés.
+
+    Raises:
+        ValueError: Si un couple producteur-consommateur n'existe pas.
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec les nouveaux prix.
+    """
+    for p, prix_p in prix.items():
+        for c, valeur in prix_p.items():
+            if (p, c) not in model.Prix_vente_H2:
+                raise ValueError(f"Pas de prix de vente entre '{p}' et '{c}'.")
+            model.Prix_vente_H2[p, c] = valeur
+    return model
+
+
+def charger_donnees(
+    model: pyo.ConcreteModel,
+    Production_elec: dict[str, list[float]],
+    Impact_elec: dict[str, list[float]],
+    Prix_energie: dict[str, list[float]],
+    Demande_H2: dict[str, list[float]],
+) -> pyo.ConcreteModel:
+    """Charge de nouvelles séries temporelles dans un modèle déjà construit.
+
+    Seuls les paramètres mutables sont modifiés : un solveur persistant ne reçoit que
+    les coefficients mis à jour. Les séries doivent avoir la longueur de l'horizon du modèle
+    (séries horaires agrégées sur les segments d'un modèle segmenté).
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+        Production_elec (dict[str, list[float]]):
+            Stock disponible d'électricité - en MWh.
+        Impact_elec (dict[str, list[float]]):
+            Impact carbone de l'électricité - en kgCo2/MWh.
+        Prix_energie (dict[str, list[float]]):
+            Prix de l'énergie - en €/MWh.
+        Demande_H2 (dict[str, list[float]]):
+            Demande d'H2 de chaque consommateur - en kgH2.
+
+    Raises:
+        ValueError: Si la longueur d'une série diffère de l'horizon du modèle, ou si la
+            demande totale d'un consommateur passe de nulle à non nulle (ou inversement),
+            ce qui change la structure de C_val_cons.
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec les nouvelles données.
+    """
+    Time = model.Time
+    durees = [model.Duree[t] for t in Time]
+    horizon = sum(durees)
+    series = [
+        (model.Production_elec, Production_elec, Electricite),
+        (model.Impact_elec, Impact_elec, Electricite),
+        (model.Prix_energie, Prix_energie, Energie),
+        (model.Demande_H2, Demande_H2, Cons),
+    ]
+    for _, serie, noms in series:
+        for k in noms:
+            if len(serie[k]) != horizon:
+                raise ValueError(
+                    f"La série '{k}' ({len(serie[k])}) n'a pas la longueur de l'horizon du modèle ({horizon})."
+                )
+    if horizon != len(Time):
+        # Modèle segmenté : séries agrégées par segment
+        agregees = segmentation.agreger(
+            (Production_elec, Impact_elec, Prix_energie, Demande_H2), durees
+        )
+        series = [(p, a, noms) for (p, _, noms), a in zip(series, agregees)]
+        Demande_H2 = agregees[3]
+    for j in Cons:
+        if (sum(pyo.value(model.Demande_H2[j, t]) for t in Time) == 0) != (
+            sum(Demande_H2[j][t] for t in Time) == 0
+        ):
+            raise ValueError(
+                f"La demande totale de '{j}' ne peut pas changer de nulle à non nulle."
+            )
+
+    for param, serie, noms in series:
+        for k in noms:
+            for t in Time:
+                param[k, t] = serie[k][t]
+    return model
+
+
+def charger_fenetre(
+    model: pyo.ConcreteModel, debut_data: int, fichier: str | None = None
+) -> pyo.ConcreteModel:
+    """Lit une fenêtre du fichier de données de la longueur de l'horizon du modèle
+    et la charge dans le modèle déjà construit.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+        debut_data (int):
+            Première heure de la fenêtre dans le fichier.
+        fichier (str | None, optional):
+            Fichier csv de données. Defaults to None (fichier de config.py).
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec les données de la fenêtre.
+    """
+    if fichier is None:
+        fichier = data.fichier_données
+    horizon = sum(model.Duree[t] for t in model.Time)
+    return charger_donnees(
+        model, *utils.read_data(fichier, horizon, debut_data=debut_data)
+    )
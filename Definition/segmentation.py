@@ -0,0 +1,300 @@
+import numpy as np
+import pyomo.environ as pyo
+import config as config
+from Donnees.data import (
+    Prod,
+    Cons,
+    Electricite,
+    Producteurs_energie,
+    P_electrolyseur,
+    P_SMR,
+    Taille_vaporeformeur,
+)
+
+# Segmentation adaptative de l'horizon en pas de temps de durée variable.
+#
+# Les heures consécutives dont les séries (production et impact de l'électricité, prix de
+# l'énergie, demande d'H2) varient peu sont fusionnées en un segment. Le modèle segmenté
+# (init_model(durees=...)) garde l'ordre des heures : le stockage reste chronologique,
+# contrairement à une réduction en journées représentatives.
+#
+# Les variables d'un segment sont des quantités sur toute sa durée (MWh, kgH2, kgCO2) :
+#   - la production disponible et la demande sont sommées sur le segment, l'impact carbone
+#     et le prix de l'énergie sont moyennés ;
+#   - les bilans, le stock, les coûts d'énergie, les recettes et les émissions restent
+#     des sommes sur les pas de temps ;
+#   - les capacités horaires (électrolyseur, vaporeformeur, captage) et le CAPEX par heure
+#     sont pondérés par la durée des pas de temps (paramètre model.Duree).
+#
+# Après une résolution, raffiner coupe en deux les segments où le stockage est utilisé ou
+# une capacité est saturée : adapter enchaîne segmentation, résolutions et raffinements.
+
+# Capacité considérée comme saturée au-delà de cette part de son maximum
+SATURATION = 0.999
+
+# Flux du stockage considéré comme nul, relatif à la taille du stockage (au moins 1 kgH2)
+STOCKAGE_NUL = 1e-6
+
+# Séries sommées sur un segment (production disponible, demande), les autres sont moyennées
+SOMMEES = (True, False, False, True)
+
+
+def debuts(durees: list[int]) -> list[int]:
+    """
+    Première heure de chaque segment (index des pas de temps du modèle segmenté).
+
+    Args:
+        durees (list[int]):
+            Durée de chaque segment - en heures.
+
+    Returns:
+        list[int]:
+            Les heures de début.
+    """
+    return [0, *np.cumsum(durees[:-1]).tolist()]
+
+
+def segmenter(
+    donnees: tuple,
+    tolerance: float | None = None,
+    duree_max: int | None = None,
+) -> list[int]:
+    """
+    Fusionne les heures consécutives dont les séries varient peu.
+
+    Un segment est prolongé tant que, pour chaque série, l'écart entre ses valeurs
+    extrêmes sur le segment ne dépasse pas tolerance fois l'amplitude de la série sur
+    l'horizon (séries constantes et séries des sources d'énergie qu'aucun producteur
+    n'achète ignorées).
+
+    Args:
+        donnees (tuple):
+            Séries (Production_elec, Impact_elec, Prix_energie, Demande_H2) au format de
+            Utils.utils.read_data.
+        tolerance (float | None, optional):
+            Écart relatif toléré. Defaults to None (config.segmentation_tolerance).
+        duree_max (int | None, optional):
+            Durée maximale d'un segment - en heures. Defaults to None
+            (config.segmentation_duree_max).
+
+    Returns:
+        list[int]:
+            Durée de chaque segment - en heures (somme égale à l'horizon).
+    """
+    if tolerance is None:
+        tolerance = config.segmentation_tolerance
+    if duree_max is None:
+        duree_max = config.segmentation_duree_max
+    # Séries utilisées par le modèle (source d'énergie achetée par au moins un producteur)
+    series = np.array(
+        [
+            famille[k]
+            for famille in donnees
+            for k in famille
+            if k not in Producteurs_energie or Producteurs_energie[k]
+        ],
+        dtype=np.float64,
+    )
+    amplitude = np.ptp(series, axis=1)
+    # Séries normalisées par leur amplitude, séries constantes ignorées
+    series = series[amplitude > 0] / amplitude[amplitude > 0, None]
+
+    durees = []
+    debut = 0
+    bas = haut = series[:, 0]
+    for t in range(1, series.shape[1]):
+        bas = np.minimum(bas, series[:, t])
+        haut = np.maximum(haut, series[:, t])
+        if t - debut >= duree_max or np.any(haut - bas > tolerance):
+            durees.append(t - debut)
+            debut = t
+            bas = haut = series[:, t]
+    durees.append(series.shape[1] - debut)
+    return durees
+
+
+def agreger(donnees: tuple, durees: list[int]) -> tuple:
+    """
+    Agrège les séries horaires sur les segments.
+
+    Args:
+        donnees (tuple):
+            Séries horaires (Production_elec, Impact_elec, Prix_energie, Demande_H2).
+        durees (list[int]):
+            Durée de chaque segment - en heures.
+
+    Raises:
+        ValueError: Si les durées ne couvrent pas exactement les séries.
+
+    Returns:
+        tuple:
+            Séries par segment au même format, indexées par l'heure de début du segment.
+    """
+    index = debuts(durees)
+    duree = np.asarray(durees, dtype=np.float64)
+    agregees = []
+    for famille, somme in zip(donnees, SOMMEES):
+        serie_agregee = {}
+        for k, serie in famille.items():
+            if len(serie) != sum(durees):
+                raise ValueError(
+                    f"La série '{k}' ({len(serie)}) n'a pas la longueur des segments ({sum(durees)})."
+                )
+            valeurs = np.add.reduceat(np.asarray(serie, dtype=np.float64), index)
+            if not somme:
+                valeurs = valeurs / duree
+            serie_agregee[k] = dict(zip(index, valeurs.tolist()))
+        agregees.append(serie_agregee)
+    return tuple(agregees)
+
+
+def _valeur(composant, k) -> float:
+    # Valeur d'une variable, 0 si non chargée
+    valeur = pyo.value(composant[k], exception=False)
+    return 0.0 if valeur is None else valeur
+
+
+def actifs(model: pyo.ConcreteModel) -> list[int]:
+    """
+    Segments de plus d'une heure où la solution chargée utilise le stockage ou sature une
+    capacité (électrolyseur, vaporeformeur, captage, électricité disponible).
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle segmenté, avec une solution.
+
+    Returns:
+        list[int]:
+            Les heures de début des segments actifs.
+    """
+    segments = []
+    for t in model.Time:
+        duree = model.Duree[t]
+        if duree == 1:
+            continue
+        saturees = [
+            (_valeur(model.Q_energie_total, (i, t)), taille * duree)
+            for i, taille in [
+                *[(i, _valeur(model.Taille_electrolyseur, i)) for i in P_electrolyseur],
+                *[(i, Taille_vaporeformeur[i]) for i in P_SMR],
+            ]
+        ]
+        saturees += [
+            (_valeur(model.Captage, (i, t)), _valeur(model.Taille_captage, i) * duree)
+            for i in P_SMR
+        ]
+        saturees += [
+            (
+                sum(
+                    _valeur(model.Q_energie, (i, e, t)) for i in Producteurs_energie[e]
+                ),
+                pyo.value(model.Production_elec[e, t]),
+            )
+            for e in Electricite
+        ]
+        stockage = any(
+            _valeur(model.Q_H2_stock_in, (i, t)) + _valeur(model.Q_H2_stock_out, (i, t))
+            > STOCKAGE_NUL * max(1.0, _valeur(model.Taille_stockage, i))
+            for i in P_electrolyseur
+        )
+        if stockage or any(q >= SATURATION * c and c > 0 for q, c in saturees):
+            segments.append(t)
+    return segments
+
+
+def raffiner(durees: list[int], segments: list[int]) -> list[int]:
+    """
+    Coupe en deux les segments donnés.
+
+    Args:
+        durees (list[int]):
+            Durée de chaque segment - en heures.
+        segments (list[int]):
+            Heures de début des segments à couper (voir actifs).
+
+    Returns:
+        list[int]:
+            Les nouvelles durées.
+    """
+    segments = set(segments)
+    nouvelles = []
+    for debut, duree in zip(debuts(durees), durees):
+        if debut in segments and duree > 1:
+            nouvelles += [duree // 2, duree - duree // 2]
+        else:
+            nouvelles.append(duree)
+    return nouvelles
+
+
+def adapter(
+    emission_CO2_heure: bool = True,
+    optim_prix: bool | str = False,
+    donnees: tuple | None = None,
+    raffinements: int | None = None,
+    display: bool = False,
+) -> list[int]:
+    """
+    Segmentation adaptative : segmente les données puis, à chaque raffinement, résout le
+    modèle segmenté (objectif sans priorité de la table des gains) et coupe les segments
+    actifs de sa solution.
+
+    Args:
+        emission_CO2_heure (bool, optional):
+            Option emission_CO2_heure de init_model. Defaults to True.
+        optim_prix (bool | str, optional):
+            Option optim_prix de init_model. Defaults to False.
+        donnees (tuple | None, optional):
+            Séries horaires. Defaults to None (données de Donnees.data).
+        raffinements (int | None, optional):
+            Nombre maximal de raffinements. Defaults to None
+            (config.segmentation_raffinements).
+        display (bool, optional):
+            Si True, active les print. Defaults to False.
+
+    Returns:
+        list[int]:
+            Durée de chaque segment - en heures.
+    """
+    import Definition.modelisation as modelisation
+    import Resolution.solveur as solveur
+    import Donnees.data as data
+
+    # Fonction display
+    def _print(texte: str) -> None:
+        if display:
+            print(texte)
+
+    if donnees is None:
+        donnees = (
+            data.Production_elec,
+            data.Impact_elec,
+            data.Prix_energie,
+            data.Demande_H2,
+        )
+    if raffinements is None:
+        raffinements = config.segmentation_raffinements
+    durees = segmenter(donnees)
+    _print(f"Segmentation : {len(durees)} pas de temps pour {sum(durees)} heures")
+    for _ in range(raffinements):
+        model = modelisation.init_model(
+            emission_CO2_heure=emission_CO2_heure,
+            optim_prix=optim_prix,
+            donnees=donnees,
+            durees=durees,
+        )
+        model.objectif = pyo.Objective(
+            expr=sum(model.fn_obj[a] for a in Prod)
+            + sum(
+                model.fn_obj[c] * sum(model.Demande_H2[c, t] for t in model.Time)
+                for c in Cons
+            ),
+            sense=pyo.minimize,
+        )
+        resultat = solveur.resoudre(model, phase="segmentation")
+        solveur.exiger_solution(resultat, "segmentation", "La segmentation adaptative")
+        nouvelles = raffiner(durees, actifs(model))
+        if len(nouvelles) == len(durees):
+            break
+        durees = nouvelles
+        _print(f"Raffinement : {len(durees)} pas de temps")
+    return durees
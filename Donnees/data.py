@@ -1,24 +1,38 @@
 import Utils.utils as utils
+import Donnees.registre as registre
+import Donnees.memoire_partagee as memoire_partagee
 import config
 
 # fichier de données csv
-fichier_données = "Donnees/Stage_dataseries.csv"
+fichier_données = config.fichier_donnees
 
 # Debut des données 106
-debut_data = 0
+debut_data = config.debut_data
 # Horizon de temps en heure max = 8736
 Time_horizon = config.Time_horizon
 # Energie
 Energie = ["Elec_reseau", "PV", "Gaz"]
 Electricite = ["Elec_reseau", "PV"]
 
-# Producteurs
-Prod = ["P1_electrolyse(avec PV)", "P2_electrolyse", "P3_SMR"]
-P_electrolyseur = ["P1_electrolyse(avec PV)", "P2_electrolyse"]
-P_SMR = ["P3_SMR"]
+# Registre des acteurs (technologies, sources d'énergie, paramètres)
+Registre = registre.lire_registre(config.fichier_acteurs, Energie)
+
+# Producteurs (électrolyseurs puis SMR)
+P_electrolyseur = registre.producteurs(Registre, "electrolyse")
+P_SMR = registre.producteurs(Registre, "SMR")
+Prod = P_electrolyseur + P_SMR
+
+# Sources d'énergie autorisées pour chaque producteur
+Energies_autorisees = registre.parametre(Registre, "energies", Prod)
+# Couples (producteur, source d'énergie) autorisés, index des achats d'énergie Q_energie
+Couples_energie = [(p, e) for p in Prod for e in Energies_autorisees[p]]
+# Producteurs autorisés à acheter chaque source d'énergie
+Producteurs_energie = {
+    e: [p for p in Prod if e in Energies_autorisees[p]] for e in Energie
+}
 
 # Consommateurs
-Cons = ["C1_industriel", "C2_mobilite"]
+Cons = list(Registre["consommateurs"])
 
 # Acteurs
 Acteurs = Prod + Cons
@@ -31,69 +45,94 @@ Time = [i for i in range(Time_horizon)]
 # Impact_elec : Impact carbone de l'électricité - en kgCo2/MWh
 # Prix_energie : Prix de l'énergie - en €/MWh
 # Demande_H2 : Demande d'H2 du client j
-Production_elec, Impact_elec, Prix_energie, Demande_H2 = utils.read_data(
-    fichier_données, Time_horizon
-)
+# Séries publiées en mémoire partagée par le processus parent (voir memoire_partagee.py) :
+# vues sans copie si la fenêtre de données est la même, sinon lecture du fichier
+series_partagees = memoire_partagee.chercher(fichier_données, debut_data, Time_horizon)
+if series_partagees is not None:
+    Production_elec, Impact_elec, Prix_energie, Demande_H2 = memoire_partagee.attacher(
+        series_partagees
+    )
+else:
+    Production_elec, Impact_elec, Prix_energie, Demande_H2 = utils.read_data(
+        fichier_données, Time_horizon
+    )
 
 
 # ----------------------------#
 #    Données producteurs      #
 # ----------------------------#
 # Rendement électrolyseur - en kgH2/MWh
-Rendement_electrolyseur = {p: 20 for p in Prod}
+Rendement_electrolyseur = registre.parametre(
+    Registre, "Rendement_electrolyseur", P_electrolyseur
+)
 # Rendement vaporeformage - en kgH2/MWh
-Rendement_vaporeformage = {p: 20 for p in Prod}
+Rendement_vaporeformage = registre.parametre(Registre, "Rendement_vaporeformage", P_SMR)
 # Taille vaporeformeur - en MW
-Taille_vaporeformeur = {p: 1_000_000 for p in Prod}
+Taille_vaporeformeur = registre.parametre(Registre, "Taille_vaporeformeur", P_SMR)
 # Taille max de l'électrolyseur - en MW
-Taille_max_electrolyseur = {p: 10 for p in P_electrolyseur} | {p: 0 for p in P_SMR}
+Taille_max_electrolyseur = registre.parametre(
+    Registre, "Taille_max_electrolyseur", P_electrolyseur
+)
 # Taille max du stockage - en kgH2
-Taille_max_stockage = {p: 1_000 for p in P_electrolyseur} | {p: 0 for p in P_SMR}
+Taille_max_stockage = registre.parametre(
+    Registre, "Taille_max_stockage", P_electrolyseur
+)
 # Taille max du captage - en kgCO2
-Taille_max_captage = {p: 0 for p in P_electrolyseur} | {p: 1_000 for p in P_SMR}
+Taille_max_captage = registre.parametre(Registre, "Taille_max_captage", P_SMR)
 
 # Calcul des CAPEX
 
 # CAPEX en EUR/unit
 # CAPEX electrolyseur - en EUR/MW
-CAPEX_electrolyseur = {p: 600_000 for p in Prod}
+CAPEX_electrolyseur = registre.parametre(
+    Registre, "CAPEX_electrolyseur", P_electrolyseur
+)
 # CAPEX stockage - en EUR/kgH2
-CAPEX_stockage = {p: 1_000 for p in Prod}
+CAPEX_stockage = registre.parametre(Registre, "CAPEX_stockage", P_electrolyseur)
 # CAPEX captage - en EUR/kgCO2
-CAPEX_captage = {p: 4_800 for p in Prod}
+CAPEX_captage = registre.parametre(Registre, "CAPEX_captage", P_SMR)
 
 # Durée de vie
 # electrolyseur - en années
-Vie_electrolyseur = {p: 10 for p in Prod}
+Vie_electrolyseur = registre.parametre(Registre, "Vie_electrolyseur", P_electrolyseur)
 # stockage - en années
-Vie_stockage = {p: 10 for p in Prod}
+Vie_stockage = registre.parametre(Registre, "Vie_stockage", P_electrolyseur)
 # captage - en années
-Vie_captage = {p: 10 for p in Prod}
+Vie_captage = registre.parametre(Registre, "Vie_captage", P_SMR)
 
 # CAPEX en EUR/unit/h
 # electrolyseur - en EUR/MW/h
 CAPEX_t_electrolyseur = {
-    p: CAPEX_electrolyseur[p] / (8760 * Vie_electrolyseur[p]) for p in Prod
+    p: CAPEX_electrolyseur[p] / (8760 * Vie_electrolyseur[p]) for p in P_electrolyseur
 }
 # stockage - en EUR/kgH2/h
-CAPEX_t_stockage = {p: CAPEX_stockage[p] / (8760 * Vie_stockage[p]) for p in Prod}
+CAPEX_t_stockage = {
+    p: CAPEX_stockage[p] / (8760 * Vie_stockage[p]) for p in P_electrolyseur
+}
 # captage - en EUR/kgCO2/h
-CAPEX_t_captage = {p: CAPEX_captage[p] / (8760 * Vie_captage[p]) for p in Prod}
+CAPEX_t_captage = {p: CAPEX_captage[p] / (8760 * Vie_captage[p]) for p in P_SMR}
 
 
 # Impact vaporeformage - en kgCO2/kgH2
-Impact_vaporeformage = {p: 10 for p in Prod}
+Impact_vaporeformage = registre.parametre(Registre, "Impact_vaporeformage", P_SMR)
 # Impact Co2 maximal autorisé - en kgCO2 / kgH2
-Impact_max = {p: 3.5 for p in Prod}
+Impact_max = registre.parametre(Registre, "Impact_max", Prod)
 
 # ----------------------------#
 #    Données consommateurs    #
 # ----------------------------#
-# Prix de vente - en €/kgH2
-Prix_vente_H2 = config.Prix_vente_H2
+# Prix de vente - en €/kgH2 (prix du registre, remplacés par ceux de config.py)
+Prix_vente_H2 = registre.prix_vente(Registre, config.Prix_vente_H2)
 
 # Demande totale
 Demande_totale = sum(sum(values) for values in Demande_H2.values())
 # Prix acceptés par le consommateur : prix cible et prix max
-Pire_prix = {"C1_industriel": 10, "C2_mobilite": 20}
-Meilleur_prix = {"C1_industriel": 0, "C2_mobilite": 0}
+Pire_prix = registre.parametre(Registre, "Pire_prix", Cons)
+Meilleur_prix = registre.parametre(Registre, "Meilleur_prix", Cons)
+# Menu de prix de contrat (optim_prix = "menu") - en €/kgH2
+Menu_prix = {
+    c: sorted(
+        config.menu_prix[c] if isinstance(config.menu_prix, dict) else config.menu_prix
+    )
+    for c in Cons
+}
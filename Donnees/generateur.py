@@ -0,0 +1,297 @@
+import argparse
+import csv
+import math
+from typing import Iterator, TextIO
+import numpy as np
+
+# Générateur de séries temporelles synthétiques au format lu par Utils.utils.read_data :
+# 4 lignes d'en-tête (noms, descriptions, unités, "true") puis une ligne par heure,
+# séparateur ";".
+#
+# Les séries sont produites jour par jour et écrites au fil de l'eau : un fichier de
+# plusieurs années n'est jamais entièrement en mémoire. Pour une même graine, le fichier
+# est identique quelle que soit la machine.
+#
+# Utilisation :
+#   python -m Donnees.generateur --sortie Donnees/synthetique.csv --annees 3 --graine 1
+#   python -m Donnees.generateur --sortie Donnees/synthetique.csv --heures 8736 \
+#       --consommateurs C1_industriel C2_mobilite C3_industriel C4_mobilite
+
+HEURES_ANNEE = 8760
+
+# Colonnes énergie : (nom, description, unité)
+COLONNES_ENERGIE = [
+    ("PV", "power", "MW"),
+    ("Elec_reseau", "power", "MW"),
+    ("PV_impact", "PV impact", "kg/MWh"),
+    ("Elec_reseau_impact", "grid impact", "kg CO2 eq/MWh"),
+    ("PV_prix", "PV prix", "EUR/MWh"),
+    ("Elec_reseau_prix", "grid price", "EUR/MWh"),
+    ("Gaz_prix", "gaz price", "EUR/MWh"),
+]
+
+CONSOMMATEURS = ["C1_industriel", "C2_mobilite"]
+
+# Paramètres par défaut des profils
+PUISSANCE_PV = 8.0  # Puissance crête PV - en MW
+CAPACITE_RESEAU = 1_000_000  # Électricité disponible sur le réseau - en MW
+IMPACT_PV = 26.0  # en kgCO2/MWh
+PRIX_PV = 100.0  # en €/MWh
+PRIX_RESEAU = 80.0  # Prix moyen du réseau - en €/MWh
+IMPACT_RESEAU = 45.0  # Impact moyen du réseau - en kgCO2/MWh
+PRIX_GAZ = 50.0  # en €/MWh
+DEMANDE = {"industriel": 3.0, "mobilite": 6.25}  # Demande moyenne - en kg/h
+
+
+def type_consommateur(nom: str) -> str:
+    """
+    Type de profil de demande d'un consommateur, déduit de son nom.
+
+    Args:
+        nom (str):
+            Nom de la colonne, par exemple "C2_mobilite".
+
+    Returns:
+        str:
+            "mobilite" si le nom contient "mobilite", "industriel" sinon.
+    """
+    return "mobilite" if "mobilite" in nom.lower() else "industriel"
+
+
+def profil_jour(
+    jour: int,
+    rng: np.random.Generator,
+    etat: dict[str, float],
+    consommateurs: list[str],
+    demande_moyenne: dict[str, float],
+) -> dict[str, np.ndarray]:
+    """
+    Génère les 24 valeurs horaires de chaque colonne pour un jour de l'année.
+
+    - PV : cloche entre le lever et le coucher du soleil (durée du jour saisonnière),
+      modulée par une nébulosité journalière autocorrélée.
+    - Réseau : prix avec pointes du matin et du soir, plus élevé en hiver et
+      moins cher quand le PV produit ; impact carbone corrélé au prix.
+    - Gaz : prix suivant une marche aléatoire lente autour de PRIX_GAZ.
+    - Demande : industrielle en trois-huit avec baisse le week-end,
+      mobilité avec pointes de recharge le matin et le soir.
+
+    Args:
+        jour (int):
+            Numéro du jour depuis le début de la série (jour 0 : 1er janvier, lundi).
+        rng (np.random.Generator):
+            Générateur aléatoire (graine fixée).
+        etat (dict[str, float]):
+            État des processus autocorrélés (nébulosité, prix du gaz), modifié en place.
+        consommateurs (list[str]):
+            Noms des colonnes de demande.
+        demande_moyenne (dict[str, float]):
+            Demande moyenne de chaque consommateur - en kg/h.
+
+    Returns:
+        dict[str, np.ndarray]:
+            Les 24 valeurs horaires de chaque colonne.
+    """
+    heures = np.arange(24)
+    jour_annee = jour % 365
+    # Saison : 1 au solstice d'hiver, -1 au solstice d'été
+    saison = math.cos(2 * math.pi * (jour_annee + 10) / 365)
+    week_end = jour % 7 >= 5
+
+    # PV : durée du jour entre 8h (hiver) et 16h (été)
+    duree_jour = 12 - 4 * saison
+    lever = 12.5 - duree_jour / 2
+    position = (heures + 0.5 - lever) / duree_jour
+    cloche = np.where(
+        (position > 0) & (position < 1), np.sin(np.pi * np.clip(position, 0, 1)), 0.0
+    )
+    etat["nebulosite"] = float(
+        np.clip(0.7 * etat["nebulosite"] + 0.3 * rng.uniform(0, 1), 0, 0.9)
+    )
+    eclairement = (1 - 0.25 * saison) / 1.25 * (1 - etat["nebulosite"])
+    PV = PUISSANCE_PV * cloche * eclairement * rng.uniform(0.9, 1.0, 24)
+
+    # Réseau : pointes à 8h et 19h, creux l'après-midi quand le PV produit
+    pointes = np.exp(-((heures - 8) ** 2) / 4) + 1.2 * np.exp(-((heures - 19) ** 2) / 5)
+    nuit = np.where((heures < 6) | (heures >= 23), -1.0, 0.0)
+    prix_reseau = (
+        PRIX_RESEAU
+        + 8 * saison
+        + 12 * pointes
+        + 4 * nuit
+        - 10 * cloche * (1 - etat["nebulosite"])
+        - (5 if week_end else 0)
+        + rng.normal(0, 3, 24)
+    )
+    prix_reseau = np.clip(prix_reseau, 0, None)
+    impact_reseau = np.clip(
+        IMPACT_RESEAU
+        + 0.25 * (prix_reseau - PRIX_RESEAU)
+        + 2 * saison
+        + rng.normal(0, 1, 24),
+        0,
+        None,
+    )
+
+    # Gaz : marche aléatoire avec rappel vers PRIX_GAZ, constant sur la journée
+    etat["prix_gaz"] = float(
+        etat["prix_gaz"] + 0.05 * (PRIX_GAZ - etat["prix_gaz"]) + rng.normal(0, 0.5)
+    )
+
+    valeurs = {
+        "PV": PV,
+        "Elec_reseau": np.full(24, float(CAPACITE_RESEAU)),
+        "PV_impact": np.full(24, IMPACT_PV),
+        "Elec_reseau_impact": impact_reseau,
+        "PV_prix": np.full(24, PRIX_PV),
+        "Elec_reseau_prix": prix_reseau,
+        "Gaz_prix": np.full(24, max(etat["prix_gaz"], 0.0)),
+    }
+    for c in consommateurs:
+        moyenne = demande_moyenne[c]
+        if type_consommateur(c) == "mobilite":
+            forme = (
+                0.6
+                + 0.8 * np.exp(-((heures - 7) ** 2) / 3)
+                + np.exp(-((heures - 18) ** 2) / 4)
+            )
+            forme = forme / forme.mean() * (0.85 if week_end else 1.0)
+        else:
+            # Trois équipes de 8h de charges différentes
+            forme = np.repeat([0.6, 1.3, 1.1], 8) * (0.5 if week_end else 1.0)
+        valeurs[c] = np.clip(moyenne * forme * rng.normal(1, 0.05, 24), 0, None)
+    return valeurs
+
+
+def lignes(
+    heures: int,
+    consommateurs: list[str] = CONSOMMATEURS,
+    graine: int = 0,
+    demande_moyenne: dict[str, float] | None = None,
+) -> Iterator[list[str]]:
+    """
+    Itère sur les lignes de données (sans en-tête), générées jour par jour.
+
+    Args:
+        heures (int):
+            Nombre d'heures (lignes) à générer.
+        consommateurs (list[str], optional):
+            Noms des colonnes de demande. Defaults to CONSOMMATEURS.
+        graine (int, optional):
+            Graine du générateur aléatoire. Defaults to 0.
+        demande_moyenne (dict[str, float] | None, optional):
+            Demande moyenne de chaque consommateur - en kg/h.
+            Defaults to None (DEMANDE selon le type de consommateur).
+
+    Yields:
+        list[str]:
+            Une ligne du fichier csv (temps en secondes puis valeurs formatées).
+    """
+    if demande_moyenne is None:
+        demande_moyenne = {}
+    demande_moyenne = {
+        c: demande_moyenne.get(c, DEMANDE[type_consommateur(c)]) for c in consommateurs
+    }
+    rng = np.random.default_rng(graine)
+    etat = {"nebulosite": 0.3, "prix_gaz": PRIX_GAZ}
+    formats = {"PV": "{:.3f}", "Elec_reseau": "{:.0f}"} | {
+        c: "{:.3f}" for c in consommateurs
+    }
+    colonnes = [nom for nom, _, _ in COLONNES_ENERGIE] + consommateurs
+
+    t = 0
+    for jour in range(math.ceil(heures / 24)):
+        valeurs = profil_jour(jour, rng, etat, consommateurs, demande_moyenne)
+        for h in range(min(24, heures - t)):
+            t += 1
+            yield [str(t * 3600)] + [
+                formats.get(col, "{:.2f}").format(valeurs[col][h]) for col in colonnes
+            ]
+
+
+def ecrire_donnees(
+    sortie: TextIO,
+    heures: int,
+    consommateurs: list[str] = CONSOMMATEURS,
+    graine: int = 0,
+    demande_moyenne: dict[str, float] | None = None,
+) -> None:
+    """
+    Écrit un fichier de données synthétiques au format de Utils.utils.read_data.
+
+    Les lignes sont écrites au fur et à mesure de leur génération.
+
+    Args:
+        sortie (TextIO):
+            Fichier (ou flux) ouvert en écriture.
+        heures (int):
+            Nombre d'heures à générer (8760 par an).
+        consommateurs (list[str], optional):
+            Noms des colonnes de demande. Defaults to CONSOMMATEURS.
+        graine (int, optional):
+            Graine du générateur aléatoire. Defaults to 0.
+        demande_moyenne (dict[str, float] | None, optional):
+            Demande moyenne de chaque consommateur - en kg/h. Defaults to None.
+    """
+    writer = csv.writer(sortie, delimiter=";", lineterminator="\n")
+    writer.writerow(["Time"] + [nom for nom, _, _ in COLONNES_ENERGIE] + consommateurs)
+    writer.writerow(
+        [""]
+        + [description for _, description, _ in COLONNES_ENERGIE]
+        + ["H2 flow rate"] * len(consommateurs)
+    )
+    writer.writerow(
+        ["s"]
+        + [unite for _, _, unite in COLONNES_ENERGIE]
+        + ["kg/h"] * len(consommateurs)
+    )
+    writer.writerow(["true"] * (1 + len(COLONNES_ENERGIE) + len(consommateurs)))
+    writer.writerows(lignes(heures, consommateurs, graine, demande_moyenne))
+
+
+def generer_donnees(
+    fichier: str,
+    heures: int = HEURES_ANNEE,
+    consommateurs: list[str] = CONSOMMATEURS,
+    graine: int = 0,
+    demande_moyenne: dict[str, float] | None = None,
+) -> str:
+    """
+    Génère un fichier csv de données synthétiques.
+
+    Args:
+        fichier (str):
+            Chemin du fichier csv à écrire.
+        heures (int, optional):
+            Nombre d'heures à générer. Defaults to HEURES_ANNEE.
+        consommateurs (list[str], optional):
+            Noms des colonnes de demande. Defaults to CONSOMMATEURS.
+        graine (int, optional):
+            Graine du générateur aléatoire. Defaults to 0.
+        demande_moyenne (dict[str, float] | None, optional):
+            Demande moyenne de chaque consommateur - en kg/h. Defaults to None.
+
+    Returns:
+        str:
+            Le chemin du fichier écrit.
+    """
+    with open(fichier, "w", newline="") as file:
+        ecrire_donnees(file, heures, consommateurs, graine, demande_moyenne)
+    return fichier
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Génération de séries temporelles synthétiques."
+    )
+    parser.add_argument("--sortie", required=True, help="Fichier csv à écrire.")
+    duree = parser.add_mutually_exclusive_group()
+    duree.add_argument("--heures", type=int, default=None)
+    duree.add_argument("--annees", type=float, default=1)
+    parser.add_argument("--consommateurs", nargs="+", default=CONSOMMATEURS)
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args()
+
+    heures = args.heures or round(args.annees * HEURES_ANNEE)
+    generer_donnees(args.sortie, heures, args.consommateurs, args.graine)
+    print(f"{heures} heures écrites dans {args.sortie}")
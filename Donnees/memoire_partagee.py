@@ -0,0 +1,134 @@
+import atexit
+import json
+import os
+from multiprocessing import shared_memory
+from typing import Any
+import numpy as np
+
+# Séries temporelles partagées entre processus (multiprocessing.shared_memory).
+#
+# Le processus parent publie une seule fois les séries lues (Production_elec, Impact_elec,
+# Prix_energie, Demande_H2) dans un segment de mémoire partagée, avant de créer un pool
+# (Utils.scenarios.capturer_config). Le descripteur du segment est placé dans une
+# variable d'environnement, héritée par les processus créés ensuite : l'import de
+# Donnees.data peut donc avoir lieu avant l'initialisation du pool (réimport du module
+# principal). Un processus dont le fichier, le début et l'horizon des données sont ceux
+# d'un segment publié s'y attache au lieu de relire le fichier csv : ses séries sont des
+# vues NumPy du segment, sans copie.
+#
+# Le segment appartient au processus qui l'a publié et est supprimé à sa fin.
+
+# Variable d'environnement contenant les descripteurs des segments publiés (json)
+VARIABLE = "DONNEES_SERIES_PARTAGEES"
+
+# Segments publiés (par fenêtre de données) et segments attachés par ce processus
+_publies = {}
+_attaches = {}
+
+
+def _fenetre(fichier: str, debut_data: int, Time_horizon: int) -> tuple:
+    return (fichier, debut_data, Time_horizon)
+
+
+def publier(
+    series: tuple[
+        dict[str, list[float]],
+        dict[str, list[float]],
+        dict[str, list[float]],
+        dict[str, list[float]],
+    ],
+    fichier: str,
+    debut_data: int,
+    Time_horizon: int,
+) -> dict[str, Any]:
+    """
+    Publie les séries dans un segment de mémoire partagée (une seule fois par fenêtre).
+
+    Args:
+        series (tuple[dict[str, list[float]], ...]):
+            Séries (Production_elec, Impact_elec, Prix_energie, Demande_H2).
+        fichier (str):
+            Fichier csv d'où viennent les séries.
+        debut_data (int):
+            Début des séries dans le fichier.
+        Time_horizon (int):
+            Longueur des séries.
+
+    Returns:
+        dict[str, Any]:
+            Le descripteur du segment : nom, fenêtre de données, forme et clés des séries.
+    """
+    fenetre = _fenetre(fichier, debut_data, Time_horizon)
+    if fenetre in _publies:
+        return _publies[fenetre][1]
+    cles = [(i, k) for i, serie in enumerate(series) for k in serie]
+    forme = (len(cles), len(series[cles[0][0]][cles[0][1]]) if cles else 0)
+    segment = shared_memory.SharedMemory(
+        create=True, size=max(1, 8 * forme[0] * forme[1])
+    )
+    tableau = np.ndarray(forme, dtype=np.float64, buffer=segment.buf)
+    for ligne, (i, k) in enumerate(cles):
+        tableau[ligne] = series[i][k]
+    descripteur = {
+        "nom": segment.name,
+        "fenetre": list(fenetre),
+        "forme": list(forme),
+        "cles": [list(cle) for cle in cles],
+    }
+    _publies[fenetre] = (segment, descripteur)
+    os.environ[VARIABLE] = json.dumps([d for _, d in _publies.values()])
+    return descripteur
+
+
+def chercher(fichier: str, debut_data: int, Time_horizon: int) -> dict[str, Any] | None:
+    """
+    Descripteur du segment publié (par ce processus ou son parent) contenant la fenêtre
+    de données demandée, ou None.
+    """
+    fenetre = list(_fenetre(fichier, debut_data, Time_horizon))
+    for descripteur in json.loads(os.environ.get(VARIABLE, "[]")):
+        if descripteur["fenetre"] == fenetre:
+            return descripteur
+    return None
+
+
+def attacher(
+    descripteur: dict[str, Any],
+) -> tuple[
+    dict[str, np.ndarray],
+    dict[str, np.ndarray],
+    dict[str, np.ndarray],
+    dict[str, np.ndarray],
+]:
+    """
+    S'attache au segment publié et retourne les séries sans les copier.
+
+    Args:
+        descripteur (dict[str, Any]):
+            Le descripteur retourné par publier.
+
+    Returns:
+        tuple[dict[str, np.ndarray], ...]:
+            Séries (Production_elec, Impact_elec, Prix_energie, Demande_H2), vues en
+            lecture seule du segment.
+    """
+    segment = shared_memory.SharedMemory(name=descripteur["nom"])
+    _attaches[descripteur["nom"]] = segment
+    tableau = np.ndarray(
+        tuple(descripteur["forme"]), dtype=np.float64, buffer=segment.buf
+    )
+    tableau.flags.writeable = False
+    series = ({}, {}, {}, {})
+    for ligne, (i, k) in enumerate(descripteur["cles"]):
+        series[i][k] = tableau[ligne]
+    return series
+
+
+@atexit.register
+def _liberer() -> None:
+    # Suppression des segments publiés par ce processus
+    for segment, _ in _publies.values():
+        segment.close()
+        segment.unlink()
+    _publies.clear()
+    os.environ.pop(VARIABLE, None)
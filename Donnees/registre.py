@@ -0,0 +1,190 @@
+import json
+import warnings
+from typing import Any
+
+# Registre des acteurs du réseau : producteurs (technologie, sources d'énergie autorisées,
+# paramètres techniques et économiques, prix de vente) et consommateurs.
+#
+# Le registre est lu dans un fichier json (config.fichier_acteurs) de la forme :
+#   {
+#       "producteurs": {
+#           "P1": {"technologie": "electrolyse", "energies": ["Elec_reseau", "PV"],
+#                  "Taille_max_electrolyseur": 10, "Prix_vente_H2": {"C1": 6}},
+#           ...
+#       },
+#       "consommateurs": {"C1": {"Pire_prix": 10}, ...}
+#   }
+# Les paramètres non renseignés prennent la valeur par défaut de la technologie.
+
+# Paramètres par défaut de chaque technologie de production
+TECHNOLOGIES = {
+    "electrolyse": {
+        # Rendement électrolyseur - en kgH2/MWh
+        "Rendement_electrolyseur": 20,
+        # Taille max de l'électrolyseur - en MW
+        "Taille_max_electrolyseur": 10,
+        # Taille max du stockage - en kgH2
+        "Taille_max_stockage": 1_000,
+        # CAPEX electrolyseur - en EUR/MW
+        "CAPEX_electrolyseur": 600_000,
+        # CAPEX stockage - en EUR/kgH2
+        "CAPEX_stockage": 1_000,
+        # Durée de vie électrolyseur - en années
+        "Vie_electrolyseur": 10,
+        # Durée de vie stockage - en années
+        "Vie_stockage": 10,
+        # Impact Co2 maximal autorisé - en kgCO2 / kgH2
+        "Impact_max": 3.5,
+    },
+    "SMR": {
+        # Rendement vaporeformage - en kgH2/MWh
+        "Rendement_vaporeformage": 20,
+        # Taille vaporeformeur - en MW
+        "Taille_vaporeformeur": 1_000_000,
+        # Taille max du captage - en kgCO2
+        "Taille_max_captage": 1_000,
+        # CAPEX captage - en EUR/kgCO2
+        "CAPEX_captage": 4_800,
+        # Durée de vie captage - en années
+        "Vie_captage": 10,
+        # Impact vaporeformage - en kgCO2/kgH2
+        "Impact_vaporeformage": 10,
+        # Impact Co2 maximal autorisé - en kgCO2 / kgH2
+        "Impact_max": 3.5,
+    },
+}
+
+# Paramètres par défaut des consommateurs : prix cible et prix max - en €/kgH2
+CONSOMMATEUR = {"Meilleur_prix": 0, "Pire_prix": 10}
+
+# Clés d'un producteur qui ne sont pas des paramètres de sa technologie
+CLES_PRODUCTEUR = {"technologie", "energies", "Prix_vente_H2"}
+
+
+def lire_registre(fichier: str, energies: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    Lit et valide le registre des acteurs.
+
+    Args:
+        fichier (str):
+            Chemin du fichier json du registre.
+        energies (list[str]):
+            Sources d'énergie disponibles dans les données.
+
+    Raises:
+        ValueError: Si une technologie, une source d'énergie ou un paramètre est inconnu,
+            ou si un producteur n'a pas de prix de vente pour un consommateur.
+
+    Returns:
+        dict[str, dict[str, Any]]:
+            Le registre complété par les valeurs par défaut :
+            registre["producteurs"][nom] et registre["consommateurs"][nom].
+    """
+    with open(fichier, "r") as file:
+        contenu = json.load(file)
+
+    consommateurs = {}
+    for c, parametres in contenu.get("consommateurs", {}).items():
+        inconnus = set(parametres) - set(CONSOMMATEUR)
+        if inconnus:
+            raise ValueError(f"Paramètres inconnus pour '{c}' : {sorted(inconnus)}.")
+        consommateurs[c] = {**CONSOMMATEUR, **parametres}
+
+    producteurs = {}
+    for p, parametres in contenu.get("producteurs", {}).items():
+        technologie = parametres.get("technologie")
+        if technologie not in TECHNOLOGIES:
+            raise ValueError(
+                f"Technologie '{technologie}' de '{p}' inconnue (choix : {list(TECHNOLOGIES)})."
+            )
+        autorisees = parametres.get("energies", [])
+        if not autorisees or not set(autorisees) <= set(energies):
+            raise ValueError(
+                f"Sources d'énergie de '{p}' invalides : {autorisees} (choix : {energies})."
+            )
+        inconnus = set(parametres) - set(TECHNOLOGIES[technologie]) - CLES_PRODUCTEUR
+        if inconnus:
+            raise ValueError(f"Paramètres inconnus pour '{p}' : {sorted(inconnus)}.")
+        prix = parametres.get("Prix_vente_H2", {})
+        manquants = [c for c in consommateurs if c not in prix]
+        if manquants:
+            raise ValueError(f"Pas de prix de vente entre '{p}' et {manquants}.")
+        producteurs[p] = {**TECHNOLOGIES[technologie], **parametres}
+
+    if not producteurs or not consommateurs:
+        raise ValueError(
+            "Le registre doit contenir au moins un producteur et un consommateur."
+        )
+    return {"producteurs": producteurs, "consommateurs": consommateurs}
+
+
+def producteurs(registre: dict[str, dict[str, Any]], technologie: str) -> list[str]:
+    """
+    Liste les producteurs d'une technologie, dans l'ordre du registre.
+    """
+    return [
+        p
+        for p, parametres in registre["producteurs"].items()
+        if parametres["technologie"] == technologie
+    ]
+
+
+def parametre(
+    registre: dict[str, dict[str, Any]], nom: str, acteurs: list[str]
+) -> dict[str, Any]:
+    """
+    Valeur d'un paramètre pour chaque acteur donné.
+
+    Args:
+        registre (dict[str, dict[str, Any]]):
+            Le registre lu par lire_registre.
+        nom (str):
+            Nom du paramètre, par exemple "Taille_max_electrolyseur".
+        acteurs (list[str]):
+            Producteurs ou consommateurs concernés.
+
+    Returns:
+        dict[str, Any]:
+            Le paramètre de chaque acteur.
+    """
+    tous = registre["producteurs"] | registre["consommateurs"]
+    return {a: tous[a][nom] for a in acteurs}
+
+
+def prix_vente(
+    registre: dict[str, dict[str, Any]], prix: dict[str, dict[str, float]]
+) -> dict[str, dict[str, float]]:
+    """
+    Prix de vente de l'H2 du registre, remplacés par les prix donnés (config.py).
+
+    Les couples producteur-consommateur absents du registre (par exemple des prix écrits
+    pour un autre registre) sont ignorés avec un avertissement.
+
+    Args:
+        registre (dict[str, dict[str, Any]]):
+            Le registre lu par lire_registre.
+        prix (dict[str, dict[str, float]]):
+            Prix prix[producteur][consommateur] qui remplacent ceux du registre.
+
+    Returns:
+        dict[str, dict[str, float]]:
+            La matrice complète des prix de vente - en €/kgH2.
+    """
+    matrice = {
+        p: {c: parametres["Prix_vente_H2"][c] for c in registre["consommateurs"]}
+        for p, parametres in registre["producteurs"].items()
+    }
+    inconnus = []
+    for p, prix_p in prix.items():
+        for c, valeur in prix_p.items():
+            if p not in matrice or c not in matrice[p]:
+                inconnus.append((p, c))
+                continue
+            matrice[p][c] = valeur
+    if inconnus:
+        warnings.warn(
+            f"Prix de vente ignorés, couples absents du registre des acteurs : {inconnus} "
+            "(voir Prix_vente_H2 dans config.py).",
+            stacklevel=2,
+        )
+    return matrice
@@ -0,0 +1,268 @@
+import copy
+import itertools
+import multiprocessing
+import time
+from typing import Any
+import pyomo.environ as pyo
+from pyomo.opt import TerminationCondition
+import config as config
+from Donnees.data import Prod, Cons, Acteurs, Prix_vente_H2
+import Definition.modelisation as modelisation
+import Resolution.goal_programming as gp
+import Resolution.max_min_satisfaction as max_min
+import Resolution.optim_individuelle as optim_indiv
+import Resolution.solveur as solveur
+import Utils.scenarios as scenarios
+
+# Balayage des prix de vente de l'H2 sur un modèle déjà construit.
+#
+# Le paramètre mutable model.Prix_vente_H2 est modifié en place pour chaque point de la
+# grille : le modèle n'est construit qu'une fois et chaque résolution part de la solution
+# précédente (solveur persistant + warmstart).
+
+
+def grille_prix(
+    valeurs: dict[str, dict[str, list[float]]],
+    base: dict[str, dict[str, float]] | None = None,
+) -> list[dict[str, dict[str, float]]]:
+    """
+    Construit la grille des matrices de prix (produit cartésien des valeurs données).
+
+    Args:
+        valeurs (dict[str, dict[str, list[float]]]):
+            Valeurs prises par chaque prix balayé, valeurs[producteur][consommateur].
+        base (dict[str, dict[str, float]] | None, optional):
+            Prix des couples non balayés. Defaults to None (prix de config.py).
+
+    Returns:
+        list[dict[str, dict[str, float]]]:
+            Une matrice de prix complète par point de la grille.
+    """
+    if base is None:
+        base = Prix_vente_H2
+    couples = [(p, c) for p in valeurs for c in valeurs[p]]
+    grille = []
+    for combinaison in itertools.product(*(valeurs[p][c] for p, c in couples)):
+        prix = copy.deepcopy(base)
+        for (p, c), valeur in zip(couples, combinaison):
+            prix[p][c] = valeur
+        grille.append(prix)
+    return grille
+
+
+def balayage_prix(
+    model: pyo.ConcreteModel,
+    grille: list[dict[str, dict[str, float]]],
+    lower_bound: dict[str, float],
+    upper_bound: dict[str, float],
+    utopia: dict[str, float],
+    nadir: dict[str, float],
+    methode: str = "gp",
+    recalcul_payoff: bool = False,
+    solver=None,
+    display: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Résout le modèle pour chaque matrice de prix de la grille en modifiant en place
+    le paramètre mutable Prix_vente_H2.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo construit avec init_model (optim_prix = False).
+        grille (list[dict[str, dict[str, float]]]):
+            Matrices de prix prix[producteur][consommateur] (éventuellement partielles).
+        lower_bound (dict[str, float]):
+            Valeurs pour lesquelles tout acteur est satisfait au maximum.
+        upper_bound (dict[str, float]):
+            Valeurs pour lesquelles tout acteur n'est plus satisfait.
+        utopia (dict[str, float]):
+            Valeurs optimales (utopiques) par acteur.
+        nadir (dict[str, float]):
+            Valeurs nadir par acteur.
+        methode (str, optional):
+            "gp" (Goal Programming) ou "max_min". Defaults to "gp".
+        recalcul_payoff (bool, optional):
+            Si True, la table des gains (utopie, nadir et bornes des producteurs) est
+            recalculée pour chaque prix. Sinon les bornes données sont conservées.
+            Defaults to False.
+        solver (optional):
+            Solveur à utiliser. Si None, un solveur persistant est créé. Defaults to None.
+        display (bool, optional):
+            Si True, affiche l'avancement. Defaults to False.
+
+    Returns:
+        list[dict[str, Any]]:
+            Une ligne par point de la grille : prix, statut, objectif, fonctions
+            objectives et satisfaction de chaque acteur, impact CO2 et temps de résolution.
+    """
+
+    def _print(texte: str) -> None:
+        if display:
+            print(texte)
+
+    if methode not in ["gp", "max_min"]:
+        raise ValueError(f"Méthode inconnue : '{methode}'.")
+    if not hasattr(model, "C_cons_2"):
+        raise ValueError(
+            "Le balayage des prix nécessite un modèle avec optim_prix = False."
+        )
+    if solver is None:
+        solver = solveur.creer_solveur(persistant=True)
+
+    def objectif_gp() -> None:
+        modelisation.reinitialiser_model(model)
+        gp.satisfaction_function(model, lower_bound, upper_bound, utopia, nadir)
+        model.objectif = pyo.Objective(
+            expr=sum(model.satisfaction[a] for a in Acteurs), sense=pyo.maximize
+        )
+
+    # Les contraintes de satisfaction ne dépendent pas des prix : construites une fois
+    if methode == "gp" and not recalcul_payoff:
+        objectif_gp()
+
+    tableau = []
+    for n, prix in enumerate(grille):
+        start_time = time.time()
+        modelisation.modifier_prix(model, prix)
+        ligne = {
+            f"Prix {p} - {c}": pyo.value(model.Prix_vente_H2[p, c])
+            for p in Prod
+            for c in Cons
+        }
+
+        if recalcul_payoff:
+            modelisation.reinitialiser_model(model)
+            utopia, nadir, _, _ = optim_indiv.optim_individuelle(model, solver=solver)
+            lower_bound, upper_bound = optim_indiv.bornes_satisfaction(utopia)
+
+        if methode == "gp":
+            if recalcul_payoff:
+                objectif_gp()
+            results = solveur.resoudre(
+                model,
+                solver=solver,
+                warmstart=True,
+                charger=[model.fn_obj, model.satisfaction, model.Impact_prod],
+            )
+            faisable = (
+                results.solver.termination_condition == TerminationCondition.optimal
+            )
+            ligne["statut"] = str(results.solver.termination_condition)
+            if faisable:
+                satisfaction = {a: pyo.value(model.satisfaction[a]) for a in Acteurs}
+        else:
+            modelisation.reinitialiser_model(model)
+            try:
+                _, satisfaction, _, _ = max_min.max_min_satisfaction(
+                    model,
+                    lower_bound=lower_bound,
+                    upper_bound=upper_bound,
+                    utopia=utopia,
+                    nadir=nadir,
+                    display=False,
+                    dossier_resultats=None,
+                    chargement_complet=False,
+                    solver=solver,
+                )
+                faisable = True
+                ligne["statut"] = "optimal"
+            except solveur.AucuneSolution as e:
+                faisable = False
+                ligne["statut"] = str(e.results.solver.termination_condition)
+
+        if faisable:
+            # GP : satisfaction totale, max min : satisfaction minimale
+            ligne["objectif"] = (
+                pyo.value(model.objectif)
+                if methode == "gp"
+                else min(satisfaction.values())
+            )
+            for a in Acteurs:
+                ligne[f"Objectif {a}"] = pyo.value(model.fn_obj[a])
+            for a in satisfaction:
+                ligne[f"Satisfaction {a}"] = satisfaction[a]
+            ligne["Impact CO2"] = round(
+                sum(
+                    pyo.value(model.Impact_prod[i, t]) for i in Prod for t in model.Time
+                )
+                / sum(
+                    pyo.value(model.Demande_H2[c, t]) for c in Cons for t in model.Time
+                ),
+                4,
+            )
+        ligne["temps"] = time.time() - start_time
+        _print(
+            f"Point {n + 1}/{len(grille)} : {ligne['statut']} ({ligne['temps']:.2f}s)"
+        )
+        tableau.append(ligne)
+    return tableau
+
+
+def _balayage_processus(args: tuple) -> list[dict[str, Any]]:
+    # Un modèle construit par processus, qui résout une tranche contiguë de la grille
+    grille, bornes, methode, recalcul_payoff, threads = args
+    config.solveur_threads = threads
+    model = modelisation.init_model(
+        emission_CO2_heure=config.emission_CO2_heure, optim_prix=False
+    )
+    return balayage_prix(
+        model, grille, *bornes, methode=methode, recalcul_payoff=recalcul_payoff
+    )
+
+
+def balayage_prix_parallele(
+    grille: list[dict[str, dict[str, float]]],
+    lower_bound: dict[str, float],
+    upper_bound: dict[str, float],
+    utopia: dict[str, float],
+    nadir: dict[str, float],
+    methode: str = "gp",
+    recalcul_payoff: bool = False,
+    processus: int = 1,
+    threads: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Répartit la grille de prix entre plusieurs processus, chacun construisant un modèle
+    et résolvant une tranche contiguë de la grille avec balayage_prix.
+
+    Les processus utilisent les options courantes de config.py.
+
+    Args:
+        grille (list[dict[str, dict[str, float]]]):
+            Matrices de prix prix[producteur][consommateur].
+        lower_bound, upper_bound, utopia, nadir (dict[str, float]):
+            Bornes de satisfaction et table des gains (voir balayage_prix).
+        methode (str, optional):
+            "gp" ou "max_min". Defaults to "gp".
+        recalcul_payoff (bool, optional):
+            Recalcul de la table des gains pour chaque prix. Defaults to False.
+        processus (int, optional):
+            Nombre de processus. Defaults to 1.
+        threads (int | None, optional):
+            Nombre de threads du solveur par processus. Defaults to None.
+
+    Returns:
+        list[dict[str, Any]]:
+            Le tableau des résultats, dans l'ordre de la grille.
+    """
+    if not grille:
+        return []
+    # Tranches contiguës : des prix voisins donnent de bons points de départ
+    taille = -(-len(grille) // processus)
+    tranches = [grille[i : i + taille] for i in range(0, len(grille), taille)]
+    bornes = (lower_bound, upper_bound, utopia, nadir)
+    taches = [
+        (tranche, bornes, methode, recalcul_payoff, threads) for tranche in tranches
+    ]
+
+    contexte = multiprocessing.get_context("spawn")
+    with contexte.Pool(
+        processes=min(processus, len(tranches)),
+        initializer=scenarios.restaurer_config,
+        initargs=(scenarios.capturer_config(),),
+    ) as pool:
+        return [
+            ligne
+            for tableau in pool.map(_balayage_processus, taches)
+            for ligne in tableau
+        ]
@@ -0,0 +1,456 @@
+import argparse
+import collections
+import functools
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import time
+import weakref
+import pyomo.environ as pyo
+from pyomo.opt import Solution, SolverResults, SolverStatus, TerminationCondition
+import config as config
+
+# Course de solveurs : plusieurs configurations (solveur et paramètres) résolvent le même
+# problème en parallèle, le premier résultat prouvé optimal est retenu et les autres
+# résolutions sont arrêtées.
+#
+# Le modèle Pyomo n'étant pas sérialisable (règles locales), il est écrit une fois au format
+# LP ; chaque configuration lit ce fichier dans son propre processus avec l'API Python du
+# solveur (highspy, cplex). La solution gagnante est rechargée dans le modèle par les
+# symboles du fichier.
+#
+# Chaque course gagnée est ajoutée au journal config.course_journal (une ligne JSON par
+# résolution : phase, configuration gagnante, temps, taille du problème). Le journal
+# détermine l'ordre des configurations des courses suivantes d'une même phase : si
+# config.course_processus limite le nombre de résolutions simultanées, les configurations
+# les plus souvent gagnantes sont lancées.
+#
+# Exemple de configurations (config.course_configurations) :
+#   [{"nom": "dual", "solveur": "highs", "options": {"solver": "simplex", "simplex_strategy": 1}},
+#    {"nom": "primal", "solveur": "highs", "options": {"solver": "simplex", "simplex_strategy": 4}},
+#    {"nom": "barriere", "solveur": "highs", "options": {"solver": "ipm"}}]
+#
+# Utilisation (bilan du journal par phase) :
+#   python -m Resolution.course --journal Resultats/course_solveurs.jsonl
+
+
+def _highs(
+    fichier: str,
+    options: dict,
+    threads: int | None,
+    temps_max: float | None,
+    ecart_max: float | None,
+) -> tuple:
+    # Résolution du fichier LP par HiGHS
+    import highspy
+
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    if threads is not None:
+        h.setOptionValue("threads", threads)
+    if temps_max is not None:
+        h.setOptionValue("time_limit", float(temps_max))
+    if ecart_max is not None:
+        h.setOptionValue("mip_rel_gap", float(ecart_max))
+    for cle, valeur in options.items():
+        h.setOptionValue(cle, valeur)
+    h.readModel(fichier)
+    h.run()
+    etat = h.getModelStatus()
+    statuts = {
+        highspy.HighsModelStatus.kOptimal: TerminationCondition.optimal,
+        highspy.HighsModelStatus.kInfeasible: TerminationCondition.infeasible,
+        highspy.HighsModelStatus.kUnbounded: TerminationCondition.unbounded,
+        highspy.HighsModelStatus.kUnboundedOrInfeasible: TerminationCondition.infeasibleOrUnbounded,
+        highspy.HighsModelStatus.kTimeLimit: TerminationCondition.maxTimeLimit,
+        highspy.HighsModelStatus.kIterationLimit: TerminationCondition.maxIterations,
+    }
+    statut = statuts.get(etat, TerminationCondition.other)
+    info = h.getInfo()
+    realisable = statut == TerminationCondition.optimal or (
+        info.primal_solution_status
+        == highspy.SolutionStatus.kSolutionStatusFeasible.value
+    )
+    if not realisable:
+        return statut, None, None, None, None
+    objectif = info.objective_function_value
+    entiers = any(i != highspy.HighsVarType.kContinuous for i in h.getLp().integrality_)
+    return (
+        statut,
+        objectif,
+        info.mip_dual_bound if entiers else objectif,
+        list(h.getLp().col_names_),
+        list(h.getSolution().col_value),
+    )
+
+
+def _cplex(
+    fichier: str,
+    options: dict,
+    threads: int | None,
+    temps_max: float | None,
+    ecart_max: float | None,
+) -> tuple:
+    # Résolution du fichier LP par CPLEX, options désignées par leur chemin
+    # (par exemple "lpmethod" ou "emphasis.mip")
+    import cplex
+
+    c = cplex.Cplex(fichier)
+    for flux in ("log", "results", "warning"):
+        getattr(c, f"set_{flux}_stream")(None)
+    if threads is not None:
+        c.parameters.threads.set(threads)
+    if temps_max is not None:
+        c.parameters.timelimit.set(temps_max)
+    if ecart_max is not None:
+        c.parameters.mip.tolerances.mipgap.set(ecart_max)
+    for cle, valeur in options.items():
+        functools.reduce(getattr, cle.split("."), c.parameters).set(valeur)
+    c.solve()
+    s = c.solution.status
+    statuts = {
+        s.optimal: TerminationCondition.optimal,
+        s.MIP_optimal: TerminationCondition.optimal,
+        s.optimal_tolerance: TerminationCondition.optimal,
+        s.infeasible: TerminationCondition.infeasible,
+        s.MIP_infeasible: TerminationCondition.infeasible,
+        s.unbounded: TerminationCondition.unbounded,
+        s.MIP_unbounded: TerminationCondition.unbounded,
+        s.infeasible_or_unbounded: TerminationCondition.infeasibleOrUnbounded,
+        s.MIP_infeasible_or_unbounded: TerminationCondition.infeasibleOrUnbounded,
+        s.abort_time_limit: TerminationCondition.maxTimeLimit,
+        s.MIP_time_limit_feasible: TerminationCondition.maxTimeLimit,
+        s.MIP_time_limit_infeasible: TerminationCondition.maxTimeLimit,
+    }
+    statut = statuts.get(c.solution.get_status(), TerminationCondition.other)
+    if not c.solution.is_primal_feasible():
+        return statut, None, None, None, None
+    objectif = c.solution.get_objective_value()
+    return (
+        statut,
+        objectif,
+        c.solution.MIP.get_best_objective()
+        if c.problem_type[c.get_problem_type()].startswith("MI")
+        else objectif,
+        c.variables.get_names(),
+        c.solution.get_values(),
+    )
+
+
+# Solveurs utilisables dans une course (lecture d'un fichier LP dans le processus)
+SOLVEURS = {"highs": _highs, "cplex": _cplex}
+
+
+def _concurrent(
+    indice: int,
+    fichier: str,
+    configuration: dict,
+    limites: tuple,
+    resultats: multiprocessing.Queue,
+) -> None:
+    # Résolution d'une configuration dans un processus de la course
+    # limites : threads, temps limite et écart relatif
+    start_time = time.time()
+    try:
+        statut, objectif, borne, noms, valeurs = SOLVEURS[configuration["solveur"]](
+            fichier, configuration.get("options", {}), *limites
+        )
+        statut = str(statut.value)
+    except Exception as erreur:
+        statut, objectif, borne, noms, valeurs = (
+            f"erreur: {erreur}",
+            None,
+            None,
+            None,
+            None,
+        )
+    resultats.put(
+        (indice, statut, objectif, borne, time.time() - start_time, noms, valeurs)
+    )
+
+
+def nom_configuration(configuration: dict) -> str:
+    """
+    Nom d'une configuration : son champ "nom", sinon le solveur et ses options.
+    """
+    if "nom" in configuration:
+        return configuration["nom"]
+    return json.dumps(
+        {"solveur": configuration["solveur"], **configuration.get("options", {})},
+        sort_keys=True,
+    )
+
+
+def lire_journal(fichier: str | None = None) -> list[dict]:
+    """
+    Lit le journal des courses.
+
+    Args:
+        fichier (str | None, optional):
+            Journal à lire. Defaults to None (config.course_journal).
+
+    Returns:
+        list[dict]:
+            Les courses enregistrées, dans l'ordre (liste vide si le journal n'existe pas).
+    """
+    fichier = config.course_journal if fichier is None else fichier
+    if fichier is None or not os.path.exists(fichier):
+        return []
+    with open(fichier, "r") as file:
+        return [json.loads(ligne) for ligne in file if ligne.strip()]
+
+
+def victoires(
+    phase: str | None = None, fichier: str | None = None
+) -> collections.Counter:
+    """
+    Nombre de courses gagnées par chaque configuration.
+
+    Args:
+        phase (str | None, optional):
+            Phase de résolution ("table_gains", "goal_programming", "max_min").
+            Si None, toutes les phases. Defaults to None.
+        fichier (str | None, optional):
+            Journal à lire. Defaults to None (config.course_journal).
+
+    Returns:
+        collections.Counter:
+            Les victoires par nom de configuration.
+    """
+    return collections.Counter(
+        course["gagnant"]
+        for course in lire_journal(fichier)
+        if phase is None or course["phase"] == phase
+    )
+
+
+def ordonner(configurations: list[dict], phase: str | None) -> list[dict]:
+    """
+    Trie les configurations par nombre de victoires dans la phase (ordre de la liste
+    en cas d'égalité).
+
+    Args:
+        configurations (list[dict]):
+            Configurations {"nom", "solveur", "options"}.
+        phase (str | None):
+            Phase de résolution.
+
+    Returns:
+        list[dict]:
+            Les configurations, les plus souvent gagnantes en premier.
+    """
+    gains = victoires(phase)
+    return sorted(configurations, key=lambda c: -gains[nom_configuration(c)])
+
+
+def _enregistrer(course: dict) -> None:
+    # Ajout d'une course gagnée au journal
+    if config.course_journal is None:
+        return
+    dossier = os.path.dirname(config.course_journal)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    with open(config.course_journal, "a") as file:
+        file.write(json.dumps(course) + "\n")
+
+
+def _charger(
+    model: pyo.ConcreteModel,
+    symbol_map,
+    noms: list[str],
+    valeurs: list[float],
+) -> None:
+    # Affectation de la solution gagnante aux variables du modèle (par symbole)
+    for nom, valeur in zip(noms, valeurs):
+        var = symbol_map.bySymbol.get(nom)
+        if isinstance(var, weakref.ref):
+            var = var()
+        if var is None or var.ctype is not pyo.Var or var.fixed:
+            continue
+        var.set_value(valeur, skip_validation=True)
+
+
+def courir(
+    model: pyo.ConcreteModel,
+    configurations: list[dict] | None = None,
+    phase: str | None = None,
+    processus: int | None = None,
+    temps_max: float | None = None,
+    ecart_max: float | None = None,
+) -> SolverResults:
+    """
+    Résout le modèle avec plusieurs configurations en parallèle et charge la première
+    solution prouvée optimale ; les autres résolutions sont arrêtées.
+
+    Si aucune configuration ne prouve l'optimalité (temps limite), la meilleure solution
+    réalisable trouvée est chargée, avec la meilleure borne prouvée.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo à résoudre (un seul objectif actif).
+        configurations (list[dict] | None, optional):
+            Configurations {"nom", "solveur", "options"} en concurrence (solveurs de
+            SOLVEURS). Defaults to None (config.course_configurations).
+        phase (str | None, optional):
+            Phase de résolution, enregistrée dans le journal et utilisée pour ordonner les
+            configurations. Defaults to None.
+        processus (int | None, optional):
+            Nombre de configurations lancées. Defaults to None (config.course_processus,
+            toutes si None).
+        temps_max (float | None, optional):
+            Temps limite de chaque configuration - en secondes. Defaults to None.
+        ecart_max (float | None, optional):
+            Écart relatif visé des problèmes en nombres entiers. Defaults to None.
+
+    Returns:
+        SolverResults:
+            Les résultats de la résolution (statut dans results.solver.termination_condition,
+            bornes dans results.problem, configuration retenue dans results.solver.name).
+    """
+    if configurations is None:
+        configurations = config.course_configurations
+    if processus is None:
+        processus = config.course_processus
+    configurations = ordonner(configurations, phase)[:processus]
+    for configuration in configurations:
+        if configuration["solveur"] not in SOLVEURS:
+            raise ValueError(
+                f"Solveur {configuration['solveur']} inconnu pour la course (solveurs : {list(SOLVEURS)})"
+            )
+    sens = next(model.component_data_objects(pyo.Objective, active=True)).sense
+
+    dossier = tempfile.mkdtemp(prefix="course_")
+    fichier = os.path.join(dossier, "modele.lp")
+    start_time = time.time()
+    _, smap_id = model.write(fichier, io_options={"symbolic_solver_labels": False})
+    symbol_map = model.solutions.symbol_map[smap_id]
+
+    contexte = multiprocessing.get_context("spawn")
+    resultats = contexte.Queue()
+    limites = (config.solveur_threads, temps_max, ecart_max)
+    concurrents = [
+        contexte.Process(
+            target=_concurrent,
+            args=(i, fichier, c, limites, resultats),
+            daemon=True,
+        )
+        for i, c in enumerate(configurations)
+    ]
+    for p in concurrents:
+        p.start()
+
+    # statuts[i] : statut de la configuration i, solutions[i] : (objectif, borne, temps,
+    # noms, valeurs) si elle a trouvé une solution réalisable
+    statuts = {}
+    solutions = {}
+    gagnant = None
+    try:
+        while gagnant is None and len(statuts) < len(concurrents):
+            try:
+                indice, statut, objectif, borne, temps, noms, valeurs = resultats.get(
+                    timeout=0.1
+                )
+            except queue.Empty:
+                # Un processus arrêté sans résultat (mémoire, signal) ne répondra plus
+                for i, p in enumerate(concurrents):
+                    if i not in statuts and p.exitcode not in (None, 0):
+                        statuts[i] = f"erreur: code de sortie {p.exitcode}"
+                continue
+            statuts[indice] = statut
+            if noms is not None:
+                solutions[indice] = (objectif, borne, temps, noms, valeurs)
+            if statut == TerminationCondition.optimal.value:
+                gagnant = indice
+    finally:
+        for p in concurrents:
+            if p.is_alive():
+                p.terminate()
+        for p in concurrents:
+            p.join()
+        resultats.close()
+        shutil.rmtree(dossier, ignore_errors=True)
+
+    results = SolverResults()
+    results.problem.sense = sens
+    retenu = gagnant
+    if retenu is None and solutions:
+        # Meilleure solution réalisable des configurations arrêtées par le temps limite
+        signe = 1 if sens == pyo.minimize else -1
+        retenu = min(solutions, key=lambda i: signe * solutions[i][0])
+    if retenu is not None:
+        objectif, borne, temps, noms, valeurs = solutions[retenu]
+        if gagnant is None:
+            # Meilleure borne prouvée parmi toutes les configurations
+            bornes = [s[1] for s in solutions.values() if s[1] is not None]
+            borne = (max if sens == pyo.minimize else min)(bornes, default=None)
+        _charger(model, symbol_map, noms, valeurs)
+        results.problem.lower_bound, results.problem.upper_bound = (
+            (borne, objectif) if sens == pyo.minimize else (objectif, borne)
+        )
+        results.solution.insert(Solution())
+        results.solver.name = nom_configuration(configurations[retenu])
+    if gagnant is not None:
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        _enregistrer(
+            {
+                "phase": phase,
+                "gagnant": results.solver.name,
+                "objectif": objectif,
+                "temps_solveur": temps,
+                "temps_course": time.time() - start_time,
+                "concurrents": [nom_configuration(c) for c in configurations],
+                "variables": model.nvariables(),
+                "contraintes": model.nconstraints(),
+                "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        )
+        return results
+
+    # Aucune configuration n'a prouvé l'optimalité : statut le plus informatif
+    conditions = [
+        TerminationCondition(s)
+        for s in statuts.values()
+        if s in TerminationCondition._value2member_map_
+    ]
+    for condition in (
+        TerminationCondition.infeasible,
+        TerminationCondition.unbounded,
+        TerminationCondition.infeasibleOrUnbounded,
+        TerminationCondition.maxTimeLimit,
+    ):
+        if condition in conditions:
+            break
+    else:
+        condition = TerminationCondition.error
+    results.solver.status = SolverStatus.warning
+    results.solver.termination_condition = condition
+    results.solver.message = "; ".join(
+        f"{nom_configuration(configurations[i])}: {s}" for i, s in statuts.items()
+    )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bilan du journal des courses de solveurs."
+    )
+    parser.add_argument("--journal", default=config.course_journal)
+    parser.add_argument("--phase", default=None)
+    args = parser.parse_args()
+
+    courses = lire_journal(args.journal)
+    phases = sorted(
+        {c["phase"] for c in courses if args.phase in (None, c["phase"])}, key=str
+    )
+    for phase in phases:
+        temps = collections.defaultdict(list)
+        for c in courses:
+            if c["phase"] == phase:
+                temps[c["gagnant"]].append(c["temps_solveur"])
+        print(f"Phase {phase} :")
+        for nom, t in sorted(temps.items(), key=lambda x: -len(x[1])):
+            print(f"   {nom} : {len(t)} victoires, temps moyen {sum(t) / len(t):.3f}s")
@@ -0,0 +1,358 @@
+import argparse
+import json
+import multiprocessing
+import time
+from typing import Any
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.opt import TerminationCondition
+import config as config
+import Donnees.data as data
+from Donnees.data import (
+    Prod,
+    Cons,
+    Energie,
+    Energies_autorisees,
+    Acteurs,
+    P_electrolyseur,
+)
+import Definition.modelisation as modelisation
+import Resolution.solveur as solveur
+import Utils.scenarios as scenarios
+import Utils.utils as utils
+
+# Exploitation du réseau à tailles fixées, par blocs indépendants.
+#
+# Les tailles sont des données (init_model(tailles=...)) : il ne reste qu'un LP
+# d'exploitation, sans contraintes de taille max ni de CAPEX. L'horizon est découpé en
+# blocs (par exemple des journées de 24h) qui commencent et finissent chacun avec la
+# moitié du stockage (C_prod_elec_5/6) : les blocs sont indépendants et résolus en
+# parallèle. Chaque processus garde un modèle et un solveur persistant par longueur de
+# bloc et n'y charge que les séries du bloc (charger_donnees).
+#
+# L'objectif d'un bloc est une somme pondérée des objectifs des acteurs, séparable par
+# bloc : les fn_obj des producteurs s'additionnent d'un bloc à l'autre et la part d'un
+# bloc dans l'objectif d'un consommateur est son paiement divisé par sa demande sur tout
+# l'horizon. Sans poids, c'est le coût total de la chaîne (énergie et CAPEX, les
+# paiements des consommateurs compensant les recettes des producteurs) : la répartition des
+# ventes entre producteurs ne le change pas et dépendrait du solveur et du découpage. Les
+# paiements y sont donc comptés avec un poids 1 + DEPARTAGE : à coût égal, chaque
+# consommateur achète au producteur le moins cher, et l'objectif de chaque acteur ne dépend
+# plus du nombre de processus.
+# Avec emission_CO2_heure = False, le plafond d'impact CO2 porte sur chaque bloc.
+#
+# Utilisation :
+#   python -m Resolution.dispatch --tailles tailles.json --horizon 8736 --bloc 24 --processus 4
+
+# Poids supplémentaire des paiements des consommateurs sans poids (départage des ventes)
+DEPARTAGE = 1e-5
+
+
+def decouper(
+    donnees: tuple[
+        dict[str, list[float]],
+        dict[str, list[float]],
+        dict[str, list[float]],
+        dict[str, list[float]],
+    ],
+    longueur_bloc: int,
+) -> list[tuple[dict[str, list[float]], ...]]:
+    """
+    Découpe des séries temporelles en blocs consécutifs.
+
+    Args:
+        donnees (tuple[dict[str, list[float]], ...]):
+            Séries (Production_elec, Impact_elec, Prix_energie, Demande_H2) au format de
+            utils.read_data.
+        longueur_bloc (int):
+            Nombre d'heures d'un bloc (le dernier bloc peut être plus court).
+
+    Returns:
+        list[tuple[dict[str, list[float]], ...]]:
+            Les séries de chaque bloc.
+    """
+    T = len(donnees[3][Cons[0]])
+    return [
+        tuple(
+            {k: valeurs[debut : debut + longueur_bloc] for k, valeurs in serie.items()}
+            for serie in donnees
+        )
+        for debut in range(0, T, longueur_bloc)
+    ]
+
+
+def coefficients(
+    poids: dict[str, float] | None, Demande_H2: dict[str, list[float]]
+) -> dict[str, float]:
+    """
+    Coefficients de l'objectif de dispatch : fn_obj des producteurs et paiements des
+    consommateurs.
+
+    Args:
+        poids (dict[str, float] | None):
+            Poids de l'objectif de chaque acteur sur l'horizon (acteurs absents : 0).
+            Si None, coût total de la chaîne (poids 1 des producteurs, paiements des
+            consommateurs avec le poids 1 + DEPARTAGE).
+        Demande_H2 (dict[str, list[float]]):
+            Demande d'H2 de chaque consommateur sur l'horizon.
+
+    Returns:
+        dict[str, float]:
+            Le coefficient de chaque acteur.
+    """
+    if poids is None:
+        return {a: 1.0 if a in Prod else 1.0 + DEPARTAGE for a in Acteurs}
+    coefs = {p: poids.get(p, 0.0) for p in Prod}
+    for c in Cons:
+        demande = sum(Demande_H2[c])
+        coefs[c] = poids.get(c, 0.0) / demande if demande > 0 else 0.0
+    return coefs
+
+
+def objectif_dispatch(
+    model: pyo.ConcreteModel, coefs: dict[str, float]
+) -> pyo.ConcreteModel:
+    """
+    Ajoute l'objectif de dispatch (voir coefficients) au modèle.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo construit avec des tailles fixées.
+        coefs (dict[str, float]):
+            Coefficient de chaque acteur.
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec le paramètre poids_dispatch et l'objectif objectif.
+    """
+    model.poids_dispatch = pyo.Param(
+        Acteurs, initialize=lambda m, a: coefs[a], mutable=True
+    )
+    model.objectif = pyo.Objective(
+        expr=sum(model.poids_dispatch[p] * model.fn_obj[p] for p in Prod)
+        + sum(
+            model.poids_dispatch[c]
+            * sum(model.P_H2_vendu[i, c, t] for i in Prod for t in model.Time)
+            for c in Cons
+        ),
+        sense=pyo.minimize,
+    )
+    return model
+
+
+def _resoudre_bloc(
+    modeles: dict,
+    tailles: dict[str, dict[str, float]],
+    coefs: dict[str, float],
+    emission_CO2_heure: bool,
+    donnees: tuple[dict[str, list[float]], ...],
+) -> dict[str, Any]:
+    # Résolution d'un bloc avec le modèle de sa longueur (construit au premier bloc).
+    # La structure de C_val_cons dépend des demandes nulles : elles font partie de la clé.
+    Demande_H2 = donnees[3]
+    cle = (len(Demande_H2[Cons[0]]), tuple(sum(Demande_H2[c]) == 0 for c in Cons))
+    if cle not in modeles:
+        model = modelisation.init_model(
+            emission_CO2_heure=emission_CO2_heure, donnees=donnees, tailles=tailles
+        )
+        objectif_dispatch(model, coefs)
+        modeles[cle] = (model, solveur.creer_solveur(persistant=True))
+    else:
+        modelisation.charger_donnees(modeles[cle][0], *donnees)
+    model, solver = modeles[cle]
+    Time = list(model.Time)
+
+    start_time = time.time()
+    results = solveur.resoudre(model, solver)
+    statut = results.solver.termination_condition
+    bloc = {"statut": str(statut), "temps": time.time() - start_time}
+    if statut != TerminationCondition.optimal:
+        return bloc
+    bloc["fn_obj"] = {p: pyo.value(model.fn_obj[p]) for p in Prod}
+    bloc["paye"] = {
+        c: sum(pyo.value(model.P_H2_vendu[i, c, t]) for i in Prod for t in Time)
+        for c in Cons
+    }
+    bloc["Impact_prod"] = {
+        p: sum(pyo.value(model.Impact_prod[p, t]) for t in Time) for p in Prod
+    }
+    bloc["Q_H2_prod"] = np.array(
+        [[pyo.value(model.Q_H2_prod[p, t]) for t in Time] for p in Prod]
+    )
+    bloc["Q_H2_stock"] = np.array(
+        [[pyo.value(model.Q_H2_stock[p, t]) for t in Time] for p in P_electrolyseur]
+    ).reshape(len(P_electrolyseur), len(Time))
+    bloc["Q_H2_vendu"] = np.array(
+        [
+            [[pyo.value(model.Q_H2_vendu[p, c, t]) for t in Time] for c in Cons]
+            for p in Prod
+        ]
+    )
+    # Sources non autorisées du producteur : achats nuls
+    bloc["Q_energie"] = np.array(
+        [
+            [
+                [
+                    pyo.value(model.Q_energie[p, e, t])
+                    if e in Energies_autorisees[p]
+                    else 0.0
+                    for t in Time
+                ]
+                for e in Energie
+            ]
+            for p in Prod
+        ]
+    )
+    return bloc
+
+
+# Modèles du processus (pool de dispatch) par longueur de bloc
+_modeles_processus = {}
+
+
+def _dispatch_processus(args: tuple) -> dict[str, Any]:
+    return _resoudre_bloc(_modeles_processus, *args)
+
+
+def dispatch(
+    tailles: dict[str, dict[str, float]],
+    donnees: tuple[dict[str, list[float]], ...] | None = None,
+    longueur_bloc: int = 24,
+    processus: int = 1,
+    poids: dict[str, float] | None = None,
+    emission_CO2_heure: bool | None = None,
+    display: bool = False,
+) -> dict[str, Any]:
+    """
+    Optimise l'exploitation du réseau à tailles fixées, par blocs indépendants.
+
+    Args:
+        tailles (dict[str, dict[str, float]]):
+            Tailles fixées tailles[nom][producteur] (voir modelisation.TAILLES).
+        donnees (tuple[dict[str, list[float]], ...] | None, optional):
+            Séries (Production_elec, Impact_elec, Prix_energie, Demande_H2). Si None,
+            séries de Donnees.data. Defaults to None.
+        longueur_bloc (int, optional):
+            Nombre d'heures d'un bloc. Defaults to 24.
+        processus (int, optional):
+            Nombre de processus résolvant les blocs. Defaults to 1.
+        poids (dict[str, float] | None, optional):
+            Poids des objectifs des acteurs (voir coefficients). Defaults to None.
+        emission_CO2_heure (bool | None, optional):
+            Plafond CO2 horaire ou par bloc. Defaults to None (config.emission_CO2_heure).
+        display (bool, optional):
+            Si True, affiche l'avancement. Defaults to False.
+
+    Returns:
+        dict[str, Any]:
+            - "fn_obj" : objectif de chaque acteur sur l'horizon (nan si un bloc a échoué)
+            - "Impact_prod" : impact CO2 de chaque producteur - en kgCO2
+            - "statuts" : statut de résolution de chaque bloc
+            - "temps" : temps de résolution de chaque bloc
+            - "Q_H2_prod", "Q_H2_stock", "Q_H2_vendu", "Q_energie" : décisions horaires
+              indexées comme les variables du modèle (producteurs puis temps en dernier)
+    """
+
+    def _print(texte: str) -> None:
+        if display:
+            print(texte)
+
+    if donnees is None:
+        donnees = (
+            data.Production_elec,
+            data.Impact_elec,
+            data.Prix_energie,
+            data.Demande_H2,
+        )
+    if emission_CO2_heure is None:
+        emission_CO2_heure = config.emission_CO2_heure
+    coefs = coefficients(poids, donnees[3])
+    blocs = decouper(donnees, longueur_bloc)
+    taches = [(tailles, coefs, emission_CO2_heure, bloc) for bloc in blocs]
+    _print(f"{len(blocs)} blocs de {longueur_bloc}h")
+
+    if processus > 1:
+        contexte = multiprocessing.get_context("spawn")
+        with contexte.Pool(
+            processes=min(processus, len(taches)),
+            initializer=scenarios.restaurer_config,
+            initargs=(scenarios.capturer_config(),),
+        ) as pool:
+            resultats = pool.map(
+                _dispatch_processus,
+                taches,
+                chunksize=max(1, len(taches) // (4 * processus)),
+            )
+    else:
+        modeles = {}
+        resultats = [_resoudre_bloc(modeles, *tache) for tache in taches]
+
+    statuts = [r["statut"] for r in resultats]
+    echecs = [b for b, r in enumerate(resultats) if "fn_obj" not in r]
+    if echecs:
+        _print(f"Blocs sans solution optimale : {echecs}")
+    longueurs = [len(bloc[3][Cons[0]]) for bloc in blocs]
+
+    def _concatener(nom, forme):
+        return np.concatenate(
+            [
+                r[nom] if "fn_obj" in r else np.full(forme + (n,), np.nan)
+                for r, n in zip(resultats, longueurs)
+            ],
+            axis=-1,
+        )
+
+    def _somme(nom, acteurs):
+        return {
+            a: sum(r[nom][a] if "fn_obj" in r else np.nan for r in resultats)
+            for a in acteurs
+        }
+
+    fn_obj = _somme("fn_obj", Prod)
+    paye = _somme("paye", Cons)
+    for c in Cons:
+        demande = sum(donnees[3][c])
+        fn_obj[c] = paye[c] / demande if demande > 0 else 0
+    return {
+        "fn_obj": fn_obj,
+        "Impact_prod": _somme("Impact_prod", Prod),
+        "statuts": statuts,
+        "temps": np.array([r["temps"] for r in resultats]),
+        "Q_H2_prod": _concatener("Q_H2_prod", (len(Prod),)),
+        "Q_H2_stock": _concatener("Q_H2_stock", (len(P_electrolyseur),)),
+        "Q_H2_vendu": _concatener("Q_H2_vendu", (len(Prod), len(Cons))),
+        "Q_energie": _concatener("Q_energie", (len(Prod), len(Energie))),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Exploitation à tailles fixées, par blocs résolus en parallèle."
+    )
+    parser.add_argument(
+        "--tailles",
+        required=True,
+        help="Fichier json des tailles {nom: {producteur: valeur}} (voir modelisation.TAILLES).",
+    )
+    parser.add_argument("--fichier", default=config.fichier_donnees)
+    parser.add_argument("--debut", type=int, default=config.debut_data)
+    parser.add_argument("--horizon", type=int, default=config.Time_horizon)
+    parser.add_argument("--bloc", type=int, default=24)
+    parser.add_argument("--processus", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(args.tailles, "r") as file:
+        tailles = json.load(file)
+    donnees = utils.read_data(args.fichier, args.horizon, debut_data=args.debut)
+    start_time = time.time()
+    resultat = dispatch(
+        tailles,
+        donnees,
+        longueur_bloc=args.bloc,
+        processus=args.processus,
+        display=True,
+    )
+    for a, valeur in resultat["fn_obj"].items():
+        print(f"{a:<30} {valeur:>14.2f}")
+    print(f"{'CO2':<30} {sum(resultat['Impact_prod'].values()):>14.2f}")
+    print(f"Dispatch en {time.time() - start_time:.2f}s")
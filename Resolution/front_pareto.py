@@ -0,0 +1,442 @@
+import argparse
+import itertools
+import math
+import multiprocessing
+import os
+import time
+from typing import Any
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.opt import TerminationCondition
+import config as config
+from Donnees.data import Acteurs
+import Definition.modelisation as modelisation
+import Resolution.optim_individuelle as optim_indiv
+import Resolution.solveur as solveur
+import Utils.scenarios as scenarios
+
+# Génération du front de Pareto par la méthode epsilon-contrainte (AUGMECON2).
+#
+# Un objectif principal est minimisé pendant que les autres objectifs (acteurs ou impact
+# CO2 total "CO2") sont contraints par epsilon : f_n + ecart_n = epsilon_n. Les epsilon
+# parcourent une grille entre le nadir et l'utopie de la table des gains. Le terme
+# - DELTA * sum(ecart_n / étendue_n) de l'objectif garantit que chaque point est efficace.
+#
+# La grille est parcourue par lignes : les epsilon des objectifs extérieurs sont fixés et
+# celui du premier objectif contraint (intérieur) est resserré pas à pas en partant de la
+# solution précédente (warmstart). Si l'écart de l'objectif intérieur dépasse k pas, les
+# k points suivants donnent la même solution et sont sautés ; dès qu'un point est
+# infaisable, les suivants (plus contraints) le sont aussi et la ligne s'arrête.
+# Les lignes sont réparties entre plusieurs processus qui construisent chacun leur modèle.
+#
+# Utilisation :
+#   python -m Resolution.front_pareto --principal P3_SMR \
+#       --contraintes "P1_electrolyse(avec PV)" CO2 --intervalles 10 --processus 4
+
+# Nom de l'objectif impact CO2 total (somme de Impact_prod) - en kgCO2
+CO2 = "CO2"
+
+# Poids des écarts dans l'objectif (AUGMECON2)
+DELTA = 1e-3
+
+
+def expression_objectif(model: pyo.ConcreteModel, nom: str):
+    """
+    Expression Pyomo d'un objectif : fonction objective d'un acteur ou impact CO2 total.
+    """
+    if nom == CO2:
+        return sum(model.Impact_prod.values())
+    return model.fn_obj[nom]
+
+
+def valeurs_objectifs(model: pyo.ConcreteModel) -> dict[str, float]:
+    """
+    Valeurs de tous les objectifs (acteurs et CO2) de la solution chargée dans le modèle.
+    """
+    valeurs = {a: pyo.value(model.fn_obj[a]) for a in Acteurs}
+    valeurs[CO2] = pyo.value(expression_objectif(model, CO2))
+    return valeurs
+
+
+def bornes_objectifs(
+    model: pyo.ConcreteModel,
+    noms: list[str],
+    utopia: dict[str, float],
+    nadir: dict[str, float],
+    solver=None,
+) -> dict[str, tuple[float, float]]:
+    """
+    Bornes (utopie, nadir) de chaque objectif du front.
+
+    Les bornes des acteurs sont celles de la table des gains. Celles de l'impact CO2 sont
+    calculées : minimum de l'impact, et pire impact lorsque chaque acteur est priorisé.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo, sans objectif.
+        noms (list[str]):
+            Objectifs du front (acteurs et éventuellement CO2).
+        utopia (dict[str, float]):
+            Valeurs optimales (utopiques) par acteur.
+        nadir (dict[str, float]):
+            Valeurs nadir par acteur.
+        solver (optional):
+            Solveur à utiliser. Defaults to None.
+
+    Returns:
+        dict[str, tuple[float, float]]:
+            Les bornes (utopie, nadir) de chaque objectif.
+    """
+    bornes = {a: (utopia[a], nadir[a]) for a in noms if a != CO2}
+    if CO2 not in noms:
+        return bornes
+
+    charger = [model.Impact_prod]
+    model.objective = pyo.Objective(
+        expr=expression_objectif(model, CO2), sense=pyo.minimize
+    )
+    solveur.resoudre(model, solver=solver, charger=charger)
+    minimum = pire = pyo.value(expression_objectif(model, CO2))
+    del model.objective
+    for a in bornes:
+        model.objective = pyo.Objective(expr=model.fn_obj[a], sense=pyo.minimize)
+        solveur.resoudre(model, solver=solver, charger=charger)
+        pire = max(pire, pyo.value(expression_objectif(model, CO2)))
+        del model.objective
+    bornes[CO2] = (minimum, pire)
+    return bornes
+
+
+def grille_epsilon(
+    bornes: dict[str, tuple[float, float]], contraintes: list[str], intervalles: int
+) -> dict[str, np.ndarray]:
+    """
+    Valeurs de epsilon de chaque objectif contraint, du nadir vers l'utopie.
+
+    Un objectif dont l'utopie et le nadir sont égaux n'a qu'une valeur.
+    """
+    grille = {}
+    for n in contraintes:
+        utopie, nadir = bornes[n]
+        if nadir - utopie <= 1e-9 * max(1, abs(nadir)):
+            grille[n] = np.array([nadir])
+        else:
+            grille[n] = np.linspace(nadir, utopie, intervalles + 1)
+    return grille
+
+
+def ajouter_epsilon(
+    model: pyo.ConcreteModel,
+    principal: str,
+    contraintes: list[str],
+    bornes: dict[str, tuple[float, float]],
+) -> None:
+    """
+    Ajoute au modèle les contraintes epsilon (epsilon mutables) et l'objectif AUGMECON2.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+        principal (str):
+            Objectif minimisé.
+        contraintes (list[str]):
+            Objectifs contraints par epsilon.
+        bornes (dict[str, tuple[float, float]]):
+            Bornes (utopie, nadir) de chaque objectif contraint.
+    """
+    model.epsilon = pyo.Param(
+        contraintes, mutable=True, initialize={n: bornes[n][1] for n in contraintes}
+    )
+    model.ecart_epsilon = pyo.Var(contraintes, within=pyo.NonNegativeReals)
+
+    def C_epsilon_rule(m, n):
+        return expression_objectif(m, n) + m.ecart_epsilon[n] == m.epsilon[n]
+
+    model.C_epsilon = pyo.Constraint(contraintes, rule=C_epsilon_rule)
+
+    # Écarts normalisés par l'étendue de chaque objectif, pondérés par ordre d'importance
+    etendues = {n: bornes[n][1] - bornes[n][0] for n in contraintes}
+    model.objectif = pyo.Objective(
+        expr=expression_objectif(model, principal)
+        - DELTA
+        * sum(
+            10 ** (-i) * model.ecart_epsilon[n] / etendues[n]
+            for i, n in enumerate(contraintes)
+            if etendues[n] > 0
+        ),
+        sense=pyo.minimize,
+    )
+
+
+def parcourir_ligne(
+    model: pyo.ConcreteModel,
+    grille: dict[str, np.ndarray],
+    contraintes: list[str],
+    exterieurs: tuple[int, ...],
+    solver,
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Résout une ligne de la grille : les epsilon des objectifs extérieurs sont fixés et
+    celui de l'objectif intérieur (contraintes[0]) est resserré avec sauts AUGMECON2.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle avec les contraintes epsilon (voir ajouter_epsilon).
+        grille (dict[str, np.ndarray]):
+            Valeurs de epsilon de chaque objectif contraint.
+        contraintes (list[str]):
+            Objectifs contraints, l'objectif intérieur en premier.
+        exterieurs (tuple[int, ...]):
+            Indices dans la grille des epsilon de contraintes[1:].
+        solver:
+            Solveur persistant.
+
+    Returns:
+        tuple[list[dict[str, Any]], int]:
+            - Les points trouvés : "indices" (dans la grille), "valeurs" (tous les
+              objectifs) et "temps" de résolution.
+            - Le nombre de sous-problèmes résolus.
+    """
+    interne = contraintes[0]
+    for n, k in zip(contraintes[1:], exterieurs):
+        model.epsilon[n] = grille[n][k]
+    valeurs_interne = grille[interne]
+    pas = (
+        abs(valeurs_interne[1] - valeurs_interne[0])
+        if len(valeurs_interne) > 1
+        else math.inf
+    )
+
+    points = []
+    resolutions = 0
+    k = 0
+    while k < len(valeurs_interne):
+        model.epsilon[interne] = valeurs_interne[k]
+        start_time = time.time()
+        results = solveur.resoudre(model, solver=solver, warmstart=True)
+        resolutions += 1
+        if results.solver.termination_condition != TerminationCondition.optimal:
+            # Les epsilon suivants sont plus contraignants : infaisables aussi
+            break
+        points.append(
+            {
+                "indices": (k, *exterieurs),
+                "valeurs": valeurs_objectifs(model),
+                "temps": time.time() - start_time,
+            }
+        )
+        # Saut : les points dont l'epsilon reste au-dessus de la valeur atteinte
+        # donnent la même solution
+        k += math.floor(pyo.value(model.ecart_epsilon[interne]) / pas + 1e-9) + 1
+    return points, resolutions
+
+
+# Modèle et solveur construits une fois par processus
+_model_processus = None
+_solver_processus = None
+
+
+def _front_processus(args: tuple) -> tuple[list[dict[str, Any]], int]:
+    global _model_processus, _solver_processus
+    lignes, principal, contraintes, bornes, grille = args
+    if _model_processus is None:
+        _model_processus = modelisation.init_model(
+            emission_CO2_heure=config.emission_CO2_heure, optim_prix=config.optim_prix
+        )
+        ajouter_epsilon(_model_processus, principal, contraintes, bornes)
+        _solver_processus = solveur.creer_solveur(persistant=True)
+    points, resolutions = [], 0
+    for exterieurs in lignes:
+        p, r = parcourir_ligne(
+            _model_processus, grille, contraintes, exterieurs, _solver_processus
+        )
+        points += p
+        resolutions += r
+    return points, resolutions
+
+
+def non_domines(F: np.ndarray) -> np.ndarray:
+    """
+    Masque des points non dominés (minimisation de chaque colonne de F).
+    """
+    inferieur = np.all(F[:, None, :] <= F[None, :, :], axis=2)
+    strict = np.any(F[:, None, :] < F[None, :, :], axis=2)
+    # domine[j, i] : le point j domine le point i
+    domine = inferieur & strict
+    return ~domine.any(axis=0)
+
+
+def front_pareto(
+    model: pyo.ConcreteModel,
+    principal: str,
+    contraintes: list[str],
+    utopia: dict[str, float],
+    nadir: dict[str, float],
+    intervalles: int = 10,
+    processus: int = 1,
+    solver=None,
+    display: bool = False,
+) -> dict[str, np.ndarray]:
+    """
+    Génère le front de Pareto entre l'objectif principal et les objectifs contraints.
+
+    Les processus utilisent les options courantes de config.py et construisent chacun
+    leur modèle. Si processus vaut 1, le modèle donné est utilisé puis réinitialisé.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo construit avec init_model.
+        principal (str):
+            Objectif minimisé : un acteur ou CO2.
+        contraintes (list[str]):
+            Objectifs contraints par epsilon (acteurs ou CO2), l'objectif intérieur
+            (sauts AUGMECON2) en premier.
+        utopia (dict[str, float]):
+            Valeurs optimales (utopiques) par acteur.
+        nadir (dict[str, float]):
+            Valeurs nadir par acteur.
+        intervalles (int, optional):
+            Nombre d'intervalles de la grille de chaque objectif contraint. Defaults to 10.
+        processus (int, optional):
+            Nombre de processus. Defaults to 1.
+        solver (optional):
+            Solveur utilisé si processus vaut 1. Si None, un solveur persistant est créé.
+            Defaults to None.
+        display (bool, optional):
+            Si True, affiche l'avancement. Defaults to False.
+
+    Raises:
+        ValueError: Si un objectif est inconnu ou répété.
+
+    Returns:
+        dict[str, np.ndarray]:
+            Tableaux du front :
+            - "colonnes" : noms des colonnes de "valeurs" (acteurs puis CO2),
+            - "objectifs" : objectif principal puis objectifs contraints,
+            - "valeurs" : valeurs de tous les objectifs de chaque point,
+            - "epsilon" : epsilon des objectifs contraints de chaque point,
+            - "non_domine" : masque des points non dominés sur les objectifs du front,
+            - "temps" : temps de résolution de chaque point,
+            - "resolutions" : nombre de sous-problèmes résolus.
+    """
+
+    def _print(texte: str) -> None:
+        if display:
+            print(texte)
+
+    objectifs = [principal] + contraintes
+    inconnus = set(objectifs) - set(Acteurs) - {CO2}
+    if inconnus or len(set(objectifs)) != len(objectifs) or not contraintes:
+        raise ValueError(
+            f"Objectifs invalides : {objectifs} (choix : {Acteurs + [CO2]})."
+        )
+    if solver is None:
+        solver = solveur.creer_solveur(persistant=True)
+
+    modelisation.reinitialiser_model(model)
+    bornes = bornes_objectifs(model, objectifs, utopia, nadir, solver)
+    grille = grille_epsilon(bornes, contraintes, intervalles)
+    lignes = list(itertools.product(*(range(len(grille[n])) for n in contraintes[1:])))
+    _print(f"{len(lignes)} lignes de {len(grille[contraintes[0]])} points")
+
+    if processus > 1:
+        # Tranches contiguës : des lignes voisines donnent de bons points de départ
+        taille = -(-len(lignes) // (4 * processus))
+        taches = [
+            (lignes[i : i + taille], principal, contraintes, bornes, grille)
+            for i in range(0, len(lignes), taille)
+        ]
+        contexte = multiprocessing.get_context("spawn")
+        with contexte.Pool(
+            processes=min(processus, len(taches)),
+            initializer=scenarios.restaurer_config,
+            initargs=(scenarios.capturer_config(),),
+        ) as pool:
+            resultats = pool.map(_front_processus, taches)
+    else:
+        ajouter_epsilon(model, principal, contraintes, bornes)
+        resultats = [
+            parcourir_ligne(model, grille, contraintes, exterieurs, solver)
+            for exterieurs in lignes
+        ]
+        modelisation.reinitialiser_model(model)
+
+    points = [p for p_tranche, _ in resultats for p in p_tranche]
+    resolutions = sum(r for _, r in resultats)
+    _print(f"{len(points)} points, {resolutions} sous-problèmes résolus")
+
+    colonnes = Acteurs + [CO2]
+    valeurs = np.array(
+        [[p["valeurs"][c] for c in colonnes] for p in points], dtype=float
+    ).reshape(len(points), len(colonnes))
+    epsilon = np.array(
+        [[grille[n][i] for n, i in zip(contraintes, p["indices"])] for p in points],
+        dtype=float,
+    ).reshape(len(points), len(contraintes))
+    F = valeurs[:, [colonnes.index(n) for n in objectifs]]
+    return {
+        "colonnes": np.array(colonnes),
+        "objectifs": np.array(objectifs),
+        "valeurs": valeurs,
+        "epsilon": epsilon,
+        "non_domine": non_domines(F),
+        "temps": np.array([p["temps"] for p in points]),
+        "resolutions": np.array(resolutions),
+    }
+
+
+def enregistrer_front(front: dict[str, np.ndarray], fichier: str) -> str:
+    """
+    Enregistre les tableaux du front dans un fichier numpy (.npz).
+    """
+    dossier = os.path.dirname(fichier)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    np.savez(fichier, **front)
+    return fichier
+
+
+def lire_front(fichier: str) -> dict[str, np.ndarray]:
+    """
+    Lit un front enregistré par enregistrer_front.
+    """
+    with np.load(fichier) as contenu:
+        return {cle: contenu[cle] for cle in contenu.files}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Front de Pareto par la méthode epsilon-contrainte (AUGMECON2)."
+    )
+    parser.add_argument("--principal", required=True, help="Objectif minimisé.")
+    parser.add_argument(
+        "--contraintes",
+        nargs="+",
+        required=True,
+        help=f"Objectifs contraints (acteurs ou {CO2}), l'objectif intérieur en premier.",
+    )
+    parser.add_argument("--intervalles", type=int, default=10)
+    parser.add_argument("--processus", type=int, default=1)
+    parser.add_argument("--sortie", default="Resultats/front_pareto.npz")
+    args = parser.parse_args()
+
+    model = modelisation.init_model(
+        emission_CO2_heure=config.emission_CO2_heure, optim_prix=config.optim_prix
+    )
+    point_utopia, point_nadir, _, _ = optim_indiv.optim_individuelle(model)
+    start_time = time.time()
+    front = front_pareto(
+        model,
+        args.principal,
+        args.contraintes,
+        point_utopia,
+        point_nadir,
+        intervalles=args.intervalles,
+        processus=args.processus,
+        display=True,
+    )
+    enregistrer_front(front, args.sortie)
+    print(
+        f"{int(front['non_domine'].sum())} points non dominés écrits dans {args.sortie} "
+        f"({time.time() - start_time:.2f}s)"
+    )
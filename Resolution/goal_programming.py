@@ -1,7 +1,9 @@
 import pyomo.environ as pyo
-from Donnees.data import Prod, Acteurs, Time, Demande_totale
+from Donnees.data import Prod, Cons, Acteurs
 import Utils.plotting as plot
+import Resolution.solveur as solveur
 from pyomo.opt import TerminationCondition
+import os
 
 
 # Définition de la fonction de satisfaction:
@@ -134,6 +136,9 @@ def goal_programming(
     utopia: dict[str, float],
     nadir: dict[str, float],
     display: bool = False,
+    dossier_resultats: str | None = "Resultats",
+    chargement_complet: bool = True,
+    solver=None,
 ) -> tuple[dict[str, float], dict[str, float], float]:
     """
     Applique la méthode de Goal Programming pour maximiser la satisfaction des acteurs,
@@ -152,6 +157,16 @@ def goal_programming(
             Valeurs nadir par acteur.
         display (bool, optional):
             Si True, affiche les résultats dans la console. Defaults to False.
+        dossier_resultats (str | None, optional):
+            Dossier dans lequel enregistrer les graphiques.
+            Si None, aucun graphique n'est généré. Defaults to "Resultats".
+        chargement_complet (bool, optional):
+            Si True, toute la solution finale est chargée dans le modèle (nécessaire pour
+            les graphiques et le rapport). Sinon seuls les objectifs, satisfactions et
+            impacts CO2 sont chargés. Defaults to True.
+        solver (optional):
+            Solveur à utiliser (par exemple un solveur persistant partagé entre
+            plusieurs résolutions). Si None, un solveur est créé. Defaults to None.
 
     Returns:
         tuple[dict[str, float], dict[str, float], float]:
@@ -175,9 +190,12 @@ def goal_programming(
                 Impact carbone moyen par kg de H₂ (arrondi à 4 décimales).
         """
         total_impact_co2 = sum(
-            pyo.value(model.Impact_prod[i, t]) for i in Prod for t in Time
+            pyo.value(model.Impact_prod[i, t]) for i in Prod for t in model.Time
         )
-        return round(total_impact_co2 / Demande_totale, 4)
+        demande_totale = sum(
+            pyo.value(model.Demande_H2[c, t]) for c in Cons for t in model.Time
+        )
+        return round(total_impact_co2 / demande_totale, 4)
 
     satisfaction_function(model, lower_bound, upper_bound, utopia, nadir)
 
@@ -190,12 +208,24 @@ def goal_programming(
     _print("\n--------------------------------------------")
     _print("---Maximisation de la satisfaction totale---")
     _print("--------------------------------------------")
-    solver = pyo.SolverFactory("cplex")
-    results = solver.solve(model, tee=False)
+    if solver is None:
+        solver = solveur.creer_solveur()
+    results = solveur.resoudre(
+        model,
+        solver=solver,
+        charger=None
+        if chargement_complet
+        else [model.fn_obj, model.satisfaction, model.Impact_prod],
+        phase="goal_programming",
+    )
 
-    if results.solver.termination_condition == TerminationCondition.infeasible:
-        print("La version Goal Programming est infaisable.")
-        exit()
+    solveur.exiger_solution(results, "goal_programming", "La version Goal Programming")
+    if results.solver.termination_condition != TerminationCondition.optimal:
+        # Meilleure solution trouvée dans le budget de la phase
+        q = solveur.qualite(results)
+        _print(
+            f"Solution non prouvée optimale ({q['statut']}) : borne {q['borne']}, écart {q['ecart']}"
+        )
     _print(f"Valeur objective goal programming: {model.objectif()}")
 
     # Calcul des anciennes fonctions objectives après optimisation
@@ -210,5 +240,8 @@ def goal_programming(
         )
     _print("--------------------------------------------")
 
-    plot.sankey_flow_diag(model, filename="Resultats\\GP_sankey.png")
+    if dossier_resultats is not None:
+        plot.sankey_flow_diag(
+            model, filename=os.path.join(dossier_resultats, "GP_sankey.png")
+        )
     return f_new, {a: model.satisfaction[a].value for a in Acteurs}, calcul_CO2()
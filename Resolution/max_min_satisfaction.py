@@ -1,9 +1,11 @@
 import Resolution.goal_programming as gp
 import pyomo.environ as pyo
 import config as config
-from Donnees.data import Prod, Time, Demande_totale, Cons, Acteurs
+from Donnees.data import Prod, Cons, Acteurs
 import Utils.plotting as plot
+import Resolution.solveur as solveur
 from pyomo.opt import TerminationCondition
+import os
 
 
 # Résolution d'un problème multi-objectif en maximisant l'insatisfaction minimum
@@ -17,6 +19,9 @@ def max_min_satisfaction(
     nadir: dict[str, float],
     display: bool = True,
     optim_prix: bool = False,
+    dossier_resultats: str | None = "Resultats",
+    chargement_complet: bool = True,
+    solver=None,
 ) -> tuple[dict[str, float], dict[str, float], float]:
     """
     Optimise le modèle selon une approche de satisfaction équitable (max-min),
@@ -37,6 +42,16 @@ def max_min_satisfaction(
             Si True, affiche les résultats dans la console. Defaults to False.
         optim_prix (bool, optional):
             True si les prix sont des variables d'optimisation. Defaults to False.
+        dossier_resultats (str | None, optional):
+            Dossier dans lequel enregistrer les graphiques.
+            Si None, aucun graphique n'est généré. Defaults to "Resultats".
+        chargement_complet (bool, optional):
+            Si True, toute la solution finale est chargée dans le modèle (nécessaire pour
+            les graphiques et le rapport). Sinon seuls les objectifs, satisfactions et
+            impacts CO2 sont chargés. Defaults to True.
+        solver (optional):
+            Solveur à utiliser (par exemple un solveur persistant partagé entre
+            plusieurs résolutions). Si None, un solveur est créé. Defaults to None.
 
     Returns:
         tuple[dict[str, float], dict[str, float], float]:
@@ -50,6 +65,14 @@ def max_min_satisfaction(
         if display:
             print(texte)
 
+    def _print_qualite(results) -> None:
+        # Meilleure solution trouvée dans le budget de la phase
+        if results.solver.termination_condition != TerminationCondition.optimal:
+            q = solveur.qualite(results)
+            _print(
+                f"Solution non prouvée optimale ({q['statut']}) : borne {q['borne']}, écart {q['ecart']}"
+            )
+
     def calcul_CO2() -> float:
         """
         Calcule l'empreinte carbone moyenne (en CO2) par kg d'hydrogène consommé,
@@ -61,9 +84,12 @@ def max_min_satisfaction(
                 Impact carbone moyen par kg d' H2 (arrondi à 4 décimales).
         """
         total_impact_co2 = sum(
-            pyo.value(model.Impact_prod[i, t]) for i in Prod for t in Time
+            pyo.value(model.Impact_prod[i, t]) for i in Prod for t in model.Time
+        )
+        demande_totale = sum(
+            pyo.value(model.Demande_H2[c, t]) for c in Cons for t in model.Time
         )
-        return round(total_impact_co2 / Demande_totale, 4)
+        return round(total_impact_co2 / demande_totale, 4)
 
     # Calcul manuel de la satisfaction après optimisation
     def calcul_satisfaction(Names: list[str]) -> dict[str, float]:
@@ -133,14 +159,17 @@ def max_min_satisfaction(
     _print("\n---------------------------------------------")
     _print("---Maximisation de la satisfaction minimum---")
     _print("---------------------------------------------")
-    solver = pyo.SolverFactory("cplex")
-    results = solver.solve(model)
+    if solver is None:
+        solver = solveur.creer_solveur()
+    # Les itérations n'utilisent que les objectifs et satisfactions :
+    # chargement partiel de la solution
+    charger = [model.fn_obj, model.satisfaction, model.z]
+    results = solveur.resoudre(model, solver=solver, charger=charger, phase="max_min")
     if hasattr(model, "linear_z"):
         del model.linear_z
 
-    if results.solver.termination_condition == TerminationCondition.infeasible:
-        print("La version Max_Min est infaisable.")
-        exit()
+    solveur.exiger_solution(results, "max_min", "La version Max_Min")
+    _print_qualite(results)
     _print(f"Valeur objective max min: {model.objectif()}\n")
 
     # Calcul des anciennes fonctions objectives après optimisation
@@ -159,6 +188,10 @@ def max_min_satisfaction(
         _print(
             f"L'acteur le moins satisfait est : {min_acteur} avec une satisfaction de {satisf_min}\n"
         )
+        if Acteurs_a_optim == [min_acteur]:
+            # Dernier acteur : sans contrainte linear_z, la maximisation de z serait
+            # non bornée et toutes les satisfactions sont déjà fixées
+            break
 
         def C_seuil_satisf_rule(m, a):
             if a in Acteurs_a_optim:
@@ -176,14 +209,25 @@ def max_min_satisfaction(
 
         model.linear_z = pyo.Constraint(Acteurs_a_optim, rule=linear_rule)
 
-        results = solver.solve(model, warmstart=True)
-        satisfaction = calcul_satisfaction(Names)
-        satisf_evolution.append([satisfaction[a] for a in Names])
+        results = solveur.resoudre(
+            model, solver=solver, warmstart=True, charger=charger, phase="max_min"
+        )
+        disponible = solveur.solution_disponible(results)
+        if disponible:
+            _print_qualite(results)
+            satisfaction = calcul_satisfaction(Names)
+            satisf_evolution.append([satisfaction[a] for a in Names])
 
         if hasattr(model, "C_seuil_satisf"):
             del model.C_seuil_satisf
         if hasattr(model, "linear_z"):
             del model.linear_z
+        if not disponible:
+            # Budget épuisé sans solution : on garde les satisfactions de l'étape précédente
+            _print(
+                f"Étape sans solution ({results.solver.termination_condition}) : arrêt des itérations\n"
+            )
+            break
 
     # Après optimisation économique, on optimise la partie environnementale
     # On fixe un taux de dégradation acceptable sur la satisfaction
@@ -198,10 +242,20 @@ def max_min_satisfaction(
 
     del model.objectif
     model.objectif = pyo.Objective(
-        expr=sum(model.Impact_prod[i, t] for i in Prod for t in Time),
+        expr=sum(model.Impact_prod[i, t] for i in Prod for t in model.Time),
         sense=pyo.minimize,
     )
-    results = solver.solve(model, warmstart=True)
+    results = solveur.resoudre(
+        model,
+        solver=solver,
+        warmstart=True,
+        charger=None
+        if chargement_complet
+        else [model.fn_obj, model.satisfaction, model.Impact_prod],
+        phase="co2",
+    )
+    solveur.exiger_solution(results, "co2", "L'optimisation CO2 du Max_Min")
+    _print_qualite(results)
     satisfaction = calcul_satisfaction(Names)
     satisf_evolution.append([satisfaction[a] for a in Names])
 
@@ -209,15 +263,16 @@ def max_min_satisfaction(
         f"Optimisation CO2\n(dégradation: {config.degradation_acceptable})"
     ]
 
-    plot.plot_data(
-        file_name="Resultats\\evolution_maxmin.png",
-        data=satisf_evolution,
-        labels_fn=iterations,
-        labels_acteurs=Names,
-        titre="Évolution de la satisfaction des acteurs",
-        titre_legende="Itérations",
-        y_axis_titre="Satisfaction",
-    )
+    if dossier_resultats is not None:
+        plot.plot_data(
+            file_name=os.path.join(dossier_resultats, "evolution_maxmin.png"),
+            data=satisf_evolution,
+            labels_fn=iterations,
+            labels_acteurs=Names,
+            titre="Évolution de la satisfaction des acteurs",
+            titre_legende="Itérations",
+            y_axis_titre="Satisfaction",
+        )
 
     for a in Names:
         f_new[a] = pyo.value(model.fn_obj[a])
@@ -230,5 +285,8 @@ def max_min_satisfaction(
 
     _print("---------------------------------------------")
 
-    plot.sankey_flow_diag(model, filename="Resultats\\max_min_sankey.png")
+    if dossier_resultats is not None:
+        plot.sankey_flow_diag(
+            model, filename=os.path.join(dossier_resultats, "max_min_sankey.png")
+        )
     return f_new, satisfaction, calcul_CO2(), Names
@@ -0,0 +1,542 @@
+import multiprocessing
+from typing import Any
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.common.collections import ComponentMap
+from pyomo.contrib.fbbt.fbbt import fbbt
+from pyomo.opt import TerminationCondition
+from pyomo.repn import generate_standard_repn
+import config as config
+import Resolution.solveur as solveur
+import Utils.scenarios as scenarios
+
+# Point nadir d'un problème linéaire multi-objectif sur l'ensemble efficace (KKT).
+#
+# Pour un problème linéaire, une solution est efficace si et seulement si elle minimise
+# une somme pondérée des objectifs avec des poids strictement positifs. La composante k
+# du point nadir est donc le maximum de f_k sur les solutions qui vérifient les
+# conditions d'optimalité (KKT) d'une somme pondérée, les poids étant des variables :
+#   - réalisabilité primale : contraintes du modèle construit,
+#   - réalisabilité duale : sum_i poids_i * c_i = A^T (mu_bas - mu_haut) + s - t,
+#   - complémentarité (big M) : chaque multiplicateur est nul ou sa contrainte est saturée.
+#
+# Le big M ne vaut qu'aux tolérances du solveur près : un binaire égal à 1e-6 laisse
+# passer un multiplicateur de M * 1e-6 (ou un écart de la même taille), et la solution
+# du MIP n'est alors pas optimale pour ses propres poids. Chaque résultat est donc :
+#   - résolu avec une tolérance d'intégrité serrée (TOLERANCE_ENTIERS),
+#   - repris par le programme linéaire KKT à binaires fixés (complémentarité exacte),
+#   - vérifié a posteriori : la somme pondérée est résolue avec les poids retournés et
+#     la valeur est rejetée si son optimum diffère de la somme pondérée au point trouvé.
+# Une valeur acceptée est atteinte sur le front de Pareto. C'est la composante du nadir
+# si M borne les multiplicateurs et les écarts d'au moins une solution maximisante,
+# sinon une borne inférieure de celle-ci ; ce n'est pas une valeur exacte garantie.
+# Le MIP est limité par le budget de la phase "nadir" (config.budgets_phases) : arrêté
+# par la limite, sa meilleure solution est reprise et vérifiée de la même façon, et ne
+# remplace la valeur de la table des gains que si elle est plus grande.
+#
+# Chaque composante est un MIP indépendant, résolu dans son propre processus et démarré
+# à partir de la solution (primale et duale) de la somme pondérée qui priorise l'acteur
+# donnant la valeur de la table des gains.
+#
+# Le modèle n'est pas transmis aux processus (ses règles ne sont pas sérialisables) :
+# sa forme standard (matrice creuse, bornes des lignes et des variables) est extraite
+# une fois puis chaque processus reconstruit le MIP à partir des tableaux.
+
+# Poids minimal de chaque objectif dans la somme pondérée (les poids somment à 1)
+POIDS_MIN = 1e-4
+
+# Tolérance de saturation d'une contrainte pour le démarrage
+TOLERANCE = 1e-7
+
+# Tolérance d'intégrité des binaires de complémentarité
+TOLERANCE_ENTIERS = 1e-9
+
+# Écart relatif maximal entre la somme pondérée au point trouvé et son optimum
+TOLERANCE_VERIFICATION = 1e-6
+
+# Nom de l'option de tolérance d'intégrité de chaque solveur (sans le préfixe appsi_)
+OPTIONS_ENTIERS = {
+    "highs": "mip_feasibility_tolerance",
+    "cplex": "mip_tolerances_integrality",
+    "gurobi": "IntFeasTol",
+    "cbc": "integerTolerance",
+}
+
+
+def forme_standard(model: pyo.ConcreteModel, objectifs: list) -> dict[str, Any]:
+    """
+    Extrait la forme standard du modèle linéaire : bas <= A x <= haut, lb <= x <= ub.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo (sans objectif actif).
+        objectifs (list):
+            Variables portant chaque objectif, par exemple [model.fn_obj[a] for a in Names].
+
+    Raises:
+        ValueError: Si le modèle contient des variables entières ou des termes non linéaires.
+
+    Returns:
+        dict[str, Any]:
+            Tableaux numpy "lignes", "colonnes", "coefs" (coefficients non nuls de A),
+            "bas", "haut" (bornes des lignes), "lb", "ub" (bornes des variables, +-inf si
+            absentes) et "objectifs" (colonne de chaque objectif).
+    """
+    indices = ComponentMap()
+    variables = []
+    lignes, colonnes, coefs, bas, haut = [], [], [], [], []
+    for contrainte in model.component_data_objects(pyo.Constraint, active=True):
+        repn = generate_standard_repn(contrainte.body, compute_values=True)
+        if not repn.is_linear():
+            raise ValueError(f"Contrainte non linéaire : {contrainte.name}.")
+        if not repn.linear_vars:
+            continue
+        r = len(bas)
+        for v, a in zip(repn.linear_vars, repn.linear_coefs):
+            if v not in indices:
+                if not v.is_continuous():
+                    raise ValueError(f"Variable entière : {v.name}.")
+                indices[v] = len(variables)
+                variables.append(v)
+            lignes.append(r)
+            colonnes.append(indices[v])
+            coefs.append(a)
+        constante = pyo.value(repn.constant)
+        lb, ub = contrainte.lb, contrainte.ub
+        bas.append(-np.inf if lb is None else lb - constante)
+        haut.append(np.inf if ub is None else ub - constante)
+
+    return {
+        "lignes": np.array(lignes, dtype=int),
+        "colonnes": np.array(colonnes, dtype=int),
+        "coefs": np.array(coefs, dtype=float),
+        "bas": np.array(bas),
+        "haut": np.array(haut),
+        "lb": np.array([-np.inf if v.lb is None else v.lb for v in variables]),
+        "ub": np.array([np.inf if v.ub is None else v.ub for v in variables]),
+        "objectifs": np.array([indices[v] for v in objectifs], dtype=int),
+    }
+
+
+def _groupes(indices: np.ndarray, taille: int) -> list[np.ndarray]:
+    # Positions des coefficients de chaque ligne (ou colonne)
+    ordre = np.argsort(indices, kind="stable")
+    bornes = np.searchsorted(indices[ordre], np.arange(taille + 1))
+    return [ordre[bornes[i] : bornes[i + 1]] for i in range(taille)]
+
+
+def _borne(valeur: float) -> float | None:
+    return None if np.isinf(valeur) else float(valeur)
+
+
+def _ou_M(ecarts: np.ndarray, M: float) -> np.ndarray:
+    # Écarts maximaux finis gardés tels quels (les réduire couperait des solutions), M sinon
+    return np.where(np.isfinite(ecarts), ecarts, M)
+
+
+def bornes_impliquees(model: pyo.ConcreteModel) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bornes des variables impliquées par les contraintes (propagation des bornes, FBBT).
+
+    Les bornes du modèle ne sont pas modifiées : elles sont rétablies après la
+    propagation.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Modèle linéaire dont les variables sont model.x (construit par model_kkt).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            Bornes inférieures et supérieures de chaque variable (+-inf si non bornée).
+    """
+    bornes = [(x.lb, x.ub) for x in model.x.values()]
+    fbbt(model, deactivate_satisfied_constraints=False)
+    lb = np.array([-np.inf if x.lb is None else x.lb for x in model.x.values()])
+    ub = np.array([np.inf if x.ub is None else x.ub for x in model.x.values()])
+    for x, (bas, haut) in zip(model.x.values(), bornes):
+        x.setlb(bas)
+        x.setub(haut)
+    return lb, ub
+
+
+def model_kkt(forme: dict[str, Any], M: float) -> pyo.ConcreteModel:
+    """
+    Construit le MIP des conditions KKT de la somme pondérée des objectifs.
+
+    Args:
+        forme (dict[str, Any]):
+            Forme standard extraite par forme_standard.
+        M (float):
+            Borne des multiplicateurs et des écarts non bornés (big M).
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle, sans objectif. Le bloc model.kkt (poids, multiplicateurs,
+            réalisabilité duale et complémentarité) peut être désactivé pour résoudre
+            la somme pondérée seule (objectif sur model.x et poids fixés).
+    """
+    lignes, colonnes, coefs = forme["lignes"], forme["colonnes"], forme["coefs"]
+    objectifs = forme["objectifs"].tolist()
+    bas, haut, lb, ub = forme["bas"], forme["haut"], forme["lb"], forme["ub"]
+    nb_lignes, nb_var = len(bas), len(lb)
+    par_ligne = _groupes(lignes, nb_lignes)
+    par_colonne = _groupes(colonnes, nb_var)
+
+    model = pyo.ConcreteModel()
+    model.x = pyo.Var(range(nb_var), bounds=lambda m, j: (_borne(lb[j]), _borne(ub[j])))
+
+    # Listes Python : plus rapides que les tableaux numpy pour construire les expressions
+    L, C, A = lignes.tolist(), colonnes.tolist(), coefs.tolist()
+
+    def ligne_rule(m, r):
+        expr = sum(A[k] * m.x[C[k]] for k in par_ligne[r])
+        if bas[r] == haut[r]:
+            return expr == float(bas[r])
+        return (_borne(bas[r]), expr, _borne(haut[r]))
+
+    model.ligne = pyo.Constraint(range(nb_lignes), rule=ligne_rule)
+
+    # Écart maximal de chaque contrainte, calculé avec les bornes impliquées par les
+    # contraintes (M si non borné) : un big M serré limite les fuites de la
+    # complémentarité aux tolérances du solveur
+    lb_i, ub_i = bornes_impliquees(model)
+    maximum = np.where(coefs > 0, ub_i[colonnes], lb_i[colonnes]) * coefs
+    minimum = np.where(coefs > 0, lb_i[colonnes], ub_i[colonnes]) * coefs
+    maximum = np.nan_to_num(np.bincount(lignes, maximum, nb_lignes), nan=np.inf)
+    minimum = np.nan_to_num(np.bincount(lignes, minimum, nb_lignes), nan=-np.inf)
+    ecart_bas = _ou_M(maximum - bas, M)
+    ecart_haut = _ou_M(haut - minimum, M)
+    ecart_lb = _ou_M(ub_i - lb, M)
+    ecart_ub = _ou_M(ub - lb_i, M)
+
+    model.kkt = pyo.Block()
+    kkt = model.kkt
+    kkt.poids = pyo.Var(range(len(objectifs)), bounds=(POIDS_MIN, 1))
+    kkt.C_poids = pyo.Constraint(expr=sum(kkt.poids.values()) == 1)
+
+    # Multiplicateurs des bornes finies (lignes puis variables)
+    L_bas = set(np.flatnonzero(np.isfinite(bas)).tolist())
+    L_haut = set(np.flatnonzero(np.isfinite(haut)).tolist())
+    V_bas = set(np.flatnonzero(np.isfinite(lb)).tolist())
+    V_haut = set(np.flatnonzero(np.isfinite(ub)).tolist())
+    kkt.mu_bas = pyo.Var(sorted(L_bas), bounds=(0, M))
+    kkt.mu_haut = pyo.Var(sorted(L_haut), bounds=(0, M))
+    kkt.s = pyo.Var(sorted(V_bas), bounds=(0, M))
+    kkt.t = pyo.Var(sorted(V_haut), bounds=(0, M))
+
+    def C_duale_rule(b, j):
+        expr = sum(
+            A[k] * b.mu_bas[L[k]] for k in par_colonne[j] if L[k] in L_bas
+        ) - sum(A[k] * b.mu_haut[L[k]] for k in par_colonne[j] if L[k] in L_haut)
+        if j in V_bas:
+            expr += b.s[j]
+        if j in V_haut:
+            expr -= b.t[j]
+        poids = sum(b.poids[i] for i, o in enumerate(objectifs) if o == j)
+        return poids == expr
+
+    kkt.C_duale = pyo.Constraint(range(nb_var), rule=C_duale_rule)
+
+    # Complémentarité : inutile si la contrainte est une égalité (écart toujours nul)
+    paires = (
+        [("mu_bas", r) for r in sorted(L_bas) if bas[r] < haut[r]]
+        + [("mu_haut", r) for r in sorted(L_haut) if bas[r] < haut[r]]
+        + [("s", j) for j in sorted(V_bas) if lb[j] < ub[j]]
+        + [("t", j) for j in sorted(V_haut) if lb[j] < ub[j]]
+    )
+    kkt.paires = pyo.Set(initialize=paires, dimen=2, ordered=True)
+    kkt.z = pyo.Var(kkt.paires, within=pyo.Binary)
+
+    def C_multiplicateur_rule(b, nom, i):
+        return getattr(b, nom)[i] <= M * b.z[nom, i]
+
+    kkt.C_multiplicateur = pyo.Constraint(kkt.paires, rule=C_multiplicateur_rule)
+
+    def C_ecart_rule(b, nom, i):
+        # Écart à la borne associée au multiplicateur, borné par sa valeur maximale
+        if nom == "mu_bas":
+            expr, maxi = model.ligne[i].body - float(bas[i]), ecart_bas[i]
+        elif nom == "mu_haut":
+            expr, maxi = float(haut[i]) - model.ligne[i].body, ecart_haut[i]
+        elif nom == "s":
+            expr, maxi = model.x[i] - float(lb[i]), ecart_lb[i]
+        else:
+            expr, maxi = float(ub[i]) - model.x[i], ecart_ub[i]
+        return expr <= float(maxi) * (1 - b.z[nom, i])
+
+    kkt.C_ecart = pyo.Constraint(kkt.paires, rule=C_ecart_rule)
+    return model
+
+
+def _somme_ponderee(
+    model: pyo.ConcreteModel, forme: dict[str, Any], poids: list[float], solver
+) -> float | None:
+    # Résout la somme pondérée seule (bloc KKT et objectif désactivés) et retourne son
+    # optimum, None si la résolution n'est pas optimale
+    objectifs = list(model.component_data_objects(pyo.Objective, active=True))
+    for objectif in objectifs:
+        objectif.deactivate()
+    model.kkt.deactivate()
+    model.somme_ponderee = pyo.Objective(
+        expr=sum(p * model.x[o] for p, o in zip(poids, forme["objectifs"])),
+        sense=pyo.minimize,
+    )
+    results = solveur.resoudre(model, solver=solver)
+    optimum = None
+    if results.solver.termination_condition == TerminationCondition.optimal:
+        optimum = pyo.value(model.somme_ponderee)
+    del model.somme_ponderee
+    model.kkt.activate()
+    for objectif in objectifs:
+        objectif.activate()
+    return optimum
+
+
+def _tolerance_entiers(solver) -> None:
+    # Tolérance d'intégrité serrée : le big M multiplie l'écart d'un binaire à 0 ou 1
+    nom = config.solveur.removeprefix("appsi_")
+    option = OPTIONS_ENTIERS.get(nom)
+    if option is None:
+        return
+    if hasattr(solver, "load_vars"):
+        # Interface appsi : options propres au solveur (highs_options, ...)
+        options = getattr(solver, f"{nom}_options", None)
+        if options is not None:
+            options[option] = TOLERANCE_ENTIERS
+    else:
+        solver.options[option] = TOLERANCE_ENTIERS
+
+
+def _multiplicateurs(model: pyo.ConcreteModel, solver) -> tuple:
+    # Duales des contraintes et coûts réduits des variables
+    if hasattr(solver, "get_duals"):
+        return solver.get_duals(), solver.get_reduced_costs()
+    return model.dual, model.rc
+
+
+def demarrage(
+    model: pyo.ConcreteModel, forme: dict[str, Any], poids: list[float], solver
+) -> bool:
+    """
+    Résout la somme pondérée des objectifs et initialise toutes les variables du MIP
+    (solution primale, multiplicateurs et binaires) à partir de sa solution.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle construit par model_kkt.
+        forme (dict[str, Any]):
+            Forme standard extraite par forme_standard.
+        poids (list[float]):
+            Poids de chaque objectif (strictement positifs, de somme 1).
+        solver:
+            Le solveur utilisé.
+
+    Returns:
+        bool:
+            True si la somme pondérée a été résolue à l'optimalité.
+    """
+    kkt = model.kkt
+    if not hasattr(solver, "get_duals"):
+        model.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+        model.rc = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+    if _somme_ponderee(model, forme, poids, solver) is None:
+        return False
+
+    duales, couts = _multiplicateurs(model, solver)
+    for i, p in enumerate(poids):
+        kkt.poids[i].set_value(p)
+    for r in kkt.mu_bas:
+        kkt.mu_bas[r].set_value(max(duales.get(model.ligne[r], 0), 0))
+    for r in kkt.mu_haut:
+        kkt.mu_haut[r].set_value(max(-duales.get(model.ligne[r], 0), 0))
+    for j in kkt.s:
+        kkt.s[j].set_value(max(couts.get(model.x[j], 0), 0))
+    for j in kkt.t:
+        kkt.t[j].set_value(max(-couts.get(model.x[j], 0), 0))
+    for nom, i in kkt.paires:
+        if nom in ("mu_bas", "mu_haut"):
+            corps = pyo.value(model.ligne[i].body)
+            borne = forme["bas"][i] if nom == "mu_bas" else forme["haut"][i]
+        else:
+            corps = pyo.value(model.x[i])
+            borne = forme["lb"][i] if nom == "s" else forme["ub"][i]
+        kkt.z[nom, i].set_value(
+            int(abs(corps - borne) <= TOLERANCE * max(1, abs(borne)))
+        )
+    return True
+
+
+def maximiser_objectif(
+    forme: dict[str, Any], k: int, poids: list[float], M: float
+) -> dict[str, Any]:
+    """
+    Maximise l'objectif k sur l'ensemble efficace (composante k du point nadir).
+
+    Le MIP est résolu avec une tolérance d'intégrité serrée, puis les binaires sont
+    arrondis et fixés et le programme linéaire obtenu (complémentarité exacte) est
+    résolu à nouveau. La valeur est enfin vérifiée : la somme pondérée est résolue avec
+    les poids trouvés et la valeur est rejetée si son optimum diffère de la somme
+    pondérée au point trouvé de plus de TOLERANCE_VERIFICATION (en relatif).
+
+    Args:
+        forme (dict[str, Any]):
+            Forme standard extraite par forme_standard.
+        k (int):
+            Indice de l'objectif dans forme["objectifs"].
+        poids (list[float]):
+            Poids de la somme pondérée utilisée comme point de départ.
+        M (float):
+            Borne des multiplicateurs et des écarts non bornés (big M).
+
+    Returns:
+        dict[str, Any]:
+            "statut" (condition d'arrêt du solveur, ou cause du rejet), "valeur" (None
+            si non optimale ou rejetée), "depart" (valeur de l'objectif au point de
+            départ), "poids" (poids trouvés) et "ecart" (écart relatif de la
+            vérification), ces deux derniers à None si la vérification n'a pas eu lieu.
+    """
+    model = model_kkt(forme, M)
+    solver = solveur.creer_solveur()
+    x_k = model.x[forme["objectifs"][k]]
+    depart = None
+    if demarrage(model, forme, poids, solver):
+        depart = pyo.value(x_k)
+    resultat = {"depart": depart, "poids": None, "ecart": None}
+
+    model.objective = pyo.Objective(expr=x_k, sense=pyo.maximize)
+    _tolerance_entiers(solver)
+    results = solveur.resoudre(
+        model, solver=solver, warmstart=depart is not None, phase="nadir"
+    )
+    statut = results.solver.termination_condition
+    if not solveur.solution_disponible(results):
+        return {"statut": str(statut), "valeur": None, **resultat}
+
+    # Complémentarité exacte : binaires arrondis et fixés, programme linéaire
+    for z in model.kkt.z.values():
+        z.fix(round(z.value))
+    results = solveur.resoudre(model, solver=solver)
+    if results.solver.termination_condition != TerminationCondition.optimal:
+        return {
+            "statut": f"complémentarité ({results.solver.termination_condition})",
+            "valeur": None,
+            **resultat,
+        }
+    valeur = pyo.value(x_k)
+
+    # Vérification : le point est optimal pour ses propres poids
+    poids = [pyo.value(p) for p in model.kkt.poids.values()]
+    point = sum(p * pyo.value(model.x[o]) for p, o in zip(poids, forme["objectifs"]))
+    optimum = _somme_ponderee(model, forme, poids, solver)
+    resultat["poids"] = poids
+    if optimum is None:
+        return {"statut": "vérification non résolue", "valeur": None, **resultat}
+    resultat["ecart"] = (point - optimum) / max(1, abs(optimum))
+    if resultat["ecart"] > TOLERANCE_VERIFICATION:
+        return {"statut": "non optimal pour ses poids", "valeur": None, **resultat}
+    return {"statut": str(statut), "valeur": valeur, **resultat}
+
+
+# Forme standard partagée par les processus
+_forme_processus = None
+
+
+def _initialiser_processus(options: dict[str, Any], forme: dict[str, Any]) -> None:
+    global _forme_processus
+    scenarios.restaurer_config(options)
+    _forme_processus = forme
+
+
+def _maximiser_processus(args: tuple) -> dict[str, Any]:
+    k, poids, M = args
+    return maximiser_objectif(_forme_processus, k, poids, M)
+
+
+def nadir_exact(
+    model: pyo.ConcreteModel,
+    Names: list[str],
+    f_nadir: dict[str, float],
+    priority_results: dict[str, dict[str, float]] | None = None,
+    processus: int = 1,
+    display: bool = False,
+) -> dict[str, float]:
+    """
+    Calcule le point nadir des objectifs de Names sur l'ensemble efficace du modèle
+    construit (conditions KKT, big M).
+
+    Chaque composante est le maximum de l'objectif sur l'ensemble efficace (voir
+    maximiser_objectif) : une valeur de Pareto, égale à la composante du nadir si M
+    borne les multiplicateurs et les écarts, sinon une borne inférieure. Les
+    sous-problèmes sont indépendants et résolus dans "processus" processus. Une
+    composante sans solution ou rejetée par la vérification a posteriori garde la valeur
+    de la table des gains ; la meilleure solution d'un MIP arrêté par son budget
+    (phase "nadir") ne la remplace que si elle est plus grande.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle construit par init_model, sans objectif.
+        Names (list[str]):
+            Acteurs dont les objectifs définissent l'ensemble efficace.
+        f_nadir (dict[str, float]):
+            Point nadir de la table des gains (optimisations individuelles).
+        priority_results (dict[str, dict[str, float]] | None, optional):
+            Table des gains : l'acteur donnant la pire valeur de l'objectif k sert de
+            point de départ pour k. Defaults to None.
+        processus (int, optional):
+            Nombre de processus. Defaults to 1.
+        display (bool, optional):
+            Active l'affichage des résultats. Defaults to False.
+
+    Returns:
+        dict[str, float]:
+            Le point nadir (les acteurs hors de Names gardent la valeur de f_nadir).
+    """
+
+    # Fonction display
+    def _print(texte: str) -> None:
+        if display:
+            print(texte)
+
+    forme = forme_standard(model, [model.fn_obj[a] for a in Names])
+    M = config.nadir_exact_M
+    taches = []
+    for k, a in enumerate(Names):
+        # Somme pondérée qui priorise l'acteur donnant la pire valeur de a
+        autres = [b for b in Names if b != a]
+        if priority_results is not None:
+            priorise = max(autres, key=lambda b: priority_results[b][a])
+        else:
+            priorise = autres[0]
+        poids = [POIDS_MIN] * len(Names)
+        poids[Names.index(priorise)] = 1 - POIDS_MIN * (len(Names) - 1)
+        taches.append((k, poids, M))
+
+    if processus > 1:
+        contexte = multiprocessing.get_context("spawn")
+        with contexte.Pool(
+            processes=min(processus, len(taches)),
+            initializer=_initialiser_processus,
+            initargs=(scenarios.capturer_config(), forme),
+        ) as pool:
+            resultats = pool.map(_maximiser_processus, taches)
+    else:
+        resultats = [maximiser_objectif(forme, *tache) for tache in taches]
+
+    nadir = dict(f_nadir)
+    for a, resultat in zip(Names, resultats):
+        if resultat["valeur"] is None:
+            _print(
+                f"nad {a} : {resultat['statut']} (écart de vérification : "
+                f"{resultat['ecart']}), valeur de la table des gains"
+            )
+            continue
+        nadir[a] = resultat["valeur"]
+        if resultat["statut"] != str(TerminationCondition.optimal):
+            # MIP arrêté par la limite : la meilleure solution ne fait que minorer
+            # la composante, comme la valeur de la table des gains
+            nadir[a] = max(nadir[a], f_nadir[a])
+        _print(
+            f"nad {a} : {nadir[a]} (table des gains : {f_nadir[a]}, "
+            f"départ : {resultat['depart']})"
+        )
+    return nadir
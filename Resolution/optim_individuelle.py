@@ -1,9 +1,23 @@
 import pyomo.environ as pyo
-from Donnees.data import Demande_totale, Prod, Time, Cons, Demande_H2, Acteurs
+from Donnees.data import (
+    Prod,
+    Cons,
+    Acteurs,
+    Meilleur_prix,
+    Pire_prix,
+)
+import Resolution.solveur as solveur
+import Definition.modelisation as modelisation
+import Resolution.sensibilite as sensibilite
+import config as config
 
 
 def optim_individuelle(
-    model: pyo.ConcreteModel, display: bool = False
+    model: pyo.ConcreteModel,
+    display: bool = False,
+    solver=None,
+    prix_contrat: dict[tuple[str, str], list[tuple[float, float]]] | None = None,
+    rapports_sensibilite: dict[str, dict] | None = None,
 ) -> tuple[
     dict[str, float], dict[str, float], dict[str, float], dict[str, dict[str, float]]
 ]:
@@ -19,6 +33,19 @@ def optim_individuelle(
             Le modèle pyomo
         display (bool, optional):
             Active l'affichage des étapes de résolution. Defaults to False.
+        solver (optional):
+            Solveur à utiliser (par exemple un solveur persistant partagé entre
+            plusieurs résolutions). Si None, un solveur est créé. Defaults to None.
+        prix_contrat (dict[tuple[str, str], list[tuple[float, float]]] | None, optional):
+            Si donné (enveloppes de McCormick), complété avec les prix de contrat et coûts
+            de revient des solutions de la table des gains (modelisation.relever_prix),
+            pour modelisation.resserrer_prix.
+            Defaults to None.
+        rapports_sensibilite (dict[str, dict] | None, optional):
+            Si donné (modèle linéaire), complété avec le rapport de sensibilite.analyser
+            de l'optimisation de chaque acteur priorisé, lu dans les duales du solveur
+            qui vient de la résoudre (familles config.sensibilite_familles).
+            Defaults to None.
 
     Returns:
         tuple[ dict[str, float], dict[str, float], dict[str, float], dict[str, dict[str, float]] ]:
@@ -47,20 +74,51 @@ def optim_individuelle(
         Affiche l'impact carbone moyen par kg de H2 (arrondi à 4 décimales).
         """
         total_impact_co2 = sum(
-            pyo.value(model.Impact_prod[i, t]) for i in Prod for t in Time
+            pyo.value(model.Impact_prod[i, t]) for i in Prod for t in model.Time
+        )
+        demande_totale = sum(
+            pyo.value(model.Demande_H2[c, t]) for c in Cons for t in model.Time
         )
         _print(total_impact_co2)
         _print(
-            f"Somme totale de l'impact CO2 des producteurs : {round(total_impact_co2 / Demande_totale, 4)} kgCo2/kgH2\n"
+            f"Somme totale de l'impact CO2 des producteurs : {round(total_impact_co2 / demande_totale, 4)} kgCo2/kgH2\n"
+        )
+
+    def relever_prix() -> None:
+        # Prix de contrat de la solution chargée (enveloppes de McCormick)
+        if prix_contrat is None or not hasattr(model, "Prix_min"):
+            return
+        modelisation.relever_prix(
+            prix_contrat,
+            {k: pyo.value(model.P_H2_contrat[k]) for k in model.P_H2_contrat},
+            {
+                (i, j): sum(pyo.value(model.Q_H2_vendu[i, j, t]) for t in model.Time)
+                for i, j in model.P_H2_contrat
+            },
+            {
+                i: pyo.value(model.fn_obj[i])
+                + sum(
+                    pyo.value(model.P_H2_vendu[i, j, t])
+                    for j in Cons
+                    for t in model.Time
+                )
+                for i in Prod
+            },
         )
 
     _print("Objectifs sans priorité :")
     expr = sum(model.fn_obj[a] for a in Prod) + sum(
-        model.fn_obj[a] * sum(Demande_H2[a][t] for t in Time) for a in Cons
+        model.fn_obj[a] * sum(model.Demande_H2[a, t] for t in model.Time) for a in Cons
     )
     model.objective = pyo.Objective(expr=expr, sense=pyo.minimize)
-    solver = pyo.SolverFactory("cplex")
-    solver.solve(model, tee=False)
+    if solver is None:
+        solver = solveur.creer_solveur()
+    # Seuls les objectifs et l'impact CO2 sont utilisés : chargement partiel de la solution
+    charger = [model.fn_obj, model.Impact_prod]
+    resultat = solveur.resoudre(
+        model, solver=solver, charger=charger, phase="table_gains"
+    )
+    solveur.exiger_solution(resultat, "table_gains", "L'optimisation sans priorité")
 
     results = {}
     # Point idéal/utopia
@@ -75,6 +133,7 @@ def optim_individuelle(
         _print(f"Objectif {a}: {results[a]}")
         point_utopia[a] = point_worst[a] = point_nadir[a] = results[a]
     calcul_CO2()
+    relever_prix()
     del model.objective
 
     # Calcul du point idéal
@@ -82,9 +141,18 @@ def optim_individuelle(
     for a in Acteurs:
         _print(f"Objectifs en priorisant {a} :")
         model.objective = pyo.Objective(expr=model.fn_obj[a], sense=pyo.minimize)
-        solver.solve(model, tee=False)
+        resultat = solveur.resoudre(
+            model, solver=solver, charger=charger, phase="table_gains"
+        )
+        solveur.exiger_solution(
+            resultat, "table_gains", f"L'optimisation en priorisant {a}"
+        )
 
         point_utopia[a] = pyo.value(model.fn_obj[a])
+        if rapports_sensibilite is not None:
+            rapports_sensibilite[a] = sensibilite.analyser(
+                model, config.sensibilite_familles, importer=False, solver=solver
+            )
 
         results = {}
         for b in Acteurs:
@@ -93,16 +161,50 @@ def optim_individuelle(
             _print(f"Objectif {b}: {results[b]}")
         priority_results[a] = results
         calcul_CO2()
+        relever_prix()
         del model.objective
 
     # Calcul du pire point
     # NB: Peut être enlever pour résultat + rapides
     for a in Acteurs:
         model.objective = pyo.Objective(expr=model.fn_obj[a], sense=pyo.maximize)
-        solver.solve(model, tee=False)
+        resultat = solveur.resoudre(
+            model, solver=solver, charger=charger, phase="table_gains"
+        )
+        solveur.exiger_solution(
+            resultat, "table_gains", f"La maximisation de l'objectif de {a}"
+        )
         point_worst[a] = pyo.value(model.fn_obj[a])
         del model.objective
 
         # point_worst[a] = 0
 
     return point_utopia, point_nadir, point_worst, priority_results
+
+
+def bornes_satisfaction(
+    point_utopia: dict[str, float],
+) -> tuple[dict[str, float], dict[str, float]]:
+    """
+    Définit les objectifs de chaque acteur à partir du point utopique.
+
+    Args:
+        point_utopia (dict[str, float]):
+            Meilleure valeur atteignable pour chaque acteur.
+
+    Returns:
+        tuple[dict[str, float], dict[str, float]]:
+            - lower_bound: valeur à laquelle chaque acteur aspire.
+            - upper_bound: valeur maximale que chaque acteur est prêt à accepter.
+    """
+    lower_bound = {}
+    upper_bound = {}
+    for a in Prod:
+        lower_bound[a] = point_utopia[a]
+        # Le producteur n'accepte pas de vendre à perte => Peut être le point nadir selon modification
+        upper_bound[a] = 0
+    for a in Cons:
+        # Le consommateur a des attentes sur le prix d'achat
+        lower_bound[a] = Meilleur_prix[a]
+        upper_bound[a] = Pire_prix[a]
+    return lower_bound, upper_bound
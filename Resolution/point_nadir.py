@@ -2,6 +2,9 @@ from Donnees.data import (
     Prod,
     Acteurs,
     Cons,
+    Energie,
+    Electricite,
+    Energies_autorisees,
     Prix_vente_H2,
     P_electrolyseur,
     Rendement_vaporeformage,
@@ -9,16 +12,23 @@ from Donnees.data import (
     CAPEX_t_captage,
     P_SMR,
     Time_horizon,
-    Time,
     Demande_H2,
     CAPEX_t_electrolyseur,
     Prix_energie,
     Production_elec,
+    Impact_elec,
     Rendement_electrolyseur,
+    Taille_max_electrolyseur,
+    Taille_max_captage,
+    Taille_vaporeformeur,
+    Impact_max,
 )
 import config as config
+import Resolution.nadir_exact as nadir_exact
+import multiprocessing
 import numpy as np
-from pymoo.core.problem import ElementwiseProblem
+from pymoo.core.problem import Problem
+from pymoo.core.repair import Repair
 from pymoo.algorithms.moo.nsga2 import NSGA2
 from pymoo.operators.crossover.sbx import SBX
 from pymoo.operators.mutation.pm import PM
@@ -26,8 +36,291 @@ from pymoo.operators.sampling.rnd import FloatRandomSampling
 from pymoo.termination.default import DefaultMultiObjectiveTermination
 from pymoo.optimize import minimize
 
+# Simplified model used by NSGA-II to estimate the nadir point.
+#
+# The decision variables are the flows sold by every producer but one to every consumer
+# at every hour. The remaining producer (the last SMR, which has no capacity limit in
+# practice) completes the demand. Storage is not used and each producer buys its energy
+# from the cheapest allowed sources first, so every individual maps to a feasible point
+# of the Pyomo model (with empty storage) and its objectives are the fn_obj values of
+# that point (sale prices fixed to Prix_vente_H2).
 
-def point_nadir(f_nadir: dict[str, float]) -> dict[str, float]:
+
+def donnees_probleme(emission_CO2_heure: bool = True) -> dict:
+    """
+    Gather the data of the simplified model as NumPy arrays.
+
+    Args:
+        emission_CO2_heure (bool, optional):
+            If True, the CO2 limit is hourly, otherwise on the whole horizon.
+            Defaults to True.
+
+    Returns:
+        dict:
+            Arrays indexed by [producer], [consumer], [energy] and [time] in the order
+            of Prod, Cons and Energie.
+    """
+    T = Time_horizon
+    # Producteur complétant la demande : le dernier SMR, sinon le dernier producteur
+    complement = Prod.index(P_SMR[-1]) if P_SMR else len(Prod) - 1
+    disponible = np.array(
+        [
+            Production_elec[e] if e in Electricite else np.full(T, np.inf)
+            for e in Energie
+        ],
+        dtype=float,
+    )
+    impact = np.array(
+        [Impact_elec[e] if e in Electricite else np.zeros(T) for e in Energie],
+        dtype=float,
+    )
+    return {
+        "T": T,
+        "complement": complement,
+        "libres": [p for p in range(len(Prod)) if p != complement],
+        "electrolyse": np.array([p in P_electrolyseur for p in Prod]),
+        "demande": np.array([Demande_H2[c] for c in Cons], dtype=float),
+        "prix_vente": np.array(
+            [[Prix_vente_H2[p][c] for c in Cons] for p in Prod], dtype=float
+        ),
+        "rendement": np.array(
+            [
+                Rendement_electrolyseur[p]
+                if p in P_electrolyseur
+                else Rendement_vaporeformage[p]
+                for p in Prod
+            ],
+            dtype=float,
+        ),
+        # Sources autorisées de chaque producteur (indices dans Energie)
+        "sources": [[Energie.index(e) for e in Energies_autorisees[p]] for p in Prod],
+        "prix_energie": np.array([Prix_energie[e] for e in Energie], dtype=float),
+        "disponible": disponible,
+        "impact_energie": impact,
+        "electricite": [Energie.index(e) for e in Electricite],
+        "taille_max": np.array(
+            [
+                Taille_max_electrolyseur[p]
+                if p in P_electrolyseur
+                else Taille_vaporeformeur[p]
+                for p in Prod
+            ],
+            dtype=float,
+        ),
+        "taille_max_captage": np.array(
+            [Taille_max_captage.get(p, 0) for p in Prod], dtype=float
+        ),
+        "capex_t": np.array(
+            [
+                CAPEX_t_electrolyseur[p] if p in P_electrolyseur else CAPEX_t_captage[p]
+                for p in Prod
+            ],
+            dtype=float,
+        ),
+        "impact_vaporeformage": np.array(
+            [Impact_vaporeformage.get(p, 0) for p in Prod], dtype=float
+        ),
+        "impact_max": np.array([Impact_max[p] for p in Prod], dtype=float),
+        "emission_CO2_heure": emission_CO2_heure,
+    }
+
+
+def _achat_energie(
+    energie: np.ndarray, donnees: dict, p: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Achat de l'énergie du producteur p aux sources autorisées les moins chères d'abord
+    # energie : (N, T) en MWh
+    sources = donnees["sources"][p]
+    prix = donnees["prix_energie"][sources]
+    disponible = donnees["disponible"][sources]
+    impact = donnees["impact_energie"][sources]
+    ordre = np.argsort(prix, axis=0, kind="stable")
+    prix = np.take_along_axis(prix, ordre, axis=0)
+    disponible_trie = np.take_along_axis(disponible, ordre, axis=0)
+    impact = np.take_along_axis(impact, ordre, axis=0)
+    # Énergie disponible aux sources moins chères (somme exclusive)
+    avant = np.zeros_like(disponible_trie)
+    avant[1:] = np.cumsum(disponible_trie[:-1], axis=0)
+    achat = np.clip(energie[:, None, :] - avant[None], 0, disponible_trie[None])
+    cout = np.sum(achat * prix[None], axis=(1, 2))
+    impact_t = np.sum(achat * impact[None], axis=1)
+    # Quantité achetée par source autorisée, dans l'ordre de `sources`
+    achat = np.take_along_axis(achat, np.argsort(ordre, axis=0)[None], axis=1)
+    return cout, impact_t, achat
+
+
+def _taille_captage_globale(emission: np.ndarray, besoin: np.ndarray) -> np.ndarray:
+    # Plus petite taille s telle que sum_t min(s, emission[t]) >= besoin (dichotomie)
+    bas = np.zeros(len(besoin))
+    haut = emission.max(axis=1)
+    for _ in range(50):
+        milieu = (bas + haut) / 2
+        capte = np.minimum(milieu[:, None], emission).sum(axis=1)
+        suffisant = capte >= besoin
+        haut = np.where(suffisant, milieu, haut)
+        bas = np.where(suffisant, bas, milieu)
+    return haut
+
+
+def evaluer(X: np.ndarray, donnees: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate a whole population of the simplified model.
+
+    Args:
+        X (np.ndarray):
+            Population of shape (N, (len(Prod) - 1) * len(Cons) * T): flows sold by
+            every producer but the complement one.
+        donnees (dict):
+            Data built by donnees_probleme.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            - F of shape (N, len(Acteurs)): objective of every actor (fn_obj),
+            - G of shape (N, n_ieq_constr): inequality constraints (feasible if <= 0).
+    """
+    N = X.shape[0]
+    T = donnees["T"]
+    demande = donnees["demande"]
+    nb_prod = len(donnees["rendement"])
+    nb_cons = demande.shape[0]
+
+    flux = np.empty((N, nb_prod, nb_cons, T))
+    flux[:, donnees["libres"]] = np.round(X.reshape(N, nb_prod - 1, nb_cons, T), 2)
+    flux[:, donnees["complement"]] = demande[None] - flux[:, donnees["libres"]].sum(
+        axis=1
+    )
+
+    q_H2 = flux.sum(axis=2)  # (N, P, T) en kgH2
+    energie = q_H2 / donnees["rendement"][None, :, None]  # en MWh
+    recettes = np.einsum("npct,pc->np", flux, donnees["prix_vente"])
+
+    F = np.empty((N, nb_prod + nb_cons))
+    G = [-flux[:, donnees["complement"]].reshape(N, -1)]
+    achat_total = np.zeros((N, len(donnees["prix_energie"]), T))
+    for p in range(nb_prod):
+        cout, impact_t, achat = _achat_energie(energie[:, p], donnees, p)
+        sources = donnees["sources"][p]
+        achat_total[:, sources] += achat
+        # Toute l'énergie nécessaire est disponible (si les sources sont limitées)
+        disponible = donnees["disponible"][sources].sum(axis=0)
+        if np.isfinite(disponible).all():
+            G.append(energie[:, p] - disponible[None])
+        taille = energie[:, p].max(axis=1)
+        G.append((taille - donnees["taille_max"][p])[:, None])
+
+        if donnees["electrolyse"][p]:
+            capex = taille * donnees["capex_t"][p] * T
+            limite = donnees["impact_max"][p] * q_H2[:, p]
+            if donnees["emission_CO2_heure"]:
+                G.append(impact_t - limite)
+            else:
+                G.append((impact_t.sum(axis=1) - limite.sum(axis=1))[:, None])
+        else:
+            # Émissions de vaporeformage à capter pour respecter Impact_max
+            emission = q_H2[:, p] * donnees["impact_vaporeformage"][p]
+            limite = donnees["impact_max"][p] * q_H2[:, p]
+            if donnees["emission_CO2_heure"]:
+                taille_captage = np.maximum(emission - limite, 0).max(axis=1)
+            else:
+                besoin = np.maximum(emission.sum(axis=1) - limite.sum(axis=1), 0)
+                taille_captage = _taille_captage_globale(emission, besoin)
+            G.append((taille_captage - donnees["taille_max_captage"][p])[:, None])
+            capex = taille_captage * donnees["capex_t"][p] * T
+        F[:, p] = cout + capex - recettes[:, p]
+
+    # L'électricité est partagée entre les producteurs
+    for e in donnees["electricite"]:
+        G.append(achat_total[:, e] - donnees["disponible"][e][None])
+
+    # Consommateurs : prix moyen payé par kgH2
+    depenses = np.einsum("npct,pc->nc", flux, donnees["prix_vente"])
+    demande_totale = demande.sum(axis=1)
+    F[:, nb_prod:] = np.where(
+        demande_totale[None] > 0, depenses / np.maximum(demande_totale, 1e-12)[None], 0
+    )
+    return F, np.concatenate(G, axis=1)
+
+
+# Données des processus d'évaluation parallèle
+_donnees_processus = None
+
+
+def _initialiser_processus(donnees: dict) -> None:
+    global _donnees_processus
+    _donnees_processus = donnees
+
+
+def _evaluer_processus(X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return evaluer(X, _donnees_processus)
+
+
+class ProblemeNadir(Problem):
+    """
+    Batched pymoo problem of the simplified model: the whole population is evaluated
+    at once with NumPy, optionally split between the processes of a pool.
+
+    Args:
+        donnees (dict):
+            Data built by donnees_probleme.
+        objectifs (list[int]):
+            Indices (in Acteurs) of the objectives kept.
+        pool (multiprocessing.pool.Pool | None, optional):
+            Pool initialised with _initialiser_processus. Defaults to None.
+        processus (int, optional):
+            Number of population slices evaluated in parallel. Defaults to 1.
+    """
+
+    def __init__(self, donnees: dict, objectifs: list[int], pool=None, processus=1):
+        self.donnees = donnees
+        self.objectifs = objectifs
+        self.pool = pool
+        self.processus = processus
+        nb_var = len(donnees["libres"]) * donnees["demande"].size
+        _, G = evaluer(np.zeros((1, nb_var)), donnees)
+        super().__init__(
+            n_var=nb_var,
+            n_obj=len(objectifs),
+            n_ieq_constr=G.shape[1],
+            xl=np.zeros(nb_var),
+            xu=np.tile(donnees["demande"].ravel(), len(donnees["libres"])),
+        )
+
+    def _evaluate(self, x, out, *args, **kwargs):
+        if self.pool is None or self.processus <= 1 or len(x) < 2 * self.processus:
+            F, G = evaluer(x, self.donnees)
+        else:
+            resultats = self.pool.map(
+                _evaluer_processus, np.array_split(x, self.processus)
+            )
+            F = np.concatenate([r[0] for r in resultats])
+            G = np.concatenate([r[1] for r in resultats])
+        out["F"] = F[:, self.objectifs]
+        out["G"] = G
+
+
+class RepartitionDemande(Repair):
+    """
+    Scale down the flows of the free producers where they exceed the demand, so that the
+    complement producer never has to sell a negative quantity.
+    """
+
+    def _do(self, problem, X, **kwargs):
+        donnees = problem.donnees
+        demande = donnees["demande"]
+        flux = X.reshape(len(X), len(donnees["libres"]), *demande.shape)
+        total = flux.sum(axis=1)
+        facteur = np.where(
+            total > demande[None], demande[None] / np.maximum(total, 1e-12), 1
+        )
+        return (flux * facteur[:, None]).reshape(X.shape)
+
+
+def point_nadir(
+    f_nadir: dict[str, float],
+    display: bool = False,
+    model=None,
+    priority_results: dict[str, dict[str, float]] | None = None,
+) -> dict[str, float]:
     """
     Calculate the nadir point for a multi-objective optimization problem.
 
@@ -37,239 +330,110 @@ def point_nadir(f_nadir: dict[str, float]) -> dict[str, float]:
     For problems with two or fewer objectives, the input nadir point is returned directly
     as it is computed using sequential mono-objective optimisations.
 
-    For more than two objectives, the function sets up and solves a multi-objective
-    optimization problem using NSGA-II to estimate the nadir points.
-    NB: This part is experimental and not working properly. Therefore we return the
-    nadir point inputed.
+    For more than two objectives and if config.nadir_exact is True and the built model is
+    given, each component is maximised over the efficient set of the model by
+    Resolution.nadir_exact (one big-M KKT MIP per objective, solved in
+    config.nadir_processus processes). Each accepted value is checked a posteriori and
+    is attained on the Pareto front; it is a lower bound of the true component unless
+    config.nadir_exact_M bounds the multipliers, and a rejected component keeps its
+    input value.
+
+    Otherwise, if config.nadir_nsga2 is True, the input estimation is completed with
+    NSGA-II on the simplified model (see ProblemeNadir): each component is the larger of
+    its input value and the worst value of the objective on the final non-dominated
+    front. The population is evaluated in config.nadir_processus processes. Consumers
+    whose sale prices are all equal have a constant objective when prices are fixed and
+    keep their input value, as do all consumers with config.optim_prix (the simplified
+    model only knows the fixed prices Prix_vente_H2, not the model's contract prices).
+
+    Direction of the NSGA-II estimate: the front points are feasible in the full model
+    (empty storage, fixed prices) but only non-dominated within the simplified model.
+    The front alone can lie well inside the payoff table values (it misses the storage
+    and price decisions), so it never lowers them; a component it raises may exceed the
+    true nadir if the front point is dominated in the full model.
 
     Args:
         f_nadir (dict[str, float]):
             The estimation of the nadir point computed previously using sequential
             mono-objective optimisation.
+        display (bool, optional):
+            If True, print the NSGA-II progress. Defaults to False.
+        model (pyo.ConcreteModel | None, optional):
+            The model built by init_model, used by the KKT computation. Defaults to None.
+        priority_results (dict[str, dict[str, float]] | None, optional):
+            The payoff table, used to warm start the KKT computation. Defaults to None.
 
     Returns:
         dict[str, float]:
-            In theory: a better approximate of the nadir point using NSGA-II.
-            In practice: returns the estimation in the input.
+            The nadir point computed on the model, the input estimation completed with
+            NSGA-II, or the input estimation.
     """
+    kkt = config.nadir_exact and model is not None
     # Cas où 2 objectifs
-    if len(Acteurs) <= 2:
+    if len(Acteurs) <= 2 or not (kkt or config.nadir_nsga2):
         return f_nadir
 
-    return f_nadir
-
-    # Ne fonctionne pas correctement
-
-    if not config.optim_prix:
-        Names = Prod.copy()
-        # Si tout les prix sont les mêmes, on optimise pas le consommateur
-        for c in Cons:
-            valeurs = [sous_dico[c] for sous_dico in Prix_vente_H2.values()]
-            if len(set(valeurs)) > 1:
-                Names.append(c)
+    Names = Prod.copy()
+    # Si tout les prix sont les mêmes, on optimise pas le consommateur
+    for c in Cons:
+        valeurs = [Prix_vente_H2[p][c] for p in Prod]
+        if config.optim_prix or len(set(valeurs)) > 1:
+            Names.append(c)
+    if len(Names) <= 2:
+        return f_nadir
+    if kkt:
+        return nadir_exact.nadir_exact(
+            model,
+            Names,
+            f_nadir,
+            priority_results,
+            processus=config.nadir_processus,
+            display=display,
+        )
+    if config.optim_prix:
+        # Objectifs des consommateurs évalués aux prix fixés : pas ceux du modèle
+        Names = [a for a in Names if a not in Cons]
         if len(Names) <= 2:
             return f_nadir
-    nb_Prod = len(Prod)
-    nb_P_elec = len(P_electrolyseur)
-    nb_P_SMR = len(P_SMR)
-    nb_Cons = len(Cons)
-
-    # Cas où 3 ou + objectifs
-    class MyProblem(ElementwiseProblem):
-        def __init__(self):
-            self.nb_var = [[0 for _ in Cons] for _ in range(nb_Prod - 1)]
-
-            for p in range(nb_Prod - 1):
-                for c in range(nb_Cons):
-                    self.nb_var[p][c] = Time_horizon
-
-            self.total_vars = (nb_Prod - 1) * nb_Cons * Time_horizon
-
-            super().__init__(
-                n_var=self.total_vars,
-                # n_obj = len(Acteurs),
-                n_obj=5,
-                # n_ieq_constr = 2 * nb_Cons * Time_horizon,
-                n_ieq_constr=nb_Cons * Time_horizon,
-                xl=np.zeros(self.total_vars),
-                xu=np.array(
-                    [
-                        Demande_H2[c][t]
-                        for _ in range(nb_Prod - 1)
-                        for c in Cons
-                        for t in Time
-                    ]
-                ),
-            )
 
-        def decode(self, x):
-            """
-                Reshape and round the decision variable array for easier manipulation.
-
-            Args:
-                x (numpy array):
-                    A flat 1D array representing decision variables
-                    for production allocation over producers, consumers,
-                    and time steps.
-
-            Returns:
-                numpy array:
-                    A 3D array reshaped to dimensions
-                    (number_of_producers - 1, number_of_consumers, time_horizon),
-                    with values rounded to two decimal places.
-            """
-            x_reshaped = x.reshape((nb_Prod - 1, nb_Cons, Time_horizon))
-            x_reshaped = np.round(x_reshaped, 2)
-            return x_reshaped
-
-        def _evaluate(self, x, out, *args, **kwargs):
-            flux = self.decode(x)
-            flux_P3 = []
-
-            # Objectifs
-            # In pymoo, minimization
-            F = []
-            for p in range(nb_Prod):
-                # P_electrolyseur
-                if p < nb_P_elec:
-                    f = -np.sum(
-                        np.sum(
-                            (
-                                flux[p, c, :]
-                                * Prix_vente_H2[P_electrolyseur[p]][Cons[c]]
-                                for c in range(nb_Cons)
-                            )
-                        )
-                    )
-                    flux_max = np.max(np.sum(flux[p, :, :], axis=0))
-                    capex = CAPEX_t_electrolyseur[P_electrolyseur[p]] * Time_horizon
-                    f += flux_max * capex
-                    if Prod[p] == "P1_electrolyse(avec PV)":
-                        p_elec = (
-                            np.sum(
-                                [
-                                    np.sum(flux[p, c, t] for c in range(nb_Cons))
-                                    * min(
-                                        Prix_energie["Elec_reseau"][t],
-                                        Prix_energie["PV"][t]
-                                        if Production_elec["PV"][t] > 0
-                                        else 10_000,
-                                    )
-                                    for t in Time
-                                ]
-                            )
-                            / Rendement_electrolyseur[P_electrolyseur[p]]
-                        )
-                    else:
-                        p_elec = (
-                            np.sum(
-                                [
-                                    np.sum(flux[p, c, t] for c in range(nb_Cons))
-                                    * Prix_energie["Elec_reseau"][t]
-                                    for t in Time
-                                ]
-                            )
-                            / Rendement_electrolyseur[P_electrolyseur[p]]
-                        )
-                    f += p_elec
-                    F.append(f)
-                # P_smr => Contrainte C02 horaire
-                else:
-                    p_ = p - nb_P_elec
-                    # On fixe manuellement un acteur qui doit remplir la demande manquante
-                    # Pour augmenter la proba d'obtenir une solution
-                    if p_ + 1 == nb_P_SMR:
-                        for c in range(nb_Cons):
-                            flux_P3.append([])
-                            for t in Time:
-                                flux_P3[c].append(
-                                    max(
-                                        Demande_H2[Cons[c]][t]
-                                        - np.sum(
-                                            flux[p_var, c, t]
-                                            for p_var in range(nb_Prod)
-                                            if p_var != p
-                                        ),
-                                        0,
-                                    )
-                                )
-                    else:
-                        print("Erreur pas impplémenté pour P_SMR >=2")
-                        exit()
-                    # Profit de vente d'H2
-                    f = -sum(
-                        np.sum(flux_P3[c] * Prix_vente_H2[P_SMR[p_]][Cons[c]])
-                        for c in range(nb_Cons)
-                    )
-                    # Fixe le CAPEX du captage
-                    if config.emission_CO2_heure:
-                        flux_max = np.max(np.sum(flux_P3[:][:], axis=0))
-                        captage = max(
-                            flux_max * Impact_vaporeformage[P_SMR[p_]] - 3.5, 0
-                        )
-                        capex = CAPEX_t_captage[P_SMR[p_]] * Time_horizon
-                        f += capex * captage
-                    else:
-                        print("Error: Contrainte globale pas encore implémentée")
-                        exit()
-                    # Cout de production
-                    p_gaz = sum(
-                        np.sum(
-                            [
-                                (flux_P3[c][t] * Prix_energie["Gaz"][t])
-                                / Rendement_vaporeformage[P_SMR[p_]]
-                                for t in Time
-                            ]
-                        )
-                        for c in range(nb_Cons)
-                    )
-                    f += p_gaz
-                    F.append(f)
-            # Consommateurs
-            for c in range(nb_Cons):
-                if np.sum(Demande_H2[Cons[c]]) > 0:
-                    dem = np.sum(Demande_H2[Cons[c]])
-                    f = np.sum(
-                        np.sum(
-                            flux[p, c, :] * Prix_vente_H2[Prod[p]][Cons[c]]
-                            for p in range(nb_Prod - 1)
-                        )
-                    )
-                    f += sum(flux_P3[c] * Prix_vente_H2[P_SMR[p_]][Cons[c]])
-                    f = f / dem
-                else:
-                    f = 0
-                F.append(f)
-            # Contrainte : sum_p flux[p][c][t] == Demande_H2[c][t]
-            # vu que P3 complète: sa valeur doit être >=0
-            G = []
-            for c in range(nb_Cons):
-                for t in Time:
-                    G.append(-flux_P3[c][t])
-            out["F"] = np.array(F)
-            out["G"] = np.array(G)
-
-    # Definition de mon problème, version simplifiée du model pyomo
-    problem = MyProblem()
+    donnees = donnees_probleme(config.emission_CO2_heure)
+    objectifs = [Acteurs.index(a) for a in Names]
     algorithm = NSGA2(
         pop_size=100,
         sampling=FloatRandomSampling(),
         crossover=SBX(eta=15, prob=0.8),
         mutation=PM(eta=20, prob=0.2),
+        repair=RepartitionDemande(),
         eliminate_duplicates=True,
     )
     termination = DefaultMultiObjectiveTermination(
         xtol=1e-1, cvtol=1e-1, ftol=1e-1, period=20, n_max_gen=150, n_max_evals=100000
     )
 
-    res = minimize(
-        problem, algorithm, termination, seed=3, save_history=True, verbose=True
-    )
+    processus = config.nadir_processus
+    if processus > 1:
+        contexte = multiprocessing.get_context("spawn")
+        with contexte.Pool(
+            processes=processus,
+            initializer=_initialiser_processus,
+            initargs=(donnees,),
+        ) as pool:
+            problem = ProblemeNadir(donnees, objectifs, pool, processus)
+            res = minimize(problem, algorithm, termination, seed=3, verbose=display)
+    else:
+        problem = ProblemeNadir(donnees, objectifs)
+        res = minimize(problem, algorithm, termination, seed=3, verbose=display)
 
-    F = res.F
-    # points_nadir = []
-    for i, a in enumerate(Acteurs):
-        nad = np.max(F[:, i])
-        ideal = np.min(F[:, i])
-        print(f"nad {a} : {nad}")
-        print(f"ideal {a} : {ideal}")
+    if res.F is None:
+        # Aucune solution réalisable trouvée
+        return f_nadir
+    F = np.atleast_2d(res.F)
+    nadir = dict(f_nadir)
+    for i, a in enumerate(Names):
+        # Le front du modèle simplifié ne remplace pas la table des gains : il ne peut
+        # que relever une composante
+        nadir[a] = max(f_nadir[a], float(np.max(F[:, i])))
+        if display:
+            print(f"nad {a} : {nadir[a]} (front NSGA-II : {np.max(F[:, i])})")
+            print(f"ideal {a} : {np.min(F[:, i])}")
+    return nadir
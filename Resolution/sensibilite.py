@@ -0,0 +1,401 @@
+import json
+import math
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.repn.plugins.standard_form import LinearStandardFormCompiler
+import Definition.cache_modele as cache_modele
+import Definition.contraintes_paresseuses as contraintes_paresseuses
+from Donnees.data import Acteurs
+
+# Analyse de sensibilité d'une résolution linéaire (variables entières fixées).
+#
+# Les duales des contraintes et les coûts réduits des variables sont lus dans le solveur
+# persistant (appsi) de la résolution du pipeline elle-même. Le modèle n'est compilé en
+# forme standard et résolu à nouveau par HiGHS que pour les plages de validité (ranging,
+# config.sensibilite_plages), pour fixer des variables entières ou si le solveur ne fournit
+# pas de duales (autre interface). Les duales sont agrégées par famille de contraintes sur
+# l'horizon :
+#   - duale totale : variation de l'objectif si le second membre de chaque ligne de la
+#     famille augmente d'une unité (par exemple 1 MWh d'électricité disponible de plus à
+#     chaque heure pour C_prod_elec_max_energie) ;
+#   - duale par indice (producteur, consommateur, source d'énergie, acteur) ;
+#   - avec les plages : plage de chaque ligne active (second membre sur lequel sa duale
+#     reste valable) et décalage uniforme de toute la famille garanti par la règle des 100 %.
+# Les questions « et si » sur les données se lisent alors sur une seule résolution.
+
+# Familles de contraintes analysées par défaut
+FAMILLES = [
+    "C_prod_elec_max_energie",
+    "C_cons_1",
+    "C_prod_elec_17",
+    "C_prod_smr_11",
+    "C_seuil_satisf",
+]
+
+# Variables dont le coût réduit est donné (décisions de dimensionnement et de prix)
+VARIABLES = [
+    "Taille_electrolyseur",
+    "Taille_stockage",
+    "Taille_captage",
+    "P_H2_contrat",
+]
+
+# Duale considérée comme nulle (contrainte non active)
+TOLERANCE = 1e-9
+
+# Nombre de lignes actives détaillées par famille (plus grandes duales)
+LIGNES_DETAILLEES = 10
+
+
+def _fini(x: float) -> float | None:
+    # Valeur JSON : None pour l'infini
+    return float(x) if math.isfinite(x) else None
+
+
+def _indice(index) -> str:
+    # Premier indice d'une ligne (producteur, consommateur, source ou acteur)
+    if isinstance(index, tuple):
+        return str(index[0])
+    return str(index)
+
+
+def _decalage_uniforme(hausse: np.ndarray, baisse: np.ndarray) -> list:
+    # Règle des 100 % : un décalage d des seconds membres de toutes les lignes garde les
+    # duales valables si la somme des d / (marge de chaque ligne) ne dépasse pas 1
+    with np.errstate(divide="ignore"):
+        haut = 1 / np.sum(1 / hausse) if hausse.size else math.inf
+        bas = 1 / np.sum(1 / baisse) if baisse.size else math.inf
+    return [_fini(-bas) if bas else 0.0, _fini(haut)]
+
+
+def entieres_libres(model: pyo.ConcreteModel) -> list:
+    """
+    Variables entières non fixées du modèle (l'analyse demande un modèle linéaire).
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo.
+
+    Returns:
+        list:
+            Les variables (VarData) entières non fixées.
+    """
+    return [
+        v
+        for v in model.component_data_objects(pyo.Var)
+        if v.is_integer() and not v.fixed
+    ]
+
+
+def analyser(
+    model: pyo.ConcreteModel,
+    familles: list[str] | None = None,
+    fixer_entiers: bool = False,
+    importer: bool = True,
+    plages: bool = False,
+    solver=None,
+) -> dict:
+    """
+    Analyse de sensibilité du modèle pour son objectif actif.
+
+    Sans plages ni variables entières, les duales et coûts réduits sont lus dans le solveur
+    persistant qui vient de résoudre le modèle : aucune nouvelle résolution. Sinon, ou si
+    le solveur ne fournit pas de duales, le modèle est résolu à nouveau par HiGHS.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo, avec un seul objectif actif.
+        familles (list[str] | None, optional):
+            Contraintes à analyser. Defaults to None (FAMILLES présentes dans le modèle).
+        fixer_entiers (bool, optional):
+            Si True, les variables entières sont fixées à leur valeur courante (solution
+            chargée) le temps de l'analyse. Defaults to False.
+        importer (bool, optional):
+            Si True, les duales et coûts réduits sont importés dans les suffixes model.dual
+            et model.rc. Defaults to True.
+        plages (bool, optional):
+            Si True, plages de validité des seconds membres (ranging de HiGHS, nouvelle
+            résolution). Defaults to False.
+        solver (optional):
+            Solveur persistant (appsi) de la dernière résolution du modèle, avec la solution
+            chargée. Defaults to None (nouvelle résolution).
+
+    Returns:
+        dict:
+            "objectif" (valeur), "familles" (par famille : nombre de lignes et de lignes
+            actives, duales totale, min, max et par indice, lignes actives détaillées et,
+            avec les plages, décalage uniforme valable) et "variables" (valeur et coût
+            réduit).
+
+    Raises:
+        ValueError: Si des variables entières ne sont pas fixées.
+        RuntimeError: Si la résolution linéaire n'est pas optimale.
+    """
+    if familles is None:
+        familles = FAMILLES
+    familles = [f for f in familles if model.component(f) is not None]
+
+    entieres = entieres_libres(model)
+    if entieres and not fixer_entiers:
+        raise ValueError(
+            f"{len(entieres)} variable(s) entière(s) non fixée(s) (fixer_entiers=True)."
+        )
+    if plages or entieres or not hasattr(solver, "get_duals"):
+        return _analyser_highs(model, familles, entieres, importer, plages)
+
+    # Duales de la dernière résolution (une ligne par contrainte)
+    lignes = [c for nom in familles for c in model.component(nom).values()]
+    colonnes = [
+        v
+        for nom in VARIABLES
+        if model.component(nom) is not None
+        for v in model.component(nom).values()
+        if v.value is not None
+    ]
+    try:
+        duales = solver.get_duals(lignes)
+        couts_reduits = solver.get_reduced_costs(colonnes)
+    except RuntimeError:
+        # Pas de duales valables (résolution non optimale)
+        return _analyser_highs(model, familles, entieres, importer, plages)
+    if importer:
+        _importer(model, duales.items(), couts_reduits.items())
+    objectif = next(model.component_data_objects(pyo.Objective, active=True))
+    return _rapport(
+        familles,
+        lignes,
+        np.array([duales[c] for c in lignes], dtype=np.float64),
+        np.array([c.ub if c.has_ub() else c.lb for c in lignes], dtype=np.float64),
+        None,
+        colonnes,
+        np.array([v.value for v in colonnes], dtype=np.float64),
+        np.array([couts_reduits[v] for v in colonnes], dtype=np.float64),
+        pyo.value(objectif),
+    )
+
+
+def _importer(model: pyo.ConcreteModel, duales, couts_reduits) -> None:
+    # Duales (contrainte, valeur) et coûts réduits (variable, valeur) dans les suffixes
+    if not hasattr(model, "dual"):
+        model.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+    if not hasattr(model, "rc"):
+        model.rc = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+    model.dual.clear()
+    model.rc.clear()
+    for c, d in duales:
+        # Contrainte encadrée : deux lignes, duales cumulées
+        model.dual[c] = model.dual.get(c, 0.0) + d
+    for v, rc in couts_reduits:
+        model.rc[v] = rc
+
+
+def _analyser_highs(
+    model: pyo.ConcreteModel,
+    familles: list[str],
+    entieres: list,
+    importer: bool,
+    plages: bool,
+) -> dict:
+    # Nouvelle résolution du modèle compilé en forme standard par HiGHS (ranging si plages)
+    import highspy
+
+    for v in entieres:
+        v.fix(round(v.value))
+    # Analyse sur le modèle complet, même si des contraintes sont paresseuses
+    ajoutees = contraintes_paresseuses.completer(model)
+    try:
+        info = LinearStandardFormCompiler().write(
+            model, mixed_form=True, set_sense=None
+        )
+    finally:
+        contraintes_paresseuses.retirer(model, ajoutees)
+        for v in entieres:
+            v.unfix()
+
+    colonnes = info.columns
+    lignes = info.rows
+    maximiser = info.objectives[0].sense == pyo.maximize
+    cache = {
+        "A": info.A.tocsc(),
+        "rhs": np.asarray(info.rhs, dtype=np.float64),
+        "sens": np.array([r.bound_type for r in lignes], dtype=np.int8),
+        "col_lower": np.array(
+            [-np.inf if v.lb is None else v.lb for v in colonnes], dtype=np.float64
+        ),
+        "col_upper": np.array(
+            [np.inf if v.ub is None else v.ub for v in colonnes], dtype=np.float64
+        ),
+        "entiers": np.zeros(len(colonnes), dtype=bool),
+        "c": info.c.toarray(),
+        "c_offset": np.asarray(info.c_offset, dtype=np.float64),
+        "colonnes": [v.name for v in colonnes],
+        "lignes": [r.constraint.name for r in lignes],
+        "objectifs": ["objectif"],
+    }
+    h = cache_modele.instance_highs(cache, "objectif", maximiser)
+    h.run()
+    if h.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+        raise RuntimeError(
+            f"Analyse de sensibilité : résolution linéaire non optimale ({h.getModelStatus()})."
+        )
+    solution = h.getSolution()
+    duales = np.asarray(solution.row_dual)
+    couts_reduits = np.asarray(solution.col_dual)
+
+    if importer:
+        _importer(
+            model,
+            zip((r.constraint for r in lignes), duales),
+            zip(colonnes, couts_reduits),
+        )
+
+    plage = None
+    if plages:
+        # Plage du second membre de chaque ligne : ranging de HiGHS pour les lignes
+        # actives, activité de la ligne (écart) pour les lignes non actives
+        activite = np.asarray(solution.row_value)
+        _, ranging = h.getRanging()
+        actives = np.abs(duales) > TOLERANCE
+        sens = cache["sens"]
+        plage = (
+            np.where(
+                actives,
+                np.asarray(ranging.row_bound_dn.value_),
+                np.where(sens == cache_modele.INFERIEUR, activite, -np.inf),
+            ),
+            np.where(
+                actives,
+                np.asarray(ranging.row_bound_up.value_),
+                np.where(sens == cache_modele.SUPERIEUR, activite, np.inf),
+            ),
+        )
+    return _rapport(
+        familles,
+        [r.constraint for r in lignes],
+        duales,
+        cache["rhs"],
+        plage,
+        colonnes,
+        np.asarray(solution.col_value),
+        couts_reduits,
+        h.getInfo().objective_function_value,
+    )
+
+
+def _rapport(
+    familles: list[str],
+    lignes: list,
+    duales: np.ndarray,
+    rhs: np.ndarray,
+    plage: tuple[np.ndarray, np.ndarray] | None,
+    colonnes: list,
+    valeurs: np.ndarray,
+    couts_reduits: np.ndarray,
+    objectif: float,
+) -> dict:
+    # Rapport par famille (lignes : contrainte de chaque ligne) et par variable
+    actives = np.abs(duales) > TOLERANCE
+    rapport_familles = {}
+    composantes = [c.parent_component().name for c in lignes]
+    for nom in familles:
+        rangs = np.array([k for k, c in enumerate(composantes) if c == nom], dtype=int)
+        if rangs.size == 0:
+            rapport_familles[nom] = {"lignes": 0, "actives": 0}
+            continue
+        d = duales[rangs]
+        par_indice = {}
+        for k in rangs:
+            cle = _indice(lignes[k].index())
+            entree = par_indice.setdefault(cle, {"duale": 0.0, "actives": 0})
+            entree["duale"] += float(duales[k])
+            entree["actives"] += int(actives[k])
+        ordre = rangs[np.argsort(-np.abs(d), kind="stable")]
+        rapport_familles[nom] = {
+            "lignes": int(rangs.size),
+            "actives": int(actives[rangs].sum()),
+            "duale_totale": float(d.sum()),
+            "duale_min": float(d.min()),
+            "duale_max": float(d.max()),
+            "par_indice": par_indice,
+            "lignes_actives": [
+                {
+                    "ligne": lignes[k].name,
+                    "duale": float(duales[k]),
+                    "second_membre": float(rhs[k]),
+                }
+                for k in ordre[:LIGNES_DETAILLEES]
+                if actives[k]
+            ],
+        }
+        if plage is not None:
+            plage_basse, plage_haute = plage
+            rapport_familles[nom]["decalage_uniforme"] = _decalage_uniforme(
+                np.maximum(plage_haute[rangs] - rhs[rangs], 0),
+                np.maximum(rhs[rangs] - plage_basse[rangs], 0),
+            )
+            for ligne, k in zip(rapport_familles[nom]["lignes_actives"], ordre):
+                ligne["plage"] = [_fini(plage_basse[k]), _fini(plage_haute[k])]
+
+    rapport_variables = {}
+    for k, v in enumerate(colonnes):
+        if v.parent_component().name in VARIABLES:
+            rapport_variables[v.name] = {
+                "valeur": float(valeurs[k]),
+                "cout_reduit": float(couts_reduits[k]),
+            }
+    return {
+        "objectif": float(objectif),
+        "familles": rapport_familles,
+        "variables": rapport_variables,
+    }
+
+
+def table_gains(
+    model: pyo.ConcreteModel, familles: list[str] | None = None, plages: bool = False
+) -> dict[str, dict]:
+    """
+    Analyse de sensibilité de l'optimisation individuelle de chaque acteur (table des gains),
+    par une nouvelle résolution HiGHS de chacune. Sans plages, préférer les duales des
+    résolutions de la table des gains (optim_individuelle avec rapports_sensibilite) ;
+    celle-ci sert quand la table a été résolue sans le modèle Pyomo (cache du modèle
+    compilé) ou sans solveur persistant, ou avec les plages.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle construit par init_model (sans objectif actif).
+        familles (list[str] | None, optional):
+            Contraintes à analyser. Defaults to None (FAMILLES).
+        plages (bool, optional):
+            Si True, plages de validité des seconds membres. Defaults to False.
+
+    Returns:
+        dict[str, dict]:
+            Le rapport de analyser pour chaque acteur priorisé.
+    """
+    if familles is None:
+        familles = FAMILLES
+    familles = [f for f in familles if model.component(f) is not None]
+    rapports = {}
+    for a in Acteurs:
+        model.objectif_sensibilite = pyo.Objective(
+            expr=model.fn_obj[a], sense=pyo.minimize
+        )
+        try:
+            rapports[a] = _analyser_highs(model, familles, [], False, plages)
+        finally:
+            model.del_component(model.objectif_sensibilite)
+    return rapports
+
+
+def ecrire(rapports: dict, fichier: str) -> None:
+    """
+    Enregistre des rapports de sensibilité en JSON.
+
+    Args:
+        rapports (dict):
+            Les rapports (par exemple {"table_gains": ..., "max_min_co2": ...}).
+        fichier (str):
+            Chemin du fichier JSON.
+    """
+    with open(fichier, "w") as file:
+        json.dump(rapports, file, indent=2)
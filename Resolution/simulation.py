@@ -0,0 +1,518 @@
+import argparse
+import json
+import time
+import numpy as np
+import pyomo.environ as pyo
+import config as config
+import Donnees.data as data
+from Donnees.data import (
+    Prod,
+    Cons,
+    Energie,
+    Electricite,
+    Energies_autorisees,
+    P_electrolyseur,
+    P_SMR,
+    Rendement_electrolyseur,
+    Rendement_vaporeformage,
+    Taille_vaporeformeur,
+    CAPEX_t_electrolyseur,
+    CAPEX_t_stockage,
+    CAPEX_t_captage,
+    Impact_vaporeformage,
+    Impact_max,
+)
+import Definition.modelisation as modelisation
+import Utils.utils as utils
+
+# Simulation gloutonne du fonctionnement du réseau pour des tailles fixées.
+#
+# Les tailles (Taille_electrolyseur, Taille_stockage, Taille_captage) sont données et
+# chaque heure est simulée sans résolution, pour plusieurs années (séries) à la fois :
+#   - les électrolyseurs, dans l'ordre de Prod, achètent leur énergie aux sources
+#     autorisées les moins chères d'abord (ordre de mérite), dans la limite de la
+#     production d'électricité restante et du plafond horaire d'impact CO2 ;
+#   - aux heures où leur énergie est moins chère que la médiane de l'année, ils produisent
+#     à pleine capacité et le surplus remplit le stockage ; aux autres heures, le stock est
+#     vendu avant de produire (dynamique du stock de C_prod_elec_4) ;
+#   - chaque producteur vend d'abord au consommateur qui lui paie le meilleur prix
+#     (Prix_vente_H2 fixés) et les SMR complètent la demande restante, avec un captage
+#     maximal.
+# Le stock final manquant (C_prod_elec_6) est racheté au prix moyen de l'énergie la moins
+# chère de l'année ; le stock final en trop est perdu. La solution n'est pas optimale mais
+# donne en quelques millisecondes par année les fn_obj et l'impact CO2 d'un
+# dimensionnement (criblage Monte-Carlo) et un point de départ pour le solveur.
+#
+# Utilisation :
+#   python -m Resolution.simulation --tailles tailles.json \
+#       --fichier Donnees/synthetique.csv --echantillons 200 --graine 1
+
+
+def tailles_model(model: pyo.ConcreteModel) -> dict[str, dict[str, float]]:
+    """
+    Tailles des installations d'une solution du modèle.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo résolu.
+
+    Returns:
+        dict[str, dict[str, float]]:
+            tailles[nom][producteur] pour chaque variable de modelisation.TAILLES.
+    """
+    return {
+        nom: {p: pyo.value(getattr(model, nom)[p]) for p in producteurs}
+        for nom, producteurs in modelisation.TAILLES.items()
+    }
+
+
+def empiler_series(
+    series: list[
+        tuple[
+            dict[str, list[float]],
+            dict[str, list[float]],
+            dict[str, list[float]],
+            dict[str, list[float]],
+        ]
+    ],
+) -> dict[str, np.ndarray]:
+    """
+    Rassemble plusieurs années de séries temporelles en tableaux NumPy.
+
+    Args:
+        series (list[tuple[dict[str, list[float]], ...]]):
+            Séries (Production_elec, Impact_elec, Prix_energie, Demande_H2) de chaque
+            année, de même longueur (format de utils.read_data).
+
+    Returns:
+        dict[str, np.ndarray]:
+            "disponible", "impact" et "prix" indexés par [année, énergie, temps] dans
+            l'ordre de Energie (disponibilité infinie et impact nul hors électricité),
+            "demande" indexé par [année, consommateur, temps].
+    """
+    T = len(series[0][3][Cons[0]])
+    infini, nul = np.full(T, np.inf), np.zeros(T)
+    return {
+        "disponible": np.array(
+            [
+                [production[e] if e in Electricite else infini for e in Energie]
+                for production, _, _, _ in series
+            ],
+            dtype=float,
+        ),
+        "impact": np.array(
+            [
+                [impact[e] if e in Electricite else nul for e in Energie]
+                for _, impact, _, _ in series
+            ],
+            dtype=float,
+        ),
+        "prix": np.array(
+            [[prix[e] for e in Energie] for _, _, prix, _ in series], dtype=float
+        ),
+        "demande": np.array(
+            [[demande[c] for c in Cons] for _, _, _, demande in series], dtype=float
+        ),
+    }
+
+
+def lire_annees(
+    fichier: str, debuts: list[int], Time_horizon: int
+) -> dict[str, np.ndarray]:
+    """
+    Lit plusieurs fenêtres d'un fichier de données (une par début) et les empile.
+
+    Args:
+        fichier (str):
+            Fichier csv au format de Stage_dataseries.csv.
+        debuts (list[int]):
+            Première ligne de chaque fenêtre.
+        Time_horizon (int):
+            Longueur des fenêtres - en heures.
+
+    Returns:
+        dict[str, np.ndarray]:
+            Les séries empilées (voir empiler_series).
+    """
+    return empiler_series(
+        [utils.read_data(fichier, Time_horizon, debut_data=d) for d in debuts]
+    )
+
+
+def _achat(
+    besoin: np.ndarray,
+    prix: np.ndarray,
+    disponible: np.ndarray,
+    impact: np.ndarray,
+    plafond: float | None,
+) -> np.ndarray:
+    # Achat de besoin (N,) MWh aux sources triées par prix croissant (N, k). Une source
+    # plus émettrice que le plafond (kgCO2/MWh) n'est achetée que dans la limite de la
+    # marge laissée par les sources moins chères déjà achetées.
+    achat = np.zeros_like(prix)
+    reste = besoin.copy()
+    marge = np.zeros_like(besoin)
+    for r in range(prix.shape[1]):
+        q = np.minimum(reste, disponible[:, r])
+        if plafond is not None:
+            exces = impact[:, r] - plafond
+            q = np.where(exces > 0, np.minimum(q, marge / np.maximum(exces, 1e-12)), q)
+            marge = np.maximum(marge - exces * q, 0)
+        achat[:, r] = q
+        reste -= q
+    return achat
+
+
+def simuler(
+    tailles: dict[str, dict[str, float]],
+    series: dict[str, np.ndarray] | None = None,
+    emission_CO2_heure: bool = True,
+    prix_vente: dict[str, dict[str, float]] | None = None,
+    trajectoires: bool = False,
+) -> dict:
+    """
+    Simule le fonctionnement du réseau pour des tailles fixées, sur plusieurs années.
+
+    Args:
+        tailles (dict[str, dict[str, float]]):
+            Tailles des installations tailles[nom][producteur] (voir modelisation.TAILLES et tailles_model).
+        series (dict[str, np.ndarray] | None, optional):
+            Séries empilées (empiler_series, lire_annees). Si None, séries de Donnees.data.
+            Defaults to None.
+        emission_CO2_heure (bool, optional):
+            Si True, le plafond d'impact CO2 est respecté à chaque heure. Sinon, il n'est
+            que vérifié sur l'horizon (voir "depassement_CO2"). Defaults to True.
+        prix_vente (dict[str, dict[str, float]] | None, optional):
+            Prix de vente de l'H2. Si None, Prix_vente_H2 de Donnees.data. Defaults to None.
+        trajectoires (bool, optional):
+            Si True, les flux horaires sont aussi retournés (pour initialiser_model).
+            Defaults to False.
+
+    Returns:
+        dict:
+            Par année (premier indice des tableaux) :
+            - "fn_obj" : valeur de l'objectif de chaque acteur
+            - "Impact_prod" : impact CO2 de chaque producteur - en kgCO2
+            - "CO2" : impact CO2 total - en kgCO2
+            - "Q_H2_prod" : production de chaque producteur - en kgH2
+            - "demande_non_servie" : demande d'H2 non servie - en kgH2
+            - "ecart_stock" : stock final moins stock initial de chaque électrolyseur
+            - "depassement_CO2" : impact au-delà du plafond sur l'horizon - en kgCO2
+            - "trajectoires" (si demandé) : flux horaires indexés comme les variables du
+              modèle, par exemple Q_H2_vendu[année, producteur, consommateur, temps]
+    """
+    if series is None:
+        series = empiler_series(
+            [
+                (
+                    data.Production_elec,
+                    data.Impact_elec,
+                    data.Prix_energie,
+                    data.Demande_H2,
+                )
+            ]
+        )
+    if prix_vente is None:
+        prix_vente = data.Prix_vente_H2
+    N, _, T = series["prix"].shape
+    disponible = series["disponible"]
+    demande = series["demande"]
+    lignes = np.arange(N)
+
+    # Sources autorisées de chaque producteur triées par prix croissant, à chaque heure
+    sources, ordre, prix, impact = {}, {}, {}, {}
+    for p in Prod:
+        sources[p] = np.array([Energie.index(e) for e in Energies_autorisees[p]])
+        tri = np.argsort(series["prix"][:, sources[p]], axis=1, kind="stable")
+        ordre[p] = sources[p][tri]
+        prix[p] = np.take_along_axis(series["prix"], ordre[p], axis=1)
+        impact[p] = np.take_along_axis(series["impact"], ordre[p], axis=1)
+
+    # Heures où l'énergie la moins chère est sous la médiane de l'année
+    bon_marche = {
+        p: prix[p][:, 0] <= np.median(prix[p][:, 0], axis=1, keepdims=True)
+        for p in P_electrolyseur
+    }
+    # Consommateurs de chaque producteur, du meilleur prix au moins bon
+    clients = {
+        p: sorted(range(len(Cons)), key=lambda j: -prix_vente[p][Cons[j]]) for p in Prod
+    }
+
+    cout = {p: np.zeros(N) for p in Prod}
+    recettes = {p: np.zeros(N) for p in Prod}
+    paye = np.zeros((N, len(Cons)))
+    emission = {p: np.zeros(N) for p in Prod}
+    production = {p: np.zeros(N) for p in Prod}
+    init = {p: 0.5 * tailles["Taille_stockage"][p] for p in P_electrolyseur}
+    stock = {p: np.full(N, init[p]) for p in P_electrolyseur}
+    non_servie = np.zeros(N)
+    if trajectoires:
+        P = len(Prod)
+        traj = {
+            nom: np.zeros((N, P, T))
+            for nom in [
+                "Q_H2_prod",
+                "Q_H2_stock",
+                "Q_H2_stock_in",
+                "Q_H2_stock_out",
+                "Impact_prod",
+                "Captage",
+            ]
+        }
+        traj["Q_energie"] = np.zeros((N, P, len(Energie), T))
+        traj["Q_H2_vendu"] = np.zeros((N, P, len(Cons), T))
+
+    def vendre(p, t, quantite):
+        # Vente de quantite (N,) aux consommateurs du meilleur prix au moins bon
+        for j in clients[p]:
+            q = np.minimum(quantite, reste[:, j])
+            reste[:, j] -= q
+            quantite = quantite - q
+            recettes[p] += q * prix_vente[p][Cons[j]]
+            paye[:, j] += q * prix_vente[p][Cons[j]]
+            if trajectoires:
+                traj["Q_H2_vendu"][:, Prod.index(p), j, t] = q
+
+    def acheter(p, t, energie, plafond):
+        # Achat de l'énergie (N,) MWh et mise à jour de l'électricité restante
+        achat = _achat(
+            energie,
+            prix[p][:, :, t],
+            restant[lignes[:, None], ordre[p][:, :, t]],
+            impact[p][:, :, t],
+            plafond,
+        )
+        restant[lignes[:, None], ordre[p][:, :, t]] -= achat
+        cout[p] += np.sum(achat * prix[p][:, :, t], axis=1)
+        if trajectoires:
+            traj["Q_energie"][lignes[:, None], Prod.index(p), ordre[p][:, :, t], t] = (
+                achat
+            )
+        return achat
+
+    for t in range(T):
+        restant = disponible[:, :, t].copy()
+        reste = demande[:, :, t].copy()
+        for p in P_electrolyseur:
+            rendement = Rendement_electrolyseur[p]
+            plafond = Impact_max[p] * rendement if emission_CO2_heure else None
+            taille_stock = tailles["Taille_stockage"][p]
+            # Capacité de production de l'heure (électricité restante, plafond CO2)
+            capacite = (
+                _achat(
+                    np.full(N, float(tailles["Taille_electrolyseur"][p])),
+                    prix[p][:, :, t],
+                    restant[lignes[:, None], ordre[p][:, :, t]],
+                    impact[p][:, :, t],
+                    plafond,
+                ).sum(axis=1)
+                * rendement
+            )
+            besoin = reste.sum(axis=1)
+            # Heure bon marché : pleine production, le surplus remplit le stock
+            prod_bm = np.minimum(capacite, besoin + taille_stock - stock[p])
+            vente_bm = np.minimum(besoin, prod_bm + stock[p])
+            # Sinon : vente du stock d'abord, puis production
+            sortie = np.minimum(stock[p], besoin)
+            prod_cher = np.minimum(capacite, besoin - sortie)
+            bm = bon_marche[p][:, t]
+            prod = np.where(bm, prod_bm, prod_cher)
+            vente = np.where(bm, vente_bm, sortie + prod_cher)
+
+            achat = acheter(p, t, prod / rendement, plafond)
+            impact_t = np.sum(achat * impact[p][:, :, t], axis=1)
+            emission[p] += impact_t
+            production[p] += prod
+            stock[p] = np.maximum(stock[p] + prod - vente, 0)
+            vendre(p, t, vente)
+            if trajectoires:
+                i = Prod.index(p)
+                traj["Q_H2_prod"][:, i, t] = prod
+                traj["Q_H2_stock"][:, i, t] = stock[p]
+                traj["Q_H2_stock_in"][:, i, t] = np.maximum(prod - vente, 0)
+                traj["Q_H2_stock_out"][:, i, t] = np.maximum(vente - prod, 0)
+                traj["Impact_prod"][:, i, t] = impact_t
+        for p in P_SMR:
+            rendement = Rendement_vaporeformage[p]
+            taille_captage = tailles["Taille_captage"][p]
+            capacite = Taille_vaporeformeur[p] * rendement
+            # Plafond horaire : (Impact_vaporeformage - Impact_max) * Q_H2_prod <= captage
+            if emission_CO2_heure and Impact_vaporeformage[p] > Impact_max[p]:
+                capacite = min(
+                    capacite, taille_captage / (Impact_vaporeformage[p] - Impact_max[p])
+                )
+            prod = np.minimum(reste.sum(axis=1), capacite)
+            acheter(p, t, prod / rendement, None)
+            captage = np.minimum(taille_captage, prod * Impact_vaporeformage[p])
+            emission[p] += prod * Impact_vaporeformage[p] - captage
+            production[p] += prod
+            vendre(p, t, prod)
+            if trajectoires:
+                i = Prod.index(p)
+                traj["Q_H2_prod"][:, i, t] = prod
+                traj["Impact_prod"][:, i, t] = prod * Impact_vaporeformage[p] - captage
+                traj["Captage"][:, i, t] = captage
+        non_servie += reste.sum(axis=1)
+
+    # Stock final manquant racheté au prix moyen de l'énergie la moins chère
+    ecart_stock = {}
+    for p in P_electrolyseur:
+        ecart_stock[p] = stock[p] - init[p]
+        manquant = np.maximum(-ecart_stock[p], 0) / Rendement_electrolyseur[p]
+        cout[p] += manquant * prix[p][:, 0].mean(axis=1)
+        emission[p] += manquant * impact[p][:, 0].mean(axis=1)
+
+    fn_obj = {}
+    for p in P_electrolyseur:
+        capex = (
+            CAPEX_t_electrolyseur[p] * tailles["Taille_electrolyseur"][p]
+            + CAPEX_t_stockage[p] * tailles["Taille_stockage"][p]
+        )
+        fn_obj[p] = cout[p] + capex * T - recettes[p]
+    for p in P_SMR:
+        capex = CAPEX_t_captage[p] * tailles["Taille_captage"][p]
+        fn_obj[p] = cout[p] + capex * T - recettes[p]
+    demande_totale = demande.sum(axis=2)
+    for j, c in enumerate(Cons):
+        fn_obj[c] = np.divide(
+            paye[:, j],
+            demande_totale[:, j],
+            out=np.zeros(N),
+            where=demande_totale[:, j] > 0,
+        )
+
+    resultat = {
+        "fn_obj": fn_obj,
+        "Impact_prod": emission,
+        "CO2": sum(emission.values()),
+        "Q_H2_prod": production,
+        "demande_non_servie": non_servie,
+        "ecart_stock": ecart_stock,
+        "depassement_CO2": {
+            p: np.maximum(emission[p] - Impact_max[p] * production[p], 0) for p in Prod
+        },
+    }
+    if trajectoires:
+        resultat["trajectoires"] = traj
+    return resultat
+
+
+def initialiser_model(
+    model: pyo.ConcreteModel,
+    tailles: dict[str, dict[str, float]],
+    resultat: dict,
+    annee: int = 0,
+) -> pyo.ConcreteModel:
+    """
+    Donne aux variables du modèle les valeurs d'une simulation (point de départ du solveur).
+
+    Le stock final manquant racheté par la simulation n'apparaît pas dans les flux : le
+    point peut être légèrement infaisable (C_prod_elec_6).
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo, sur les mêmes séries que la simulation.
+        tailles (dict[str, dict[str, float]]):
+            Les tailles simulées.
+        resultat (dict):
+            Le résultat de simuler avec trajectoires=True.
+        annee (int, optional):
+            Année de la simulation utilisée. Defaults to 0.
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec les valeurs initiales des variables.
+    """
+    traj = {nom: valeurs[annee] for nom, valeurs in resultat["trajectoires"].items()}
+    Time = list(model.Time)
+    for nom, producteurs in modelisation.TAILLES.items():
+        for p in producteurs:
+            getattr(model, nom)[p].set_value(tailles[nom][p], skip_validation=True)
+    for i, p in enumerate(Prod):
+        for t in Time:
+            for e in Energies_autorisees[p]:
+                model.Q_energie[p, e, t].set_value(
+                    traj["Q_energie"][i, Energie.index(e), t]
+                )
+            model.Q_energie_total[p, t].set_value(traj["Q_energie"][i, :, t].sum())
+            model.Q_H2_prod[p, t].set_value(traj["Q_H2_prod"][i, t])
+            model.Q_H2_a_vendre[p, t].set_value(traj["Q_H2_vendu"][i, :, t].sum())
+            model.Impact_prod[p, t].set_value(traj["Impact_prod"][i, t])
+            for j, c in enumerate(Cons):
+                model.Q_H2_vendu[p, c, t].set_value(traj["Q_H2_vendu"][i, j, t])
+                model.P_H2_vendu[p, c, t].set_value(
+                    traj["Q_H2_vendu"][i, j, t] * pyo.value(model.Prix_vente_H2[p, c])
+                )
+        model.P_energie_total[p].set_value(
+            sum(
+                traj["Q_energie"][i, Energie.index(e), t]
+                * pyo.value(model.Prix_energie[e, t])
+                for e in Energies_autorisees[p]
+                for t in Time
+            )
+        )
+    for p in P_electrolyseur:
+        i = Prod.index(p)
+        model.Q_H2_init_stock[p].set_value(0.5 * tailles["Taille_stockage"][p])
+        for t in Time:
+            model.Q_H2_stock[p, t].set_value(traj["Q_H2_stock"][i, t])
+            model.Q_H2_stock_in[p, t].set_value(traj["Q_H2_stock_in"][i, t])
+            model.Q_H2_stock_out[p, t].set_value(traj["Q_H2_stock_out"][i, t])
+        model.P_CAPEX_Electrolyseur[p].set_value(
+            tailles["Taille_electrolyseur"][p] * CAPEX_t_electrolyseur[p]
+        )
+        model.P_CAPEX_Stockage[p].set_value(
+            tailles["Taille_stockage"][p] * CAPEX_t_stockage[p]
+        )
+    for p in P_SMR:
+        i = Prod.index(p)
+        for t in Time:
+            model.Captage[p, t].set_value(traj["Captage"][i, t])
+            model.Emission_vaporeformage[p, t].set_value(
+                traj["Q_H2_prod"][i, t] * Impact_vaporeformage[p]
+            )
+        model.P_CAPEX_Captage[p].set_value(
+            tailles["Taille_captage"][p] * CAPEX_t_captage[p]
+        )
+    for a, valeurs in resultat["fn_obj"].items():
+        model.fn_obj[a].set_value(valeurs[annee])
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Criblage Monte-Carlo d'un dimensionnement par simulation gloutonne."
+    )
+    parser.add_argument(
+        "--tailles",
+        required=True,
+        help="Fichier json des tailles {nom: {producteur: valeur}} (voir modelisation.TAILLES).",
+    )
+    parser.add_argument("--fichier", default=config.fichier_donnees)
+    parser.add_argument("--horizon", type=int, default=config.Time_horizon)
+    parser.add_argument("--echantillons", type=int, default=100)
+    parser.add_argument("--graine", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.tailles, "r") as file:
+        tailles = json.load(file)
+    with open(args.fichier, "r") as file:
+        # 4 lignes d'en-tête
+        lignes_donnees = sum(1 for _ in file) - 4
+    generateur = np.random.default_rng(args.graine)
+    debuts = generateur.integers(
+        0, lignes_donnees - args.horizon + 1, size=args.echantillons
+    )
+    series = lire_annees(args.fichier, debuts.tolist(), args.horizon)
+    start_time = time.time()
+    resultat = simuler(tailles, series, emission_CO2_heure=config.emission_CO2_heure)
+    duree = time.time() - start_time
+    print(f"{'':<30} {'quantile 5%':>14} {'médiane':>14} {'quantile 95%':>14}")
+    for nom, valeurs in [*resultat["fn_obj"].items(), ("CO2", resultat["CO2"])]:
+        q05, q50, q95 = np.quantile(valeurs, [0.05, 0.5, 0.95])
+        print(f"{nom:<30} {q05:>14.2f} {q50:>14.2f} {q95:>14.2f}")
+    print(
+        f"{args.echantillons} fenêtres de {args.horizon}h simulées en {duree:.2f}s "
+        f"({1000 * duree / args.echantillons:.1f}ms par fenêtre), demande non servie "
+        f"max {resultat['demande_non_servie'].max():.2f} kgH2"
+    )
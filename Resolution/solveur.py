@@ -0,0 +1,495 @@
+import math
+import time
+import pyomo.environ as pyo
+from pyomo.common.collections import ComponentSet
+import config as config
+from pyomo.opt import TerminationCondition
+
+# Phases de la chaîne d'optimisation, dans l'ordre d'exécution : le délai total
+# (config.delai_total) est réparti entre les phases restantes au début de chacune
+PHASES = ["table_gains", "goal_programming", "max_min", "co2"]
+
+# Temps minimal accordé à une résolution lorsque le délai est dépassé - en secondes
+TEMPS_MIN = 1.0
+
+# Noms des options de temps limite et d'écart relatif des solveurs par fichier
+OPTIONS_LIMITES = {
+    "cplex": ("timelimit", "mip_tolerances_mipgap"),
+    "gurobi": ("TimeLimit", "MIPGap"),
+    "cbc": ("sec", "ratio"),
+    "glpk": ("tmlim", "mipgap"),
+}
+
+# Limites transmises à l'interface appsi en l'absence de limite : une limite passée reste
+# dans le solveur (HiGHS) tant qu'une autre ne la remplace pas. Écart relatif par défaut
+# de HiGHS, CPLEX et Gurobi
+TEMPS_SANS_LIMITE = 1e75
+ECART_DEFAUT = 1e-4
+
+# Échéance de la chaîne : fin du délai total, phase en cours et fin de sa part du délai
+_echeance = {"fin": None, "phase": None, "fin_phase": None}
+# Qualité des résolutions de chaque phase depuis demarrer_echeance
+_bilan = []
+
+
+class AucuneSolution(RuntimeError):
+    """
+    Résolution terminée sans solution réalisable : problème infaisable, non borné, ou
+    limite de temps atteinte avant de trouver une solution.
+
+    Attributes:
+        results (SolverResults | None):
+            Les résultats de la résolution (None si le problème n'a pas été résolu).
+        phase (str | None):
+            La phase de résolution.
+        infaisable (bool):
+            True si le problème est prouvé infaisable.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        results,
+        phase: str | None = None,
+        infaisable: bool | None = None,
+    ):
+        super().__init__(message)
+        self.results = results
+        self.phase = phase
+        if infaisable is None:
+            infaisable = (
+                results.solver.termination_condition == TerminationCondition.infeasible
+            )
+        self.infaisable = infaisable
+
+
+def creer_solveur(persistant: bool = False) -> pyo.SolverFactory:
+    """
+    Crée le solveur utilisé pour les résolutions, configuré à partir du fichier config.py.
+
+    Le nom du solveur est donné par config.solveur. Si config.solveur_threads est renseigné,
+    le nombre de threads du solveur est limité (utile lorsque plusieurs scénarios sont
+    résolus en parallèle sur la même machine).
+
+    Args:
+        persistant (bool, optional):
+            Si True, utilise l'interface persistante (appsi) du solveur : le modèle est
+            conservé par le solveur entre deux résolutions et seules les modifications
+            (paramètres mutables, contraintes ajoutées ou supprimées) sont transmises.
+            Defaults to False.
+
+    Returns:
+        pyo.SolverFactory:
+            Le solveur Pyomo configuré.
+    """
+    nom = config.solveur
+    if persistant and not nom.startswith("appsi_"):
+        nom = "appsi_" + nom
+    solver = pyo.SolverFactory(nom)
+    if config.solveur_threads is not None:
+        solver.options["threads"] = config.solveur_threads
+    return solver
+
+
+def variables_a_charger(charger: list) -> list:
+    """
+    Liste les variables (VarData) à charger à partir de composants Var indexés ou non.
+
+    Args:
+        charger (list):
+            Variables du modèle, par exemple [model.fn_obj, model.satisfaction, model.z].
+
+    Returns:
+        list:
+            Les variables individuelles.
+    """
+    variables = []
+    for var in charger:
+        if var.is_indexed():
+            variables.extend(var.values())
+        else:
+            variables.append(var)
+    return variables
+
+
+def charger_solution(
+    model: pyo.ConcreteModel, solver, results, charger: list | None = None
+) -> None:
+    """
+    Charge dans le modèle la solution trouvée par le solveur.
+
+    Le chargement partiel ne concerne que les solveurs par fichier (cplex, gurobi, cbc,
+    glpk), dont le chargement de toute la solution (model.solutions.load_from) coûte
+    autant que la résolution des petits problèmes. L'interface appsi extrait de toute
+    façon toutes les valeurs primales : la solution y est toujours chargée en entier.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo résolu.
+        solver:
+            Le solveur ayant résolu le modèle.
+        results (SolverResults):
+            Les résultats retournés par solver.solve(..., load_solutions=False). Après un
+            chargement partiel, ils ne contiennent plus que les variables chargées.
+        charger (list | None, optional):
+            Variables à charger. Les autres variables non fixées sont vidées (valeur None)
+            pour qu'un démarrage ultérieur (warmstart) ne mélange pas les valeurs de deux
+            solutions. Si None, toutes les variables sont chargées. Defaults to None.
+    """
+    if charger is None or hasattr(solver, "load_vars"):
+        if hasattr(solver, "load_vars"):
+            # Interface persistante (appsi)
+            solver.load_vars()
+        else:
+            model.solutions.load_from(results)
+        return
+
+    # Solveurs par fichier : seules les variables demandées sont gardées dans la solution
+    # lue, retrouvées par la table des symboles que solve(load_solutions=False) laisse
+    # dans les résultats
+    variables = variables_a_charger(charger)
+    symboles = results._smap.byObject
+    a_garder = {symboles[id(v)] for v in variables if id(v) in symboles}
+    solution = results.solution(0).variable
+    for symbole in [s for s in solution if s not in a_garder]:
+        del solution[symbole]
+    model.solutions.load_from(results)
+
+    a_charger = ComponentSet(variables)
+    for var in model.component_data_objects(pyo.Var):
+        if not var.fixed and var not in a_charger:
+            var.set_value(None, skip_validation=True)
+
+
+def demarrer_echeance(delai: float | None = None) -> None:
+    """
+    Démarre le délai total d'une exécution de la chaîne et vide le bilan des résolutions.
+
+    Le délai est réparti entre les phases de PHASES au début de chacune (première
+    résolution de la phase) : la phase reçoit la part du temps restant proportionnelle à
+    son poids (config.budgets_phases) parmi les phases restantes. Le temps non utilisé par
+    une phase revient ainsi aux suivantes.
+
+    Args:
+        delai (float | None, optional):
+            Délai total - en secondes. Si None, pas de délai. Defaults to None.
+    """
+    _echeance["fin"] = None if delai is None else time.time() + delai
+    _echeance["phase"] = None
+    _echeance["fin_phase"] = None
+    _bilan.clear()
+
+
+def _temps_restant(phase: str | None) -> float | None:
+    # Temps restant de la part du délai de la phase (début de la phase si elle change)
+    if _echeance["fin"] is None:
+        return None
+    maintenant = time.time()
+    if phase not in PHASES:
+        return max(TEMPS_MIN, _echeance["fin"] - maintenant)
+    if phase != _echeance["phase"]:
+        poids = {
+            p: config.budgets_phases.get(p, {}).get("poids", 1)
+            for p in PHASES[PHASES.index(phase) :]
+        }
+        part = poids[phase] / sum(poids.values()) if sum(poids.values()) > 0 else 1
+        _echeance["phase"] = phase
+        _echeance["fin_phase"] = (
+            maintenant + max(0.0, _echeance["fin"] - maintenant) * part
+        )
+    return max(TEMPS_MIN, _echeance["fin_phase"] - maintenant)
+
+
+def limites(
+    phase: str | None,
+    temps_max: float | None = None,
+    ecart_max: float | None = None,
+) -> tuple[float | None, float | None]:
+    """
+    Temps limite et écart relatif visé d'une résolution de la phase : budget de la phase
+    (config.budgets_phases), réduit au temps restant de sa part du délai total.
+
+    Args:
+        phase (str | None):
+            Phase de résolution.
+        temps_max (float | None, optional):
+            Temps limite imposé (remplace celui du budget). Defaults to None.
+        ecart_max (float | None, optional):
+            Écart relatif imposé (remplace celui du budget). Defaults to None.
+
+    Returns:
+        tuple[float | None, float | None]:
+            Le temps limite (en secondes) et l'écart relatif, None si pas de limite.
+    """
+    budget = config.budgets_phases.get(phase, {}) if phase is not None else {}
+    if temps_max is None:
+        temps_max = budget.get("temps")
+    if ecart_max is None:
+        ecart_max = budget.get("ecart")
+    reste = _temps_restant(phase)
+    if reste is not None:
+        temps_max = reste if temps_max is None else min(temps_max, reste)
+    return temps_max, ecart_max
+
+
+def _appliquer_limites(
+    solver, temps_max: float | None, ecart_max: float | None
+) -> dict:
+    # Limites transmises au solveur : configuration appsi ou options du solveur par
+    # fichier. Retourne les arguments à passer à solver.solve
+    if hasattr(solver, "load_vars"):
+        if "mip_gap" in solver.config:
+            solver.config.mip_gap = ECART_DEFAUT if ecart_max is None else ecart_max
+        # Le temps limite de l'interface appsi est un argument de solve
+        return {"timelimit": TEMPS_SANS_LIMITE if temps_max is None else temps_max}
+    noms = OPTIONS_LIMITES.get(getattr(solver, "name", None))
+    if noms is not None:
+        for nom, valeur in zip(noms, (temps_max, ecart_max)):
+            if valeur is None:
+                solver.options.pop(nom, None)
+            else:
+                solver.options[nom] = valeur
+    return {}
+
+
+def solution_disponible(results) -> bool:
+    """
+    Indique si la résolution a fourni une solution : optimale, ou réalisable (meilleure
+    solution connue) lorsqu'une limite de temps ou d'écart a arrêté le solveur.
+    """
+    statut = results.solver.termination_condition
+    if statut == TerminationCondition.optimal:
+        return True
+    return (
+        statut
+        not in (
+            TerminationCondition.infeasible,
+            TerminationCondition.unbounded,
+            TerminationCondition.infeasibleOrUnbounded,
+        )
+        and len(results.solution) > 0
+    )
+
+
+def qualite(results) -> dict:
+    """
+    Qualité de la solution retournée : valeur de la meilleure solution, meilleure borne
+    prouvée et écart relatif entre les deux.
+
+    Args:
+        results (SolverResults):
+            Les résultats retournés par resoudre.
+
+    Returns:
+        dict:
+            "statut", "valeur", "borne" et "ecart" (None lorsqu'ils ne sont pas connus).
+    """
+
+    def _fini(x):
+        return x if x is not None and math.isfinite(x) else None
+
+    if results.problem.sense == pyo.maximize:
+        valeur, borne = results.problem.lower_bound, results.problem.upper_bound
+    else:
+        valeur, borne = results.problem.upper_bound, results.problem.lower_bound
+    valeur, borne = _fini(valeur), _fini(borne)
+    if not solution_disponible(results):
+        valeur = None
+    ecart = None
+    if valeur is not None and borne is not None:
+        ecart = abs(valeur - borne) / max(abs(valeur), 1e-10)
+    return {
+        "statut": str(results.solver.termination_condition),
+        "valeur": valeur,
+        "borne": borne,
+        "ecart": ecart,
+    }
+
+
+def bilan(phases: list[str] | None = None) -> dict[str, dict]:
+    """
+    Bilan des résolutions de chaque phase depuis demarrer_echeance.
+
+    Args:
+        phases (list[str] | None, optional):
+            Phases à inclure. Si None, toutes. Defaults to None.
+
+    Returns:
+        dict[str, dict]:
+            Par phase : nombre de résolutions, nombre de solutions prouvées optimales,
+            plus grand écart relatif, temps total et nombre de lignes de contraintes
+            paresseuses ajoutées.
+    """
+    resume = {}
+    for entree in _bilan:
+        if phases is not None and entree["phase"] not in phases:
+            continue
+        r = resume.setdefault(
+            entree["phase"],
+            {
+                "resolutions": 0,
+                "optimales": 0,
+                "ecart_max": 0.0,
+                "temps": 0.0,
+                "lignes_ajoutees": 0,
+            },
+        )
+        r["resolutions"] += 1
+        r["optimales"] += entree["statut"] == str(TerminationCondition.optimal)
+        if entree["ecart"] is None:
+            if entree["statut"] != str(TerminationCondition.optimal):
+                r["ecart_max"] = None
+        elif r["ecart_max"] is not None:
+            r["ecart_max"] = max(r["ecart_max"], entree["ecart"])
+        r["temps"] += entree["temps"]
+        r["lignes_ajoutees"] += entree["lignes_ajoutees"]
+    return resume
+
+
+def exiger_solution(results, phase: str | None, description: str) -> None:
+    """
+    Lève AucuneSolution si la résolution n'a fourni aucune solution.
+
+    Args:
+        results (SolverResults):
+            Les résultats retournés par resoudre.
+        phase (str | None):
+            La phase de résolution.
+        description (str):
+            Description du problème résolu, pour le message d'erreur.
+    """
+    if solution_disponible(results):
+        return
+    statut = results.solver.termination_condition
+    if statut == TerminationCondition.infeasible:
+        message = f"{description} est infaisable."
+    else:
+        message = f"{description} : aucune solution ({statut})."
+    raise AucuneSolution(message, results, phase)
+
+
+def resoudre(
+    model: pyo.ConcreteModel,
+    solver=None,
+    warmstart: bool = False,
+    tee: bool = False,
+    charger: list | None = None,
+    phase: str | None = None,
+    temps_max: float | None = None,
+    ecart_max: float | None = None,
+):
+    """
+    Résout le modèle et charge la solution si la résolution en a fourni une.
+
+    Contrairement à solver.solve, une résolution infaisable ne lève pas d'erreur
+    (quel que soit le solveur) : le statut doit être vérifié dans les résultats retournés
+    (voir solution_disponible et exiger_solution). Si une limite de temps ou d'écart arrête
+    le solveur, la meilleure solution connue est chargée ; sa valeur, la meilleure borne et
+    l'écart relatif sont donnés par qualite(results).
+
+    Si des familles de contraintes du modèle sont paresseuses (init_model avec
+    contraintes_paresseuses), les lignes violées par la solution sont ajoutées et le modèle
+    est résolu à nouveau jusqu'à ce que la solution respecte le modèle complet.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle Pyomo à résoudre.
+        solver (optional):
+            Solveur à utiliser. Si None, un solveur est créé. Defaults to None.
+        warmstart (bool, optional):
+            Si True, la solution courante du modèle sert de point de départ. Defaults to False.
+        tee (bool, optional):
+            Si True, affiche la sortie du solveur. Defaults to False.
+        charger (list | None, optional):
+            Variables dont la valeur est chargée dans le modèle après résolution
+            (par exemple [model.fn_obj, model.Impact_prod]), avec un solveur par fichier
+            (voir charger_solution) : les autres variables sont vidées. Si None, ou avec
+            l'interface appsi ou une course de solveurs, toute la solution est chargée.
+            Defaults to None.
+        phase (str | None, optional):
+            Phase de résolution ("table_gains", "goal_programming", "max_min"). Si la
+            phase est dans config.course_phases et que config.course_configurations est
+            renseigné, le modèle est résolu par une course de solveurs (Resolution.course) ;
+            warmstart et tee sont alors ignorés. Le budget de la phase
+            (config.budgets_phases) et sa part du délai total limitent la résolution.
+            Defaults to None.
+        temps_max (float | None, optional):
+            Temps limite - en secondes (remplace celui du budget de la phase).
+            Defaults to None.
+        ecart_max (float | None, optional):
+            Écart relatif visé des problèmes en nombres entiers (remplace celui du budget
+            de la phase). Defaults to None.
+
+    Returns:
+        SolverResults:
+            Les résultats de la résolution (statut dans results.solver.termination_condition).
+    """
+    import Definition.contraintes_paresseuses as paresseuses
+
+    temps_max, ecart_max = limites(phase, temps_max, ecart_max)
+    start_time = time.time()
+    # Familles de contraintes générées au fil des résolutions (plans coupants) : leurs
+    # variables doivent être chargées pour vérifier la solution
+    familles = paresseuses.familles_incompletes(model)
+    if familles and charger is not None:
+        charger = charger + paresseuses.variables(model, familles)
+    lignes_ajoutees = 0
+    while True:
+        temps = temps_max
+        if temps is not None:
+            temps = max(TEMPS_MIN, temps_max - (time.time() - start_time))
+        results = _resoudre(
+            model, solver, warmstart, tee, charger, phase, temps, ecart_max
+        )
+        if not familles or not solution_disponible(results):
+            break
+        # Ajout des lignes violées par la solution, puis nouvelle résolution
+        ajoutees = paresseuses.ajouter_violees(model, familles)
+        if ajoutees == 0:
+            break
+        lignes_ajoutees += ajoutees
+    if phase is not None:
+        _bilan.append(
+            {
+                "phase": phase,
+                "temps": time.time() - start_time,
+                "lignes_ajoutees": lignes_ajoutees,
+                **qualite(results),
+            }
+        )
+    return results
+
+
+def _resoudre(
+    model: pyo.ConcreteModel,
+    solver,
+    warmstart: bool,
+    tee: bool,
+    charger: list | None,
+    phase: str | None,
+    temps_max: float | None,
+    ecart_max: float | None,
+):
+    # Une résolution (course de solveurs ou solveur unique) et chargement de la solution
+    if (
+        phase is not None
+        and config.course_configurations
+        and phase in config.course_phases
+    ):
+        import Resolution.course as course
+
+        return course.courir(
+            model,
+            phase=phase,
+            temps_max=temps_max,
+            ecart_max=ecart_max,
+        )
+    if solver is None:
+        solver = creer_solveur()
+    arguments = _appliquer_limites(solver, temps_max, ecart_max)
+    results = solver.solve(
+        model, tee=tee, warmstart=warmstart, load_solutions=False, **arguments
+    )
+    if solution_disponible(results):
+        charger_solution(model, solver, results, charger)
+    return results
@@ -0,0 +1,722 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+import traceback
+import warnings
+from typing import Any
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.opt import TerminationCondition
+import config as config
+import Donnees.data as data
+from Donnees.data import (
+    Prod,
+    Acteurs,
+    Taille_max_electrolyseur,
+    Taille_max_stockage,
+    Taille_max_captage,
+    CAPEX_t_electrolyseur,
+    CAPEX_t_stockage,
+    CAPEX_t_captage,
+)
+import Definition.modelisation as modelisation
+import Resolution.dispatch as dispatch
+import Resolution.solveur as solveur
+import Utils.scenarios as scenarios
+import Utils.utils as utils
+
+# Modèle stochastique à deux étapes : dimensionnement commun, exploitation par scénario.
+#
+# Les tailles (modelisation.TAILLES) sont décidées une fois (première étape) alors que la
+# production PV, les prix de l'énergie et la demande sont incertains. Chaque scénario est
+# une série de données (plusieurs années d'un fichier ou perturbations des séries de
+# Donnees.data) avec son modèle init_model et l'objectif de dispatch (coût total de la
+# chaîne ou somme pondérée des objectifs des acteurs) ; l'objectif est l'espérance sur
+# les scénarios (prix de vente fixés).
+#
+# Deux résolutions :
+#   - forme étendue : un seul modèle contenant tous les scénarios, tailles égales entre
+#     scénarios (petits cas) ;
+#   - progressive hedging : chaque scénario est résolu séparément avec une pénalité
+#     w.(x - x_moy) + rho/2 (x - x_moy)^2 sur ses tailles x, les multiplicateurs w et les
+#     pénalités rho étant mis à jour jusqu'à ce que les tailles des scénarios coïncident
+#     (consensus x_moy). Les sous-problèmes sont répartis entre des processus qui gardent
+#     leurs modèles et un solveur persistant d'une itération à l'autre : le nombre de
+#     scénarios suit le nombre de coeurs, pas la taille du modèle. Le terme quadratique est approché par des tangentes (HiGHS ne
+#     traite pas les objectifs quadratiques via appsi).
+# L'itération 0 (sans pénalité) donne une borne inférieure (information parfaite) et le
+# consensus final est évalué sur chaque scénario à tailles fixées.
+#
+# Utilisation :
+#   python -m Resolution.stochastique --scenarios 8 --processus 4 --horizon 168
+#   python -m Resolution.stochastique --fichier Donnees/synthetique.csv --debuts 0 8760 17520 \
+#       --horizon 720 --forme-etendue --sortie tailles.json
+
+# CAPEX par heure et taille maximale de chaque variable de dimensionnement
+CAPEX_t = {
+    "Taille_electrolyseur": CAPEX_t_electrolyseur,
+    "Taille_stockage": CAPEX_t_stockage,
+    "Taille_captage": CAPEX_t_captage,
+}
+TAILLES_MAX = {
+    "Taille_electrolyseur": Taille_max_electrolyseur,
+    "Taille_stockage": Taille_max_stockage,
+    "Taille_captage": Taille_max_captage,
+}
+
+# Nombre de tangentes de chaque côté de x_moy approchant le terme quadratique, en
+# taille max / 2^k (k < TANGENTES) : le terme est sous-estimé d'au plus 1/8 sur tout le
+# domaine de la taille au-dessus de taille max / 2^TANGENTES (au lieu d'une pénalité
+# seulement linéaire hors d'une étendue fixée à l'itération précédente)
+TANGENTES = 16
+
+# Plus petit écart pris en compte dans rho et dans les écarts relatifs, relatif à la
+# taille max (rho borné quand les scénarios coïncident)
+PLANCHER = 1e-4
+
+# Séries perturbées (production d'électricité, prix de l'énergie, demande d'H2)
+PERTURBEES = (0, 2, 3)
+
+
+def premiere_etape() -> list[tuple[str, str]]:
+    """
+    Variables de première étape (nom, producteur), dans l'ordre de modelisation.TAILLES.
+
+    Returns:
+        list[tuple[str, str]]:
+            Les variables de dimensionnement.
+    """
+    return [
+        (nom, p)
+        for nom, producteurs in modelisation.TAILLES.items()
+        for p in producteurs
+    ]
+
+
+def _valeurs_premiere_etape(model: pyo.ConcreteModel) -> np.ndarray:
+    return np.array(
+        [pyo.value(model.component(nom)[p]) for nom, p in premiere_etape()],
+        dtype=np.float64,
+    )
+
+
+def _tailles(x: np.ndarray) -> dict[str, dict[str, float]]:
+    # Tailles au format de modelisation.fixer_tailles
+    tailles = {nom: {} for nom in modelisation.TAILLES}
+    for (nom, p), valeur in zip(premiere_etape(), x):
+        tailles[nom][p] = max(0.0, float(valeur))
+    return tailles
+
+
+def perturber(
+    donnees: tuple[dict[str, list[float]], ...],
+    ecart: float,
+    generateur: np.random.Generator,
+) -> tuple[dict[str, list[float]], ...]:
+    """
+    Perturbe la production d'électricité, les prix de l'énergie et la demande d'H2 :
+    chaque série est multipliée par un facteur propre au scénario et par un bruit horaire,
+    tous deux d'écart type relatif ecart (valeurs négatives ramenées à 0).
+
+    Args:
+        donnees (tuple[dict[str, list[float]], ...]):
+            Séries (Production_elec, Impact_elec, Prix_energie, Demande_H2).
+        ecart (float):
+            Écart type relatif des perturbations.
+        generateur (np.random.Generator):
+            Générateur aléatoire.
+
+    Returns:
+        tuple[dict[str, list[float]], ...]:
+            Les séries perturbées.
+    """
+    perturbees = []
+    for rang, serie in enumerate(donnees):
+        if rang not in PERTURBEES:
+            perturbees.append(serie)
+            continue
+        nouvelle = {}
+        for k, valeurs in serie.items():
+            valeurs = np.asarray(valeurs, dtype=np.float64)
+            facteur = 1 + ecart * generateur.standard_normal()
+            bruit = 1 + ecart * generateur.standard_normal(valeurs.size)
+            nouvelle[k] = np.maximum(valeurs * facteur * bruit, 0).tolist()
+        perturbees.append(nouvelle)
+    return tuple(perturbees)
+
+
+def generer_scenarios(
+    nombre: int,
+    debuts: list[int] | None = None,
+    fichier: str | None = None,
+    horizon: int | None = None,
+    ecart: float | None = None,
+    graine: int | None = None,
+) -> list[tuple[dict[str, list[float]], ...]]:
+    """
+    Scénarios de données : une fenêtre du fichier par début (par exemple une par année),
+    puis des perturbations de ces fenêtres jusqu'au nombre demandé.
+
+    Args:
+        nombre (int):
+            Nombre de scénarios (au moins le nombre de fenêtres).
+        debuts (list[int] | None, optional):
+            Première heure de chaque fenêtre. Defaults to None (séries de Donnees.data).
+        fichier (str | None, optional):
+            Fichier csv de données. Defaults to None (fichier de config.py).
+        horizon (int | None, optional):
+            Longueur des fenêtres - en heures. Defaults to None (config.Time_horizon).
+        ecart (float | None, optional):
+            Écart type relatif des perturbations (voir perturber). Defaults to None
+            (config.stochastique_ecart).
+        graine (int | None, optional):
+            Graine du générateur aléatoire. Defaults to None.
+
+    Returns:
+        list[tuple[dict[str, list[float]], ...]]:
+            Les séries de chaque scénario.
+    """
+    if ecart is None:
+        ecart = config.stochastique_ecart
+    if debuts is None:
+        fenetres = [
+            (data.Production_elec, data.Impact_elec, data.Prix_energie, data.Demande_H2)
+        ]
+    else:
+        if fichier is None:
+            fichier = data.fichier_données
+        if horizon is None:
+            horizon = data.Time_horizon
+        fenetres = [utils.read_data(fichier, horizon, debut_data=d) for d in debuts]
+    generateur = np.random.default_rng(graine)
+    return [
+        fenetres[k]
+        if k < len(fenetres)
+        else perturber(fenetres[k % len(fenetres)], ecart, generateur)
+        for k in range(max(nombre, len(fenetres)))
+    ]
+
+
+def construire_scenario(
+    donnees: tuple[dict[str, list[float]], ...],
+    emission_CO2_heure: bool,
+    poids: dict[str, float] | None = None,
+) -> pyo.ConcreteModel:
+    """
+    Modèle d'un scénario : init_model sur ses séries et objectif de dispatch (tailles
+    variables).
+
+    Args:
+        donnees (tuple[dict[str, list[float]], ...]):
+            Séries du scénario.
+        emission_CO2_heure (bool):
+            Option emission_CO2_heure de init_model.
+        poids (dict[str, float] | None, optional):
+            Poids des objectifs des acteurs (voir dispatch.coefficients). Defaults to None
+            (coût total de la chaîne).
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec l'objectif objectif.
+    """
+    model = modelisation.init_model(
+        emission_CO2_heure=emission_CO2_heure, donnees=donnees
+    )
+    dispatch.objectif_dispatch(model, dispatch.coefficients(poids, donnees[3]))
+    return model
+
+
+def ajouter_hedging(model: pyo.ConcreteModel) -> pyo.ConcreteModel:
+    """
+    Ajoute au modèle d'un scénario l'objectif de progressive hedging :
+    objectif + w.x + rho/2 (x - x_moy)^2 sur les variables de première étape, le terme
+    quadratique étant approché par TANGENTES tangentes de chaque côté de x_moy.
+
+    Les paramètres mutables ph_w, ph_moyenne et ph_rho (indexés par le rang de la
+    variable dans premiere_etape) sont modifiés à chaque itération sans reconstruire le
+    modèle.
+
+    Args:
+        model (pyo.ConcreteModel):
+            Le modèle du scénario (construire_scenario).
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec l'objectif objectif_ph actif (objectif désactivé).
+    """
+    variables = premiere_etape()
+    rangs = range(len(variables))
+    model.ph_w = pyo.Param(rangs, initialize=0.0, mutable=True)
+    model.ph_moyenne = pyo.Param(rangs, initialize=0.0, mutable=True)
+    model.ph_rho = pyo.Param(rangs, initialize=0.0, mutable=True)
+    # Epigraphe du terme quadratique de chaque variable
+    model.ph_proximal = pyo.Var(rangs, within=pyo.NonNegativeReals)
+
+    pentes = [s * 2.0**-k for s in (1, -1) for k in range(TANGENTES)]
+
+    # Tangente de rho/2 d^2 en d = a : rho/2 (2 a d - a^2)
+    def C_ph_tangente_rule(m, r, n):
+        nom, p = variables[r]
+        a = pentes[n] * (TAILLES_MAX[nom][p] or 1.0)
+        d = m.component(nom)[p] - m.ph_moyenne[r]
+        return m.ph_proximal[r] >= m.ph_rho[r] / 2 * (2 * a * d - a**2)
+
+    model.C_ph_tangente = pyo.Constraint(
+        rangs, range(len(pentes)), rule=C_ph_tangente_rule
+    )
+    model.objectif.deactivate()
+    model.objectif_ph = pyo.Objective(
+        expr=model.objectif.expr
+        + sum(
+            model.ph_w[r] * model.component(nom)[p] + model.ph_proximal[r]
+            for r, (nom, p) in enumerate(variables)
+        ),
+        sense=pyo.minimize,
+    )
+    return model
+
+
+def forme_etendue(
+    donnees_scenarios: list[tuple[dict[str, list[float]], ...]],
+    probabilites: list[float] | None = None,
+    emission_CO2_heure: bool | None = None,
+    poids: dict[str, float] | None = None,
+) -> pyo.ConcreteModel:
+    """
+    Forme étendue du modèle stochastique : un bloc par scénario (construire_scenario),
+    tailles égales à celles du premier scénario (non-anticipativité), espérance des
+    objectifs des scénarios.
+
+    Args:
+        donnees_scenarios (list[tuple[dict[str, list[float]], ...]]):
+            Séries de chaque scénario (generer_scenarios).
+        probabilites (list[float] | None, optional):
+            Probabilité de chaque scénario. Defaults to None (équiprobables).
+        emission_CO2_heure (bool | None, optional):
+            Option emission_CO2_heure de init_model. Defaults to None
+            (config.emission_CO2_heure).
+        poids (dict[str, float] | None, optional):
+            Poids des objectifs des acteurs (voir dispatch.coefficients). Defaults to None.
+
+    Returns:
+        pyo.ConcreteModel:
+            Le modèle avec les blocs scenario[k] et l'objectif objectif.
+    """
+    if emission_CO2_heure is None:
+        emission_CO2_heure = config.emission_CO2_heure
+    S = len(donnees_scenarios)
+    if probabilites is None:
+        probabilites = [1 / S] * S
+    model = pyo.ConcreteModel()
+    model.Scenarios = pyo.Set(initialize=range(S), ordered=True)
+    model.scenario = pyo.Block(model.Scenarios)
+    for k, donnees in enumerate(donnees_scenarios):
+        bloc = construire_scenario(donnees, emission_CO2_heure, poids)
+        bloc.objectif.deactivate()
+        model.scenario[k].transfer_attributes_from(bloc)
+
+    variables = premiere_etape()
+
+    # Non-anticipativité : mêmes tailles dans tous les scénarios
+    def C_non_anticipativite_rule(m, k, r):
+        if k == m.Scenarios.first():
+            return pyo.Constraint.Skip
+        nom, p = variables[r]
+        premier = m.scenario[m.Scenarios.first()]
+        return m.scenario[k].component(nom)[p] == premier.component(nom)[p]
+
+    model.C_non_anticipativite = pyo.Constraint(
+        model.Scenarios, range(len(variables)), rule=C_non_anticipativite_rule
+    )
+    model.objectif = pyo.Objective(
+        expr=sum(
+            probabilites[k] * model.scenario[k].objectif.expr for k in model.Scenarios
+        ),
+        sense=pyo.minimize,
+    )
+    return model
+
+
+def _resultat_scenario(model: pyo.ConcreteModel, results) -> dict[str, Any]:
+    statut = results.solver.termination_condition
+    resultat = {"statut": str(statut)}
+    if statut == TerminationCondition.optimal:
+        resultat["objectif"] = pyo.value(model.objectif)
+        resultat["x"] = _valeurs_premiere_etape(model)
+        resultat["fn_obj"] = {a: pyo.value(model.fn_obj[a]) for a in Acteurs}
+        resultat["Impact_prod"] = sum(
+            pyo.value(model.Impact_prod[p, t]) for p in Prod for t in model.Time
+        )
+    return resultat
+
+
+def resoudre_forme_etendue(
+    donnees_scenarios: list[tuple[dict[str, list[float]], ...]],
+    probabilites: list[float] | None = None,
+    emission_CO2_heure: bool | None = None,
+    poids: dict[str, float] | None = None,
+    display: bool = False,
+) -> dict[str, Any]:
+    """
+    Résout la forme étendue du modèle stochastique (petits cas).
+
+    Args:
+        donnees_scenarios (list[tuple[dict[str, list[float]], ...]]):
+            Séries de chaque scénario.
+        probabilites (list[float] | None, optional):
+            Probabilité de chaque scénario. Defaults to None (équiprobables).
+        emission_CO2_heure (bool | None, optional):
+            Option emission_CO2_heure de init_model. Defaults to None
+            (config.emission_CO2_heure).
+        poids (dict[str, float] | None, optional):
+            Poids des objectifs des acteurs. Defaults to None.
+        display (bool, optional):
+            Si True, affiche l'avancement. Defaults to False.
+
+    Raises:
+        solveur.AucuneSolution: Si la forme étendue n'a pas de solution.
+
+    Returns:
+        dict[str, Any]:
+            - "tailles" : tailles de première étape (format de fixer_tailles)
+            - "objectif" : espérance de l'objectif
+            - "scenarios" : objectif, fn_obj et impact CO2 de chaque scénario
+            - "temps" : temps de construction et de résolution - en secondes
+    """
+
+    def _print(texte: str) -> None:
+        if display:
+            print(texte)
+
+    start_time = time.time()
+    model = forme_etendue(donnees_scenarios, probabilites, emission_CO2_heure, poids)
+    _print(
+        f"Forme étendue : {len(donnees_scenarios)} scénarios, {model.nvariables()} variables"
+    )
+    results = solveur.resoudre(model)
+    solveur.exiger_solution(results, None, "La forme étendue")
+    premier = model.scenario[model.Scenarios.first()]
+    return {
+        "tailles": _tailles(_valeurs_premiere_etape(premier)),
+        "objectif": pyo.value(model.objectif),
+        "scenarios": [
+            _resultat_scenario(model.scenario[k], results) for k in model.Scenarios
+        ],
+        "temps": time.time() - start_time,
+    }
+
+
+def _construire_groupe(
+    groupe: list[tuple[int, tuple]], emission_CO2_heure: bool, poids
+) -> dict[int, tuple]:
+    # Modèle de hedging et solveur persistant de chaque scénario du groupe
+    return {
+        k: (
+            ajouter_hedging(construire_scenario(donnees, emission_CO2_heure, poids)),
+            solveur.creer_solveur(persistant=True),
+        )
+        for k, donnees in groupe
+    }
+
+
+def _executer(modeles: dict[int, tuple], commande: tuple) -> list[tuple[int, dict]]:
+    # Commande du coordinateur : ("resoudre", moyenne, w par scénario, rho) ou
+    # ("evaluer", tailles) ; résultat de chaque scénario du groupe
+    reponses = []
+    for k, (model, solver) in modeles.items():
+        if commande[0] == "resoudre":
+            _, moyenne, w, rho = commande
+            for r in range(len(moyenne)):
+                model.ph_moyenne[r] = moyenne[r]
+                model.ph_w[r] = w[k][r]
+                model.ph_rho[r] = rho[r]
+        else:
+            for r in model.ph_rho:
+                model.ph_w[r] = 0.0
+                model.ph_rho[r] = 0.0
+            modelisation.fixer_tailles(model, commande[1])
+        results = solveur.resoudre(model, solver, warmstart=True)
+        reponses.append((k, _resultat_scenario(model, results)))
+    return reponses
+
+
+def _hedging_processus(groupe, emission_CO2_heure, poids, commandes, resultats) -> None:
+    # Processus du pool : garde les modèles de son groupe de scénarios et exécute les
+    # commandes jusqu'à None
+    try:
+        modeles = _construire_groupe(groupe, emission_CO2_heure, poids)
+        while (commande := commandes.get()) is not None:
+            resultats.put(_executer(modeles, commande))
+    except Exception:
+        resultats.put(("erreur", traceback.format_exc()))
+
+
+def progressive_hedging(
+    donnees_scenarios: list[tuple[dict[str, list[float]], ...]],
+    probabilites: list[float] | None = None,
+    processus: int | None = None,
+    rho: float | None = None,
+    iterations: int | None = None,
+    tolerance: float | None = None,
+    emission_CO2_heure: bool | None = None,
+    poids: dict[str, float] | None = None,
+    display: bool = False,
+) -> dict[str, Any]:
+    """
+    Résout le modèle stochastique par progressive hedging, les sous-problèmes des
+    scénarios étant répartis entre plusieurs processus.
+
+    Args:
+        donnees_scenarios (list[tuple[dict[str, list[float]], ...]]):
+            Séries de chaque scénario.
+        probabilites (list[float] | None, optional):
+            Probabilité de chaque scénario. Defaults to None (équiprobables).
+        processus (int | None, optional):
+            Nombre de processus. Defaults to None (config.stochastique_processus, nombre
+            de coeurs si None).
+        rho (float | None, optional):
+            Facteur de la pénalité : rho d'une taille = facteur x CAPEX par heure x horizon
+            / écart moyen des tailles des scénarios à leur moyenne, recalculé à chaque
+            itération. Defaults to None (config.stochastique_rho).
+        iterations (int | None, optional):
+            Nombre maximal d'itérations. Defaults to None (config.stochastique_iterations).
+        tolerance (float | None, optional):
+            Écart moyen des tailles des scénarios à leur moyenne, relatif à la moyenne,
+            à la convergence (avertissement si le nombre maximal d'itérations est atteint
+            avant). Defaults to None (config.stochastique_tolerance).
+        emission_CO2_heure (bool | None, optional):
+            Option emission_CO2_heure de init_model. Defaults to None
+            (config.emission_CO2_heure).
+        poids (dict[str, float] | None, optional):
+            Poids des objectifs des acteurs (voir dispatch.coefficients). Defaults to None.
+        display (bool, optional):
+            Si True, affiche l'avancement. Defaults to False.
+
+    Raises:
+        solveur.AucuneSolution: Si un sous-problème n'a pas de solution optimale.
+        RuntimeError: Si un processus s'est arrêté sur une erreur.
+
+    Returns:
+        dict[str, Any]:
+            - "tailles" : consensus (moyenne des tailles des scénarios) à la dernière
+              itération (format de fixer_tailles)
+            - "objectif" : espérance de l'objectif à tailles fixées (nan si un scénario
+              est infaisable)
+            - "borne_inferieure" : espérance des optimums par scénario (itération 0)
+            - "iterations", "ecarts" : nombre d'itérations et écart à chaque itération
+            - "converge" : False si le nombre maximal d'itérations est atteint avant la
+              tolérance
+            - "scenarios" : évaluation de chaque scénario à tailles fixées
+            - "temps" : temps total - en secondes
+    """
+
+    def _print(texte: str) -> None:
+        if display:
+            print(texte)
+
+    if emission_CO2_heure is None:
+        emission_CO2_heure = config.emission_CO2_heure
+    if processus is None:
+        processus = config.stochastique_processus
+    if processus is None:
+        processus = os.cpu_count() or 1
+    if rho is None:
+        rho = config.stochastique_rho
+    if iterations is None:
+        iterations = config.stochastique_iterations
+    if tolerance is None:
+        tolerance = config.stochastique_tolerance
+    S = len(donnees_scenarios)
+    if probabilites is None:
+        probabilites = [1 / S] * S
+    probabilites = np.asarray(probabilites, dtype=np.float64)
+
+    start_time = time.time()
+    variables = premiere_etape()
+    horizon = len(donnees_scenarios[0][3][data.Cons[0]])
+    plancher = PLANCHER * np.array([TAILLES_MAX[nom][p] or 1.0 for nom, p in variables])
+    couts = horizon * np.array([CAPEX_t[nom][p] for nom, p in variables])
+
+    # Groupes de scénarios contigus, un par processus
+    processus = max(1, min(processus, S))
+    taille_groupe = math.ceil(S / processus)
+    groupes = [
+        [(k, donnees_scenarios[k]) for k in range(debut, min(debut + taille_groupe, S))]
+        for debut in range(0, S, taille_groupe)
+    ]
+    _print(f"{S} scénarios sur {len(groupes)} processus")
+
+    def _iteration(envoyer, commande) -> dict[int, dict]:
+        reponses = {}
+        for k, resultat in envoyer(commande):
+            if "x" not in resultat and commande[0] == "resoudre":
+                raise solveur.AucuneSolution(
+                    f"Progressive hedging : le scénario {k} n'a pas de solution "
+                    f"optimale ({resultat['statut']}).",
+                    None,
+                    "stochastique",
+                    infaisable=resultat["statut"]
+                    == str(TerminationCondition.infeasible),
+                )
+            reponses[k] = resultat
+        return reponses
+
+    def _boucle(envoyer) -> dict[str, Any]:
+        w = np.zeros((S, len(variables)))
+        moyenne = np.zeros(len(variables))
+        # Itération 0 sans pénalité : optimum de chaque scénario
+        rhos = np.zeros(len(variables))
+        ecarts = []
+        borne_inferieure = None
+        converge = False
+        iteration = 0
+        for iteration in range(iterations + 1):
+            reponses = _iteration(
+                envoyer, ("resoudre", moyenne.tolist(), w.tolist(), rhos.tolist())
+            )
+            x = np.array([reponses[k]["x"] for k in range(S)])
+            if iteration == 0:
+                borne_inferieure = float(
+                    probabilites @ [reponses[k]["objectif"] for k in range(S)]
+                )
+            moyenne = probabilites @ x
+            echelles = np.maximum(np.abs(moyenne), plancher)
+            ecart = float(
+                probabilites @ np.mean(np.abs(x - moyenne) / echelles, axis=1)
+            )
+            ecarts.append(ecart)
+            _print(f"Itération {iteration} : écart {ecart:.2e}")
+            if ecart <= tolerance:
+                converge = True
+                break
+            # rho proportionnel au coût de la taille sur l'horizon, divisé par l'écart
+            # des scénarios à la moyenne (Watson et Woodruff), recalculé à chaque
+            # itération : w varie d'environ facteur x coût par itération, même quand
+            # les scénarios se rapprochent
+            rhos = (
+                rho * couts / np.maximum(probabilites @ np.abs(x - moyenne), plancher)
+            )
+            w += rhos * (x - moyenne)
+        if not converge:
+            warnings.warn(
+                f"Progressive hedging : {iterations} itérations sans convergence (écart "
+                f"{ecarts[-1]:.2e} > {tolerance:.2e}), consensus évalué tel quel.",
+                stacklevel=3,
+            )
+        tailles = _tailles(moyenne)
+        evaluation = _iteration(envoyer, ("evaluer", tailles))
+        scenarios_evalues = [evaluation[k] for k in range(S)]
+        objectifs = [r.get("objectif", math.nan) for r in scenarios_evalues]
+        return {
+            "tailles": tailles,
+            "objectif": float(probabilites @ objectifs),
+            "borne_inferieure": borne_inferieure,
+            "iterations": iteration,
+            "converge": converge,
+            "ecarts": ecarts,
+            "scenarios": scenarios_evalues,
+        }
+
+    if len(groupes) > 1:
+        contexte = multiprocessing.get_context("spawn")
+        with (
+            contexte.Manager() as manager,
+            contexte.Pool(
+                processes=len(groupes),
+                initializer=scenarios.restaurer_config,
+                initargs=(scenarios.capturer_config(),),
+            ) as pool,
+        ):
+            commandes = [manager.Queue() for _ in groupes]
+            resultats = manager.Queue()
+            taches = [
+                pool.apply_async(
+                    _hedging_processus,
+                    (groupe, emission_CO2_heure, poids, file, resultats),
+                )
+                for groupe, file in zip(groupes, commandes)
+            ]
+
+            def envoyer(commande) -> list[tuple[int, dict]]:
+                for file in commandes:
+                    file.put(commande)
+                reponses = []
+                for _ in groupes:
+                    reponse = resultats.get()
+                    if reponse and reponse[0] == "erreur":
+                        raise RuntimeError(f"Processus de hedging :\n{reponse[1]}")
+                    reponses += reponse
+                return reponses
+
+            try:
+                resultat = _boucle(envoyer)
+            finally:
+                for file in commandes:
+                    file.put(None)
+                for tache in taches:
+                    tache.wait()
+    else:
+        modeles = _construire_groupe(groupes[0], emission_CO2_heure, poids)
+        resultat = _boucle(lambda commande: _executer(modeles, commande))
+    resultat["temps"] = time.time() - start_time
+    return resultat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Dimensionnement stochastique à deux étapes (progressive hedging ou forme étendue)."
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=int,
+        default=config.stochastique_scenarios,
+        help="Nombre de scénarios (défaut : un par processus).",
+    )
+    parser.add_argument("--processus", type=int, default=config.stochastique_processus)
+    parser.add_argument("--fichier", default=config.fichier_donnees)
+    parser.add_argument(
+        "--debuts",
+        type=int,
+        nargs="+",
+        default=[config.debut_data],
+        help="Début de chaque fenêtre du fichier (par exemple une par année).",
+    )
+    parser.add_argument("--horizon", type=int, default=config.Time_horizon)
+    parser.add_argument("--ecart", type=float, default=config.stochastique_ecart)
+    parser.add_argument("--graine", type=int, default=None)
+    parser.add_argument(
+        "--forme-etendue",
+        action="store_true",
+        help="Résout la forme étendue au lieu du progressive hedging.",
+    )
+    parser.add_argument("--sortie", default=None, help="Fichier json des tailles.")
+    args = parser.parse_args()
+
+    processus = args.processus if args.processus is not None else os.cpu_count() or 1
+    nombre = args.scenarios if args.scenarios is not None else processus
+    donnees_scenarios = generer_scenarios(
+        nombre,
+        debuts=args.debuts,
+        fichier=args.fichier,
+        horizon=args.horizon,
+        ecart=args.ecart,
+        graine=args.graine,
+    )
+    if args.forme_etendue:
+        resultat = resoudre_forme_etendue(donnees_scenarios, display=True)
+    else:
+        resultat = progressive_hedging(
+            donnees_scenarios, processus=processus, display=True
+        )
+        print(f"Borne inférieure : {resultat['borne_inferieure']:.2f}")
+    for nom, valeurs in resultat["tailles"].items():
+        for p, valeur in valeurs.items():
+            print(f"{nom:<22} {p:<30} {valeur:>12.4f}")
+    print(f"Espérance de l'objectif : {resultat['objectif']:.2f}")
+    print(f"Résolu en {resultat['temps']:.2f}s")
+    if args.sortie is not None:
+        with open(args.sortie, "w") as file:
+            json.dump(resultat["tailles"], file, indent=2)
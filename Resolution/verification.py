@@ -0,0 +1,495 @@
+import argparse
+import json
+import math
+import time
+import numpy as np
+import config as config
+import Donnees.data as data
+from Donnees.data import (
+    Prod,
+    Cons,
+    Energie,
+    Electricite,
+    Energies_autorisees,
+    P_electrolyseur,
+    P_SMR,
+    Rendement_electrolyseur,
+    Rendement_vaporeformage,
+    Taille_vaporeformeur,
+    Taille_max_electrolyseur,
+    Taille_max_stockage,
+    Taille_max_captage,
+    Impact_vaporeformage,
+    Impact_max,
+)
+import Resolution.simulation as simulation
+import Resolution.solveur as solveur
+
+# Vérification rapide de la faisabilité d'un scénario, sans construire ni résoudre le modèle.
+#
+# La demande d'H2 (C_cons_1) est comparée heure par heure à la production maximale du
+# réseau, calculée sur les séries (tableaux numpy, plusieurs fenêtres à la fois) :
+#   - électrolyseurs : taille max, énergie disponible des sources autorisées et plafond
+#     d'impact horaire (sources les moins émettrices d'abord) ;
+#   - SMR : taille du vaporeformeur et, avec le plafond horaire, taille max du captage ;
+#   - électricité partagée entre les producteurs qui n'utilisent que de l'électricité ;
+#   - stockage : un stock unique de la somme des tailles max, à moitié plein au début et
+#     à la fin, rempli dès que la production dépasse la demande.
+# Ces conditions sont nécessaires (relaxation du modèle) : un scénario signalé est
+# infaisable, un scénario non signalé peut encore l'être. Après la table des gains,
+# verifier_bornes signale les bornes de satisfaction incohérentes.
+#
+# Utilisation :
+#   python -m Resolution.verification
+#   python -m Resolution.verification --fichier Donnees/synthetique.csv --horizon 720 --debuts 0 720 1440
+
+# Violation tolérée, relative à la demande de l'heure (au moins 1 kgH2)
+TOLERANCE = 1e-6
+
+
+class ScenarioInfaisable(solveur.AucuneSolution):
+    """
+    Scénario infaisable détecté par la vérification préalable (sans résolution).
+
+    Attributes:
+        rapport (dict):
+            Rapport de la vérification (voir verifier_demande et verifier_bornes).
+    """
+
+    def __init__(self, message: str, rapport: dict):
+        super().__init__(message, None, phase="verification", infaisable=True)
+        self.rapport = rapport
+
+
+def _energie_max(
+    taille: float,
+    disponible: np.ndarray,
+    impact: np.ndarray,
+    plafond: float | None,
+) -> np.ndarray:
+    # Énergie maximale (N, T) achetée aux sources (N, k, T) dans la limite de la taille et
+    # du plafond d'impact moyen (kgCO2/MWh) : sources les moins émettrices d'abord, une
+    # source au-dessus du plafond n'est achetée que dans la marge laissée par les autres
+    if plafond is None:
+        return np.minimum(taille, disponible.sum(axis=1))
+    ordre = np.argsort(impact, axis=1, kind="stable")
+    disponible = np.take_along_axis(disponible, ordre, axis=1)
+    exces = np.take_along_axis(impact, ordre, axis=1) - plafond
+    reste = np.full(disponible[:, 0].shape, float(taille))
+    marge = np.zeros_like(reste)
+    energie = np.zeros_like(reste)
+    for r in range(disponible.shape[1]):
+        q = np.minimum(reste, disponible[:, r])
+        q = np.where(
+            exces[:, r] > 0,
+            np.minimum(q, marge / np.maximum(exces[:, r], 1e-12)),
+            q,
+        )
+        marge = marge - np.where(q > 0, exces[:, r] * q, 0)
+        energie += q
+        reste -= q
+    return energie
+
+
+def capacites(
+    series: dict[str, np.ndarray] | None = None,
+    emission_CO2_heure: bool = True,
+    tailles: dict[str, dict[str, float]] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Production d'H2 maximale de chaque producteur à chaque heure.
+
+    Args:
+        series (dict[str, np.ndarray] | None, optional):
+            Séries empilées (simulation.empiler_series, simulation.lire_annees).
+            Si None, séries de Donnees.data. Defaults to None.
+        emission_CO2_heure (bool, optional):
+            Si True, le plafond d'impact CO2 horaire limite la production. Defaults to True.
+        tailles (dict[str, dict[str, float]] | None, optional):
+            Tailles fixées (mode dispatch, voir modelisation.TAILLES). Si None, tailles max
+            du registre. Defaults to None.
+
+    Returns:
+        dict[str, np.ndarray]:
+            Indexés par [fenêtre, producteur, temps] (producteurs dans l'ordre de Prod) :
+            - "production" : production maximale - en kgH2
+            - "bride_energie" : True si l'énergie disponible limite la production
+            - "bride_co2" : True si le plafond d'impact limite la production
+            Et "offre" [fenêtre, temps] : production maximale du réseau (électricité
+            partagée comprise), "electrolyse" [fenêtre, temps] : celle des électrolyseurs.
+    """
+    if series is None:
+        series = simulation.empiler_series(
+            [
+                (
+                    data.Production_elec,
+                    data.Impact_elec,
+                    data.Prix_energie,
+                    data.Demande_H2,
+                )
+            ]
+        )
+    N, _, T = series["prix"].shape
+    production = np.zeros((N, len(Prod), T))
+    bride_energie = np.zeros((N, len(Prod), T), dtype=bool)
+    bride_co2 = np.zeros((N, len(Prod), T), dtype=bool)
+
+    for i, p in enumerate(Prod):
+        sources = [Energie.index(e) for e in Energies_autorisees[p]]
+        disponible = series["disponible"][:, sources]
+        impact = series["impact"][:, sources]
+        if p in P_electrolyseur:
+            rendement = Rendement_electrolyseur[p]
+            taille = (
+                Taille_max_electrolyseur[p]
+                if tailles is None
+                else tailles["Taille_electrolyseur"][p]
+            )
+            sans_plafond = _energie_max(taille, disponible, impact, None)
+            energie = sans_plafond
+            if emission_CO2_heure:
+                energie = _energie_max(
+                    taille, disponible, impact, Impact_max[p] * rendement
+                )
+            production[:, i] = energie * rendement
+        else:
+            rendement = Rendement_vaporeformage[p]
+            taille = Taille_vaporeformeur[p]
+            sans_plafond = _energie_max(taille, disponible, impact, None)
+            energie = sans_plafond
+            # Plafond horaire : (Impact_vaporeformage - Impact_max) * Q_H2_prod <= captage
+            if emission_CO2_heure and Impact_vaporeformage[p] > Impact_max[p]:
+                captage = (
+                    Taille_max_captage[p]
+                    if tailles is None
+                    else tailles["Taille_captage"][p]
+                )
+                energie = np.minimum(
+                    energie,
+                    captage / (Impact_vaporeformage[p] - Impact_max[p]) / rendement,
+                )
+            production[:, i] = energie * rendement
+        bride_energie[:, i] = sans_plafond < taille * (1 - TOLERANCE)
+        bride_co2[:, i] = energie < sans_plafond * (1 - TOLERANCE)
+
+    # Les producteurs n'utilisant que de l'électricité se partagent la production
+    # d'électricité des sources qu'ils utilisent
+    electriques = [
+        i for i, p in enumerate(Prod) if set(Energies_autorisees[p]) <= set(Electricite)
+    ]
+    autres = [i for i in range(len(Prod)) if i not in electriques]
+    offre = production[:, autres].sum(axis=1)
+    if electriques:
+        sources = sorted(
+            {
+                Energie.index(e)
+                for i in electriques
+                for e in Energies_autorisees[Prod[i]]
+            }
+        )
+        rendement_max = max(
+            Rendement_electrolyseur[Prod[i]]
+            if Prod[i] in P_electrolyseur
+            else Rendement_vaporeformage[Prod[i]]
+            for i in electriques
+        )
+        offre = offre + np.minimum(
+            production[:, electriques].sum(axis=1),
+            rendement_max * series["disponible"][:, sources].sum(axis=1),
+        )
+    indices_electrolyse = [Prod.index(p) for p in P_electrolyseur]
+    electrolyse = np.minimum(production[:, indices_electrolyse].sum(axis=1), offre)
+    return {
+        "production": production,
+        "bride_energie": bride_energie,
+        "bride_co2": bride_co2,
+        "offre": offre,
+        "electrolyse": electrolyse,
+    }
+
+
+def verifier_demande(
+    series: dict[str, np.ndarray] | None = None,
+    emission_CO2_heure: bool = True,
+    tailles: dict[str, dict[str, float]] | None = None,
+) -> list[dict]:
+    """
+    Vérifie que la demande d'H2 peut être servie à chaque heure (conditions nécessaires).
+
+    Args:
+        series (dict[str, np.ndarray] | None, optional):
+            Séries empilées (simulation.empiler_series, simulation.lire_annees).
+            Si None, séries de Donnees.data. Defaults to None.
+        emission_CO2_heure (bool, optional):
+            Si True, le plafond d'impact CO2 horaire limite la production. Defaults to True.
+        tailles (dict[str, dict[str, float]] | None, optional):
+            Tailles fixées (mode dispatch). Si None, tailles max du registre.
+            Defaults to None.
+
+    Returns:
+        list[dict]:
+            Un rapport par fenêtre :
+            - "realisable" : False si la fenêtre est infaisable
+            - "heures", "manque" : heures où la demande ne peut pas être servie et
+              quantité manquante - en kgH2
+            - "stock_final" : stock manquant à la fin pour revenir au stock initial - en kgH2
+            - "consommateurs" : demande de chaque consommateur aux heures signalées
+            - "producteurs" : nombre d'heures signalées où l'énergie disponible
+              ("bride_energie") ou le plafond CO2 ("bride_co2") limite chaque producteur
+    """
+    if series is None:
+        series = simulation.empiler_series(
+            [
+                (
+                    data.Production_elec,
+                    data.Impact_elec,
+                    data.Prix_energie,
+                    data.Demande_H2,
+                )
+            ]
+        )
+    capacite = capacites(series, emission_CO2_heure, tailles)
+    demande = series["demande"].sum(axis=1)
+    N, T = demande.shape
+    offre = capacite["offre"]
+    smr = capacite["production"][:, [Prod.index(p) for p in P_SMR]].sum(axis=1)
+
+    # Stock unique : rempli par la production des électrolyseurs au-delà de la demande
+    # (les SMR servent la demande en premier), vidé aux heures où la demande dépasse l'offre
+    taille_stock = sum(
+        Taille_max_stockage[p] if tailles is None else tailles["Taille_stockage"][p]
+        for p in P_electrolyseur
+    )
+    surplus = np.maximum(
+        np.minimum(
+            capacite["electrolyse"] - np.maximum(demande - smr, 0), offre - demande
+        ),
+        0,
+    )
+    deficit = np.maximum(demande - offre, 0)
+    stock = np.full(N, 0.5 * taille_stock)
+    manque = np.zeros((N, T))
+    for t in range(T):
+        stock = np.minimum(taille_stock, stock + surplus[:, t])
+        manque[:, t] = np.maximum(deficit[:, t] - stock, 0)
+        stock = np.maximum(stock - deficit[:, t], 0)
+    stock_final = np.maximum(0.5 * taille_stock - stock, 0)
+
+    signale = manque > TOLERANCE * np.maximum(demande, 1)
+    rapports = []
+    for n in range(N):
+        heures = np.nonzero(signale[n])[0]
+        rapports.append(
+            {
+                "realisable": bool(
+                    heures.size == 0
+                    and stock_final[n] <= TOLERANCE * max(taille_stock, 1)
+                ),
+                "heures": heures.tolist(),
+                "manque": manque[n, heures].tolist(),
+                "stock_final": float(stock_final[n]),
+                "consommateurs": {
+                    c: float(series["demande"][n, j, heures].sum())
+                    for j, c in enumerate(Cons)
+                },
+                "producteurs": {
+                    p: {
+                        "bride_energie": int(
+                            capacite["bride_energie"][n, i, heures].sum()
+                        ),
+                        "bride_co2": int(capacite["bride_co2"][n, i, heures].sum()),
+                    }
+                    for i, p in enumerate(Prod)
+                },
+            }
+        )
+    return rapports
+
+
+def verifier_bornes(
+    lower_bound: dict[str, float],
+    upper_bound: dict[str, float],
+    utopia: dict[str, float],
+    nadir: dict[str, float],
+) -> list[dict]:
+    """
+    Vérifie la cohérence des bornes de satisfaction avec la table des gains.
+
+    Args:
+        lower_bound (dict[str, float]):
+            Valeurs pour lesquelles tout acteur est satisfait au maximum.
+        upper_bound (dict[str, float]):
+            Valeurs pour lesquelles tout acteur n'est plus satisfait.
+        utopia (dict[str, float]):
+            Valeurs optimales (utopiques) par acteur.
+        nadir (dict[str, float]):
+            Valeurs nadir par acteur.
+
+    Returns:
+        list[dict]:
+            Les problèmes détectés ("acteur", "probleme", "bloquant"). Un problème
+            bloquant rend la fonction de satisfaction invalide (Goal Programming, max min).
+    """
+    problemes = []
+    for a in lower_bound:
+        valeurs = [lower_bound[a], upper_bound[a], utopia[a], nadir[a]]
+        if not all(math.isfinite(v) for v in valeurs):
+            problemes.append(
+                {"acteur": a, "probleme": "valeur non finie", "bloquant": True}
+            )
+        elif upper_bound[a] < lower_bound[a]:
+            # Producteur : utopie positive, vente à perte pour tout point réalisable
+            problemes.append(
+                {
+                    "acteur": a,
+                    "probleme": f"bornes inversées ({lower_bound[a]} > {upper_bound[a]})",
+                    "bloquant": True,
+                }
+            )
+        elif utopia[a] > upper_bound[a]:
+            problemes.append(
+                {
+                    "acteur": a,
+                    "probleme": f"utopie {utopia[a]} au-delà de la borne {upper_bound[a]} : satisfaction toujours nulle",
+                    "bloquant": False,
+                }
+            )
+        if (
+            math.isfinite(utopia[a])
+            and math.isfinite(nadir[a])
+            and nadir[a] < utopia[a]
+        ):
+            problemes.append(
+                {
+                    "acteur": a,
+                    "probleme": f"nadir {nadir[a]} meilleur que l'utopie {utopia[a]}",
+                    "bloquant": False,
+                }
+            )
+    return problemes
+
+
+def exiger_faisabilite(
+    emission_CO2_heure: bool = True,
+    tailles: dict[str, dict[str, float]] | None = None,
+) -> dict:
+    """
+    Vérifie la demande du scénario (séries de Donnees.data) et lève ScenarioInfaisable
+    si elle ne peut pas être servie.
+
+    Args:
+        emission_CO2_heure (bool, optional):
+            Option emission_CO2_heure du modèle. Defaults to True.
+        tailles (dict[str, dict[str, float]] | None, optional):
+            Tailles fixées (mode dispatch). Defaults to None.
+
+    Returns:
+        dict:
+            Le rapport de la vérification.
+
+    Raises:
+        ScenarioInfaisable: Si la demande ne peut pas être servie.
+    """
+    rapport = verifier_demande(emission_CO2_heure=emission_CO2_heure, tailles=tailles)[
+        0
+    ]
+    if not rapport["realisable"]:
+        if rapport["heures"]:
+            message = (
+                f"Demande non servie sur {len(rapport['heures'])} heure(s) "
+                f"(première : {rapport['heures'][0]}, manque total "
+                f"{sum(rapport['manque']):.2f} kgH2)."
+            )
+        else:
+            message = f"Stock final inférieur au stock initial de {rapport['stock_final']:.2f} kgH2."
+        raise ScenarioInfaisable(message, rapport)
+    return rapport
+
+
+def exiger_bornes(
+    lower_bound: dict[str, float],
+    upper_bound: dict[str, float],
+    utopia: dict[str, float],
+    nadir: dict[str, float],
+) -> list[dict]:
+    """
+    Vérifie les bornes de satisfaction et lève ScenarioInfaisable si un problème est
+    bloquant.
+
+    Args:
+        lower_bound (dict[str, float]):
+            Valeurs pour lesquelles tout acteur est satisfait au maximum.
+        upper_bound (dict[str, float]):
+            Valeurs pour lesquelles tout acteur n'est plus satisfait.
+        utopia (dict[str, float]):
+            Valeurs optimales (utopiques) par acteur.
+        nadir (dict[str, float]):
+            Valeurs nadir par acteur.
+
+    Returns:
+        list[dict]:
+            Les problèmes non bloquants détectés.
+
+    Raises:
+        ScenarioInfaisable: Si un problème est bloquant.
+    """
+    problemes = verifier_bornes(lower_bound, upper_bound, utopia, nadir)
+    bloquants = [p for p in problemes if p["bloquant"]]
+    if bloquants:
+        message = "Bornes de satisfaction incohérentes : " + ", ".join(
+            f"{p['acteur']} ({p['probleme']})" for p in bloquants
+        )
+        raise ScenarioInfaisable(message, {"bornes": problemes})
+    return problemes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Vérification de la faisabilité de la demande sans résolution."
+    )
+    parser.add_argument("--fichier", default=None)
+    parser.add_argument("--horizon", type=int, default=config.Time_horizon)
+    parser.add_argument(
+        "--debuts",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Première ligne de chaque fenêtre du fichier (défaut : données de config.py).",
+    )
+    parser.add_argument(
+        "--tailles",
+        default=None,
+        help="Fichier json des tailles fixées {nom: {producteur: valeur}}.",
+    )
+    args = parser.parse_args()
+
+    series = None
+    debuts = [config.debut_data]
+    if args.fichier is not None or args.debuts is not None:
+        debuts = args.debuts if args.debuts is not None else [0]
+        fichier = args.fichier if args.fichier is not None else config.fichier_donnees
+        series = simulation.lire_annees(fichier, debuts, args.horizon)
+    tailles = None
+    if args.tailles is not None:
+        with open(args.tailles, "r") as file:
+            tailles = json.load(file)
+    start_time = time.time()
+    rapports = verifier_demande(series, config.emission_CO2_heure, tailles)
+    duree = time.time() - start_time
+    for debut, rapport in zip(debuts, rapports):
+        if rapport["realisable"]:
+            print(f"Fenêtre {debut} : réalisable")
+            continue
+        print(
+            f"Fenêtre {debut} : infaisable, {len(rapport['heures'])} heure(s) non servie(s), "
+            f"stock final manquant {rapport['stock_final']:.2f} kgH2"
+        )
+        for h, m in list(zip(rapport["heures"], rapport["manque"]))[:10]:
+            print(f"   heure {h} : manque {m:.2f} kgH2")
+        for p, brides in rapport["producteurs"].items():
+            if brides["bride_energie"] or brides["bride_co2"]:
+                print(
+                    f"   {p} : limité par l'énergie {brides['bride_energie']}h, "
+                    f"par le plafond CO2 {brides['bride_co2']}h"
+                )
+    print(f"{len(rapports)} fenêtre(s) vérifiée(s) en {1000 * duree:.1f}ms")
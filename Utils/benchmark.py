@@ -0,0 +1,688 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import subprocess
+import sys
+import time
+import traceback
+import tracemalloc
+from typing import Any, Callable
+import pyomo.environ as pyo
+from pyomo.repn import generate_standard_repn
+import config as config
+import Resolution.solveur as solveur
+import Utils.scenarios as scenarios
+
+try:
+    import resource
+except ImportError:
+    # Windows : pas de mesure du pic de mémoire résidente
+    resource = None
+
+# Banc de mesure de la chaîne d'optimisation complète.
+#
+# Chaque configuration (horizon, contrainte CO2, optimisation des prix) est exécutée dans
+# un processus neuf (contexte "spawn") car Donnees.data lit les options à l'import.
+# Les phases de main.py sont mesurées séparément : temps, pic mémoire et taille du modèle.
+# Les résultats sont enregistrés en JSON pour être comparés d'un commit à l'autre.
+# Le suivi des allocations Python (tracemalloc) ralentit la construction du modèle : il
+# n'est activé qu'à la demande (--memoire), dans une exécution distincte des mesures de
+# temps de référence.
+#
+# Utilisation :
+#   python -m Utils.benchmark --horizons 24 168 --sortie Resultats/benchmarks/ref.json
+#   python -m Utils.benchmark --horizons 24 168 --comparer Resultats/benchmarks/ref.json
+#   python -m Utils.benchmark --horizons 24 168 --memoire --sortie memoire.json
+#   python -m Utils.benchmark --comparer ref.json --avec nouveau.json
+
+HORIZONS = [24, 168, 720, 2190, 8736]
+
+PHASES = [
+    "donnees",
+    "init_model",
+    "optim_individuelle",
+    "goal_programming",
+    "init_model_max_min",
+    "max_min_satisfaction",
+    "rapport",
+]
+
+# En dessous de cette durée (en secondes) un écart de temps est considéré comme du bruit
+BRUIT_TEMPS = 0.05
+
+
+def nommer_configuration(configuration: dict[str, Any]) -> str:
+    """
+    Return the name of a benchmark configuration, e.g. "T168_CO2heure_prixfixe".
+    """
+    return (
+        f"T{configuration['Time_horizon']}"
+        + ("_CO2heure" if configuration["emission_CO2_heure"] else "_CO2global")
+        + (
+            "_prixmenu"
+            if configuration["optim_prix"] == "menu"
+            else "_prixoptim"
+            if configuration["optim_prix"]
+            else "_prixfixe"
+        )
+    )
+
+
+def configurations(
+    horizons: list[int] = HORIZONS,
+    emission_CO2_heure: list[bool] = [True, False],
+    optim_prix: list[bool | str] = [False, True],
+) -> list[dict[str, Any]]:
+    """
+    Build the benchmark configurations (cartesian product of the given options).
+
+    Args:
+        horizons (list[int], optional):
+            Time_horizon values. Defaults to HORIZONS.
+        emission_CO2_heure (list[bool], optional):
+            emission_CO2_heure values. Defaults to [True, False].
+        optim_prix (list[bool | str], optional):
+            optim_prix values (False, True or "menu"). Defaults to [False, True].
+
+    Returns:
+        list[dict[str, Any]]:
+            One dict of config.py options per configuration.
+    """
+    return scenarios.grille_scenarios(
+        {
+            "Time_horizon": horizons,
+            "emission_CO2_heure": emission_CO2_heure,
+            "optim_prix": optim_prix,
+        }
+    )
+
+
+def taille_model(model: pyo.ConcreteModel) -> dict[str, int]:
+    """
+    Measure the size of a model: active variables, binaries, constraints and nonzeros.
+
+    Args:
+        model (pyo.ConcreteModel):
+            The Pyomo model.
+
+    Returns:
+        dict[str, int]:
+            The size indicators of the model.
+    """
+    variables = list(model.component_data_objects(pyo.Var, active=True))
+    contraintes = list(model.component_data_objects(pyo.Constraint, active=True))
+    return {
+        "variables": len(variables),
+        "binaires": sum(1 for v in variables if v.is_binary()),
+        "contraintes": len(contraintes),
+        "non_zeros": sum(
+            len(generate_standard_repn(c.body, compute_values=False).linear_vars)
+            for c in contraintes
+        ),
+    }
+
+
+def _rss_pic_cumule_mo() -> dict[str, float]:
+    # Pic de mémoire résidente du processus et des sous-processus (solveurs par fichier)
+    # depuis le début du processus : ru_maxrss est un maximum courant, pas le pic de la
+    # phase (une phase ne l'augmente que si elle dépasse le pic des phases précédentes)
+    if resource is None:
+        return {}
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    unite = 1024**2 if sys.platform == "darwin" else 1024
+    return {
+        "rss_pic_cumule_mo": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unite,
+        "rss_pic_cumule_enfants_mo": resource.getrusage(
+            resource.RUSAGE_CHILDREN
+        ).ru_maxrss
+        / unite,
+    }
+
+
+def mesurer_configuration(
+    options: dict[str, Any],
+    phases: list[str] = PHASES,
+    dossier: str | None = None,
+    suivi_memoire: bool = False,
+) -> dict[str, Any]:
+    """
+    Run the phases of main.py for one configuration and measure each of them.
+
+    Must run in a fresh process: the options are applied before Donnees.data is imported.
+    Graphs are only generated (inside the goal_programming and max_min_satisfaction
+    phases, as in main.py) when the "rapport" phase is requested.
+
+    Args:
+        options (dict[str, Any]):
+            config.py options of the configuration.
+        phases (list[str], optional):
+            Phases to run, among PHASES. The phases a requested phase depends on
+            are always run. Defaults to PHASES.
+        dossier (str | None, optional):
+            Output folder of the graphs and report. Defaults to None.
+        suivi_memoire (bool, optional):
+            If True, the peak of Python allocations of each phase is measured with
+            tracemalloc. Tracing slows down model building, so the times of such a run
+            are not comparable to untraced baselines. Defaults to False.
+
+    Returns:
+        dict[str, Any]:
+            Status and measures of each phase: "temps" (s), "memoire_python_mo" (peak
+            of the phase, only with suivi_memoire), "rss_pic_cumule_mo" and
+            "rss_pic_cumule_enfants_mo" (resident memory peak of the process and its
+            children since the process started, up to the end of the phase) and
+            "taille" of the model.
+    """
+    resultat = {"statut": "ok", "phases": {}}
+    rapport_pdf = "rapport" in phases
+    if rapport_pdf and dossier is None:
+        raise ValueError("La phase 'rapport' nécessite un dossier de sortie.")
+    dossier_resultats = dossier if rapport_pdf else None
+    if dossier_resultats is not None:
+        os.makedirs(dossier_resultats, exist_ok=True)
+
+    def mesurer(phase: str, fonction: Callable[[], Any]) -> Any:
+        if suivi_memoire:
+            tracemalloc.reset_peak()
+            debut_memoire = tracemalloc.get_traced_memory()[0]
+        start_time = time.perf_counter()
+        retour = fonction()
+        mesure = {"temps": time.perf_counter() - start_time}
+        if suivi_memoire:
+            mesure["memoire_python_mo"] = (
+                tracemalloc.get_traced_memory()[1] - debut_memoire
+            ) / 1024**2
+        mesure.update(_rss_pic_cumule_mo())
+        resultat["phases"][phase] = mesure
+        return retour
+
+    if suivi_memoire:
+        tracemalloc.start()
+    try:
+        for cle, valeur in options.items():
+            setattr(config, cle, valeur)
+
+        def importer_donnees():
+            import Donnees.data as data
+
+            return data
+
+        data = mesurer("donnees", importer_donnees)
+        import Definition.modelisation as modelisation
+        import Resolution.optim_individuelle as optim_indiv
+        import Resolution.point_nadir as p_nad
+        import Resolution.goal_programming as gp
+        import Resolution.max_min_satisfaction as max_min
+        import Utils.rapport_latex as rapport
+
+        resultat["acteurs"] = len(data.Acteurs)
+
+        def construire():
+            return modelisation.init_model(
+                emission_CO2_heure=config.emission_CO2_heure,
+                optim_prix=config.optim_prix,
+            )
+
+        model_gp = mesurer("init_model", construire)
+        resultat["phases"]["init_model"]["taille"] = taille_model(model_gp)
+        if not set(phases) - {"donnees", "init_model"}:
+            return resultat
+
+        # Prix de contrat des solutions de la table des gains (enveloppes de McCormick)
+        prix_contrat = {}
+
+        def individuelle():
+            point_utopia, point_nadir, point_worst, priority_results = (
+                optim_indiv.optim_individuelle(model_gp, prix_contrat=prix_contrat)
+            )
+            return (
+                point_utopia,
+                p_nad.point_nadir(
+                    point_nadir, model=model_gp, priority_results=priority_results
+                ),
+                point_worst,
+                priority_results,
+            )
+
+        point_utopia, point_nadir, point_worst, priority_results = mesurer(
+            "optim_individuelle", individuelle
+        )
+        lower_bound, upper_bound = optim_indiv.bornes_satisfaction(point_utopia)
+        if config.optim_prix:
+            modelisation.resserrer_prix(model_gp, prix_contrat)
+        bornes = {
+            "lower_bound": lower_bound,
+            "upper_bound": upper_bound,
+            "utopia": point_utopia,
+            "nadir": point_nadir,
+        }
+
+        if "goal_programming" in phases or rapport_pdf:
+            f_gp, satisf_gp, CO2_gp = mesurer(
+                "goal_programming",
+                lambda: gp.goal_programming(
+                    model_gp,
+                    **bornes,
+                    display=False,
+                    dossier_resultats=dossier_resultats,
+                ),
+            )
+            resultat["phases"]["goal_programming"]["taille"] = taille_model(model_gp)
+
+        if "max_min_satisfaction" in phases or rapport_pdf:
+            model_mm = mesurer("init_model_max_min", construire)
+            if config.optim_prix:
+                modelisation.resserrer_prix(model_mm, prix_contrat)
+            f_mm, satisf_mm, CO2_mm, _ = mesurer(
+                "max_min_satisfaction",
+                lambda: max_min.max_min_satisfaction(
+                    model_mm,
+                    **bornes,
+                    display=False,
+                    optim_prix=config.optim_prix,
+                    dossier_resultats=dossier_resultats,
+                ),
+            )
+            resultat["phases"]["max_min_satisfaction"]["taille"] = taille_model(
+                model_mm
+            )
+
+        if rapport_pdf:
+            results = {
+                "Options d'optimisation": {
+                    "Prix_variable": config.optim_prix,
+                    "Contrainte_CO2": config.emission_CO2_heure,
+                },
+                "Optimisations Individuelles": {
+                    "Table de priorité": priority_results,
+                    "Point Idéal": point_utopia,
+                    "Pire Point": point_worst,
+                    "Point Nadir": point_nadir,
+                    "Temps": resultat["phases"]["optim_individuelle"]["temps"],
+                },
+                "Goal Programming": {
+                    **{
+                        a: {"Fonction objective": f_gp[a], "Satisfaction": satisf_gp[a]}
+                        for a in data.Acteurs
+                    },
+                    "Impact CO2": CO2_gp,
+                    "Sankey": "GP_sankey.png",
+                    "Model": model_gp,
+                    "Temps": resultat["phases"]["goal_programming"]["temps"],
+                },
+                "Max min satisfaction": {
+                    **{
+                        a: {
+                            "Fonction objective": f_mm.get(a, f_gp[a]),
+                            "Satisfaction": satisf_mm.get(a, satisf_gp[a]),
+                        }
+                        for a in data.Acteurs
+                    },
+                    "Impact CO2": CO2_mm,
+                    "Evolution maxmin": "evolution_maxmin.png",
+                    "Sankey": "max_min_sankey.png",
+                    "Model": model_mm,
+                    "Temps": resultat["phases"]["max_min_satisfaction"]["temps"],
+                },
+            }
+            mesurer(
+                "rapport",
+                lambda: rapport.rapport_latex(
+                    filename=os.path.join(dossier, "Fichier_resultat"),
+                    title="Rapport d'optimisation",
+                    results=results,
+                ),
+            )
+    except solveur.AucuneSolution as e:
+        # Une résolution de la chaîne n'a fourni aucune solution
+        resultat["statut"] = "infaisable" if e.infaisable else "sans_solution"
+    except Exception:
+        resultat["statut"] = "erreur"
+        resultat["erreur"] = traceback.format_exc()
+    finally:
+        if suivi_memoire:
+            tracemalloc.stop()
+    return resultat
+
+
+def _mesurer_processus(file: multiprocessing.Queue, *args) -> None:
+    file.put(mesurer_configuration(*args))
+
+
+def executer_configuration(
+    options: dict[str, Any],
+    phases: list[str] = PHASES,
+    dossier: str | None = None,
+    suivi_memoire: bool = False,
+    delai: float | None = None,
+) -> dict[str, Any]:
+    """
+    Measure one configuration in a fresh process, killed after `delai` seconds.
+
+    Args:
+        options (dict[str, Any]):
+            config.py options of the configuration.
+        phases (list[str], optional):
+            Phases to run. Defaults to PHASES.
+        dossier (str | None, optional):
+            Output folder of the graphs and report. Defaults to None.
+        suivi_memoire (bool, optional):
+            Measure the peak of Python allocations (slows down the timed phases).
+            Defaults to False.
+        delai (float | None, optional):
+            Time limit of the configuration in seconds. Defaults to None (no limit).
+
+    Returns:
+        dict[str, Any]:
+            The measures (see mesurer_configuration), with the "timeout" status if
+            the time limit is reached.
+    """
+    contexte = multiprocessing.get_context("spawn")
+    file = contexte.Queue()
+    processus = contexte.Process(
+        target=_mesurer_processus,
+        args=(file, options, phases, dossier, suivi_memoire),
+    )
+    processus.start()
+    try:
+        resultat = file.get(timeout=delai)
+    except queue.Empty:
+        processus.terminate()
+        resultat = {"statut": "timeout", "phases": {}}
+    processus.join()
+    if "statut" not in resultat:
+        resultat = {"statut": "erreur", "phases": {}}
+    return resultat
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executer_benchmark(
+    liste_configurations: list[dict[str, Any]],
+    phases: list[str] = PHASES,
+    repetitions: int = 1,
+    dossier: str | None = None,
+    suivi_memoire: bool = False,
+    delai: float | None = None,
+) -> dict[str, Any]:
+    """
+    Measure every configuration, one fresh process per configuration and repetition.
+
+    For each phase the fastest repetition time is kept (the least noisy estimate)
+    together with the largest memory peak.
+
+    Args:
+        liste_configurations (list[dict[str, Any]]):
+            config.py options of each configuration (see configurations).
+        phases (list[str], optional):
+            Phases to run. Defaults to PHASES.
+        repetitions (int, optional):
+            Number of runs of each configuration. Defaults to 1.
+        dossier (str | None, optional):
+            Output folder of the graphs and reports (one subfolder per configuration).
+            Defaults to None.
+        suivi_memoire (bool, optional):
+            Measure the peak of Python allocations (slows down the timed phases).
+            Defaults to False.
+        delai (float | None, optional):
+            Time limit of each run in seconds. Defaults to None.
+
+    Returns:
+        dict[str, Any]:
+            The benchmark baseline: commit, machine, solver and measures of each configuration.
+    """
+    options_parent = scenarios.capturer_config()
+    benchmark = {
+        "commit": _commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "plateforme": platform.platform(),
+            "processeur": platform.processor(),
+            "cpu": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "solveur": config.solveur,
+        "solveur_threads": config.solveur_threads,
+        "fichier_donnees": config.fichier_donnees,
+        "suivi_memoire": suivi_memoire,
+        "configurations": {},
+    }
+    for configuration in liste_configurations:
+        nom = nommer_configuration(configuration)
+        mesures = []
+        for _ in range(repetitions):
+            mesures.append(
+                executer_configuration(
+                    {**options_parent, **configuration},
+                    phases=phases,
+                    dossier=None if dossier is None else os.path.join(dossier, nom),
+                    suivi_memoire=suivi_memoire,
+                    delai=delai,
+                )
+            )
+            if mesures[-1]["statut"] != "ok":
+                break
+
+        resultat = {**configuration, "statut": mesures[-1]["statut"], "phases": {}}
+        for cle in ["acteurs", "erreur"]:
+            if cle in mesures[-1]:
+                resultat[cle] = mesures[-1][cle]
+        for phase in PHASES:
+            valeurs = [m["phases"][phase] for m in mesures if phase in m["phases"]]
+            if not valeurs:
+                continue
+            resultat["phases"][phase] = {
+                "temps": min(v["temps"] for v in valeurs),
+                "temps_repetitions": [v["temps"] for v in valeurs],
+                **{
+                    cle: max(v[cle] for v in valeurs)
+                    for cle in [
+                        "memoire_python_mo",
+                        "rss_pic_cumule_mo",
+                        "rss_pic_cumule_enfants_mo",
+                    ]
+                    if cle in valeurs[0]
+                },
+                **({"taille": valeurs[0]["taille"]} if "taille" in valeurs[0] else {}),
+            }
+        resultat["temps_total"] = sum(p["temps"] for p in resultat["phases"].values())
+        benchmark["configurations"][nom] = resultat
+        print(f"{nom}: {resultat['statut']} ({resultat['temps_total']:.2f}s)")
+    return benchmark
+
+
+def comparer(
+    reference: dict[str, Any], courant: dict[str, Any], seuil: float = 0.1
+) -> list[dict[str, Any]]:
+    """
+    Compare two benchmark baselines phase by phase.
+
+    A phase regresses when its time grows by more than `seuil` (relative) and by more
+    than BRUIT_TEMPS seconds, or when its Python memory peak grows by more than `seuil`.
+
+    Args:
+        reference (dict[str, Any]):
+            The reference baseline (e.g. of the previous commit).
+        courant (dict[str, Any]):
+            The baseline to check.
+        seuil (float, optional):
+            Relative tolerance. Defaults to 0.1.
+
+    Returns:
+        list[dict[str, Any]]:
+            One row per configuration and phase measured in both baselines.
+    """
+    lignes = []
+    for nom, conf in courant["configurations"].items():
+        if nom not in reference["configurations"]:
+            continue
+        conf_ref = reference["configurations"][nom]
+        if conf["statut"] != conf_ref["statut"]:
+            lignes.append(
+                {
+                    "configuration": nom,
+                    "phase": "statut",
+                    "reference": conf_ref["statut"],
+                    "courant": conf["statut"],
+                    "regression": conf["statut"] != "ok",
+                }
+            )
+        for phase, mesure in conf["phases"].items():
+            if phase not in conf_ref["phases"]:
+                continue
+            mesure_ref = conf_ref["phases"][phase]
+            ratio = mesure["temps"] / max(mesure_ref["temps"], 1e-9)
+            regression = (
+                ratio > 1 + seuil
+                and mesure["temps"] - mesure_ref["temps"] > BRUIT_TEMPS
+            )
+            ligne = {
+                "configuration": nom,
+                "phase": phase,
+                "reference": round(mesure_ref["temps"], 4),
+                "courant": round(mesure["temps"], 4),
+                "ratio": round(ratio, 3),
+            }
+            if "memoire_python_mo" in mesure and "memoire_python_mo" in mesure_ref:
+                ratio_memoire = mesure["memoire_python_mo"] / max(
+                    mesure_ref["memoire_python_mo"], 1e-9
+                )
+                ligne["ratio_memoire"] = round(ratio_memoire, 3)
+                regression = regression or (
+                    ratio_memoire > 1 + seuil
+                    and mesure["memoire_python_mo"] - mesure_ref["memoire_python_mo"]
+                    > 1
+                )
+            ligne["regression"] = regression
+            lignes.append(ligne)
+    return lignes
+
+
+def afficher_comparaison(lignes: list[dict[str, Any]]) -> None:
+    """
+    Print a comparison table made by comparer.
+    """
+    print(
+        f"{'configuration':<28}{'phase':<24}{'reference':>12}{'courant':>12}{'ratio':>8}"
+    )
+    for ligne in lignes:
+        print(
+            f"{ligne['configuration']:<28}{ligne['phase']:<24}"
+            f"{ligne['reference']!s:>12}{ligne['courant']!s:>12}"
+            f"{ligne.get('ratio', ''):>8}"
+            + ("  <- regression" if ligne["regression"] else "")
+        )
+
+
+def lire_benchmark(fichier: str) -> dict[str, Any]:
+    """
+    Read a benchmark baseline written by the command line.
+    """
+    with open(fichier, "r") as file:
+        return json.load(file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Banc de mesure de la chaîne d'optimisation."
+    )
+    parser.add_argument("--horizons", type=int, nargs="+", default=HORIZONS)
+    parser.add_argument(
+        "--emission-CO2-heure",
+        dest="emission_CO2_heure",
+        choices=["true", "false"],
+        nargs="+",
+        default=["true", "false"],
+    )
+    parser.add_argument(
+        "--optim-prix",
+        dest="optim_prix",
+        choices=["true", "false", "menu"],
+        nargs="+",
+        default=["false", "true"],
+    )
+    parser.add_argument(
+        "--phases",
+        nargs="+",
+        choices=PHASES,
+        default=[p for p in PHASES if p != "rapport"],
+        help="Phases mesurées (la phase rapport génère aussi les graphiques).",
+    )
+    parser.add_argument("--repetitions", type=int, default=1)
+    parser.add_argument(
+        "--delai", type=float, default=None, help="Temps limite par exécution (s)."
+    )
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--fichier", default=None, help="Fichier csv de données.")
+    parser.add_argument(
+        "--memoire",
+        action="store_true",
+        help="Mesure le pic d'allocations Python de chaque phase (tracemalloc, ralentit "
+        "les phases : temps non comparables à une référence sans suivi).",
+    )
+    parser.add_argument("--sortie", default=None, help="Fichier JSON de résultats.")
+    parser.add_argument(
+        "--comparer", default=None, help="Fichier JSON de référence à comparer."
+    )
+    parser.add_argument(
+        "--avec",
+        default=None,
+        help="Compare ce fichier JSON à la référence sans lancer de mesure.",
+    )
+    parser.add_argument("--seuil", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.avec is not None:
+        if args.comparer is None:
+            parser.error("--avec nécessite --comparer.")
+        courant = lire_benchmark(args.avec)
+    else:
+        config.solveur_threads = args.threads
+        if args.fichier is not None:
+            config.fichier_donnees = args.fichier
+        sortie = args.sortie or os.path.join(
+            "Resultats", "benchmarks", f"benchmark_{_commit() or 'local'}.json"
+        )
+        os.makedirs(os.path.dirname(sortie) or ".", exist_ok=True)
+        courant = executer_benchmark(
+            configurations(
+                args.horizons,
+                [e == "true" for e in args.emission_CO2_heure],
+                [{"true": True, "false": False}.get(o, o) for o in args.optim_prix],
+            ),
+            phases=args.phases,
+            repetitions=args.repetitions,
+            dossier=os.path.join(os.path.dirname(sortie) or ".", "rapports"),
+            suivi_memoire=args.memoire,
+            delai=args.delai,
+        )
+        with open(sortie, "w") as file:
+            json.dump(courant, file, indent=2)
+        print(f"Résultats enregistrés dans {sortie}")
+
+    if args.comparer is not None:
+        reference = lire_benchmark(args.comparer)
+        if reference.get("suivi_memoire", True) != courant.get("suivi_memoire", True):
+            print(
+                "Attention : une seule des deux mesures suit la mémoire (tracemalloc), "
+                "les temps ne sont pas comparables."
+            )
+        lignes = comparer(reference, courant, seuil=args.seuil)
+        afficher_comparaison(lignes)
+        if any(ligne["regression"] for ligne in lignes):
+            sys.exit(1)
@@ -0,0 +1,298 @@
+import argparse
+import collections
+import json
+import sys
+import time
+from typing import Any, TextIO
+import pyomo.environ as pyo
+from pyomo.opt import TerminationCondition
+import config as config
+import Donnees.data as data
+from Donnees.data import Prod, Cons, Energies_autorisees, P_electrolyseur
+import Definition.modelisation as modelisation
+import Resolution.dispatch as dispatch
+import Resolution.solveur as solveur
+import Utils.utils as utils
+
+# Exploitation en horizon glissant alimentée par un flux de données.
+#
+# Chaque nouvelle ligne du flux (fichier csv complété au fil de l'eau, entrée standard ou
+# tube nommé) donne les séries d'une heure. Dès que les N heures t, ..., t+N-1 sont
+# connues, l'exploitation de ces N heures est réoptimisée à tailles fixées (objectif de
+# Resolution.dispatch) et seules les décisions de l'heure t sont appliquées : le stock
+# réalisé à la fin de l'heure t devient le stock initial du pas suivant. Le stock final de
+# la fenêtre doit atteindre la moitié du stockage (comme C_prod_elec_6) ; si c'est
+# impossible, il ne doit pas descendre sous le stock initial (toujours faisable).
+#
+# Le modèle (construit une fois sur N heures) et le solveur persistant restent en mémoire :
+# à chaque pas, seules les séries décalées d'une heure et le stock initial changent.
+# Si une résolution n'aboutit pas (temps limite sans solution), l'heure suit le plan du pas
+# précédent.
+#
+# Les décisions de chaque heure sont écrites sur stdout (un objet JSON par ligne) et le
+# temps de résolution de chaque pas sur stderr.
+#
+# Utilisation :
+#   python -m Utils.horizon_glissant --tailles tailles.json --source Donnees/flux.csv --horizon 24
+#   producteur_de_donnees | python -m Utils.horizon_glissant --tailles tailles.json --source -
+
+
+def _log(texte: str) -> None:
+    # stdout est réservé aux décisions
+    print(f"[horizon] {texte}", file=sys.stderr, flush=True)
+
+
+def stock_glissant(model: pyo.ConcreteModel) -> pyo.ConcreteModel:
+    """
+    Replace the storage boundary conditions of the model by a carried-forward state.
+
+    C_prod_elec_5 and C_prod_elec_6 (initial and final stock equal to half the storage)
+    are deactivated. The initial stock is the mutable parameter stock_initial and the
+    final stock must be at least the mutable parameter stock_final.
+
+    Args:
+        model (pyo.ConcreteModel):
+            The Pyomo model built with fixed sizes.
+
+    Returns:
+        pyo.ConcreteModel:
+            The model with stock_initial, stock_final, C_stock_initial and C_stock_final.
+    """
+    model.C_prod_elec_5.deactivate()
+    model.C_prod_elec_6.deactivate()
+    moitie = {p: 0.5 * pyo.value(model.Taille_stockage[p]) for p in P_electrolyseur}
+    model.stock_initial = pyo.Param(
+        P_electrolyseur, initialize=lambda m, p: moitie[p], mutable=True
+    )
+    model.stock_final = pyo.Param(
+        P_electrolyseur, initialize=lambda m, p: moitie[p], mutable=True
+    )
+
+    def C_stock_initial_rule(m, p):
+        return m.Q_H2_init_stock[p] == m.stock_initial[p]
+
+    model.C_stock_initial = pyo.Constraint(P_electrolyseur, rule=C_stock_initial_rule)
+
+    def C_stock_final_rule(m, p):
+        return m.Q_H2_stock[p, m.Time.last()] >= m.stock_final[p]
+
+    model.C_stock_final = pyo.Constraint(P_electrolyseur, rule=C_stock_final_rule)
+    return model
+
+
+def _decisions(model: pyo.ConcreteModel, t: int) -> dict[str, Any]:
+    # Décisions de l'heure t de la fenêtre
+    return {
+        "Q_H2_prod": {p: pyo.value(model.Q_H2_prod[p, t]) for p in Prod},
+        "Q_H2_stock": {p: pyo.value(model.Q_H2_stock[p, t]) for p in P_electrolyseur},
+        "Q_H2_vendu": {
+            p: {c: pyo.value(model.Q_H2_vendu[p, c, t]) for c in Cons} for p in Prod
+        },
+        "Q_energie": {
+            p: {e: pyo.value(model.Q_energie[p, e, t]) for e in Energies_autorisees[p]}
+            for p in Prod
+        },
+        "Impact_prod": {p: pyo.value(model.Impact_prod[p, t]) for p in Prod},
+    }
+
+
+def initialiser(
+    tailles: dict[str, dict[str, float]],
+    horizon: int,
+    emission_CO2_heure: bool | None = None,
+    temps_max: float | None = None,
+) -> dict[str, Any]:
+    """
+    Create the state of the receding-horizon loop (the model is built with the first
+    full window).
+
+    Args:
+        tailles (dict[str, dict[str, float]]):
+            Fixed sizes tailles[name][producer] (see modelisation.TAILLES).
+        horizon (int):
+            Number of hours N optimised at each step.
+        emission_CO2_heure (bool | None, optional):
+            Hourly CO2 limit, or limit over each window. Defaults to None
+            (config.emission_CO2_heure).
+        temps_max (float | None, optional):
+            Time limit of each solve - in seconds. Defaults to None (no limit).
+
+    Returns:
+        dict[str, Any]:
+            The state: sizes, window of the last hours, model, solver, realized stock,
+            plan of the last step and index of the next hour to decide.
+    """
+    if emission_CO2_heure is None:
+        emission_CO2_heure = config.emission_CO2_heure
+    return {
+        "tailles": tailles,
+        "horizon": horizon,
+        "emission_CO2_heure": emission_CO2_heure,
+        "temps_max": temps_max,
+        "fenetre": collections.deque(maxlen=horizon),
+        "model": None,
+        "solver": None,
+        "stock": {p: 0.5 * tailles["Taille_stockage"][p] for p in P_electrolyseur},
+        "plan": [],
+        "heure": 0,
+    }
+
+
+def _construire(etat: dict[str, Any], donnees: tuple) -> None:
+    # Modèle de la fenêtre et solveur persistant (premier pas ou changement de structure)
+    model = modelisation.init_model(
+        emission_CO2_heure=etat["emission_CO2_heure"],
+        donnees=donnees,
+        tailles=etat["tailles"],
+    )
+    dispatch.objectif_dispatch(model, dispatch.coefficients(None, donnees[3]))
+    stock_glissant(model)
+    etat["model"], etat["solver"] = model, solveur.creer_solveur(persistant=True)
+
+
+def pas(
+    etat: dict[str, Any],
+    heure: tuple[
+        dict[str, float], dict[str, float], dict[str, float], dict[str, float]
+    ],
+) -> dict[str, Any] | None:
+    """
+    Add one hour of data and, once the window is full, decide the first hour of the window.
+
+    Args:
+        etat (dict[str, Any]):
+            The state created by initialiser.
+        heure (tuple[dict[str, float], ...]):
+            Production, impact, prices and demand of the new hour (utils.stream_data).
+
+    Returns:
+        dict[str, Any] | None:
+            The decisions of the decided hour with its index ("heure"), the solve status
+            and time, or None while the window is not full.
+    """
+    etat["fenetre"].append(heure)
+    if len(etat["fenetre"]) < etat["horizon"]:
+        return None
+    donnees = tuple(
+        {k: [h[i][k] for h in etat["fenetre"]] for k in heure[i]} for i in range(4)
+    )
+    if etat["model"] is None:
+        _construire(etat, donnees)
+    else:
+        try:
+            modelisation.charger_donnees(etat["model"], *donnees)
+        except ValueError:
+            # La demande d'un consommateur sur la fenêtre devient nulle ou non nulle
+            _log("Structure de la fenêtre modifiée : reconstruction du modèle")
+            _construire(etat, donnees)
+    model = etat["model"]
+    moitie = {p: 0.5 * etat["tailles"]["Taille_stockage"][p] for p in P_electrolyseur}
+    for p in P_electrolyseur:
+        model.stock_initial[p] = etat["stock"][p]
+        model.stock_final[p] = moitie[p]
+
+    start_time = time.time()
+    results = solveur.resoudre(model, etat["solver"], temps_max=etat["temps_max"])
+    if results.solver.termination_condition == TerminationCondition.infeasible:
+        # Stock final cible inatteignable dans la fenêtre : ne pas descendre plus bas
+        for p in P_electrolyseur:
+            model.stock_final[p] = min(etat["stock"][p], moitie[p])
+        results = solveur.resoudre(model, etat["solver"], temps_max=etat["temps_max"])
+    temps = time.time() - start_time
+    statut = results.solver.termination_condition
+    if solveur.solution_disponible(results):
+        plan = [_decisions(model, t) for t in model.Time]
+        etat["plan"] = plan[1:]
+        decision = plan[0]
+    elif etat["plan"]:
+        # Suivre le plan du pas précédent
+        decision = etat["plan"].pop(0)
+    else:
+        decision = None
+    if decision is not None:
+        etat["stock"] = dict(decision["Q_H2_stock"])
+    _log(f"heure {etat['heure']} : {statut} en {temps:.3f}s")
+    resultat = {"heure": etat["heure"], "statut": str(statut), "temps": temps}
+    if decision is not None:
+        resultat.update(decision)
+    etat["heure"] += 1
+    return resultat
+
+
+def executer(
+    tailles: dict[str, dict[str, float]],
+    source: str | TextIO,
+    horizon: int = 24,
+    sortie: TextIO = sys.stdout,
+    debut_data: int = 0,
+    suivre: bool = True,
+    temps_max: float | None = None,
+) -> int:
+    """
+    Run the receding-horizon loop on a data stream until the stream ends.
+
+    Args:
+        tailles (dict[str, dict[str, float]]):
+            Fixed sizes tailles[name][producer].
+        source (str | TextIO):
+            CSV data source (see utils.stream_data).
+        horizon (int, optional):
+            Number of hours optimised at each step. Defaults to 24.
+        sortie (TextIO, optional):
+            Stream where the decisions are written (one JSON object per line).
+            Defaults to sys.stdout.
+        debut_data (int, optional):
+            Number of data rows to skip. Defaults to 0.
+        suivre (bool, optional):
+            If True, waits for new rows at the end of a file. Defaults to True.
+        temps_max (float | None, optional):
+            Time limit of each solve - in seconds. Defaults to None.
+
+    Returns:
+        int:
+            The number of decided hours.
+    """
+    etat = initialiser(tailles, horizon, temps_max=temps_max)
+    for heure in utils.stream_data(source, debut_data=debut_data, suivre=suivre):
+        resultat = pas(etat, heure)
+        if resultat is not None:
+            sortie.write(json.dumps(resultat) + "\n")
+            sortie.flush()
+    return etat["heure"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Exploitation en horizon glissant sur un flux de données."
+    )
+    parser.add_argument(
+        "--tailles",
+        required=True,
+        help="Fichier json des tailles {nom: {producteur: valeur}} (voir modelisation.TAILLES).",
+    )
+    parser.add_argument(
+        "--source",
+        default=data.fichier_données,
+        help="Fichier csv suivi au fil de l'eau, ou \"-\" pour l'entrée standard.",
+    )
+    parser.add_argument("--horizon", type=int, default=24)
+    parser.add_argument("--debut", type=int, default=0)
+    parser.add_argument(
+        "--sans-suivi",
+        action="store_true",
+        help="S'arrête à la fin du fichier au lieu d'attendre de nouvelles lignes.",
+    )
+    parser.add_argument("--temps-max", type=float, default=None)
+    args = parser.parse_args()
+
+    with open(args.tailles, "r") as file:
+        tailles = json.load(file)
+    heures = executer(
+        tailles,
+        args.source,
+        horizon=args.horizon,
+        debut_data=args.debut,
+        suivre=not args.sans_suivi,
+        temps_max=args.temps_max,
+    )
+    _log(f"{heures} heures décidées")
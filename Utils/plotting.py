@@ -57,8 +57,10 @@ def sankey_flow_diag(model: pyo.ConcreteModel, filename: str) -> None:
                             sum(
                                 pyo.value(model.Q_energie[i, e, t])
                                 * data.Rendement_electrolyseur[i]
-                                for t in data.Time
+                                for t in model.Time
                             )
+                            if e in data.Energies_autorisees[i]
+                            else 0
                             for i in data.P_electrolyseur
                             for e in data.Energie
                         ],
@@ -66,13 +68,17 @@ def sankey_flow_diag(model: pyo.ConcreteModel, filename: str) -> None:
                             sum(
                                 pyo.value(model.Q_energie[i, e, t])
                                 * data.Rendement_vaporeformage[i]
-                                for t in data.Time
+                                for t in model.Time
                             )
+                            if e in data.Energies_autorisees[i]
+                            else 0
                             for i in data.P_SMR
                             for e in data.Energie
                         ],
                         *[
-                            sum(pyo.value(model.Q_H2_vendu[i, j, t]) for t in data.Time)
+                            sum(
+                                pyo.value(model.Q_H2_vendu[i, j, t]) for t in model.Time
+                            )
                             for j in data.Cons
                             for i in data.Prod
                         ],
@@ -158,3 +164,48 @@ def plot_data(
     )
     fig.suptitle(titre)
     plt.savefig(file_name, bbox_inches="tight", dpi=300)
+
+
+def plot_front_pareto(
+    file_name: str,
+    front: dict,
+    x: str,
+    y: str,
+    couleur: str | None = None,
+) -> None:
+    """
+    Scatter plot of the non-dominated points of a Pareto front.
+
+    Args:
+        file_name (str):
+            Path where the generated plot image will be saved.
+        front (dict):
+            Front arrays returned by Resolution.front_pareto.front_pareto
+            (or read with lire_front).
+        x (str):
+            Objective on the x axis (an actor or "CO2").
+        y (str):
+            Objective on the y axis.
+        couleur (str | None, optional):
+            Objective used to colour the points. Defaults to None.
+    """
+    colonnes = list(front["colonnes"])
+    valeurs = front["valeurs"][front["non_domine"]]
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    if couleur is None:
+        ax.scatter(valeurs[:, colonnes.index(x)], valeurs[:, colonnes.index(y)])
+    else:
+        points = ax.scatter(
+            valeurs[:, colonnes.index(x)],
+            valeurs[:, colonnes.index(y)],
+            c=valeurs[:, colonnes.index(couleur)],
+            cmap="viridis",
+        )
+        fig.colorbar(points, ax=ax, label=couleur)
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    ax.grid(linestyle="--", alpha=0.7)
+    fig.suptitle("Front de Pareto")
+    plt.savefig(file_name, bbox_inches="tight", dpi=300)
+    plt.close(fig)
@@ -142,7 +142,7 @@ def rapport_latex(filename: str, title: str, results: dict[str, Any]) -> None:
                                     (
                                         sum(
                                             pyo.value(model.Q_H2_a_vendre[p, t])
-                                            for t in data.Time
+                                            for t in model.Time
                                             if model.Q_H2_a_vendre[p, t].value
                                             is not None
                                         )
@@ -158,7 +158,7 @@ def rapport_latex(filename: str, title: str, results: dict[str, Any]) -> None:
                         row = ["Total d'achat d'énergie - en MWh"]
                         for p in data.Prod:
                             row += [
-                                f"{sum(pyo.value(model.Q_energie_total[p, t]) for t in data.Time):.2f}"
+                                f"{sum(pyo.value(model.Q_energie_total[p, t]) for t in model.Time):.2f}"
                             ]
                         table.add_row(row)
                         table.add_hline()
@@ -181,7 +181,7 @@ def rapport_latex(filename: str, title: str, results: dict[str, Any]) -> None:
                                     (
                                         sum(
                                             pyo.value(model.Impact_prod[p, t])
-                                            for t in data.Time
+                                            for t in model.Time
                                             if model.Impact_prod[p, t] is not None
                                         )
                                     ),
@@ -225,7 +225,7 @@ def rapport_latex(filename: str, title: str, results: dict[str, Any]) -> None:
                                         (
                                             sum(
                                                 pyo.value(model.Q_energie_total[p, t])
-                                                for t in data.Time
+                                                for t in model.Time
                                                 if model.Q_energie_total[p, t]
                                                 is not None
                                             )
@@ -267,7 +267,7 @@ def rapport_latex(filename: str, title: str, results: dict[str, Any]) -> None:
                                         (
                                             sum(
                                                 pyo.value(model.Q_H2_stock_in[p, t])
-                                                for t in data.Time
+                                                for t in model.Time
                                                 if model.Q_H2_stock_in[p, t] is not None
                                             )
                                         )
@@ -305,7 +305,7 @@ def rapport_latex(filename: str, title: str, results: dict[str, Any]) -> None:
                             ["CO2 Capté - en kgCO2"]
                             + ["" for _ in data.P_electrolyseur]
                             + [
-                                f"{sum(pyo.value(model.Captage[p, t]) for t in data.Time):.2f}"
+                                f"{sum(pyo.value(model.Captage[p, t]) for t in model.Time):.2f}"
                                 for p in data.P_SMR
                             ]
                         )
@@ -340,7 +340,7 @@ def rapport_latex(filename: str, title: str, results: dict[str, Any]) -> None:
                         for p in data.Prod:
                             q_tot = sum(
                                 pyo.value(model.Q_energie_total[p, t])
-                                for t in data.Time
+                                for t in model.Time
                             )
                             if q_tot != 0:
                                 enr += [
@@ -359,7 +359,7 @@ def rapport_latex(filename: str, title: str, results: dict[str, Any]) -> None:
                         for p in range(len(data.Prod)):
                             q_tot = sum(
                                 pyo.value(model.Q_energie_total[data.Prod[p], t])
-                                for t in data.Time
+                                for t in model.Time
                             )
                             if q_tot != 0:
                                 if p < len(data.P_electrolyseur):
@@ -411,13 +411,12 @@ def rapport_latex(filename: str, title: str, results: dict[str, Any]) -> None:
             [results[method][a]["Satisfaction"] for a in data.Acteurs]
             for method in labels_fn
         ]
-        plot.plot_data(
-            "Resultats\\temp.png", data_satisf, labels_fn, data.Acteurs, "", "", ""
-        )
+        temp_png = os.path.join(os.path.dirname(filename), "temp.png")
+        plot.plot_data(temp_png, data_satisf, labels_fn, data.Acteurs, "", "", "")
         with doc.create(Figure(position="h!")) as fig:
             fig.add_image("temp.png", width=NoEscape(r"0.8\textwidth"))
             fig.add_caption("Comparaison of the satisfaction of the different methods")
 
     doc.generate_pdf(filename, clean_tex=True, compiler="pdflatex")
-    if os.path.exists("Resultats\\temp.png"):
-        os.remove("Resultats\\temp.png")
+    if os.path.exists(temp_png):
+        os.remove(temp_png)
@@ -0,0 +1,380 @@
+import argparse
+import copy
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from typing import Any
+import config as config
+import Donnees.memoire_partagee as memoire_partagee
+import Resolution.solveur as solveur
+
+# Exécution de plusieurs scénarios (jeux d'options de config.py) en parallèle.
+#
+# Donnees.data lit les options de config.py à l'import : chaque scénario est donc
+# exécuté dans un processus neuf (contexte "spawn", un scénario par processus) où les
+# options sont modifiées avant l'import de la chaîne d'optimisation.
+#
+# Utilisation :
+#   python -m Utils.scenarios --scenarios scenarios.json --processus 4 --threads 2
+#   python -m Utils.scenarios --grille Time_horizon=24,168 --grille optim_prix=false,true
+
+# Options de config.py modifiables par scénario
+PARAMETRES = [
+    "fichier_acteurs",
+    "Time_horizon",
+    "debut_data",
+    "emission_CO2_heure",
+    "optim_prix",
+    "segments_mccormick",
+    "Prix_vente_H2",
+    "degradation_acceptable",
+    "budgets_phases",
+    "delai_total",
+    "contraintes_paresseuses",
+    "verification_prealable",
+    "sensibilite",
+    "segmentation",
+]
+
+
+def lire_scenarios(fichier: str) -> list[dict[str, Any]]:
+    """
+    Read a scenario file.
+
+    The file is a JSON list of objects. Each object holds the config.py options
+    to override and optionally a "nom" key naming the scenario.
+    Prix_vente_H2 may be partial: given prices replace the default ones.
+
+    Args:
+        fichier (str):
+            Path to the JSON scenario file.
+
+    Returns:
+        list[dict[str, Any]]:
+            The scenarios read from the file.
+    """
+    with open(fichier, "r") as file:
+        scenarios = json.load(file)
+    if not isinstance(scenarios, list):
+        raise ValueError("Le fichier de scénarios doit contenir une liste.")
+    return scenarios
+
+
+def grille_scenarios(
+    grille: dict[str, list[Any]], base: list[dict[str, Any]] | None = None
+) -> list[dict[str, Any]]:
+    """
+    Build the cartesian product of a parameter grid, optionally over base scenarios.
+
+    Args:
+        grille (dict[str, list[Any]]):
+            Values taken by each option, e.g. {"Time_horizon": [24, 168]}.
+        base (list[dict[str, Any]] | None, optional):
+            Scenarios combined with every point of the grid. Defaults to None.
+
+    Returns:
+        list[dict[str, Any]]:
+            One scenario per combination.
+    """
+    if base is None:
+        base = [{}]
+    cles = list(grille.keys())
+    scenarios = []
+    for scenario in base:
+        for valeurs in itertools.product(*(grille[c] for c in cles)):
+            scenarios.append({**scenario, **dict(zip(cles, valeurs))})
+    return scenarios
+
+
+def nommer_scenario(scenario: dict[str, Any], numero: int) -> str:
+    """
+    Return the scenario name, built from its options if it has none.
+    """
+    if "nom" in scenario:
+        return str(scenario["nom"])
+    morceaux = []
+    for cle in PARAMETRES:
+        if cle not in scenario or isinstance(scenario[cle], dict):
+            continue
+        valeur = scenario[cle]
+        if cle.startswith("fichier_"):
+            # Nom du fichier sans dossier ni extension
+            valeur = os.path.splitext(os.path.basename(valeur))[0]
+        morceaux.append(f"{cle}={valeur}")
+    return f"{numero:03d}_" + "_".join(morceaux) if morceaux else f"{numero:03d}"
+
+
+def appliquer_parametres(parametres: dict[str, Any]) -> None:
+    """
+    Override the config.py options with the scenario values.
+
+    Args:
+        parametres (dict[str, Any]):
+            Options of the scenario (the "nom" key is ignored).
+
+    Raises:
+        ValueError: If an option is not one of PARAMETRES.
+    """
+    for cle, valeur in parametres.items():
+        if cle == "nom":
+            continue
+        if cle not in PARAMETRES:
+            raise ValueError(f"'{cle}' n'est pas une option de scénario valide.")
+        if cle == "Prix_vente_H2":
+            prix = copy.deepcopy(config.Prix_vente_H2)
+            for p, prix_p in valeur.items():
+                prix.setdefault(p, {}).update(prix_p)
+            valeur = prix
+        setattr(config, cle, valeur)
+
+
+def capturer_config() -> dict[str, Any]:
+    """
+    Snapshot the current config.py options.
+
+    Spawned worker processes re-import config.py with its default values: the snapshot
+    is passed to restaurer_config as pool initializer so the workers use the same options
+    as the parent process.
+
+    If Donnees.data is already loaded, its time series are published once in shared
+    memory (Donnees.memoire_partagee): workers created afterwards with the same data
+    window attach to them instead of reading the CSV file again.
+
+    Returns:
+        dict[str, Any]:
+            The options of config.py.
+    """
+    data = sys.modules.get("Donnees.data")
+    if data is not None:
+        memoire_partagee.publier(
+            (
+                data.Production_elec,
+                data.Impact_elec,
+                data.Prix_energie,
+                data.Demande_H2,
+            ),
+            data.fichier_données,
+            data.debut_data,
+            data.Time_horizon,
+        )
+    return {
+        cle: copy.deepcopy(valeur)
+        for cle, valeur in vars(config).items()
+        if not cle.startswith("_") and not isinstance(valeur, type(config))
+    }
+
+
+def restaurer_config(options: dict[str, Any]) -> None:
+    """
+    Apply an option snapshot made by capturer_config.
+
+    Must be called before Donnees.data is imported in the process.
+    """
+    for cle, valeur in options.items():
+        setattr(config, cle, valeur)
+
+
+def executer_scenario(
+    nom: str,
+    parametres: dict[str, Any],
+    dossier: str,
+    threads: int | None,
+    rapport_pdf: bool,
+) -> dict[str, Any]:
+    """
+    Run the full main pipeline for one scenario and write its result artifact.
+
+    Must run in a fresh process: the options are applied before Donnees.data is imported.
+
+    Args:
+        nom (str):
+            Name of the scenario.
+        parametres (dict[str, Any]):
+            Options of the scenario.
+        dossier (str):
+            Output folder of the scenario (graphs, report and resultat.json).
+        threads (int | None):
+            Solver thread limit of the worker.
+        rapport_pdf (bool):
+            If True, generate the LaTeX report.
+
+    Returns:
+        dict[str, Any]:
+            The content of the result artifact.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    resultat = {"nom": nom, "parametres": parametres}
+    start_time = time.time()
+    try:
+        appliquer_parametres(parametres)
+        config.solveur_threads = threads
+        import main
+
+        resultat["resultats"] = main.main(
+            dossier_resultats=dossier, rapport_pdf=rapport_pdf
+        )
+        resultat["statut"] = "ok"
+    except solveur.AucuneSolution as e:
+        # Une résolution de la chaîne n'a fourni aucune solution
+        resultat["statut"] = "infaisable" if e.infaisable else "sans_solution"
+        if e.phase == "verification":
+            # Détecté par la vérification préalable, sans résolution
+            resultat["verification"] = e.rapport
+    except Exception:
+        resultat["statut"] = "erreur"
+        resultat["erreur"] = traceback.format_exc()
+    resultat["temps"] = time.time() - start_time
+
+    with open(os.path.join(dossier, "resultat.json"), "w") as file:
+        json.dump(resultat, file, indent=2, default=str)
+    return resultat
+
+
+def _executer_scenario(args: tuple) -> dict[str, Any]:
+    return executer_scenario(*args)
+
+
+def ligne_resume(resultat: dict[str, Any]) -> dict[str, Any]:
+    """
+    Flatten a scenario result into one row of the summary table.
+    """
+    ligne = {"nom": resultat["nom"], "statut": resultat["statut"]}
+    for cle in PARAMETRES:
+        if cle in resultat["parametres"]:
+            valeur = resultat["parametres"][cle]
+            ligne[cle] = json.dumps(valeur) if isinstance(valeur, dict) else valeur
+    ligne["temps"] = round(resultat["temps"], 2)
+    for method, res in resultat.get("resultats", {}).items():
+        if "Satisfaction" not in res:
+            continue
+        ligne[f"{method} - Impact CO2"] = res["Impact CO2"]
+        for a, s in res["Satisfaction"].items():
+            ligne[f"{method} - Satisfaction {a}"] = s
+        for a, f in res["Fonction objective"].items():
+            ligne[f"{method} - Objectif {a}"] = f
+        if "Ecart McCormick" in res:
+            ligne[f"{method} - Ecart McCormick"] = res["Ecart McCormick"]["relatif"]
+        for phase, r in res.get("Resolutions", {}).items():
+            ligne[f"{method} - Ecart solveur {phase}"] = r["ecart_max"]
+    return ligne
+
+
+def ecrire_tableau(lignes: list[dict[str, Any]], fichier: str) -> None:
+    """
+    Write table rows to a semicolon-separated CSV file.
+
+    Args:
+        lignes (list[dict[str, Any]]):
+            The rows; the columns are the union of their keys.
+        fichier (str):
+            Path to the CSV file.
+    """
+    colonnes = []
+    for ligne in lignes:
+        colonnes += [c for c in ligne if c not in colonnes]
+    with open(fichier, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=colonnes, delimiter=";")
+        writer.writeheader()
+        writer.writerows(lignes)
+
+
+def executer_scenarios(
+    scenarios: list[dict[str, Any]],
+    sortie: str = "Resultats/scenarios",
+    processus: int = 1,
+    threads: int | None = None,
+    rapport_pdf: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Run several scenarios in a process pool and write a summary table.
+
+    Each scenario gets its own subfolder of `sortie` with a resultat.json artifact,
+    the summary of all scenarios is written to `sortie`/resume.csv.
+
+    Args:
+        scenarios (list[dict[str, Any]]):
+            Options of each scenario.
+        sortie (str, optional):
+            Output folder. Defaults to "Resultats/scenarios".
+        processus (int, optional):
+            Number of worker processes. Defaults to 1.
+        threads (int | None, optional):
+            Solver thread limit of each worker. Defaults to None.
+        rapport_pdf (bool, optional):
+            If True, generate the LaTeX report of each scenario. Defaults to False.
+
+    Returns:
+        list[dict[str, Any]]:
+            Results of the scenarios, in input order.
+    """
+    os.makedirs(sortie, exist_ok=True)
+    taches = []
+    for numero, scenario in enumerate(scenarios):
+        nom = nommer_scenario(scenario, numero)
+        parametres = {k: v for k, v in scenario.items() if k != "nom"}
+        taches.append(
+            (nom, parametres, os.path.join(sortie, nom), threads, rapport_pdf)
+        )
+
+    # Un processus neuf par scénario : les données sont lues à l'import
+    contexte = multiprocessing.get_context("spawn")
+    with contexte.Pool(processes=processus, maxtasksperchild=1) as pool:
+        resultats = []
+        for resultat in pool.imap(_executer_scenario, taches):
+            print(f"{resultat['nom']}: {resultat['statut']} ({resultat['temps']:.1f}s)")
+            resultats.append(resultat)
+
+    ecrire_tableau(
+        [ligne_resume(r) for r in resultats], os.path.join(sortie, "resume.csv")
+    )
+    return resultats
+
+
+def _lire_grille(arguments: list[str]) -> dict[str, list[Any]]:
+    # Format: option=valeur1,valeur2 ; chaque valeur est lue en JSON si possible
+    grille = {}
+    for argument in arguments:
+        cle, _, valeurs = argument.partition("=")
+        grille[cle] = []
+        for valeur in valeurs.split(","):
+            try:
+                grille[cle].append(json.loads(valeur))
+            except json.JSONDecodeError:
+                grille[cle].append(valeur)
+    return grille
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Exécution parallèle de scénarios d'optimisation."
+    )
+    parser.add_argument("--scenarios", help="Fichier JSON de scénarios.")
+    parser.add_argument(
+        "--grille",
+        action="append",
+        default=[],
+        help="Grille sur une option : option=valeur1,valeur2 (répétable).",
+    )
+    parser.add_argument("--sortie", default="Resultats/scenarios")
+    parser.add_argument("--processus", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--threads", type=int, default=None, help="Threads solveur par processus."
+    )
+    parser.add_argument("--rapport", action="store_true", help="Génère les rapports.")
+    args = parser.parse_args()
+
+    base = lire_scenarios(args.scenarios) if args.scenarios else None
+    scenarios = grille_scenarios(_lire_grille(args.grille), base)
+    executer_scenarios(
+        scenarios,
+        sortie=args.sortie,
+        processus=args.processus,
+        threads=args.threads,
+        rapport_pdf=args.rapport,
+    )
+    print("Done")
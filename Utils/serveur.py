@@ -0,0 +1,234 @@
+import argparse
+import io
+import json
+import socketserver
+import sys
+import time
+from typing import Any, TextIO
+import pyomo.environ as pyo
+import config as config
+import Definition.modelisation as modelisation
+import Donnees.data as data
+import Resolution.optim_individuelle as optim_indiv
+import Resolution.point_nadir as p_nad
+import Resolution.goal_programming as gp
+import Resolution.max_min_satisfaction as max_min
+import Resolution.solveur as solveur
+
+# Mode serveur : le modèle, la table des gains (payoff) et un solveur persistant restent
+# en mémoire pour répondre rapidement à des questions de type "et si ...".
+#
+# Une requête est un objet JSON par ligne, par exemple :
+#   {"methode": "gp", "Prix_vente_H2": {"P2_electrolyse": {"C2_mobilite": 10.5}}}
+#   {"methode": "max_min", "upper_bound": {"C1_industriel": 9}}
+#   {"methode": "payoff"}
+#   {"methode": "quitter"}
+# La réponse est un objet JSON par ligne.
+#
+# Utilisation :
+#   python -m Utils.serveur               (stdin / stdout)
+#   python -m Utils.serveur --port 5050   (socket locale)
+
+
+def _log(texte: str) -> None:
+    # stdout est réservé aux réponses
+    print(f"[serveur] {texte}", file=sys.stderr, flush=True)
+
+
+def initialiser() -> dict[str, Any]:
+    """
+    Build the model, the persistent solver and the payoff table kept in memory.
+
+    Returns:
+        dict[str, Any]:
+            The server state: model, solver, payoff points and satisfaction bounds.
+    """
+    start_time = time.time()
+    model = modelisation.init_model(
+        emission_CO2_heure=config.emission_CO2_heure, optim_prix=config.optim_prix
+    )
+    etat = {"model": model, "solver": solveur.creer_solveur(persistant=True)}
+    _log(f"Modèle construit en {time.time() - start_time:.3f}s")
+    calculer_payoff(etat)
+    return etat
+
+
+def calculer_payoff(etat: dict[str, Any]) -> None:
+    """
+    (Re)compute the payoff table and the default satisfaction bounds of the state.
+
+    Args:
+        etat (dict[str, Any]):
+            The server state, updated in place.
+    """
+    start_time = time.time()
+    modelisation.reinitialiser_model(etat["model"])
+    point_utopia, point_nadir, point_worst, priority_results = (
+        optim_indiv.optim_individuelle(etat["model"], solver=etat["solver"])
+    )
+    etat["utopia"] = point_utopia
+    etat["nadir"] = p_nad.point_nadir(
+        point_nadir, model=etat["model"], priority_results=priority_results
+    )
+    etat["worst"] = point_worst
+    etat["lower_bound"], etat["upper_bound"] = optim_indiv.bornes_satisfaction(
+        point_utopia
+    )
+    _log(f"Table des gains calculée en {time.time() - start_time:.3f}s")
+
+
+def traiter_requete(etat: dict[str, Any], requete: dict[str, Any]) -> dict[str, Any]:
+    """
+    Answer one what-if request on the resident model.
+
+    Args:
+        etat (dict[str, Any]):
+            The server state.
+        requete (dict[str, Any]):
+            The request: "methode" ("gp", "max_min" or "payoff") and optionally
+            "Prix_vente_H2", "lower_bound", "upper_bound" (partial dicts) and
+            "recalcul_payoff" (recompute the payoff table after the price change).
+
+    Returns:
+        dict[str, Any]:
+            The answer, with the solve and total request latency.
+    """
+    start_time = time.time()
+    model = etat["model"]
+    methode = requete.get("methode", "gp")
+    reponse = {"methode": methode}
+    try:
+        if "Prix_vente_H2" in requete:
+            if config.optim_prix:
+                raise ValueError("Les prix sont des variables (optim_prix = True).")
+            modelisation.modifier_prix(model, requete["Prix_vente_H2"])
+        if methode == "payoff" or requete.get("recalcul_payoff", False):
+            calculer_payoff(etat)
+        lower_bound = {**etat["lower_bound"], **requete.get("lower_bound", {})}
+        upper_bound = {**etat["upper_bound"], **requete.get("upper_bound", {})}
+
+        start_solve = time.time()
+        modelisation.reinitialiser_model(model)
+        if methode == "gp":
+            f, satisf, CO2 = gp.goal_programming(
+                model,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound,
+                utopia=etat["utopia"],
+                nadir=etat["nadir"],
+                dossier_resultats=None,
+                chargement_complet=False,
+                solver=etat["solver"],
+            )
+        elif methode == "max_min":
+            f, satisf, CO2, _ = max_min.max_min_satisfaction(
+                model,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound,
+                utopia=etat["utopia"],
+                nadir=etat["nadir"],
+                display=False,
+                optim_prix=config.optim_prix,
+                dossier_resultats=None,
+                chargement_complet=False,
+                solver=etat["solver"],
+            )
+        elif methode == "payoff":
+            f, satisf, CO2 = etat["utopia"], None, None
+            reponse["Point Nadir"] = etat["nadir"]
+            reponse["Pire Point"] = etat["worst"]
+        else:
+            raise ValueError(f"Méthode inconnue : '{methode}'.")
+        reponse["temps_resolution"] = time.time() - start_solve
+        reponse.update(
+            {
+                "statut": "ok",
+                "Fonction objective": f,
+                "Satisfaction": satisf,
+                "Impact CO2": CO2,
+                "Prix_vente_H2": {
+                    p: {c: pyo.value(model.Prix_vente_H2[p, c]) for c in data.Cons}
+                    for p in data.Prod
+                },
+            }
+        )
+    except solveur.AucuneSolution as e:
+        # Une résolution n'a fourni aucune solution
+        reponse["statut"] = "infaisable" if e.infaisable else "sans_solution"
+    except Exception as e:
+        reponse["statut"] = "erreur"
+        reponse["erreur"] = str(e)
+    reponse["temps_requete"] = time.time() - start_time
+    _log(
+        f"{methode} : {reponse['statut']}, requête {reponse['temps_requete']:.3f}s"
+        + (
+            f", résolution {reponse['temps_resolution']:.3f}s"
+            if "temps_resolution" in reponse
+            else ""
+        )
+    )
+    return reponse
+
+
+def servir(etat: dict[str, Any], entree: TextIO, sortie: TextIO) -> bool:
+    """
+    Answer JSON-line requests read from `entree` until it ends or a "quitter" request.
+
+    Returns:
+        bool:
+            True if a "quitter" request was received.
+    """
+    for ligne in entree:
+        if not ligne.strip():
+            continue
+        try:
+            requete = json.loads(ligne)
+        except json.JSONDecodeError as e:
+            reponse = {"statut": "erreur", "erreur": f"JSON invalide : {e}"}
+        else:
+            if requete.get("methode") == "quitter":
+                return True
+            reponse = traiter_requete(etat, requete)
+        sortie.write(json.dumps(reponse, default=str) + "\n")
+        sortie.flush()
+    return False
+
+
+def servir_socket(etat: dict[str, Any], port: int) -> None:
+    """
+    Serve the requests on a local TCP socket, one connection at a time.
+    """
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            entree = io.TextIOWrapper(self.rfile, encoding="utf-8")
+            sortie = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+            try:
+                if servir(etat, entree, sortie):
+                    self.server.quitter = True
+            finally:
+                # Les flux de la connexion sont fermés par StreamRequestHandler.finish
+                entree.detach()
+                sortie.detach()
+
+    with socketserver.TCPServer(("127.0.0.1", port), Handler) as server:
+        server.quitter = False
+        _log(f"En écoute sur 127.0.0.1:{port}")
+        while not server.quitter:
+            server.handle_request()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serveur de requêtes d'optimisation sur un modèle résident."
+    )
+    parser.add_argument(
+        "--port", type=int, default=None, help="Port local (sinon stdin/stdout)."
+    )
+    args = parser.parse_args()
+
+    etat = initialiser()
+    if args.port is None:
+        servir(etat, sys.stdin, sys.stdout)
+    else:
+        servir_socket(etat, args.port)
@@ -1,10 +1,42 @@
 import csv
+import sys
+import time
+from typing import Iterator, TextIO
 import Donnees.data as data
 
 
+def _index_colonnes(headers: list[str]) -> dict[str, int]:
+    # Index de chaque colonne, en vérifiant que les colonnes attendues existent
+    index = {header: i for i, header in enumerate(headers)}
+    for e in data.Electricite:
+        if e not in index:
+            raise ValueError(f"'{e}' n'existe pas dans le fichier CSV.")
+        if e + "_impact" not in index:
+            raise ValueError(f"'{e}'_impact n'existe pas dans le fichier CSV.")
+    for e in data.Energie:
+        if e + "_prix" not in index:
+            raise ValueError(f"'{e}'_prix n'existe pas dans le fichier CSV.")
+    for c in data.Cons:
+        if c not in index:
+            raise ValueError(f"'{c}'_prix n'existe pas dans le fichier CSV.")
+    return index
+
+
+def _lire_ligne(
+    row: list[str], index: dict[str, int]
+) -> tuple[dict[str, float], dict[str, float], dict[str, float], dict[str, float]]:
+    # Valeurs d'une heure : production, impact, prix et demande
+    return (
+        {e: float(row[index[e]]) for e in data.Electricite},
+        {e: float(row[index[e + "_impact"]]) for e in data.Electricite},
+        {e: float(row[index[e + "_prix"]]) for e in data.Energie},
+        {c: round(float(row[index[c]]), 2) for c in data.Cons},
+    )
+
+
 # Read data of csv file
 def read_data(
-    csv_file: str, Time_horizon: int
+    csv_file: str, Time_horizon: int, debut_data: int | None = None
 ) -> tuple[
     dict[str, list[float]],
     dict[str, list[float]],
@@ -19,6 +51,8 @@ def read_data(
             Path to the CSV file to read.
         Time_horizon (int):
          Number of time periods (rows) to read from the file.
+        debut_data (int | None, optional):
+            Index of the first row to read. Defaults to None (data.debut_data).
 
     Raises:
         ValueError: If an expected key (producer, consumer, or energy type) is missing in the CSV headers.
@@ -38,26 +72,13 @@ def read_data(
     with open(csv_file, "r") as file:
         reader = csv.reader(file, delimiter=";")
 
-        # Récupération des index
-        index = {}
-        headers = next(reader)
-        for i, header in enumerate(headers):
-            index[header] = i
-
+        index = _index_colonnes(next(reader))
         for e in data.Electricite:
-            if e not in index:
-                raise ValueError(f"'{e}' n'existe pas dans le fichier CSV.")
             Production_elec[e] = []
-            if e + "_impact" not in index:
-                raise ValueError(f"'{e}'_impact n'existe pas dans le fichier CSV.")
             Impact_elec[e] = []
         for e in data.Energie:
-            if e + "_prix" not in index:
-                raise ValueError(f"'{e}'_prix n'existe pas dans le fichier CSV.")
             Prix_energie[e] = []
         for c in data.Cons:
-            if c not in index:
-                raise ValueError(f"'{c}'_prix n'existe pas dans le fichier CSV.")
             Demande_H2[c] = []
 
         # Passer les lignes d'information
@@ -65,18 +86,77 @@ def read_data(
             next(reader, None)
 
         # Aller au début des données souhaitées
-        for _ in range(data.debut_data):
+        if debut_data is None:
+            debut_data = data.debut_data
+        for _ in range(debut_data):
             next(reader, None)
 
         # Complétion des données
         for t, row in enumerate(reader):
             if t >= Time_horizon:
                 break
-            for e in data.Electricite:
-                Production_elec[e].append(float(row[index[e]]))
-                Impact_elec[e].append(float(row[index[e + "_impact"]]))
-            for e in data.Energie:
-                Prix_energie[e].append(float(row[index[e + "_prix"]]))
-            for c in data.Cons:
-                Demande_H2[c].append(round(float(row[index[c]]), 2))
+            heure = _lire_ligne(row, index)
+            for serie, valeurs in zip(
+                (Production_elec, Impact_elec, Prix_energie, Demande_H2), heure
+            ):
+                for k, valeur in valeurs.items():
+                    serie[k].append(valeur)
     return Production_elec, Impact_elec, Prix_energie, Demande_H2
+
+
+def stream_data(
+    source: str | TextIO,
+    debut_data: int = 0,
+    suivre: bool = True,
+    attente: float = 0.5,
+) -> Iterator[
+    tuple[dict[str, float], dict[str, float], dict[str, float], dict[str, float]]
+]:
+    """
+    Reads a CSV data source row by row as rows are appended (same format as read_data).
+
+    Args:
+        source (str | TextIO):
+            Path to the CSV file, "-" for the standard input, or an open text stream
+            (for example a named pipe).
+        debut_data (int, optional):
+            Number of data rows to skip. Defaults to 0.
+        suivre (bool, optional):
+            If True and the source is a file, waits for new rows at the end of the file
+            (like tail -f). Streams always stop at end of file. Defaults to True.
+        attente (float, optional):
+            Delay between two checks for new rows - in seconds. Defaults to 0.5.
+
+    Raises:
+        ValueError: If an expected column is missing in the CSV headers.
+
+    Yields:
+        tuple[dict[str, float], dict[str, float], dict[str, float], dict[str, float]]:
+            The values of one hour: electricity production, CO2 impact, energy prices
+            and hydrogen demand.
+    """
+    fichier = isinstance(source, str) and source != "-"
+    if fichier:
+        file = open(source, "r")
+    else:
+        file = sys.stdin if source == "-" else source
+    try:
+        index = _index_colonnes(next(csv.reader([file.readline()], delimiter=";")))
+        # Passer les lignes d'information et les lignes avant debut_data
+        for _ in range(3 + debut_data):
+            file.readline()
+        while True:
+            position = file.tell() if fichier else None
+            line = file.readline()
+            if not line.endswith("\n") and fichier and suivre:
+                # Ligne incomplète ou fin du fichier : attendre la suite
+                file.seek(position)
+                time.sleep(attente)
+                continue
+            if not line:
+                return
+            if line.strip():
+                yield _lire_ligne(next(csv.reader([line], delimiter=";")), index)
+    finally:
+        if fichier:
+            file.close()
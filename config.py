@@ -1,5 +1,14 @@
 # Fichier de configuration d'optimisation. Synthétise les arguments variables du code
 
+# Fichier de données csv
+fichier_donnees = "Donnees/Stage_dataseries.csv"
+
+# Registre des acteurs (producteurs, consommateurs et leurs paramètres)
+fichier_acteurs = "Donnees/acteurs.json"
+
+# Début des données (en heures) dans le fichier csv
+debut_data = 0
+
 # Horizon d'optimisation (entre 1 et 8736)
 # 2190: 3 mois
 Time_horizon = 1
@@ -12,15 +21,138 @@ emission_CO2_heure = True
 # Configuration des prix
 # Si optim_prix = False : On utilise des prix fixé pour l'optim
 # Si optim_prix = True : On linéarise prix * quantité avec les enveloppes de McCormick (approximation)
+# Si optim_prix = "menu" : Prix choisi dans un menu de prix (menu_prix), modélisation exacte
 optim_prix = False
 
+# Nombre de segments du domaine des prix de contrat pour les enveloppes de McCormick
+# 1 : enveloppe unique (relaxation lâche, rapide)
+# > 1 : enveloppes par morceaux avec une variable binaire par segment (plus précis, plus lent)
+segments_mccormick = 1
+
+# Menu de prix de contrat si optim_prix = "menu" : chaque couple producteur-consommateur
+# choisit un prix du menu (variables binaires), le revenu est modélisé exactement - en €/kgH2
+# Liste commune à tous les consommateurs ou dictionnaire {consommateur: liste}
+menu_prix = [4, 6, 8, 10, 12]
+
 # Prix fixes si optim_prix = False
-Prix_vente_H2 = {
-    "P1_electrolyse(avec PV)": {"C1_industriel": 6, "C2_mobilite": 10},
-    "P2_electrolyse": {"C1_industriel": 8, "C2_mobilite": 11.4},
-    "P3_SMR": {"C1_industriel": 4.75, "C2_mobilite": 7.6},
-}
+# Remplacent les prix du registre des acteurs (couples non renseignés : prix du registre,
+# couples absents du registre : ignorés), par exemple
+# {"P2_electrolyse": {"C2_mobilite": 10.5}} - en €/kgH2
+Prix_vente_H2 = {}
 
 # Degradation acceptable dans la résolution du max_min pour améliorer les émissions de CO2
 # Entre 0 et 1
 degradation_acceptable = 0
+
+# Estimation du point nadir par NSGA-II sur un modèle simplifié (plus de 2 objectifs, sans
+# stockage, prix de vente fixés) : chaque composante de la table des gains est relevée si
+# le front NSGA-II est pire, jamais abaissée (producteurs seuls avec optim_prix)
+# Si False, le point nadir est celui de la table des gains (optimisations individuelles)
+nadir_nsga2 = False
+# Point nadir sur l'ensemble efficace (plus de 2 objectifs, prioritaire sur nadir_nsga2) :
+# maximum de chaque objectif sous les conditions KKT d'une somme pondérée, un MIP (big M)
+# par objectif, valeur vérifiée a posteriori (rejetée : valeur de la table des gains).
+# Borne inférieure de la composante du nadir si M ne borne pas les multiplicateurs
+nadir_exact = False
+# Borne des multiplicateurs et des écarts non bornés (big M) du calcul KKT
+nadir_exact_M = 1e6
+# Nombre de processus évaluant la population NSGA-II ou résolvant les MIP du calcul KKT
+nadir_processus = 1
+
+# Solveur utilisé pour toutes les résolutions
+solveur = "appsi_highs"
+
+# Nombre de threads alloués au solveur (None : choix du solveur)
+# Utile pour limiter chaque processus lors des exécutions de scénarios en parallèle
+solveur_threads = None
+
+# Course de solveurs (Resolution/course.py) : configurations {"nom", "solveur", "options"}
+# résolvant en parallèle le même problème, le premier résultat optimal est retenu
+# (solveurs "highs" ou "cplex", options de leur API Python). Liste vide : pas de course
+course_configurations = []
+# Phases résolues par une course ("table_gains", "goal_programming", "max_min", "co2")
+course_phases = ["table_gains", "goal_programming", "max_min", "co2"]
+# Nombre maximal de configurations lancées par course (les plus souvent gagnantes
+# d'après le journal), None : toutes
+course_processus = None
+# Journal des courses gagnées (une ligne JSON par résolution), None : pas de journal
+course_journal = "Resultats/course_solveurs.jsonl"
+
+# Budgets de résolution par phase (table des gains, Goal Programming, chaque étape du
+# max min, passe CO2 du max min, MIP du calcul KKT du nadir) : temps limite de chaque résolution - en secondes - et
+# écart relatif visé des problèmes en nombres entiers (None : pas de limite). Si une limite
+# arrête le solveur, la meilleure solution trouvée est utilisée (écart dans le résumé)
+budgets_phases = {
+    "table_gains": {"temps": None, "ecart": None, "poids": 1},
+    "goal_programming": {"temps": None, "ecart": None, "poids": 1},
+    "max_min": {"temps": None, "ecart": None, "poids": 2},
+    "co2": {"temps": None, "ecart": None, "poids": 1},
+    # Hors du partage du délai total : limitée au temps restant du délai
+    "nadir": {"temps": None, "ecart": None},
+}
+# Délai total de la chaîne d'optimisation (main.py) - en secondes, None : pas de délai
+# Au début de chaque phase, le temps restant est réparti entre les phases restantes selon
+# leur poids
+delai_total = None
+
+# Dossier du cache des modèles compilés (Definition/cache_modele.py) : la table des gains
+# est calculée sur la matrice enregistrée, sans résolution Pyomo. Seules les résolutions de
+# la table des gains sont raccourcies : le Goal Programming et le max min construisent
+# toujours leur modèle Pyomo (init_model). None : pas de cache
+cache_modeles = None
+
+# Contraintes paresseuses (Definition/contraintes_paresseuses.py) : les plafonds d'émissions
+# horaires des producteurs et la production disponible des sources d'électricité sont
+# ajoutés au modèle au fil des résolutions, seulement lorsque la solution les viole
+contraintes_paresseuses = False
+
+# Vérification préalable (Resolution/verification.py) : la demande d'H2 est comparée à la
+# production maximale du réseau avant de construire le modèle, et les bornes de satisfaction
+# à la table des gains. Un scénario infaisable est arrêté sans résolution
+verification_prealable = True
+
+# Analyse de sensibilité (Resolution/sensibilite.py) des optimisations individuelles et de la
+# passe CO2 du max min : duales agrégées par famille de contraintes et plages de validité
+sensibilite = False
+# Familles de contraintes analysées (None : électricité disponible, demande, plafonds CO2
+# horaires et seuils de satisfaction)
+sensibilite_familles = None
+# Plages de validité des seconds membres (ranging) : chaque programme linéaire analysé est
+# résolu à nouveau par HiGHS. Si False, les duales sont lues dans les résolutions du pipeline
+sensibilite_plages = False
+
+# Segmentation adaptative (Definition/segmentation.py) : les heures consécutives aux données
+# proches sont fusionnées en pas de temps de durée variable, puis les segments où le stockage
+# est utilisé ou une capacité saturée sont coupés en deux après une résolution du modèle
+segmentation = False
+# Écart maximal de chaque série dans un segment, relatif à son amplitude sur l'horizon :
+# compromis entre taille du modèle et précision. Sur Stage_dataseries.csv (168h,
+# 2 raffinements), objectifs du max min comparés au modèle horaire (168 pas, main en 24s) :
+#   - 0.5 : 161 pas, écart < 0.05 %, pas de gain de temps (valeur par défaut, validée) ;
+#   - 0.6 : 147 pas, écart < 0.25 %, main en 15s ;
+#   - 0.8 : 108 pas, écart jusqu'à 1.4 %, main en 13s.
+# Plus de raffinements rapprochent de l'horaire en revenant vers 168 pas (0.8 avec
+# 4 raffinements : 158 pas, écart 0.4 %). En dessous de 0.5, l'impact et le prix de
+# l'électricité du réseau (bruités heure par heure) empêchent presque toute fusion
+segmentation_tolerance = 0.5
+# Durée maximale d'un segment - en heures
+segmentation_duree_max = 24
+# Nombre maximal de raffinements (une résolution du modèle segmenté chacun)
+segmentation_raffinements = 2
+
+# Modèle stochastique à deux étapes (Resolution/stochastique.py) : tailles communes à tous
+# les scénarios de données (années ou perturbations des séries), exploitation par scénario
+# Nombre de scénarios (None : un par processus)
+stochastique_scenarios = None
+# Écart type relatif des perturbations de la production, des prix et de la demande
+stochastique_ecart = 0.1
+# Nombre de processus résolvant les scénarios du progressive hedging (None : nombre de coeurs)
+stochastique_processus = None
+# Progressive hedging : facteur de la pénalité (CAPEX de chaque taille sur l'horizon divisé
+# par l'écart moyen de ses valeurs à leur moyenne entre scénarios, recalculé à chaque
+# itération ; une pénalité forte converge plus vite vers un moins bon consensus), nombre
+# maximal d'itérations et écart moyen des tailles des scénarios à leur moyenne (relatif à
+# la moyenne) à la convergence
+stochastique_rho = 0.1
+stochastique_iterations = 100
+stochastique_tolerance = 1e-2
@@ -1,48 +1,131 @@
 import Definition.modelisation as modelisation
+import Definition.cache_modele as cache_modele
+import Definition.segmentation as segmentation
 import config as config
 import Resolution.point_nadir as p_nad
 import Donnees.data as data
 import Resolution.optim_individuelle as optim_indiv
 import Resolution.goal_programming as gp
 import Resolution.max_min_satisfaction as max_min
+import Resolution.solveur as solveur
+import Resolution.verification as verification
+import Resolution.sensibilite as sensibilite
 import Utils.rapport_latex as rapport
 import time
+import os
 
 
-def main():
+def main(dossier_resultats: str = "Resultats", rapport_pdf: bool = True) -> dict:
+    """
+    Exécute la chaîne complète d'optimisation avec les options du fichier config.py :
+    optimisations individuelles, Goal Programming, max min satisfaction et rapport.
+
+    Args:
+        dossier_resultats (str, optional):
+            Dossier dans lequel sont enregistrés les graphiques et le rapport.
+            Defaults to "Resultats".
+        rapport_pdf (bool, optional):
+            Si True, génère le rapport Latex. Defaults to True.
+
+    Returns:
+        dict:
+            Synthèse des résultats (objectifs, satisfactions, impact CO2 et temps)
+            de chaque méthode de résolution.
+    """
     # Options d'optimisation récupérée du fichier config.py
     optim_prix = config.optim_prix
     emission_CO2_heure = config.emission_CO2_heure
+    # Délai total réparti entre les phases (config.budgets_phases)
+    solveur.demarrer_echeance(config.delai_total)
 
-    # initialisation du model
-    model_gp = modelisation.init_model(
-        display=False, emission_CO2_heure=emission_CO2_heure, optim_prix=optim_prix
-    )
+    if config.verification_prealable:
+        # Demande impossible à servir : arrêt avant de construire le modèle
+        verification.exiger_faisabilite(emission_CO2_heure)
+
+    # Pas de temps de durée variable (config.segmentation), horaires sinon
+    durees = None
+    if config.segmentation:
+        start_time = time.time()
+        durees = segmentation.adapter(emission_CO2_heure, optim_prix)
+        exec_time_segmentation = time.time() - start_time
+
+    def construire_model():
+        return modelisation.init_model(
+            display=False,
+            emission_CO2_heure=emission_CO2_heure,
+            optim_prix=optim_prix,
+            durees=durees,
+        )
+
+    # initialisation du model (avec le cache : après la table des gains)
+    model_gp = construire_model() if config.cache_modeles is None else None
 
     # Récupération des informations obtenues grace aux optimisations individuelles
     start_time = time.time()
-    point_utopia, point_nadir, point_worst, priority_results = (
-        optim_indiv.optim_individuelle(model_gp, display=False)
-    )
+    # Prix de contrat des solutions de la table des gains (enveloppes de McCormick)
+    prix_contrat = {}
+    duales_table = None
+    if config.cache_modeles is not None:
+        # Table des gains sur le modèle compilé, lu dans le cache avant de construire le
+        # modèle Pyomo (compilé puis enregistré s'il est absent)
+        compile = cache_modele.charger(
+            cache_modele.cle(emission_CO2_heure, optim_prix, durees=durees)
+        )
+        if compile is None:
+            model_gp = construire_model()
+            compile = cache_modele.obtenir(
+                emission_CO2_heure, optim_prix, model=model_gp, durees=durees
+            )
+        point_utopia, point_nadir, point_worst, priority_results = (
+            cache_modele.table_gains(compile, prix_contrat=prix_contrat)
+        )
+    else:
+        # Duales des optimisations individuelles, lues dans leurs résolutions (modèle
+        # linéaire)
+        if (
+            config.sensibilite
+            and not config.sensibilite_plages
+            and not sensibilite.entieres_libres(model_gp)
+        ):
+            duales_table = {}
+        point_utopia, point_nadir, point_worst, priority_results = (
+            optim_indiv.optim_individuelle(
+                model_gp,
+                display=False,
+                prix_contrat=prix_contrat,
+                rapports_sensibilite=duales_table,
+            )
+        )
     end_time = time.time()
     exec_time_indiv = end_time - start_time
 
+    if model_gp is None:
+        model_gp = construire_model()
+    rapports_sensibilite = {}
+    if duales_table:
+        rapports_sensibilite["table_gains"] = duales_table
+    elif config.sensibilite and not sensibilite.entieres_libres(model_gp):
+        # Plages de validité ou table des gains résolue sur le modèle compilé : nouvelle
+        # résolution de chaque optimisation individuelle
+        rapports_sensibilite["table_gains"] = sensibilite.table_gains(
+            model_gp, config.sensibilite_familles, plages=config.sensibilite_plages
+        )
+
     # Calcul du point nadir
-    point_nadir = p_nad.point_nadir(point_nadir)
+    point_nadir = p_nad.point_nadir(
+        point_nadir, model=model_gp, priority_results=priority_results
+    )
 
     # Définition des objectifs de chaque acteurs
-    # lower_bound est la valeur à laquelle chaque acteur aspire
-    lower_bound = {}
-    # upper_bound est la valeur maximale que chaque acteur est prêt à accepter
-    upper_bound = {}
-    for a in modelisation.Prod:
-        lower_bound[a] = point_utopia[a]
-        # Le producteur n'accepte pas de vendre à perte => Peut être le point nadir selon modification
-        upper_bound[a] = 0
-    for a in modelisation.Cons:
-        # Le consommateur a des attentes sur le prix d'achat
-        lower_bound[a] = data.Meilleur_prix[a]
-        upper_bound[a] = data.Pire_prix[a]
+    lower_bound, upper_bound = optim_indiv.bornes_satisfaction(point_utopia)
+    problemes_bornes = []
+    if config.verification_prealable:
+        problemes_bornes = verification.exiger_bornes(
+            lower_bound, upper_bound, point_utopia, point_nadir
+        )
+    if optim_prix:
+        # Domaine des prix de contrat des enveloppes de McCormick
+        modelisation.resserrer_prix(model_gp, prix_contrat)
 
     # Résolution Goal Programming
     start_time = time.time()
@@ -53,14 +136,15 @@ def main():
         utopia=point_utopia,
         nadir=point_nadir,
         display=False,
+        dossier_resultats=dossier_resultats,
     )
     end_time = time.time()
     exec_time_gp = end_time - start_time
 
     # Résolution max min
-    model_mm = modelisation.init_model(
-        display=False, emission_CO2_heure=emission_CO2_heure, optim_prix=optim_prix
-    )
+    model_mm = construire_model()
+    if optim_prix:
+        modelisation.resserrer_prix(model_mm, prix_contrat)
     start_time = time.time()
     f_mm, satisf_mm, CO2_mm, Names = max_min.max_min_satisfaction(
         model_mm,
@@ -70,6 +154,7 @@ def main():
         nadir=point_nadir,
         display=False,
         optim_prix=optim_prix,
+        dossier_resultats=dossier_resultats,
     )
     end_time = time.time()
 
@@ -83,6 +168,19 @@ def main():
 
     exec_time_mm = end_time - start_time
 
+    if config.sensibilite:
+        # Duales de la passe CO2 du max min, variables binaires fixées
+        rapports_sensibilite["max_min_co2"] = sensibilite.analyser(
+            model_mm,
+            config.sensibilite_familles,
+            fixer_entiers=True,
+            plages=config.sensibilite_plages,
+        )
+        os.makedirs(dossier_resultats, exist_ok=True)
+        sensibilite.ecrire(
+            rapports_sensibilite, os.path.join(dossier_resultats, "sensibilite.json")
+        )
+
     # Pour génération du rapport Latex
     results = {
         "Options d'optimisation": {
@@ -118,11 +216,59 @@ def main():
             "Temps": exec_time_mm,
         },
     }
-    rapport.rapport_latex(
-        filename="Resultats/Fichier_resultat",
-        title="Rapport d'optimisation",
-        results=results,
+    # Synthèse des résultats (sans les modèles) avant génération du rapport
+    resume = {
+        "Optimisations Individuelles": {
+            "Point Idéal": point_utopia,
+            "Point Nadir": point_nadir,
+            "Temps": exec_time_indiv,
+            "Bornes": problemes_bornes,
+        },
+        **{
+            method: {
+                "Fonction objective": {
+                    a: results[method][a]["Fonction objective"] for a in data.Acteurs
+                },
+                "Satisfaction": {
+                    a: results[method][a]["Satisfaction"] for a in data.Acteurs
+                },
+                "Impact CO2": results[method]["Impact CO2"],
+                "Temps": results[method]["Temps"],
+            }
+            for method in ["Goal Programming", "Max min satisfaction"]
+        },
+    }
+    # Qualité des solutions de chaque phase (écart relatif si une limite a arrêté le solveur)
+    resume["Optimisations Individuelles"]["Resolutions"] = solveur.bilan(
+        ["table_gains"]
     )
+    resume["Goal Programming"]["Resolutions"] = solveur.bilan(["goal_programming"])
+    resume["Max min satisfaction"]["Resolutions"] = solveur.bilan(["max_min", "co2"])
+    if rapports_sensibilite:
+        resume["Sensibilite"] = rapports_sensibilite
+    if durees is not None:
+        resume["Segmentation"] = {
+            "Pas de temps": len(durees),
+            "Heures": sum(durees),
+            "Temps": exec_time_segmentation,
+            "Resolutions": solveur.bilan(["segmentation"]),
+        }
+    if optim_prix:
+        # Écart de la relaxation de McCormick dans chaque solution
+        resume["Goal Programming"]["Ecart McCormick"] = modelisation.ecart_mccormick(
+            model_gp
+        )
+        resume["Max min satisfaction"]["Ecart McCormick"] = (
+            modelisation.ecart_mccormick(model_mm)
+        )
+
+    if rapport_pdf:
+        rapport.rapport_latex(
+            filename=os.path.join(dossier_resultats, "Fichier_resultat"),
+            title="Rapport d'optimisation",
+            results=results,
+        )
+    return resume
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+import pytest
+import config
+import Definition.cache_modele as cache_modele
+import Definition.modelisation as modelisation
+import Resolution.optim_individuelle as optim_individuelle
+import Utils.utils as utils
+from Donnees.data import Acteurs
+
+
+def test_table_gains_du_cache(tmp_path):
+    # Petit cas : 24 h. Le modèle compilé, enregistré puis relu, donne la table des gains
+    # d'optim_individuelle sur le modèle Pyomo (point idéal, pire point et objectif de
+    # l'acteur priorisé ; les autres valeurs dépendent de l'optimum alternatif retenu)
+    donnees = utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+    model = modelisation.init_model(donnees=donnees)
+    attendu = optim_individuelle.optim_individuelle(model)
+
+    cle_cache = cache_modele.cle(True, donnees=donnees)
+    cache_modele.exporter(cache_modele.compiler(model), cle_cache, str(tmp_path))
+    cache = cache_modele.charger(cle_cache, str(tmp_path))
+    assert cache is not None
+    assert cache_modele.charger("absente", str(tmp_path)) is None
+    point_utopia, _, point_worst, priority_results = cache_modele.table_gains(cache)
+
+    for a in Acteurs:
+        assert point_utopia[a] == pytest.approx(attendu[0][a], rel=1e-6, abs=1e-6)
+        assert point_worst[a] == pytest.approx(attendu[2][a], rel=1e-6, abs=1e-6)
+        assert priority_results[a][a] == pytest.approx(
+            attendu[3][a][a], rel=1e-6, abs=1e-6
+        )
@@ -0,0 +1,38 @@
+import pyomo.environ as pyo
+import pytest
+from pyomo.opt import TerminationCondition
+import config
+import Definition.modelisation as modelisation
+import Resolution.course as course
+import Resolution.solveur as solveur
+import Utils.utils as utils
+from Donnees.data import Acteurs
+
+CONFIGURATIONS = [
+    {"nom": "dual", "solveur": "highs", "options": {"simplex_strategy": 1}},
+    {"nom": "primal", "solveur": "highs", "options": {"simplex_strategy": 4}},
+]
+
+
+def test_course_charge_la_solution(monkeypatch):
+    # Petit cas : 24 h. La solution gagnante rechargée dans le modèle par les symboles du
+    # fichier LP a l'objectif de la résolution directe et respecte le modèle
+    monkeypatch.setattr(config, "course_journal", None)
+    donnees = utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+    model = modelisation.init_model(donnees=donnees)
+    model.objective = pyo.Objective(expr=sum(model.fn_obj[a] for a in Acteurs))
+    solveur.resoudre(model)
+    attendu = pyo.value(model.objective)
+
+    for v in model.component_data_objects(pyo.Var):
+        if not v.fixed:
+            v.set_value(None)
+    results = course.courir(model, configurations=CONFIGURATIONS)
+    assert results.solver.termination_condition == TerminationCondition.optimal
+    assert pyo.value(model.objective) == pytest.approx(attendu, rel=1e-6, abs=1e-6)
+    for contrainte in model.component_data_objects(pyo.Constraint, active=True):
+        corps = pyo.value(contrainte.body)
+        if contrainte.has_lb():
+            assert corps >= pyo.value(contrainte.lower) - 1e-6
+        if contrainte.has_ub():
+            assert corps <= pyo.value(contrainte.upper) + 1e-6
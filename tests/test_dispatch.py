@@ -0,0 +1,53 @@
+import pyomo.environ as pyo
+import pytest
+from pyomo.opt import TerminationCondition
+import config
+import Definition.modelisation as modelisation
+import Resolution.dispatch as dispatch
+import Resolution.simulation as simulation
+import Resolution.solveur as solveur
+import Utils.utils as utils
+from Donnees.data import Acteurs, Cons, Prod
+
+
+def _tailles() -> dict[str, dict[str, float]]:
+    # Tailles optimales du petit cas (24 h)
+    donnees = utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+    model = modelisation.init_model(donnees=donnees)
+    model.objective = pyo.Objective(expr=sum(model.fn_obj[a] for a in Acteurs))
+    solveur.resoudre(model)
+    return simulation.tailles_model(model)
+
+
+def test_blocs_independants():
+    # Deux journées : le dispatch par blocs de 24 h (1 ou 2 processus) a les objectifs de
+    # deux modèles à tailles fixées résolus séparément sur chaque journée
+    tailles = _tailles()
+    donnees = utils.read_data(config.fichier_donnees, 48, debut_data=config.debut_data)
+    coefs = dispatch.coefficients(None, donnees[3])
+
+    attendu = {p: 0.0 for p in Prod}
+    paye = {c: 0.0 for c in Cons}
+    for bloc in dispatch.decouper(donnees, 24):
+        model = modelisation.init_model(donnees=bloc, tailles=tailles)
+        dispatch.objectif_dispatch(model, coefs)
+        results = solveur.resoudre(model)
+        assert results.solver.termination_condition == TerminationCondition.optimal
+        for p in Prod:
+            attendu[p] += pyo.value(model.fn_obj[p])
+        for c in Cons:
+            paye[c] += sum(
+                pyo.value(model.P_H2_vendu[i, c, t]) for i in Prod for t in model.Time
+            )
+    for c in Cons:
+        attendu[c] = paye[c] / sum(donnees[3][c])
+
+    for processus in (1, 2):
+        resultat = dispatch.dispatch(
+            tailles, donnees=donnees, longueur_bloc=24, processus=processus
+        )
+        assert all(s == "optimal" for s in resultat["statuts"])
+        for a in Acteurs:
+            assert resultat["fn_obj"][a] == pytest.approx(
+                attendu[a], rel=1e-6, abs=1e-6
+            )
@@ -0,0 +1,52 @@
+import pyomo.environ as pyo
+import pytest
+from pyomo.opt import TerminationCondition
+import config
+import Definition.modelisation as modelisation
+import Resolution.dispatch as dispatch
+import Resolution.simulation as simulation
+import Resolution.solveur as solveur
+import Utils.horizon_glissant as horizon_glissant
+import Utils.utils as utils
+from Donnees.data import Acteurs, P_electrolyseur
+
+
+def test_report_du_stock():
+    # Petit cas : fenêtres de 12 h glissant sur 16 h. Chaque pas (modèle et solveur
+    # persistant réutilisés) a l'objectif d'un modèle construit sur la fenêtre, partant du
+    # stock réalisé à la fin de l'heure décidée au pas précédent
+    donnees = utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+    model = modelisation.init_model(donnees=donnees)
+    model.objective = pyo.Objective(expr=sum(model.fn_obj[a] for a in Acteurs))
+    solveur.resoudre(model)
+    tailles = simulation.tailles_model(model)
+
+    horizon, heures = 12, 16
+    etat = horizon_glissant.initialiser(tailles, horizon)
+    stock = dict(etat["stock"])
+    for t in range(heures):
+        heure = tuple({k: v[t] for k, v in serie.items()} for serie in donnees)
+        resultat = horizon_glissant.pas(etat, heure)
+        if resultat is None:
+            continue
+        assert resultat["statut"] == "optimal"
+        glissant = etat["model"]
+
+        fenetre = tuple(
+            {k: v[t - horizon + 1 : t + 1] for k, v in serie.items()}
+            for serie in donnees
+        )
+        attendu = modelisation.init_model(donnees=fenetre, tailles=tailles)
+        dispatch.objectif_dispatch(attendu, dispatch.coefficients(None, fenetre[3]))
+        horizon_glissant.stock_glissant(attendu)
+        for p in P_electrolyseur:
+            assert pyo.value(glissant.Q_H2_init_stock[p]) == pytest.approx(stock[p])
+            attendu.stock_initial[p] = stock[p]
+            attendu.stock_final[p] = pyo.value(glissant.stock_final[p])
+        results = solveur.resoudre(attendu)
+        assert results.solver.termination_condition == TerminationCondition.optimal
+        assert pyo.value(glissant.objectif) == pytest.approx(
+            pyo.value(attendu.objectif), rel=1e-6, abs=1e-6
+        )
+        stock = dict(resultat["Q_H2_stock"])
+    assert etat["heure"] == heures - horizon + 1
@@ -0,0 +1,48 @@
+import multiprocessing
+import pyomo.environ as pyo
+import pytest
+import config
+import Donnees.memoire_partagee as memoire_partagee
+import Resolution.solveur as solveur
+import Utils.scenarios as scenarios
+
+# Donnees.data n'est importé que dans les fonctions : le processus fils importe ce module
+# avant que restaurer_config ne lui donne l'horizon du parent
+
+
+def _objectif(donnees=None) -> tuple[bool, float]:
+    # Coût total optimal du modèle construit sur les séries données (séries de
+    # Donnees.data si None) et séries attachées ou non à un segment partagé
+    import Donnees.data as data
+    import Definition.modelisation as modelisation
+
+    model = modelisation.init_model(donnees=donnees)
+    model.objective = pyo.Objective(expr=sum(model.fn_obj[a] for a in data.Acteurs))
+    solveur.resoudre(model)
+    return data.series_partagees is not None, pyo.value(model.objective)
+
+
+def test_processus_attache(monkeypatch):
+    # Petit cas : 24 h publiées par le parent. Le processus fils s'attache au segment au
+    # lieu de relire le fichier et son modèle a l'objectif du modèle construit sur les
+    # séries lues
+    import Donnees.data  # noqa: F401 (avant Utils.utils, import circulaire)
+    import Utils.utils as utils
+
+    horizon = 24
+    donnees = utils.read_data(config.fichier_donnees, horizon, config.debut_data)
+    memoire_partagee.publier(
+        donnees, config.fichier_donnees, config.debut_data, horizon
+    )
+    monkeypatch.setattr(config, "Time_horizon", horizon)
+
+    contexte = multiprocessing.get_context("spawn")
+    with contexte.Pool(
+        processes=1,
+        initializer=scenarios.restaurer_config,
+        initargs=(scenarios.capturer_config(),),
+    ) as pool:
+        attache, objectif = pool.apply(_objectif)
+
+    assert attache
+    assert objectif == pytest.approx(_objectif(donnees)[1], rel=1e-9)
@@ -0,0 +1,78 @@
+import pyomo.environ as pyo
+import pytest
+from pyomo.opt import TerminationCondition
+import config
+import Definition.contraintes_paresseuses as paresseuses
+import Definition.modelisation as modelisation
+import Resolution.solveur as solveur
+import Utils.utils as utils
+from Donnees.data import Acteurs, Prod, Prix_vente_H2
+
+
+def _donnees():
+    # Petit cas : 24 h du fichier de données
+    return utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+
+
+def _objectifs(model: pyo.ConcreteModel) -> dict[str, float]:
+    # Optimum de chaque acteur optimisé seul
+    objectifs = {}
+    for a in Acteurs:
+        model.objective = pyo.Objective(expr=model.fn_obj[a], sense=pyo.minimize)
+        results = solveur.resoudre(model)
+        assert results.solver.termination_condition == TerminationCondition.optimal
+        objectifs[a] = pyo.value(model.fn_obj[a])
+        del model.objective
+    return objectifs
+
+
+@pytest.mark.parametrize("segments", [1, 2])
+def test_mccormick_prix_fixes(segments):
+    # Domaine des prix réduit au prix fixé : l'enveloppe de McCormick est exacte et le
+    # modèle a les objectifs du modèle à prix fixés
+    donnees = _donnees()
+    fixe = modelisation.init_model(donnees=donnees)
+    model = modelisation.init_model(
+        optim_prix=True, donnees=donnees, segments_mccormick=segments
+    )
+    for i, j in model.Prix_min:
+        model.Prix_min[i, j] = Prix_vente_H2[i][j]
+        model.Prix_max[i, j] = Prix_vente_H2[i][j]
+
+    attendu = _objectifs(fixe)
+    for a, valeur in _objectifs(model).items():
+        assert valeur == pytest.approx(attendu[a], rel=1e-6, abs=1e-6)
+    assert modelisation.ecart_mccormick(model)["max"] == pytest.approx(0, abs=1e-6)
+
+
+def test_menu_un_niveau(monkeypatch):
+    # Menu d'un seul prix par consommateur : le menu de prix a les objectifs du modèle à
+    # prix fixés (même prix pour tous les producteurs)
+    donnees = _donnees()
+    fixe = modelisation.init_model(donnees=donnees)
+    for i, j in fixe.Prix_vente_H2:
+        prix = Prix_vente_H2[Prod[0]][j]
+        fixe.Prix_vente_H2[i, j] = prix
+        monkeypatch.setitem(modelisation.Menu_prix, j, [prix])
+    model = modelisation.init_model(optim_prix=modelisation.MENU_PRIX, donnees=donnees)
+
+    attendu = _objectifs(fixe)
+    for a, valeur in _objectifs(model).items():
+        assert valeur == pytest.approx(attendu[a], rel=1e-6, abs=1e-6)
+
+
+def test_contraintes_paresseuses():
+    # Lignes horaires ajoutées au fil des résolutions : mêmes objectifs que le modèle
+    # complet, et la dernière solution respecte toutes les lignes des familles paresseuses
+    donnees = _donnees()
+    complet = modelisation.init_model(donnees=donnees, contraintes_paresseuses=False)
+    model = modelisation.init_model(donnees=donnees, contraintes_paresseuses=True)
+    familles = paresseuses.familles_incompletes(model)
+    assert familles
+    assert not paresseuses.familles_incompletes(complet)
+
+    attendu = _objectifs(complet)
+    for a, valeur in _objectifs(model).items():
+        assert valeur == pytest.approx(attendu[a], rel=1e-6, abs=1e-6)
+    for nom in familles:
+        assert paresseuses.violations(model, nom) == []
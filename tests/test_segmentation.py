@@ -0,0 +1,52 @@
+import pyomo.environ as pyo
+import pytest
+from pyomo.opt import TerminationCondition
+import config
+import Definition.modelisation as modelisation
+import Definition.segmentation as segmentation
+import Resolution.solveur as solveur
+import Utils.utils as utils
+from Donnees.data import Acteurs
+
+
+def _donnees():
+    # Petit cas : 24 h du fichier de données
+    return utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+
+
+def _objectifs(model: pyo.ConcreteModel) -> dict[str, float]:
+    # Optimum de chaque acteur optimisé seul
+    objectifs = {}
+    for a in Acteurs:
+        model.objective = pyo.Objective(expr=model.fn_obj[a], sense=pyo.minimize)
+        results = solveur.resoudre(model)
+        assert results.solver.termination_condition == TerminationCondition.optimal
+        objectifs[a] = pyo.value(model.fn_obj[a])
+        del model.objective
+    return objectifs
+
+
+def test_agreger():
+    # Séries sommées : même total ; séries moyennées : même total pondéré par les durées
+    donnees = _donnees()
+    durees = segmentation.segmenter(donnees)
+    assert sum(durees) == 24
+    agregees = segmentation.agreger(donnees, durees)
+    for famille, agregee, somme in zip(donnees, agregees, segmentation.SOMMEES):
+        for k, serie in famille.items():
+            assert list(agregee[k]) == segmentation.debuts(durees)
+            total = sum(
+                v * (1 if somme else d) for v, d in zip(agregee[k].values(), durees)
+            )
+            assert total == pytest.approx(sum(serie), rel=1e-9, abs=1e-9)
+    with pytest.raises(ValueError):
+        segmentation.agreger(donnees, durees + [1])
+
+
+def test_segments_d_une_heure():
+    # Segments d'une heure : le modèle segmenté a les objectifs du modèle horaire
+    donnees = _donnees()
+    attendu = _objectifs(modelisation.init_model(donnees=donnees))
+    model = modelisation.init_model(donnees=donnees, durees=[1] * 24)
+    for a, valeur in _objectifs(model).items():
+        assert valeur == pytest.approx(attendu[a], rel=1e-6, abs=1e-6)
@@ -0,0 +1,59 @@
+import pyomo.environ as pyo
+import pytest
+import config
+import Definition.modelisation as modelisation
+import Resolution.sensibilite as sensibilite
+import Resolution.solveur as solveur
+import Utils.utils as utils
+from Donnees.data import Acteurs
+
+
+def _decaler(contrainte, decalage: float) -> None:
+    # Décale le second membre de la ligne (les deux bornes d'une égalité)
+    bas, haut = contrainte.lower, contrainte.upper
+    contrainte.set_value(
+        (
+            None if bas is None else pyo.value(bas) + decalage,
+            contrainte.body,
+            None if haut is None else pyo.value(haut) + decalage,
+        )
+    )
+
+
+def test_signe_des_duales():
+    # Petit cas : 24 h. Les duales lues dans le solveur persistant sont celles de la
+    # nouvelle résolution HiGHS, et la duale de la ligne la plus active de chaque famille
+    # donne la variation de l'objectif quand son second membre augmente dans sa plage
+    donnees = utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+    model = modelisation.init_model(donnees=donnees)
+    assert not sensibilite.entieres_libres(model)
+    model.objective = pyo.Objective(expr=sum(model.fn_obj[a] for a in Acteurs))
+    solver = solveur.creer_solveur(persistant=True)
+    solveur.resoudre(model, solver=solver)
+    objectif = pyo.value(model.objective)
+    persistant = sensibilite.analyser(model, solver=solver, importer=False)
+    rapport = sensibilite.analyser(model, plages=True, importer=False)
+    assert persistant["objectif"] == pytest.approx(objectif, rel=1e-9)
+    assert rapport["objectif"] == pytest.approx(objectif, rel=1e-9)
+
+    verifiees = 0
+    for nom, famille in rapport["familles"].items():
+        assert persistant["familles"][nom]["duale_totale"] == pytest.approx(
+            famille["duale_totale"], rel=1e-6, abs=1e-6
+        )
+        if not famille["actives"]:
+            continue
+        ligne = famille["lignes_actives"][0]
+        haute = ligne["plage"][1]
+        decalage = (
+            1.0 if haute is None else min(1.0, 0.5 * (haute - ligne["second_membre"]))
+        )
+        contrainte = model.find_component(ligne["ligne"])
+        _decaler(contrainte, decalage)
+        solveur.resoudre(model)
+        _decaler(contrainte, -decalage)
+        assert (pyo.value(model.objective) - objectif) / decalage == pytest.approx(
+            ligne["duale"], rel=1e-6, abs=1e-6
+        )
+        verifiees += 1
+    assert verifiees > 0
@@ -0,0 +1,45 @@
+import pyomo.environ as pyo
+import pytest
+import config
+import Definition.modelisation as modelisation
+import Resolution.simulation as simulation
+import Resolution.solveur as solveur
+import Utils.utils as utils
+from Donnees.data import Acteurs
+
+
+def test_simulation_realisable():
+    # Petit cas : tailles optimales sur 24 h, puis simulation de ces tailles. Le point
+    # simulé respecte le modèle à tailles fixées, sauf le stock final (C_prod_elec_6) dont
+    # l'écart est celui annoncé par la simulation, et ses objectifs sont ceux du modèle
+    # (lignes fn_obj respectées)
+    donnees = utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+    model = modelisation.init_model(donnees=donnees)
+    model.objective = pyo.Objective(expr=sum(model.fn_obj[a] for a in Acteurs))
+    solveur.resoudre(model)
+    tailles = simulation.tailles_model(model)
+
+    resultat = simulation.simuler(
+        tailles, series=simulation.empiler_series([donnees]), trajectoires=True
+    )
+    fixe = modelisation.init_model(donnees=donnees, tailles=tailles)
+    simulation.initialiser_model(fixe, tailles, resultat)
+
+    violations = {}
+    for contrainte in fixe.component_data_objects(pyo.Constraint, active=True):
+        corps = pyo.value(contrainte.body)
+        ecart = max(
+            pyo.value(contrainte.lower) - corps if contrainte.has_lb() else 0,
+            corps - pyo.value(contrainte.upper) if contrainte.has_ub() else 0,
+        )
+        if ecart > 1e-6:
+            violations[contrainte.name] = ecart
+    stock = {
+        f"C_prod_elec_6[{p}]": abs(valeurs[0])
+        for p, valeurs in resultat["ecart_stock"].items()
+        if abs(valeurs[0]) > 1e-6
+    }
+    assert violations.keys() == stock.keys()
+    for nom, ecart in violations.items():
+        assert ecart == pytest.approx(stock[nom], rel=1e-6)
+    assert resultat["demande_non_servie"][0] == pytest.approx(0, abs=1e-6)
@@ -0,0 +1,96 @@
+import pyomo.environ as pyo
+import pytest
+from pyomo.opt import TerminationCondition
+import config
+import Definition.modelisation as modelisation
+import Resolution.solveur as solveur
+import Utils.utils as utils
+from Donnees.data import Acteurs
+
+
+def _model():
+    # Petit cas : 24 h, coût total de tous les acteurs
+    donnees = utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+    model = modelisation.init_model(donnees=donnees)
+    model.objective = pyo.Objective(expr=sum(model.fn_obj[a] for a in Acteurs))
+    return model
+
+
+def test_limites_parts_du_delai(monkeypatch):
+    # Le délai total est réparti selon les poids des phases restantes, et le budget de
+    # la phase le plafonne
+    monkeypatch.setattr(
+        config,
+        "budgets_phases",
+        {
+            "table_gains": {"temps": None, "ecart": 0.01, "poids": 1},
+            "goal_programming": {"temps": 5.0, "ecart": None, "poids": 1},
+            "max_min": {"temps": None, "ecart": None, "poids": 2},
+            "co2": {"temps": None, "ecart": None, "poids": 0},
+        },
+    )
+    solveur.demarrer_echeance(1000.0)
+    temps, ecart = solveur.limites("table_gains")
+    assert temps == pytest.approx(250.0, abs=1.0)
+    assert ecart == 0.01
+    temps, ecart = solveur.limites("goal_programming")
+    assert temps == 5.0
+    assert ecart is None
+    assert solveur.limites("goal_programming", temps_max=2.0)[0] == 2.0
+    solveur.demarrer_echeance(None)
+    assert solveur.limites(None) == (None, None)
+
+
+def test_resolution_budgetee(monkeypatch):
+    # Une résolution sous budget (délai total et écart visé nul) a l'objectif de la
+    # résolution sans limite, et le bilan de sa phase l'enregistre comme optimale
+    model = _model()
+    solveur.resoudre(model)
+    attendu = pyo.value(model.objective)
+
+    monkeypatch.setitem(
+        config.budgets_phases,
+        "table_gains",
+        {"temps": 600.0, "ecart": 0.0, "poids": 1},
+    )
+    solveur.demarrer_echeance(3600.0)
+    for v in model.component_data_objects(pyo.Var):
+        if not v.fixed:
+            v.set_value(None)
+    results = solveur.resoudre(model, phase="table_gains")
+    solveur.exiger_solution(results, "table_gains", "Le petit cas")
+    assert results.solver.termination_condition == TerminationCondition.optimal
+    assert pyo.value(model.objective) == pytest.approx(attendu, rel=1e-6, abs=1e-6)
+
+    resume = solveur.bilan()
+    assert list(resume) == ["table_gains"]
+    assert resume["table_gains"]["resolutions"] == 1
+    assert resume["table_gains"]["optimales"] == 1
+    assert resume["table_gains"]["ecart_max"] == pytest.approx(0, abs=1e-6)
+    qualite = solveur.qualite(results)
+    assert qualite["valeur"] == pytest.approx(attendu, rel=1e-6, abs=1e-6)
+    solveur.demarrer_echeance(None)
+
+
+def test_aucune_solution():
+    # Un modèle infaisable lève AucuneSolution, marquée infaisable
+    model = _model()
+    model.infaisable = pyo.Constraint(expr=model.objective.expr <= -1e12)
+    results = solveur.resoudre(model, phase="table_gains")
+    assert not solveur.solution_disponible(results)
+    with pytest.raises(solveur.AucuneSolution) as erreur:
+        solveur.exiger_solution(results, "table_gains", "Le petit cas")
+    assert erreur.value.phase == "table_gains"
+    solveur.demarrer_echeance(None)
+
+
+def test_limites_levees(monkeypatch):
+    # Solveur réutilisé : une résolution sans limite n'hérite pas du temps limite de la
+    # précédente
+    monkeypatch.setattr(solveur, "TEMPS_MIN", 0.0)
+    model = _model()
+    solver = solveur.creer_solveur(persistant=True)
+    results = solveur.resoudre(model, solver=solver, temps_max=1e-9)
+    assert results.solver.termination_condition != TerminationCondition.optimal
+    results = solveur.resoudre(model, solver=solver)
+    assert results.solver.termination_condition == TerminationCondition.optimal
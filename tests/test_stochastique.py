@@ -0,0 +1,18 @@
+import pytest
+import config
+import Resolution.stochastique as stochastique
+
+
+def test_progressive_hedging_forme_etendue():
+    # Petit cas : le consensus du progressive hedging a l'objectif de la forme étendue
+    donnees_scenarios = stochastique.generer_scenarios(
+        3, debuts=[config.debut_data], horizon=24, graine=1
+    )
+    forme_etendue = stochastique.resoudre_forme_etendue(donnees_scenarios)
+    resultat = stochastique.progressive_hedging(donnees_scenarios, processus=1)
+
+    assert resultat["converge"]
+    assert resultat["borne_inferieure"] <= forme_etendue["objectif"] + 1e-6
+    assert resultat["objectif"] == pytest.approx(forme_etendue["objectif"], rel=1e-3)
+    # Le consensus (moyenne des tailles des scénarios) est réalisable dans chaque scénario
+    assert all(r["statut"] == "optimal" for r in resultat["scenarios"])
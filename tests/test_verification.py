@@ -0,0 +1,54 @@
+import pyomo.environ as pyo
+import pytest
+from pyomo.opt import TerminationCondition
+import config
+import Definition.modelisation as modelisation
+import Resolution.simulation as simulation
+import Resolution.solveur as solveur
+import Resolution.verification as verification
+import Utils.utils as utils
+from Donnees.data import Acteurs
+
+
+def _statut(donnees: tuple) -> TerminationCondition:
+    # Statut de la résolution du modèle construit sur les séries
+    model = modelisation.init_model(donnees=donnees)
+    model.objective = pyo.Objective(expr=sum(model.fn_obj[a] for a in Acteurs))
+    return solveur.resoudre(model).solver.termination_condition
+
+
+@pytest.mark.parametrize("facteur", [1, 1000])
+def test_rapport_et_modele(facteur):
+    # Petit cas : 24 h, demande multipliée. Une fenêtre signalée est infaisable pour le
+    # modèle (conditions nécessaires), la fenêtre du fichier est réalisable pour les deux
+    donnees = utils.read_data(config.fichier_donnees, 24, debut_data=config.debut_data)
+    donnees = (
+        *donnees[:3],
+        {c: [facteur * d for d in demande] for c, demande in donnees[3].items()},
+    )
+    rapport = verification.verifier_demande(simulation.empiler_series([donnees]))[0]
+    statut = _statut(donnees)
+    if facteur == 1:
+        assert rapport["realisable"]
+        assert rapport["heures"] == []
+        assert statut == TerminationCondition.optimal
+    else:
+        assert not rapport["realisable"]
+        assert len(rapport["heures"]) == len(rapport["manque"])
+        assert all(m > 0 for m in rapport["manque"])
+        assert statut == TerminationCondition.infeasible
+
+
+def test_bornes():
+    # Bornes inversées : bloquant ; nadir meilleur que l'utopie : signalé seulement
+    a, b = Acteurs[:2]
+    problemes = verification.verifier_bornes(
+        {a: 10.0, b: 0.0}, {a: 5.0, b: 10.0}, {a: 0.0, b: 3.0}, {a: 8.0, b: 2.0}
+    )
+    assert [(p["acteur"], p["bloquant"]) for p in problemes] == [(a, True), (b, False)]
+    with pytest.raises(verification.ScenarioInfaisable) as erreur:
+        verification.exiger_bornes(
+            {a: 10.0, b: 0.0}, {a: 5.0, b: 10.0}, {a: 0.0, b: 3.0}, {a: 8.0, b: 2.0}
+        )
+    assert erreur.value.infaisable
+    assert erreur.value.rapport["bornes"] == problemes